@@ -0,0 +1,18 @@
+SET NOCOUNT ON;
+GO
+
+IF OBJECT_ID('dbo.system_leases', 'U') IS NULL
+BEGIN
+  CREATE TABLE dbo.system_leases (
+    recid BIGINT IDENTITY(1,1) NOT NULL,
+    element_name NVARCHAR(64) NOT NULL,
+    element_holder NVARCHAR(256) NOT NULL,
+    element_acquired_on DATETIMEOFFSET(7) NOT NULL,
+    element_expires_on DATETIMEOFFSET(7) NOT NULL,
+    element_created_on DATETIMEOFFSET(7) NOT NULL CONSTRAINT DF_system_leases_created_on DEFAULT SYSUTCDATETIME(),
+    element_modified_on DATETIMEOFFSET(7) NOT NULL CONSTRAINT DF_system_leases_modified_on DEFAULT SYSUTCDATETIME(),
+    CONSTRAINT PK_system_leases PRIMARY KEY CLUSTERED (recid),
+    CONSTRAINT UQ_system_leases_name UNIQUE (element_name)
+  );
+END;
+GO
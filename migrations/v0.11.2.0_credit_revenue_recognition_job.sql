@@ -0,0 +1,46 @@
+SET NOCOUNT ON;
+GO
+
+IF NOT EXISTS (
+  SELECT 1 FROM sys.indexes
+  WHERE name = 'IX_finance_credit_lot_events_unrecognized'
+    AND object_id = OBJECT_ID('dbo.finance_credit_lot_events')
+)
+BEGIN
+  CREATE INDEX IX_finance_credit_lot_events_unrecognized
+    ON dbo.finance_credit_lot_events (recid)
+    INCLUDE (lots_recid, element_credits, element_unit_price, element_created_on)
+    WHERE journals_recid IS NULL AND element_event_type = 'Consume';
+END;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM system_batch_jobs WHERE element_name = 'credit_revenue_recognition')
+BEGIN
+  INSERT INTO system_batch_jobs (
+    element_name,
+    element_description,
+    element_class,
+    element_parameters,
+    element_cron,
+    element_recurrence_type,
+    element_total_runs,
+    element_is_enabled,
+    element_status,
+    element_created_on,
+    element_modified_on
+  )
+  VALUES (
+    'credit_revenue_recognition',
+    'Post hourly per-user revenue journals for consumed purchase credits',
+    'server.jobs.revenue_recognition.run',
+    NULL,
+    '5 * * * *',
+    1,
+    0,
+    1,
+    0,
+    SYSUTCDATETIME(),
+    SYSUTCDATETIME()
+  );
+END;
+GO
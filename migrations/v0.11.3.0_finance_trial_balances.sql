@@ -0,0 +1,109 @@
+SET NOCOUNT ON;
+GO
+
+IF OBJECT_ID('dbo.finance_trial_balances', 'U') IS NULL
+BEGIN
+  CREATE TABLE dbo.finance_trial_balances (
+    recid bigint IDENTITY(1,1) NOT NULL PRIMARY KEY,
+    periods_guid uniqueidentifier NOT NULL,
+    accounts_guid uniqueidentifier NOT NULL,
+    -- 0 when the journal has no ledger.
+    ledgers_recid bigint NOT NULL DEFAULT 0,
+    -- 0 holds the account total across every line; other rows hold the lines tagged with that dimension.
+    dimensions_recid bigint NOT NULL DEFAULT 0,
+    element_debit decimal(19,5) NOT NULL DEFAULT 0,
+    element_credit decimal(19,5) NOT NULL DEFAULT 0,
+    element_line_count int NOT NULL DEFAULT 0,
+    element_modified_on datetimeoffset(7) NOT NULL DEFAULT SYSUTCDATETIME()
+  );
+END;
+GO
+
+IF NOT EXISTS (
+  SELECT 1 FROM sys.indexes
+  WHERE name = 'UQ_finance_trial_balances_key'
+    AND object_id = OBJECT_ID('dbo.finance_trial_balances')
+)
+BEGIN
+  CREATE UNIQUE INDEX UQ_finance_trial_balances_key
+    ON dbo.finance_trial_balances (periods_guid, accounts_guid, ledgers_recid, dimensions_recid)
+    INCLUDE (element_debit, element_credit, element_line_count);
+END;
+GO
+
+-- Seed from journals already posted (2) or reversed (3).
+IF NOT EXISTS (SELECT 1 FROM dbo.finance_trial_balances)
+BEGIN
+  INSERT INTO dbo.finance_trial_balances (
+    periods_guid,
+    accounts_guid,
+    ledgers_recid,
+    dimensions_recid,
+    element_debit,
+    element_credit,
+    element_line_count,
+    element_modified_on
+  )
+  SELECT
+    journal.periods_guid,
+    line.accounts_guid,
+    ISNULL(journal.ledgers_recid, 0),
+    0,
+    SUM(line.element_debit),
+    SUM(line.element_credit),
+    COUNT(*),
+    SYSUTCDATETIME()
+  FROM dbo.finance_journals AS journal
+  JOIN dbo.finance_journal_lines AS line ON line.journals_recid = journal.recid
+  WHERE journal.element_status IN (2, 3)
+    AND journal.periods_guid IS NOT NULL
+  GROUP BY journal.periods_guid, line.accounts_guid, ISNULL(journal.ledgers_recid, 0)
+  UNION ALL
+  SELECT
+    journal.periods_guid,
+    line.accounts_guid,
+    ISNULL(journal.ledgers_recid, 0),
+    link.dimensions_recid,
+    SUM(line.element_debit),
+    SUM(line.element_credit),
+    COUNT(*),
+    SYSUTCDATETIME()
+  FROM dbo.finance_journals AS journal
+  JOIN dbo.finance_journal_lines AS line ON line.journals_recid = journal.recid
+  JOIN dbo.finance_journal_line_dimensions AS link ON link.lines_recid = line.recid
+  WHERE journal.element_status IN (2, 3)
+    AND journal.periods_guid IS NOT NULL
+  GROUP BY journal.periods_guid, line.accounts_guid, ISNULL(journal.ledgers_recid, 0), link.dimensions_recid;
+END;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM system_batch_jobs WHERE element_name = 'finance_trial_balance_reconciliation')
+BEGIN
+  INSERT INTO system_batch_jobs (
+    element_name,
+    element_description,
+    element_class,
+    element_parameters,
+    element_cron,
+    element_recurrence_type,
+    element_total_runs,
+    element_is_enabled,
+    element_status,
+    element_created_on,
+    element_modified_on
+  )
+  VALUES (
+    'finance_trial_balance_reconciliation',
+    'Compare finance_trial_balances with vw_finance_trial_balance; run with {"rebuild": true} to recompute',
+    'server.jobs.trial_balance.run',
+    NULL,
+    '30 2 * * *',
+    1,
+    0,
+    1,
+    0,
+    SYSUTCDATETIME(),
+    SYSUTCDATETIME()
+  );
+END;
+GO
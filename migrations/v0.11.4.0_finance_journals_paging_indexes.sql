@@ -0,0 +1,25 @@
+SET NOCOUNT ON;
+GO
+
+IF NOT EXISTS (
+  SELECT 1 FROM sys.indexes
+  WHERE name = 'IX_finance_journals_status_recid'
+    AND object_id = OBJECT_ID('dbo.finance_journals')
+)
+BEGIN
+  CREATE INDEX IX_finance_journals_status_recid
+    ON dbo.finance_journals (element_status, recid DESC);
+END;
+GO
+
+IF NOT EXISTS (
+  SELECT 1 FROM sys.indexes
+  WHERE name = 'IX_finance_journals_periods_recid'
+    AND object_id = OBJECT_ID('dbo.finance_journals')
+)
+BEGIN
+  CREATE INDEX IX_finance_journals_periods_recid
+    ON dbo.finance_journals (periods_guid, recid DESC)
+    INCLUDE (element_status);
+END;
+GO
@@ -0,0 +1,13 @@
+SET NOCOUNT ON;
+GO
+
+IF NOT EXISTS (
+  SELECT 1 FROM sys.indexes
+  WHERE name = 'IX_finance_staging_imports_status_recid'
+    AND object_id = OBJECT_ID('dbo.finance_staging_imports')
+)
+BEGIN
+  CREATE INDEX IX_finance_staging_imports_status_recid
+    ON dbo.finance_staging_imports (element_status, recid DESC);
+END;
+GO
@@ -0,0 +1,56 @@
+SET NOCOUNT ON;
+GO
+
+-- Import progress (report location, manifest, blob offset, rows committed)
+-- so an interrupted billing import can resume after its last batch.
+IF NOT EXISTS (
+  SELECT 1 FROM INFORMATION_SCHEMA.COLUMNS
+  WHERE TABLE_NAME = 'finance_staging_imports' AND COLUMN_NAME = 'element_checkpoint'
+)
+BEGIN
+  ALTER TABLE dbo.finance_staging_imports ADD element_checkpoint nvarchar(max) NULL;
+END;
+GO
+
+-- Row hashes make re-ingesting a batch idempotent within one import.
+IF NOT EXISTS (
+  SELECT 1 FROM INFORMATION_SCHEMA.COLUMNS
+  WHERE TABLE_NAME = 'finance_staging_line_items' AND COLUMN_NAME = 'element_row_hash'
+)
+BEGIN
+  ALTER TABLE dbo.finance_staging_line_items ADD element_row_hash char(64) NULL;
+END;
+GO
+
+IF NOT EXISTS (
+  SELECT 1 FROM INFORMATION_SCHEMA.COLUMNS
+  WHERE TABLE_NAME = 'finance_staging_azure_cost_details' AND COLUMN_NAME = 'element_row_hash'
+)
+BEGIN
+  ALTER TABLE dbo.finance_staging_azure_cost_details ADD element_row_hash char(64) NULL;
+END;
+GO
+
+IF NOT EXISTS (
+  SELECT 1 FROM sys.indexes
+  WHERE name = 'UQ_finance_staging_line_items_row_hash'
+    AND object_id = OBJECT_ID('dbo.finance_staging_line_items')
+)
+BEGIN
+  CREATE UNIQUE INDEX UQ_finance_staging_line_items_row_hash
+    ON dbo.finance_staging_line_items (imports_recid, element_row_hash)
+    WHERE element_row_hash IS NOT NULL;
+END;
+GO
+
+IF NOT EXISTS (
+  SELECT 1 FROM sys.indexes
+  WHERE name = 'UQ_finance_staging_azure_cost_details_row_hash'
+    AND object_id = OBJECT_ID('dbo.finance_staging_azure_cost_details')
+)
+BEGIN
+  CREATE UNIQUE INDEX UQ_finance_staging_azure_cost_details_row_hash
+    ON dbo.finance_staging_azure_cost_details (imports_recid, element_row_hash)
+    WHERE element_row_hash IS NOT NULL;
+END;
+GO
@@ -0,0 +1,269 @@
+"""Read-through result cache for query registry operations.
+
+Cacheable reads are declared in ``CACHE_POLICIES`` keyed by the operation
+without its version suffix. Each policy carries a TTL and the write operations
+that invalidate it. ``DbModule.run`` consults the cache before dispatching and
+invalidates dependent entries after a write completes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Mapping
+
+from queryregistry.models import DBRequest, DBResponse
+
+__all__ = [
+  "CACHE_POLICIES",
+  "CachePolicy",
+  "FINANCE_PERIOD_TTL_SECONDS",
+  "FINANCE_REFERENCE_TTL_SECONDS",
+  "PERSONA_TTL_SECONDS",
+  "QueryResultCache",
+]
+
+
+@dataclass(frozen=True, slots=True)
+class CachePolicy:
+  ttl_seconds: float
+  invalidated_by: frozenset[str] = field(default_factory=frozenset)
+
+
+FINANCE_REFERENCE_TTL_SECONDS = 300.0
+FINANCE_PERIOD_TTL_SECONDS = 120.0
+PERSONA_TTL_SECONDS = 300.0
+
+
+def _policy(ttl_seconds: float, *invalidated_by: str) -> CachePolicy:
+  return CachePolicy(ttl_seconds=ttl_seconds, invalidated_by=frozenset(invalidated_by))
+
+
+_ROLE_WRITES = ("db:system:roles:create", "db:system:roles:update", "db:system:roles:delete")
+_ROUTE_WRITES = ("db:system:public:upsert_route", "db:system:public:delete_route")
+_PERSONA_WRITES = (
+  "db:system:personas:upsert",
+  "db:system:personas:delete",
+  "db:system:personas:models_upsert",
+  "db:system:personas:models_delete",
+)
+_VENDOR_WRITES = ("db:finance:vendors:upsert_vendor", "db:finance:vendors:delete_vendor")
+_ACCOUNT_WRITES = ("db:finance:accounts:upsert", "db:finance:accounts:delete")
+_PERIOD_WRITES = (
+  "db:finance:periods:close",
+  "db:finance:periods:reopen",
+  "db:finance:periods:lock",
+  "db:finance:periods:unlock",
+  "db:finance:periods:upsert",
+  "db:finance:periods:delete",
+  "db:finance:periods:generate_calendar",
+)
+
+CACHE_POLICIES: dict[str, CachePolicy] = {
+  "db:system:roles:list": _policy(300, *_ROLE_WRITES),
+  "db:system:public:get_home_links": _policy(600),
+  "db:system:public:get_navbar_routes": _policy(300, *_ROUTE_WRITES),
+  "db:system:public:get_routes": _policy(300, *_ROUTE_WRITES),
+  "db:system:personas:list": _policy(PERSONA_TTL_SECONDS, *_PERSONA_WRITES),
+  "db:system:personas:get_by_name": _policy(PERSONA_TTL_SECONDS, *_PERSONA_WRITES),
+  "db:system:personas:models_list": _policy(PERSONA_TTL_SECONDS, *_PERSONA_WRITES),
+  "db:system:personas:models_get_by_name": _policy(PERSONA_TTL_SECONDS, *_PERSONA_WRITES),
+  "db:finance:vendors:list_vendors": _policy(FINANCE_REFERENCE_TTL_SECONDS, *_VENDOR_WRITES),
+  "db:finance:vendors:get_vendor": _policy(FINANCE_REFERENCE_TTL_SECONDS, *_VENDOR_WRITES),
+  "db:finance:vendors:get_vendor_by_name": _policy(FINANCE_REFERENCE_TTL_SECONDS, *_VENDOR_WRITES),
+  "db:finance:accounts:list": _policy(FINANCE_REFERENCE_TTL_SECONDS, *_ACCOUNT_WRITES),
+  "db:finance:accounts:get": _policy(FINANCE_REFERENCE_TTL_SECONDS, *_ACCOUNT_WRITES),
+  "db:finance:accounts:list_children": _policy(FINANCE_REFERENCE_TTL_SECONDS, *_ACCOUNT_WRITES),
+  "db:finance:periods:list": _policy(FINANCE_PERIOD_TTL_SECONDS, *_PERIOD_WRITES),
+  "db:finance:periods:list_by_year": _policy(FINANCE_PERIOD_TTL_SECONDS, *_PERIOD_WRITES),
+}
+
+
+def _strip_version(op: str) -> str:
+  return op.rsplit(":", 1)[0]
+
+
+def _build_invalidation_index(policies: Mapping[str, CachePolicy]) -> dict[str, frozenset[str]]:
+  index: dict[str, set[str]] = {}
+  for read_op, policy in policies.items():
+    for write_op in policy.invalidated_by:
+      index.setdefault(write_op, set()).add(read_op)
+  return {write_op: frozenset(reads) for write_op, reads in index.items()}
+
+
+class _Entry:
+  __slots__ = ("base_op", "payload", "rowcount", "expires_at", "size")
+
+  def __init__(self, base_op: str, payload: Any, rowcount: int, expires_at: float, size: int):
+    self.base_op = base_op
+    self.payload = payload
+    self.rowcount = rowcount
+    self.expires_at = expires_at
+    self.size = size
+
+
+class _OpMetrics:
+  __slots__ = ("hits", "misses", "coalesced", "evictions", "invalidations")
+
+  def __init__(self):
+    self.hits = 0
+    self.misses = 0
+    self.coalesced = 0
+    self.evictions = 0
+    self.invalidations = 0
+
+  def as_dict(self) -> dict[str, int]:
+    return {name: getattr(self, name) for name in self.__slots__}
+
+
+class QueryResultCache:
+  """LRU, TTL-bound cache of ``DBResponse`` payloads with single-flight loads."""
+
+  def __init__(
+    self,
+    policies: Mapping[str, CachePolicy] | None = None,
+    *,
+    max_entries: int = 2048,
+    max_bytes: int = 16 * 1024 * 1024,
+    clock: Callable[[], float] = time.monotonic,
+  ):
+    self.policies: dict[str, CachePolicy] = dict(CACHE_POLICIES if policies is None else policies)
+    self.max_entries = max_entries
+    self.max_bytes = max_bytes
+    self._clock = clock
+    self._invalidation_index = _build_invalidation_index(self.policies)
+    self._entries: OrderedDict[str, _Entry] = OrderedDict()
+    self._inflight: dict[str, asyncio.Future] = {}
+    self._generations: dict[str, int] = {}
+    self._metrics: dict[str, _OpMetrics] = {}
+    self._bytes = 0
+
+  def is_cacheable(self, op: str) -> bool:
+    return _strip_version(op) in self.policies
+
+  def _metrics_for(self, base_op: str) -> _OpMetrics:
+    metrics = self._metrics.get(base_op)
+    if metrics is None:
+      metrics = _OpMetrics()
+      self._metrics[base_op] = metrics
+    return metrics
+
+  @staticmethod
+  def _key(request: DBRequest) -> str:
+    return request.op + "|" + json.dumps(request.payload, sort_keys=True, default=str)
+
+  @staticmethod
+  def _response(op: str, entry: _Entry) -> DBResponse:
+    return DBResponse(op=op, payload=copy.deepcopy(entry.payload), rowcount=entry.rowcount)
+
+  async def get_or_load(
+    self,
+    request: DBRequest,
+    loader: Callable[[], Awaitable[DBResponse]],
+  ) -> DBResponse:
+    base_op = _strip_version(request.op)
+    policy = self.policies[base_op]
+    metrics = self._metrics_for(base_op)
+    key = self._key(request)
+
+    entry = self._entries.get(key)
+    if entry is not None:
+      if entry.expires_at > self._clock():
+        self._entries.move_to_end(key)
+        metrics.hits += 1
+        return self._response(request.op, entry)
+      self._drop(key)
+
+    pending = self._inflight.get(key)
+    if pending is not None:
+      metrics.coalesced += 1
+      try:
+        entry = await asyncio.shield(pending)
+      except asyncio.CancelledError:
+        if not pending.cancelled():
+          raise
+        return await loader()
+      return self._response(request.op, entry)
+
+    metrics.misses += 1
+    generation = self._generations.get(base_op, 0)
+    future: asyncio.Future = asyncio.get_running_loop().create_future()
+    self._inflight[key] = future
+    try:
+      response = await loader()
+      entry = _Entry(
+        base_op=base_op,
+        payload=copy.deepcopy(response.payload),
+        rowcount=response.rowcount,
+        expires_at=self._clock() + policy.ttl_seconds,
+        size=len(json.dumps(response.payload, default=str)),
+      )
+      if self._generations.get(base_op, 0) == generation:
+        self._store(key, entry)
+      future.set_result(entry)
+      return response
+    except asyncio.CancelledError:
+      future.cancel()
+      raise
+    except Exception as exc:
+      future.set_exception(exc)
+      # Retrieve the exception so an uncoalesced failure is not reported as unhandled.
+      future.exception()
+      raise
+    finally:
+      if self._inflight.get(key) is future:
+        del self._inflight[key]
+
+  def _store(self, key: str, entry: _Entry):
+    if entry.size > self.max_bytes:
+      return
+    if key in self._entries:
+      self._drop(key)
+    self._entries[key] = entry
+    self._bytes += entry.size
+    while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+      evicted_key, evicted = self._entries.popitem(last=False)
+      self._bytes -= evicted.size
+      self._metrics_for(evicted.base_op).evictions += 1
+
+  def _drop(self, key: str):
+    entry = self._entries.pop(key, None)
+    if entry is not None:
+      self._bytes -= entry.size
+
+  def invalidate_for_write(self, op: str) -> int:
+    """Drop entries made stale by the write ``op``; return the number removed."""
+    targets = self._invalidation_index.get(_strip_version(op))
+    if not targets:
+      return 0
+    return self.invalidate_ops(targets)
+
+  def invalidate_ops(self, base_ops) -> int:
+    targets = set(base_ops)
+    for base_op in targets:
+      self._generations[base_op] = self._generations.get(base_op, 0) + 1
+    # Loads started before the write must not be shared with later readers.
+    for key in [key for key in self._inflight if _strip_version(key.split("|", 1)[0]) in targets]:
+      del self._inflight[key]
+    stale = [key for key, entry in self._entries.items() if entry.base_op in targets]
+    for key in stale:
+      entry = self._entries[key]
+      self._metrics_for(entry.base_op).invalidations += 1
+      self._drop(key)
+    return len(stale)
+
+  def clear(self):
+    self.invalidate_ops(self.policies.keys())
+
+  def stats(self) -> dict[str, Any]:
+    return {
+      "entries": len(self._entries),
+      "bytes": self._bytes,
+      "max_entries": self.max_entries,
+      "max_bytes": self.max_bytes,
+      "ops": {base_op: metrics.as_dict() for base_op, metrics in sorted(self._metrics.items())},
+    }
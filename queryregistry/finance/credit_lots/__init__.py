@@ -8,21 +8,27 @@ from .models import (
   CreateEventParams,
   CreateLotParams,
   ConsumeCreditsParams,
+  ConsumeFifoParams,
   ExpireLotParams,
   GetLotParams,
+  LinkEventsJournalParams,
   ListEventsByLotParams,
   ListLotsByUserParams,
+  ListUnrecognizedConsumptionParams,
   SumRemainingByUserParams,
 )
 
 __all__ = [
   "consume_credits_request",
+  "consume_fifo_request",
   "create_event_request",
   "create_lot_request",
   "expire_lot_request",
   "get_lot_request",
+  "link_events_journal_request",
   "list_events_by_lot_request",
   "list_lots_by_user_request",
+  "list_unrecognized_consumption_request",
   "sum_remaining_by_user_request",
 ]
 
@@ -43,6 +49,10 @@ def consume_credits_request(params: ConsumeCreditsParams) -> DBRequest:
   return DBRequest(op="db:finance:credit_lots:consume_credits:1", payload=params.model_dump())
 
 
+def consume_fifo_request(params: ConsumeFifoParams) -> DBRequest:
+  return DBRequest(op="db:finance:credit_lots:consume_fifo:1", payload=params.model_dump())
+
+
 def expire_lot_request(params: ExpireLotParams) -> DBRequest:
   return DBRequest(op="db:finance:credit_lots:expire_lot:1", payload=params.model_dump())
 
@@ -55,5 +65,13 @@ def create_event_request(params: CreateEventParams) -> DBRequest:
   return DBRequest(op="db:finance:credit_lots:create_event:1", payload=params.model_dump())
 
 
+def link_events_journal_request(params: LinkEventsJournalParams) -> DBRequest:
+  return DBRequest(op="db:finance:credit_lots:link_events_journal:1", payload=params.model_dump())
+
+
+def list_unrecognized_consumption_request(params: ListUnrecognizedConsumptionParams) -> DBRequest:
+  return DBRequest(op="db:finance:credit_lots:list_unrecognized_consumption:1", payload=params.model_dump())
+
+
 def sum_remaining_by_user_request(params: SumRemainingByUserParams) -> DBRequest:
   return DBRequest(op="db:finance:credit_lots:sum_remaining_by_user:1", payload=params.model_dump())
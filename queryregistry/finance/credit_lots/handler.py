@@ -9,12 +9,15 @@ from queryregistry.models import DBRequest, DBResponse
 
 from .services import (
   consume_credits_v1,
+  consume_fifo_v1,
   create_event_v1,
   create_lot_v1,
   expire_lot_v1,
   get_lot_v1,
+  link_events_journal_v1,
   list_events_by_lot_v1,
   list_lots_by_user_v1,
+  list_unrecognized_consumption_v1,
   sum_remaining_by_user_v1,
 )
 
@@ -25,9 +28,12 @@ DISPATCHERS = {
   ("get_lot", "1"): get_lot_v1,
   ("create_lot", "1"): create_lot_v1,
   ("consume_credits", "1"): consume_credits_v1,
+  ("consume_fifo", "1"): consume_fifo_v1,
   ("expire_lot", "1"): expire_lot_v1,
   ("list_events_by_lot", "1"): list_events_by_lot_v1,
   ("create_event", "1"): create_event_v1,
+  ("link_events_journal", "1"): link_events_journal_v1,
+  ("list_unrecognized_consumption", "1"): list_unrecognized_consumption_v1,
   ("sum_remaining_by_user", "1"): sum_remaining_by_user_v1,
 }
 
@@ -10,13 +10,17 @@ __all__ = [
   "CreateEventParams",
   "CreateLotParams",
   "ConsumeCreditsParams",
+  "ConsumeFifoParams",
   "CreditLotEventRecord",
   "CreditLotRecord",
   "ExpireLotParams",
   "GetLotParams",
   "ListEventsByLotParams",
+  "LinkEventsJournalParams",
   "ListLotsByUserParams",
+  "ListUnrecognizedConsumptionParams",
   "SumRemainingByUserParams",
+  "UnrecognizedConsumptionRecord",
 ]
 
 
@@ -56,6 +60,30 @@ class ConsumeCreditsParams(BaseModel):
   credits_to_consume: int
 
 
+class ConsumeFifoParams(BaseModel):
+  model_config = ConfigDict(extra="forbid")
+
+  users_guid: str
+  credits_needed: int
+  description: str | None = None
+  actor_guid: str | None = None
+
+
+class LinkEventsJournalParams(BaseModel):
+  model_config = ConfigDict(extra="forbid")
+
+  events_recids: list[int]
+  journals_recid: int
+
+
+class ListUnrecognizedConsumptionParams(BaseModel):
+  model_config = ConfigDict(extra="forbid")
+
+  before: str
+  # Maximum user-hour groups returned; every event of a returned group is included.
+  limit: int = 1000
+
+
 class ExpireLotParams(BaseModel):
   model_config = ConfigDict(extra="forbid")
 
@@ -115,3 +143,12 @@ class CreditLotEventRecord(TypedDict):
   element_actor_guid: str | None
   journals_recid: int | None
   element_created_on: str
+
+
+class UnrecognizedConsumptionRecord(TypedDict):
+  recid: int
+  lots_recid: int
+  users_guid: str
+  element_credits: int
+  element_unit_price: str
+  element_created_on: str
@@ -2,21 +2,25 @@
 
 from __future__ import annotations
 
+import json
 from collections.abc import Mapping
 from typing import Any
 
 from queryregistry.models import DBResponse
 from server.modules.models.finance_statuses import CREDIT_LOT_ACTIVE
-from queryregistry.providers.mssql import run_exec, run_json_many, run_json_one
+from queryregistry.providers.mssql import run_exec, run_json_many, run_json_one, run_json_one_atomic
 
 __all__ = [
   "consume_credits_v1",
+  "consume_fifo_v1",
   "create_event_v1",
   "create_lot_v1",
   "expire_lot_v1",
   "get_lot_v1",
+  "link_events_journal_v1",
   "list_events_by_lot_v1",
   "list_lots_by_user_v1",
+  "list_unrecognized_consumption_v1",
   "sum_remaining_by_user_v1",
 ]
 
@@ -188,6 +192,138 @@ async def consume_credits_v1(args: Mapping[str, Any]) -> DBResponse:
   )
 
 
+async def consume_fifo_v1(args: Mapping[str, Any]) -> DBResponse:
+  """Consume credits oldest-lot-first in one transaction.
+
+  The user's active lots are read under UPDLOCK/HOLDLOCK so concurrent
+  consumers for the same user queue behind each other instead of spending the
+  same credits twice. When the lots cannot cover the request nothing is
+  written and ``success`` is 0.
+  """
+  sql = f"""
+    SET NOCOUNT ON;
+
+    DECLARE @users_guid uniqueidentifier = TRY_CAST(? AS UNIQUEIDENTIFIER);
+    DECLARE @need int = ?;
+    DECLARE @description nvarchar(512) = ?;
+    DECLARE @actor_guid uniqueidentifier = TRY_CAST(? AS UNIQUEIDENTIFIER);
+    DECLARE @available int;
+
+    DECLARE @taken TABLE (
+      lots_recid bigint PRIMARY KEY,
+      element_source_type nvarchar(64),
+      element_unit_price decimal(19,5),
+      element_credits int
+    );
+    DECLARE @events TABLE (recid bigint, lots_recid bigint);
+
+    SELECT @available = ISNULL(SUM(element_credits_remaining), 0)
+    FROM finance_credit_lots WITH (UPDLOCK, HOLDLOCK, ROWLOCK)
+    WHERE users_guid = @users_guid
+      AND element_expired = 0
+      AND element_credits_remaining > 0
+      AND element_status = {CREDIT_LOT_ACTIVE};
+
+    IF @available >= @need
+    BEGIN
+      INSERT INTO @taken (lots_recid, element_source_type, element_unit_price, element_credits)
+      SELECT
+        recid,
+        element_source_type,
+        element_unit_price,
+        CASE
+          WHEN running_total <= @need THEN element_credits_remaining
+          ELSE @need - (running_total - element_credits_remaining)
+        END
+      FROM (
+        SELECT
+          recid,
+          element_source_type,
+          element_unit_price,
+          element_credits_remaining,
+          SUM(element_credits_remaining) OVER (ORDER BY recid ROWS UNBOUNDED PRECEDING) AS running_total
+        FROM finance_credit_lots
+        WHERE users_guid = @users_guid
+          AND element_expired = 0
+          AND element_credits_remaining > 0
+          AND element_status = {CREDIT_LOT_ACTIVE}
+      ) AS lots
+      WHERE running_total - element_credits_remaining < @need;
+
+      UPDATE lot
+      SET
+        element_credits_remaining = lot.element_credits_remaining - taken.element_credits,
+        element_modified_on = SYSUTCDATETIME()
+      FROM finance_credit_lots AS lot
+      JOIN @taken AS taken ON taken.lots_recid = lot.recid;
+
+      INSERT INTO finance_credit_lot_events (
+        lots_recid,
+        element_event_type,
+        element_credits,
+        element_unit_price,
+        element_description,
+        element_actor_guid,
+        journals_recid,
+        element_created_on
+      )
+      OUTPUT inserted.recid, inserted.lots_recid INTO @events
+      SELECT
+        lots_recid,
+        'Consume',
+        element_credits,
+        element_unit_price,
+        @description,
+        @actor_guid,
+        NULL,
+        SYSUTCDATETIME()
+      FROM @taken;
+
+      UPDATE users_credits
+      SET element_credits = @available - @need
+      WHERE users_guid = @users_guid;
+    END
+
+    SELECT
+      CAST(CASE WHEN @available >= @need THEN 1 ELSE 0 END AS bit) AS success,
+      @available AS credits_available,
+      CASE WHEN @available >= @need THEN @need ELSE 0 END AS credits_consumed,
+      CASE WHEN @available >= @need THEN @available - @need ELSE @available END AS wallet_balance,
+      (
+        SELECT
+          taken.lots_recid,
+          events.recid AS events_recid,
+          taken.element_source_type AS source_type,
+          taken.element_unit_price AS unit_price,
+          taken.element_credits AS credits
+        FROM @taken AS taken
+        LEFT JOIN @events AS events ON events.lots_recid = taken.lots_recid
+        ORDER BY taken.lots_recid
+        FOR JSON PATH
+      ) AS lots
+    FOR JSON PATH, WITHOUT_ARRAY_WRAPPER, INCLUDE_NULL_VALUES;
+  """
+  params = (
+    args["users_guid"],
+    args["credits_needed"],
+    args.get("description"),
+    args.get("actor_guid"),
+  )
+  res = await run_json_one_atomic(sql, params)
+  if res.rows:
+    res.rows[0]["lots"] = res.rows[0].get("lots") or []
+  return res
+
+
+async def link_events_journal_v1(args: Mapping[str, Any]) -> DBResponse:
+  sql = """
+    UPDATE finance_credit_lot_events
+    SET journals_recid = ?
+    WHERE recid IN (SELECT CAST(value AS bigint) FROM OPENJSON(?));
+  """
+  return await run_exec(sql, (args["journals_recid"], json.dumps(args["events_recids"])))
+
+
 async def expire_lot_v1(args: Mapping[str, Any]) -> DBResponse:
   sql = """
     UPDATE finance_credit_lots
@@ -282,6 +418,48 @@ async def create_event_v1(args: Mapping[str, Any]) -> DBResponse:
   return await run_json_one(sql, params)
 
 
+async def list_unrecognized_consumption_v1(args: Mapping[str, Any]) -> DBResponse:
+  # TOP applies to whole user-hour groups so a group is never split across runs.
+  sql = """
+    WITH pending AS (
+      SELECT
+        ev.recid,
+        ev.lots_recid,
+        lot.users_guid,
+        ev.element_credits,
+        ev.element_unit_price,
+        ev.element_created_on,
+        CONVERT(char(13), SWITCHOFFSET(ev.element_created_on, '+00:00'), 126) AS element_hour
+      FROM finance_credit_lot_events AS ev
+      JOIN finance_credit_lots AS lot ON lot.recid = ev.lots_recid
+      WHERE ev.element_event_type = 'Consume'
+        AND ev.journals_recid IS NULL
+        AND ev.element_unit_price > 0
+        AND lot.element_source_type = 'purchase'
+        AND ev.element_created_on < TRY_CAST(? AS DATETIMEOFFSET(7))
+    ),
+    batch AS (
+      SELECT TOP (?) users_guid, element_hour
+      FROM pending
+      GROUP BY users_guid, element_hour
+      ORDER BY MIN(recid) ASC
+    )
+    SELECT
+      p.recid,
+      p.lots_recid,
+      p.users_guid,
+      p.element_credits,
+      p.element_unit_price,
+      p.element_created_on,
+      p.element_hour
+    FROM pending AS p
+    JOIN batch AS b ON b.users_guid = p.users_guid AND b.element_hour = p.element_hour
+    ORDER BY p.recid ASC
+    FOR JSON PATH, INCLUDE_NULL_VALUES;
+  """
+  return await run_json_many(sql, (args["before"], args["limit"]))
+
+
 async def sum_remaining_by_user_v1(args: Mapping[str, Any]) -> DBResponse:
   sql = f"""
     SELECT ISNULL(SUM(element_credits_remaining), 0) AS total_remaining
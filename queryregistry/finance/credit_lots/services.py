@@ -12,21 +12,27 @@ from .models import (
   CreateEventParams,
   CreateLotParams,
   ConsumeCreditsParams,
+  ConsumeFifoParams,
   ExpireLotParams,
   GetLotParams,
+  LinkEventsJournalParams,
   ListEventsByLotParams,
   ListLotsByUserParams,
+  ListUnrecognizedConsumptionParams,
   SumRemainingByUserParams,
 )
 
 __all__ = [
   "consume_credits_v1",
+  "consume_fifo_v1",
   "create_event_v1",
   "create_lot_v1",
   "expire_lot_v1",
   "get_lot_v1",
+  "link_events_journal_v1",
   "list_events_by_lot_v1",
   "list_lots_by_user_v1",
+  "list_unrecognized_consumption_v1",
   "sum_remaining_by_user_v1",
 ]
 
@@ -36,9 +42,14 @@ _LIST_LOTS_BY_USER_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.list_lo
 _GET_LOT_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.get_lot_v1}
 _CREATE_LOT_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.create_lot_v1}
 _CONSUME_CREDITS_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.consume_credits_v1}
+_CONSUME_FIFO_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.consume_fifo_v1}
 _EXPIRE_LOT_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.expire_lot_v1}
 _LIST_EVENTS_BY_LOT_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.list_events_by_lot_v1}
 _CREATE_EVENT_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.create_event_v1}
+_LINK_EVENTS_JOURNAL_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.link_events_journal_v1}
+_LIST_UNRECOGNIZED_CONSUMPTION_DISPATCHERS: dict[str, _Dispatcher] = {
+  "mssql": mssql.list_unrecognized_consumption_v1,
+}
 _SUM_REMAINING_BY_USER_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.sum_remaining_by_user_v1}
 
 
@@ -73,6 +84,12 @@ async def consume_credits_v1(request: DBRequest, *, provider: str) -> DBResponse
   return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
 
 
+async def consume_fifo_v1(request: DBRequest, *, provider: str) -> DBResponse:
+  params = ConsumeFifoParams.model_validate(request.payload)
+  result = await _select_dispatcher(provider, _CONSUME_FIFO_DISPATCHERS)(params.model_dump())
+  return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
+
+
 async def expire_lot_v1(request: DBRequest, *, provider: str) -> DBResponse:
   params = ExpireLotParams.model_validate(request.payload)
   result = await _select_dispatcher(provider, _EXPIRE_LOT_DISPATCHERS)(params.model_dump())
@@ -91,6 +108,18 @@ async def create_event_v1(request: DBRequest, *, provider: str) -> DBResponse:
   return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
 
 
+async def link_events_journal_v1(request: DBRequest, *, provider: str) -> DBResponse:
+  params = LinkEventsJournalParams.model_validate(request.payload)
+  result = await _select_dispatcher(provider, _LINK_EVENTS_JOURNAL_DISPATCHERS)(params.model_dump())
+  return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
+
+
+async def list_unrecognized_consumption_v1(request: DBRequest, *, provider: str) -> DBResponse:
+  params = ListUnrecognizedConsumptionParams.model_validate(request.payload)
+  result = await _select_dispatcher(provider, _LIST_UNRECOGNIZED_CONSUMPTION_DISPATCHERS)(params.model_dump())
+  return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
+
+
 async def sum_remaining_by_user_v1(request: DBRequest, *, provider: str) -> DBResponse:
   params = SumRemainingByUserParams.model_validate(request.payload)
   result = await _select_dispatcher(provider, _SUM_REMAINING_BY_USER_DISPATCHERS)(params.model_dump())
@@ -5,18 +5,22 @@ from __future__ import annotations
 from queryregistry.models import DBRequest
 
 from .models import (
+  CountJournalsParams,
   CreateJournalParams,
   GetByPostingKeyParams,
   GetJournalParams,
   ListJournalsParams,
+  PostJournalParams,
   UpdateJournalStatusParams,
 )
 
 __all__ = [
+  "count_journals_request",
   "create_journal_request",
   "get_by_posting_key_request",
   "get_journal_request",
   "list_journals_request",
+  "post_journal_request",
   "update_journal_status_request",
 ]
 
@@ -25,6 +29,10 @@ def list_journals_request(params: ListJournalsParams) -> DBRequest:
   return DBRequest(op="db:finance:journals:list:1", payload=params.model_dump())
 
 
+def count_journals_request(params: CountJournalsParams) -> DBRequest:
+  return DBRequest(op="db:finance:journals:count:1", payload=params.model_dump())
+
+
 def get_journal_request(params: GetJournalParams) -> DBRequest:
   return DBRequest(op="db:finance:journals:get:1", payload=params.model_dump())
 
@@ -37,5 +45,9 @@ def update_journal_status_request(params: UpdateJournalStatusParams) -> DBReques
   return DBRequest(op="db:finance:journals:update_status:1", payload=params.model_dump())
 
 
+def post_journal_request(params: PostJournalParams) -> DBRequest:
+  return DBRequest(op="db:finance:journals:post:1", payload=params.model_dump())
+
+
 def get_by_posting_key_request(params: GetByPostingKeyParams) -> DBRequest:
   return DBRequest(op="db:finance:journals:get_by_posting_key:1", payload=params.model_dump())
@@ -7,15 +7,25 @@ from typing import Sequence
 from queryregistry.dispatch import dispatch_subdomain_request
 from queryregistry.models import DBRequest, DBResponse
 
-from .services import create_v1, get_by_posting_key_v1, get_v1, list_v1, update_status_v1
+from .services import (
+  count_v1,
+  create_v1,
+  get_by_posting_key_v1,
+  get_v1,
+  list_v1,
+  post_v1,
+  update_status_v1,
+)
 
 __all__ = ["handle_journals_request"]
 
 DISPATCHERS = {
   ("list", "1"): list_v1,
+  ("count", "1"): count_v1,
   ("get", "1"): get_v1,
   ("create", "1"): create_v1,
   ("update_status", "1"): update_status_v1,
+  ("post", "1"): post_v1,
   ("get_by_posting_key", "1"): get_by_posting_key_v1,
 }
 
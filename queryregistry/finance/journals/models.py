@@ -7,11 +7,14 @@ from typing import TypedDict
 from pydantic import BaseModel, ConfigDict
 
 __all__ = [
+  "CountJournalsParams",
   "CreateJournalParams",
   "GetByPostingKeyParams",
   "GetJournalParams",
+  "JournalCountRecord",
   "JournalRecord",
   "ListJournalsParams",
+  "PostJournalParams",
   "UpdateJournalStatusParams",
 ]
 
@@ -21,6 +24,15 @@ class ListJournalsParams(BaseModel):
 
   status: int | None = None
   periods_guid: str | None = None
+  after_recid: int | None = None
+  limit: int | None = None
+
+
+class CountJournalsParams(BaseModel):
+  model_config = ConfigDict(extra="forbid")
+
+  status: int | None = None
+  periods_guid: str | None = None
 
 
 class GetJournalParams(BaseModel):
@@ -54,6 +66,14 @@ class UpdateJournalStatusParams(BaseModel):
   reversal_of: int | None = None
 
 
+class PostJournalParams(BaseModel):
+  model_config = ConfigDict(extra="forbid")
+
+  recid: int
+  posted_by: str | None = None
+  posted_on: str | None = None
+
+
 class GetByPostingKeyParams(BaseModel):
   model_config = ConfigDict(extra="forbid")
 
@@ -77,3 +97,8 @@ class JournalRecord(TypedDict):
   element_posted_on: str | None
   element_reversed_by: int | None
   element_reversal_of: int | None
+
+
+class JournalCountRecord(TypedDict):
+  total: int
+  estimated: bool
@@ -6,12 +6,25 @@ from collections.abc import Mapping
 from typing import Any
 
 from queryregistry.models import DBResponse
-from queryregistry.providers.mssql import run_json_many, run_json_one
+from queryregistry.providers.mssql import run_json_many, run_json_one, run_json_one_atomic
+from server.modules.models.finance_statuses import (
+  JOURNAL_DRAFT,
+  JOURNAL_PENDING_APPROVAL,
+  JOURNAL_POSTED,
+)
 
-__all__ = ["create_v1", "get_by_posting_key_v1", "get_v1", "list_v1", "update_status_v1"]
+__all__ = [
+  "count_v1",
+  "create_v1",
+  "get_by_posting_key_v1",
+  "get_v1",
+  "list_v1",
+  "post_v1",
+  "update_status_v1",
+]
 
 
-async def list_v1(args: Mapping[str, Any]) -> DBResponse:
+def _journal_filters(args: Mapping[str, Any]) -> tuple[list[str], list[Any]]:
   where_clauses: list[str] = []
   params: list[Any] = []
 
@@ -23,12 +36,32 @@ async def list_v1(args: Mapping[str, Any]) -> DBResponse:
     where_clauses.append("periods_guid = TRY_CAST(? AS UNIQUEIDENTIFIER)")
     params.append(args["periods_guid"])
 
+  return where_clauses, params
+
+
+async def list_v1(args: Mapping[str, Any]) -> DBResponse:
+  """List journals newest first, one keyset page at a time.
+
+  ``after_recid`` is the last recid of the previous page; rows continue below
+  it. Without ``limit`` every matching journal is returned.
+  """
+  where_clauses, params = _journal_filters(args)
+
+  if args.get("after_recid") is not None:
+    where_clauses.append("recid < ?")
+    params.append(args["after_recid"])
+
+  top_sql = ""
+  if args.get("limit") is not None:
+    top_sql = "TOP (?)"
+    params.insert(0, args["limit"])
+
   where_sql = ""
   if where_clauses:
     where_sql = "WHERE " + " AND ".join(where_clauses)
 
   sql = f"""
-    SELECT
+    SELECT {top_sql}
       recid,
       element_name,
       element_description,
@@ -53,6 +86,36 @@ async def list_v1(args: Mapping[str, Any]) -> DBResponse:
   return await run_json_many(sql, params)
 
 
+async def count_v1(args: Mapping[str, Any]) -> DBResponse:
+  """Count journals matching the list filters.
+
+  Unfiltered counts come from partition metadata rather than a scan and are
+  flagged as estimates.
+  """
+  where_clauses, params = _journal_filters(args)
+  if not where_clauses:
+    sql = """
+      SELECT
+        CAST(ISNULL(SUM(row_count), 0) AS bigint) AS total,
+        CAST(1 AS bit) AS estimated
+      FROM sys.dm_db_partition_stats
+      WHERE object_id = OBJECT_ID('dbo.finance_journals')
+        AND index_id IN (0, 1)
+      FOR JSON PATH, WITHOUT_ARRAY_WRAPPER, INCLUDE_NULL_VALUES;
+    """
+    return await run_json_one(sql)
+
+  sql = f"""
+    SELECT
+      COUNT_BIG(*) AS total,
+      CAST(0 AS bit) AS estimated
+    FROM finance_journals
+    WHERE {" AND ".join(where_clauses)}
+    FOR JSON PATH, WITHOUT_ARRAY_WRAPPER, INCLUDE_NULL_VALUES;
+  """
+  return await run_json_one(sql, params)
+
+
 async def get_v1(args: Mapping[str, Any]) -> DBResponse:
   sql = """
     SELECT
@@ -217,6 +280,132 @@ async def update_status_v1(args: Mapping[str, Any]) -> DBResponse:
   return await run_json_one(sql, params)
 
 
+async def post_v1(args: Mapping[str, Any]) -> DBResponse:
+  """Post a draft or pending journal and fold its lines into the trial balance.
+
+  The status change and the ``finance_trial_balances`` update run in one
+  transaction. Each line adds to the all-dimensions row (``dimensions_recid``
+  0) of its account, period and ledger, and to one row per dimension tagged on
+  the line. A journal that is no longer draft or pending is left untouched and
+  no row is returned, so a repeated post cannot count its lines twice.
+  """
+  sql = f"""
+    SET NOCOUNT ON;
+
+    DECLARE @result TABLE (
+      recid bigint,
+      element_name nvarchar(max),
+      element_description nvarchar(max),
+      numbers_recid bigint,
+      element_status tinyint,
+      element_created_on datetimeoffset,
+      element_modified_on datetimeoffset,
+      element_posting_key nvarchar(max),
+      element_source_type nvarchar(max),
+      element_source_id nvarchar(max),
+      periods_guid uniqueidentifier,
+      ledgers_recid bigint,
+      element_posted_by uniqueidentifier,
+      element_posted_on datetimeoffset,
+      element_reversed_by bigint,
+      element_reversal_of bigint
+    );
+
+    UPDATE finance_journals
+    SET
+      element_status = {JOURNAL_POSTED},
+      element_posted_by = TRY_CAST(? AS UNIQUEIDENTIFIER),
+      element_posted_on = TRY_CAST(? AS DATETIMEOFFSET(7)),
+      element_modified_on = SYSUTCDATETIME()
+    OUTPUT
+      inserted.recid,
+      inserted.element_name,
+      inserted.element_description,
+      inserted.numbers_recid,
+      inserted.element_status,
+      inserted.element_created_on,
+      inserted.element_modified_on,
+      inserted.element_posting_key,
+      inserted.element_source_type,
+      inserted.element_source_id,
+      inserted.periods_guid,
+      inserted.ledgers_recid,
+      inserted.element_posted_by,
+      inserted.element_posted_on,
+      inserted.element_reversed_by,
+      inserted.element_reversal_of
+    INTO @result
+    WHERE recid = ?
+      AND element_status IN ({JOURNAL_DRAFT}, {JOURNAL_PENDING_APPROVAL});
+
+    MERGE finance_trial_balances WITH (HOLDLOCK) AS target
+    USING (
+      SELECT
+        journal.periods_guid,
+        line.accounts_guid,
+        ISNULL(journal.ledgers_recid, 0) AS ledgers_recid,
+        CAST(0 AS bigint) AS dimensions_recid,
+        SUM(line.element_debit) AS element_debit,
+        SUM(line.element_credit) AS element_credit,
+        COUNT(*) AS element_line_count
+      FROM @result AS journal
+      JOIN finance_journal_lines AS line ON line.journals_recid = journal.recid
+      WHERE journal.periods_guid IS NOT NULL
+      GROUP BY journal.periods_guid, line.accounts_guid, ISNULL(journal.ledgers_recid, 0)
+      UNION ALL
+      SELECT
+        journal.periods_guid,
+        line.accounts_guid,
+        ISNULL(journal.ledgers_recid, 0),
+        link.dimensions_recid,
+        SUM(line.element_debit),
+        SUM(line.element_credit),
+        COUNT(*)
+      FROM @result AS journal
+      JOIN finance_journal_lines AS line ON line.journals_recid = journal.recid
+      JOIN finance_journal_line_dimensions AS link ON link.lines_recid = line.recid
+      WHERE journal.periods_guid IS NOT NULL
+      GROUP BY journal.periods_guid, line.accounts_guid, ISNULL(journal.ledgers_recid, 0), link.dimensions_recid
+    ) AS source
+    ON target.periods_guid = source.periods_guid
+      AND target.accounts_guid = source.accounts_guid
+      AND target.ledgers_recid = source.ledgers_recid
+      AND target.dimensions_recid = source.dimensions_recid
+    WHEN MATCHED THEN
+      UPDATE SET
+        element_debit = target.element_debit + source.element_debit,
+        element_credit = target.element_credit + source.element_credit,
+        element_line_count = target.element_line_count + source.element_line_count,
+        element_modified_on = SYSUTCDATETIME()
+    WHEN NOT MATCHED THEN
+      INSERT (
+        periods_guid,
+        accounts_guid,
+        ledgers_recid,
+        dimensions_recid,
+        element_debit,
+        element_credit,
+        element_line_count,
+        element_modified_on
+      )
+      VALUES (
+        source.periods_guid,
+        source.accounts_guid,
+        source.ledgers_recid,
+        source.dimensions_recid,
+        source.element_debit,
+        source.element_credit,
+        source.element_line_count,
+        SYSUTCDATETIME()
+      );
+
+    SELECT * FROM @result
+    FOR JSON PATH, WITHOUT_ARRAY_WRAPPER, INCLUDE_NULL_VALUES;
+  """
+  params = (args.get("posted_by"), args.get("posted_on"), args["recid"])
+  return await run_json_one_atomic(sql, params)
+
+
 async def get_by_posting_key_v1(args: Mapping[str, Any]) -> DBResponse:
   sql = """
     SELECT
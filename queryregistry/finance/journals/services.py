@@ -9,21 +9,33 @@ from queryregistry.models import DBRequest, DBResponse
 
 from . import mssql
 from .models import (
+  CountJournalsParams,
   CreateJournalParams,
   GetByPostingKeyParams,
   GetJournalParams,
   ListJournalsParams,
+  PostJournalParams,
   UpdateJournalStatusParams,
 )
 
-__all__ = ["create_v1", "get_by_posting_key_v1", "get_v1", "list_v1", "update_status_v1"]
+__all__ = [
+  "count_v1",
+  "create_v1",
+  "get_by_posting_key_v1",
+  "get_v1",
+  "list_v1",
+  "post_v1",
+  "update_status_v1",
+]
 
 _Dispatcher = Callable[[Mapping[str, Any]], Awaitable[DBResponse]]
 
 _LIST_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.list_v1}
+_COUNT_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.count_v1}
 _GET_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.get_v1}
 _CREATE_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.create_v1}
 _UPDATE_STATUS_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.update_status_v1}
+_POST_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.post_v1}
 _GET_BY_POSTING_KEY_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.get_by_posting_key_v1}
 
 
@@ -40,6 +52,12 @@ async def list_v1(request: DBRequest, *, provider: str) -> DBResponse:
   return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
 
 
+async def count_v1(request: DBRequest, *, provider: str) -> DBResponse:
+  params = CountJournalsParams.model_validate(request.payload)
+  result = await _select_dispatcher(provider, _COUNT_DISPATCHERS)(params.model_dump())
+  return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
+
+
 async def get_v1(request: DBRequest, *, provider: str) -> DBResponse:
   params = GetJournalParams.model_validate(request.payload)
   result = await _select_dispatcher(provider, _GET_DISPATCHERS)(params.model_dump())
@@ -58,6 +76,12 @@ async def update_status_v1(request: DBRequest, *, provider: str) -> DBResponse:
   return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
 
 
+async def post_v1(request: DBRequest, *, provider: str) -> DBResponse:
+  params = PostJournalParams.model_validate(request.payload)
+  result = await _select_dispatcher(provider, _POST_DISPATCHERS)(params.model_dump())
+  return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
+
+
 async def get_by_posting_key_v1(request: DBRequest, *, provider: str) -> DBResponse:
   params = GetByPostingKeyParams.model_validate(request.payload)
   result = await _select_dispatcher(provider, _GET_BY_POSTING_KEY_DISPATCHERS)(params.model_dump())
@@ -6,15 +6,21 @@ from queryregistry.models import DBRequest
 
 from .models import (
   CreditLotSummaryParams,
+  JournalSummaryCountParams,
   JournalSummaryParams,
   PeriodStatusParams,
+  RebuildTrialBalanceParams,
+  ReconcileTrialBalanceParams,
   TrialBalanceParams,
 )
 
 __all__ = [
   "credit_lot_summary_request",
+  "journal_summary_count_request",
   "journal_summary_request",
   "period_status_request",
+  "rebuild_trial_balance_request",
+  "reconcile_trial_balance_request",
   "trial_balance_request",
 ]
 
@@ -23,10 +29,22 @@ def trial_balance_request(params: TrialBalanceParams) -> DBRequest:
   return DBRequest(op="db:finance:reporting:trial_balance:1", payload=params.model_dump())
 
 
+def rebuild_trial_balance_request(params: RebuildTrialBalanceParams) -> DBRequest:
+  return DBRequest(op="db:finance:reporting:rebuild_trial_balance:1", payload=params.model_dump())
+
+
+def reconcile_trial_balance_request(params: ReconcileTrialBalanceParams) -> DBRequest:
+  return DBRequest(op="db:finance:reporting:reconcile_trial_balance:1", payload=params.model_dump())
+
+
 def journal_summary_request(params: JournalSummaryParams) -> DBRequest:
   return DBRequest(op="db:finance:reporting:journal_summary:1", payload=params.model_dump())
 
 
+def journal_summary_count_request(params: JournalSummaryCountParams) -> DBRequest:
+  return DBRequest(op="db:finance:reporting:journal_summary_count:1", payload=params.model_dump())
+
+
 def period_status_request(params: PeriodStatusParams) -> DBRequest:
   return DBRequest(op="db:finance:reporting:period_status:1", payload=params.model_dump())
 
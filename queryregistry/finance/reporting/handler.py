@@ -9,8 +9,11 @@ from queryregistry.models import DBRequest, DBResponse
 
 from .services import (
   credit_lot_summary_v1,
+  journal_summary_count_v1,
   journal_summary_v1,
   period_status_v1,
+  rebuild_trial_balance_v1,
+  reconcile_trial_balance_v1,
   trial_balance_v1,
 )
 
@@ -18,7 +21,10 @@ __all__ = ["handle_reporting_request"]
 
 DISPATCHERS = {
   ("trial_balance", "1"): trial_balance_v1,
+  ("rebuild_trial_balance", "1"): rebuild_trial_balance_v1,
+  ("reconcile_trial_balance", "1"): reconcile_trial_balance_v1,
   ("journal_summary", "1"): journal_summary_v1,
+  ("journal_summary_count", "1"): journal_summary_count_v1,
   ("period_status", "1"): period_status_v1,
   ("credit_lot_summary", "1"): credit_lot_summary_v1,
 }
@@ -4,15 +4,21 @@ from __future__ import annotations
 
 from typing import TypedDict
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
 
 __all__ = [
   "CreditLotSummaryParams",
   "CreditLotSummaryRecord",
+  "JOURNAL_SUMMARY_COLUMNS",
+  "JournalSummaryCountParams",
   "JournalSummaryParams",
   "JournalSummaryRecord",
   "PeriodStatusParams",
   "PeriodStatusRecord",
+  "RebuildTrialBalanceParams",
+  "RebuildTrialBalanceRecord",
+  "ReconcileTrialBalanceParams",
+  "TrialBalanceMismatchRecord",
   "TrialBalanceParams",
   "TrialBalanceRecord",
 ]
@@ -23,6 +29,21 @@ class TrialBalanceParams(BaseModel):
 
   fiscal_year: int | None = None
   period_guid: str | None = None
+  ledgers_recid: int | None = None
+  dimensions_recid: int | None = None
+
+
+class RebuildTrialBalanceParams(BaseModel):
+  model_config = ConfigDict(extra="forbid")
+
+  periods_guid: str | None = None
+
+
+class ReconcileTrialBalanceParams(BaseModel):
+  model_config = ConfigDict(extra="forbid")
+
+  fiscal_year: int | None = None
+  period_guid: str | None = None
 
 
 class JournalSummaryParams(BaseModel):
@@ -31,6 +52,27 @@ class JournalSummaryParams(BaseModel):
   journal_status: int | None = None
   fiscal_year: int | None = None
   periods_guid: str | None = None
+  after_recid: int | None = None
+  limit: int | None = None
+  columns: list[str] | None = None
+
+  @field_validator("columns")
+  @classmethod
+  def _known_columns(cls, value: list[str] | None) -> list[str] | None:
+    if value is None:
+      return None
+    unknown = sorted(set(value) - set(JOURNAL_SUMMARY_COLUMNS))
+    if unknown:
+      raise ValueError(f"Unknown journal summary columns: {', '.join(unknown)}")
+    return value
+
+
+class JournalSummaryCountParams(BaseModel):
+  model_config = ConfigDict(extra="forbid")
+
+  journal_status: int | None = None
+  fiscal_year: int | None = None
+  periods_guid: str | None = None
 
 
 class PeriodStatusParams(BaseModel):
@@ -59,6 +101,24 @@ class TrialBalanceRecord(TypedDict):
   net_balance: str
 
 
+class RebuildTrialBalanceRecord(TypedDict):
+  periods_guid: str | None
+  rows_deleted: int
+  rows_written: int
+
+
+class TrialBalanceMismatchRecord(TypedDict):
+  period_guid: str
+  fiscal_year: int | None
+  period_name: str | None
+  account_guid: str
+  account_number: str | None
+  view_debit: str
+  view_credit: str
+  table_debit: str
+  table_credit: str
+
+
 class JournalSummaryRecord(TypedDict):
   recid: int
   journal_name: str
@@ -80,6 +140,9 @@ class JournalSummaryRecord(TypedDict):
   total_credit: str
 
 
+JOURNAL_SUMMARY_COLUMNS: tuple[str, ...] = tuple(JournalSummaryRecord.__annotations__)
+
+
 class PeriodStatusRecord(TypedDict):
   period_guid: str
   fiscal_year: int
@@ -6,43 +6,227 @@ from collections.abc import Mapping
 from typing import Any
 
 from queryregistry.models import DBResponse
-from queryregistry.providers.mssql import run_json_many
+from queryregistry.providers.mssql import run_json_many, run_json_one, run_json_one_atomic
+from server.modules.models.finance_statuses import JOURNAL_POSTED, JOURNAL_REVERSED
 
 __all__ = [
   "credit_lot_summary_v1",
+  "journal_summary_count_v1",
   "journal_summary_v1",
   "period_status_v1",
+  "rebuild_trial_balance_v1",
+  "reconcile_trial_balance_v1",
   "trial_balance_v1",
 ]
 
 
 async def trial_balance_v1(args: Mapping[str, Any]) -> DBResponse:
-  where_clauses: list[str] = []
+  """Read the trial balance from the maintained ``finance_trial_balances`` rows.
+
+  ``dimensions_recid`` 0 selects the all-dimensions totals. Ledgers are summed
+  together unless ``ledgers_recid`` narrows the result to one of them.
+  """
+  where_clauses: list[str] = ["balance.dimensions_recid = ?"]
+  params: list[Any] = [args.get("dimensions_recid") or 0]
+
+  if args.get("fiscal_year") is not None:
+    where_clauses.append("period.element_year = ?")
+    params.append(args["fiscal_year"])
+
+  if args.get("period_guid"):
+    where_clauses.append("balance.periods_guid = TRY_CAST(? AS UNIQUEIDENTIFIER)")
+    params.append(args["period_guid"])
+
+  if args.get("ledgers_recid") is not None:
+    where_clauses.append("balance.ledgers_recid = ?")
+    params.append(args["ledgers_recid"])
+
+  where_sql = "WHERE " + " AND ".join(where_clauses)
+
+  sql = f"""
+    SELECT
+      period.element_guid AS period_guid,
+      period.element_year AS fiscal_year,
+      period.element_period_number AS period_number,
+      period.element_period_name AS period_name,
+      account.element_guid AS account_guid,
+      account.element_number AS account_number,
+      account.element_name AS account_name,
+      account.element_type AS account_type,
+      SUM(balance.element_debit) AS total_debit,
+      SUM(balance.element_credit) AS total_credit,
+      SUM(balance.element_debit) - SUM(balance.element_credit) AS net_balance
+    FROM finance_trial_balances AS balance
+    JOIN finance_periods AS period ON period.element_guid = balance.periods_guid
+    JOIN finance_accounts AS account ON account.element_guid = balance.accounts_guid
+    {where_sql}
+    GROUP BY
+      period.element_guid,
+      period.element_year,
+      period.element_period_number,
+      period.element_period_name,
+      account.element_guid,
+      account.element_number,
+      account.element_name,
+      account.element_type
+    ORDER BY account.element_number
+    FOR JSON PATH, INCLUDE_NULL_VALUES;
+  """
+  return await run_json_many(sql, params)
+
+
+async def rebuild_trial_balance_v1(args: Mapping[str, Any]) -> DBResponse:
+  """Recompute ``finance_trial_balances`` from the posted journal lines.
+
+  Scoped to one period when ``periods_guid`` is given, otherwise every period
+  is rebuilt. The delete and insert run in one transaction, so readers never
+  see a half-built balance.
+  """
+  sql = f"""
+    SET NOCOUNT ON;
+
+    DECLARE @periods_guid uniqueidentifier = TRY_CAST(? AS UNIQUEIDENTIFIER);
+    DECLARE @deleted int;
+    DECLARE @written int;
+
+    DELETE FROM finance_trial_balances WITH (TABLOCKX, HOLDLOCK)
+    WHERE @periods_guid IS NULL OR periods_guid = @periods_guid;
+    SET @deleted = @@ROWCOUNT;
+
+    INSERT INTO finance_trial_balances (
+      periods_guid,
+      accounts_guid,
+      ledgers_recid,
+      dimensions_recid,
+      element_debit,
+      element_credit,
+      element_line_count,
+      element_modified_on
+    )
+    SELECT
+      journal.periods_guid,
+      line.accounts_guid,
+      ISNULL(journal.ledgers_recid, 0),
+      0,
+      SUM(line.element_debit),
+      SUM(line.element_credit),
+      COUNT(*),
+      SYSUTCDATETIME()
+    FROM finance_journals AS journal
+    JOIN finance_journal_lines AS line ON line.journals_recid = journal.recid
+    WHERE journal.element_status IN ({JOURNAL_POSTED}, {JOURNAL_REVERSED})
+      AND journal.periods_guid IS NOT NULL
+      AND (@periods_guid IS NULL OR journal.periods_guid = @periods_guid)
+    GROUP BY journal.periods_guid, line.accounts_guid, ISNULL(journal.ledgers_recid, 0)
+    UNION ALL
+    SELECT
+      journal.periods_guid,
+      line.accounts_guid,
+      ISNULL(journal.ledgers_recid, 0),
+      link.dimensions_recid,
+      SUM(line.element_debit),
+      SUM(line.element_credit),
+      COUNT(*),
+      SYSUTCDATETIME()
+    FROM finance_journals AS journal
+    JOIN finance_journal_lines AS line ON line.journals_recid = journal.recid
+    JOIN finance_journal_line_dimensions AS link ON link.lines_recid = line.recid
+    WHERE journal.element_status IN ({JOURNAL_POSTED}, {JOURNAL_REVERSED})
+      AND journal.periods_guid IS NOT NULL
+      AND (@periods_guid IS NULL OR journal.periods_guid = @periods_guid)
+    GROUP BY
+      journal.periods_guid,
+      line.accounts_guid,
+      ISNULL(journal.ledgers_recid, 0),
+      link.dimensions_recid;
+    SET @written = @@ROWCOUNT;
+
+    SELECT
+      @periods_guid AS periods_guid,
+      @deleted AS rows_deleted,
+      @written AS rows_written
+    FOR JSON PATH, WITHOUT_ARRAY_WRAPPER, INCLUDE_NULL_VALUES;
+  """
+  return await run_json_one_atomic(sql, (args.get("periods_guid"),))
+
+
+async def reconcile_trial_balance_v1(args: Mapping[str, Any]) -> DBResponse:
+  """List period/account totals where the maintained balance and the view differ."""
+  where_clauses: list[str] = [
+    "(compared.view_debit <> compared.table_debit OR compared.view_credit <> compared.table_credit)"
+  ]
   params: list[Any] = []
 
   if args.get("fiscal_year") is not None:
-    where_clauses.append("fiscal_year = ?")
+    where_clauses.append("period.element_year = ?")
     params.append(args["fiscal_year"])
 
   if args.get("period_guid"):
-    where_clauses.append("period_guid = TRY_CAST(? AS UNIQUEIDENTIFIER)")
+    where_clauses.append("period.element_guid = TRY_CAST(? AS UNIQUEIDENTIFIER)")
     params.append(args["period_guid"])
 
-  where_sql = ""
-  if where_clauses:
-    where_sql = "WHERE " + " AND ".join(where_clauses)
+  where_sql = "WHERE " + " AND ".join(where_clauses)
 
   sql = f"""
-    SELECT *
-    FROM vw_finance_trial_balance
+    WITH view_totals AS (
+      SELECT
+        period_guid,
+        account_guid,
+        SUM(total_debit) AS total_debit,
+        SUM(total_credit) AS total_credit
+      FROM vw_finance_trial_balance
+      GROUP BY period_guid, account_guid
+    ),
+    table_totals AS (
+      SELECT
+        periods_guid AS period_guid,
+        accounts_guid AS account_guid,
+        SUM(element_debit) AS total_debit,
+        SUM(element_credit) AS total_credit
+      FROM finance_trial_balances
+      WHERE dimensions_recid = 0
+      GROUP BY periods_guid, accounts_guid
+    ),
+    compared AS (
+      SELECT
+        COALESCE(view_totals.period_guid, table_totals.period_guid) AS period_guid,
+        COALESCE(view_totals.account_guid, table_totals.account_guid) AS account_guid,
+        ISNULL(view_totals.total_debit, 0) AS view_debit,
+        ISNULL(view_totals.total_credit, 0) AS view_credit,
+        ISNULL(table_totals.total_debit, 0) AS table_debit,
+        ISNULL(table_totals.total_credit, 0) AS table_credit
+      FROM view_totals
+      FULL OUTER JOIN table_totals
+        ON table_totals.period_guid = view_totals.period_guid
+        AND table_totals.account_guid = view_totals.account_guid
+    )
+    SELECT
+      compared.period_guid,
+      period.element_year AS fiscal_year,
+      period.element_period_name AS period_name,
+      compared.account_guid,
+      account.element_number AS account_number,
+      compared.view_debit,
+      compared.view_credit,
+      compared.table_debit,
+      compared.table_credit
+    FROM compared
+    LEFT JOIN finance_periods AS period ON period.element_guid = compared.period_guid
+    LEFT JOIN finance_accounts AS account ON account.element_guid = compared.account_guid
     {where_sql}
-    ORDER BY account_number
+    ORDER BY period.element_year, period.element_period_number, account.element_number
     FOR JSON PATH, INCLUDE_NULL_VALUES;
   """
   return await run_json_many(sql, params)
 
 
 async def journal_summary_v1(args: Mapping[str, Any]) -> DBResponse:
+  """Page through the journal summary newest first.
+
+  ``after_recid`` continues below the last recid of the previous page and
+  ``columns`` limits the projection; ``recid`` is always returned so callers
+  can ask for the next page.
+  """
   where_clauses: list[str] = []
   params: list[Any] = []
 
@@ -58,12 +242,26 @@ async def journal_summary_v1(args: Mapping[str, Any]) -> DBResponse:
     where_clauses.append("periods_guid = TRY_CAST(? AS UNIQUEIDENTIFIER)")
     params.append(args["periods_guid"])
 
+  if args.get("after_recid") is not None:
+    where_clauses.append("recid < ?")
+    params.append(args["after_recid"])
+
+  top_sql = ""
+  if args.get("limit") is not None:
+    top_sql = "TOP (?)"
+    params.insert(0, args["limit"])
+
+  columns = args.get("columns")
+  select_sql = "*"
+  if columns:
+    select_sql = ", ".join(["recid", *(column for column in columns if column != "recid")])
+
   where_sql = ""
   if where_clauses:
     where_sql = "WHERE " + " AND ".join(where_clauses)
 
   sql = f"""
-    SELECT *
+    SELECT {top_sql} {select_sql}
     FROM vw_finance_journal_summary
     {where_sql}
     ORDER BY recid DESC
@@ -72,6 +270,51 @@ async def journal_summary_v1(args: Mapping[str, Any]) -> DBResponse:
   return await run_json_many(sql, params)
 
 
+async def journal_summary_count_v1(args: Mapping[str, Any]) -> DBResponse:
+  """Count the journals behind the journal summary filters.
+
+  Counts ``finance_journals`` directly instead of the aggregating view. An
+  unfiltered count is read from partition metadata and flagged as an estimate.
+  """
+  where_clauses: list[str] = []
+  params: list[Any] = []
+
+  if args.get("journal_status") is not None:
+    where_clauses.append("journal.element_status = ?")
+    params.append(args["journal_status"])
+
+  if args.get("fiscal_year") is not None:
+    where_clauses.append("period.element_year = ?")
+    params.append(args["fiscal_year"])
+
+  if args.get("periods_guid"):
+    where_clauses.append("journal.periods_guid = TRY_CAST(? AS UNIQUEIDENTIFIER)")
+    params.append(args["periods_guid"])
+
+  if not where_clauses:
+    sql = """
+      SELECT
+        CAST(ISNULL(SUM(row_count), 0) AS bigint) AS total,
+        CAST(1 AS bit) AS estimated
+      FROM sys.dm_db_partition_stats
+      WHERE object_id = OBJECT_ID('dbo.finance_journals')
+        AND index_id IN (0, 1)
+      FOR JSON PATH, WITHOUT_ARRAY_WRAPPER, INCLUDE_NULL_VALUES;
+    """
+    return await run_json_one(sql)
+
+  sql = f"""
+    SELECT
+      COUNT_BIG(*) AS total,
+      CAST(0 AS bit) AS estimated
+    FROM finance_journals AS journal
+    LEFT JOIN finance_periods AS period ON period.element_guid = journal.periods_guid
+    WHERE {" AND ".join(where_clauses)}
+    FOR JSON PATH, WITHOUT_ARRAY_WRAPPER, INCLUDE_NULL_VALUES;
+  """
+  return await run_json_one(sql, params)
+
+
 async def period_status_v1(args: Mapping[str, Any]) -> DBResponse:
   where_clauses: list[str] = []
   params: list[Any] = []
@@ -10,22 +10,31 @@ from queryregistry.models import DBRequest, DBResponse
 from . import mssql
 from .models import (
   CreditLotSummaryParams,
+  JournalSummaryCountParams,
   JournalSummaryParams,
   PeriodStatusParams,
+  RebuildTrialBalanceParams,
+  ReconcileTrialBalanceParams,
   TrialBalanceParams,
 )
 
 __all__ = [
   "credit_lot_summary_v1",
+  "journal_summary_count_v1",
   "journal_summary_v1",
   "period_status_v1",
+  "rebuild_trial_balance_v1",
+  "reconcile_trial_balance_v1",
   "trial_balance_v1",
 ]
 
 _Dispatcher = Callable[[Mapping[str, Any]], Awaitable[DBResponse]]
 
 _TRIAL_BALANCE_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.trial_balance_v1}
+_REBUILD_TRIAL_BALANCE_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.rebuild_trial_balance_v1}
+_RECONCILE_TRIAL_BALANCE_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.reconcile_trial_balance_v1}
 _JOURNAL_SUMMARY_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.journal_summary_v1}
+_JOURNAL_SUMMARY_COUNT_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.journal_summary_count_v1}
 _PERIOD_STATUS_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.period_status_v1}
 _CREDIT_LOT_SUMMARY_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.credit_lot_summary_v1}
 
@@ -43,12 +52,30 @@ async def trial_balance_v1(request: DBRequest, *, provider: str) -> DBResponse:
   return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
 
 
+async def rebuild_trial_balance_v1(request: DBRequest, *, provider: str) -> DBResponse:
+  params = RebuildTrialBalanceParams.model_validate(request.payload)
+  result = await _select_dispatcher(provider, _REBUILD_TRIAL_BALANCE_DISPATCHERS)(params.model_dump())
+  return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
+
+
+async def reconcile_trial_balance_v1(request: DBRequest, *, provider: str) -> DBResponse:
+  params = ReconcileTrialBalanceParams.model_validate(request.payload)
+  result = await _select_dispatcher(provider, _RECONCILE_TRIAL_BALANCE_DISPATCHERS)(params.model_dump())
+  return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
+
+
 async def journal_summary_v1(request: DBRequest, *, provider: str) -> DBResponse:
   params = JournalSummaryParams.model_validate(request.payload)
   result = await _select_dispatcher(provider, _JOURNAL_SUMMARY_DISPATCHERS)(params.model_dump())
   return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
 
 
+async def journal_summary_count_v1(request: DBRequest, *, provider: str) -> DBResponse:
+  params = JournalSummaryCountParams.model_validate(request.payload)
+  result = await _select_dispatcher(provider, _JOURNAL_SUMMARY_COUNT_DISPATCHERS)(params.model_dump())
+  return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
+
+
 async def period_status_v1(request: DBRequest, *, provider: str) -> DBResponse:
   params = PeriodStatusParams.model_validate(request.payload)
   result = await _select_dispatcher(provider, _PERIOD_STATUS_DISPATCHERS)(params.model_dump())
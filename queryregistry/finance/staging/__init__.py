@@ -9,10 +9,12 @@ from .models import (
   ApproveImportParams,
   CreateImportParams,
   DeleteImportParams,
+  GetImportParams,
   InsertCostDetailBatchParams,
   ListCostDetailsByImportParams,
   ListImportsParams,
   RejectImportParams,
+  UpdateImportCheckpointParams,
   UpdateImportStatusParams,
 )
 
@@ -21,10 +23,12 @@ __all__ = [
   "approve_import_request",
   "create_import_request",
   "delete_import_request",
+  "get_import_request",
   "insert_cost_detail_batch_request",
   "list_cost_details_by_import_request",
   "list_imports_request",
   "reject_import_request",
+  "update_import_checkpoint_request",
   "update_import_status_request",
 ]
 
@@ -37,6 +41,10 @@ def update_import_status_request(params: UpdateImportStatusParams) -> DBRequest:
   return DBRequest(op="db:finance:staging:update_import_status:1", payload=params.model_dump())
 
 
+def update_import_checkpoint_request(params: UpdateImportCheckpointParams) -> DBRequest:
+  return DBRequest(op="db:finance:staging:update_import_checkpoint:1", payload=params.model_dump())
+
+
 def approve_import_request(params: ApproveImportParams) -> DBRequest:
   return DBRequest(op="db:finance:staging:approve_import:1", payload=params.model_dump())
 
@@ -56,6 +64,10 @@ def list_imports_request(params: ListImportsParams) -> DBRequest:
   return DBRequest(op="db:finance:staging:list_imports:1", payload=params.model_dump())
 
 
+def get_import_request(params: GetImportParams) -> DBRequest:
+  return DBRequest(op="db:finance:staging:get_import:1", payload=params.model_dump())
+
+
 def list_cost_details_by_import_request(params: ListCostDetailsByImportParams) -> DBRequest:
   return DBRequest(
     op="db:finance:staging:list_cost_details_by_import:1",
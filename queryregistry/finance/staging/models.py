@@ -13,10 +13,12 @@ __all__ = [
   "ApproveImportParams",
   "CreateImportParams",
   "DeleteImportParams",
+  "GetImportParams",
   "InsertCostDetailBatchParams",
   "ListCostDetailsByImportParams",
   "ListImportsParams",
   "RejectImportParams",
+  "UpdateImportCheckpointParams",
   "UpdateImportStatusParams",
 ]
 
@@ -55,11 +57,20 @@ class UpdateImportStatusParams(BaseModel):
   error: str | None = None
 
 
+class UpdateImportCheckpointParams(BaseModel):
+  model_config = ConfigDict(extra="forbid")
+
+  recid: int
+  checkpoint: dict[str, Any] | None = None
+  row_count: int
+
+
 class InsertCostDetailBatchParams(BaseModel):
   model_config = ConfigDict(extra="forbid")
 
   imports_recid: int
   rows: list[dict[str, Any]]
+  row_hashes: list[str] | None = None
 
 
 class DeleteImportParams(BaseModel):
@@ -72,6 +83,14 @@ class ListImportsParams(BaseModel):
   model_config = ConfigDict(extra="forbid")
 
   status: int | None = None
+  after_recid: int | None = None
+  limit: int | None = None
+
+
+class GetImportParams(BaseModel):
+  model_config = ConfigDict(extra="forbid")
+
+  recid: int
 
 
 class ListCostDetailsByImportParams(BaseModel):
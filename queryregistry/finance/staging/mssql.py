@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import re
 from collections.abc import Mapping
 from typing import Any
@@ -20,10 +21,12 @@ __all__ = [
   "approve_import_v1",
   "create_import_v1",
   "delete_import_v1",
+  "get_import_v1",
   "insert_cost_detail_batch_v1",
   "list_cost_details_by_import_v1",
   "list_imports_v1",
   "reject_import_v1",
+  "update_import_checkpoint_v1",
   "update_import_status_v1",
 ]
 
@@ -116,6 +119,25 @@ async def update_import_status_v1(args: Mapping[str, Any]) -> DBResponse:
   return await run_exec(sql, params)
 
 
+async def update_import_checkpoint_v1(args: Mapping[str, Any]) -> DBResponse:
+  """Record import progress so an interrupted import can resume after its last batch."""
+  checkpoint = args.get("checkpoint")
+  sql = """
+    UPDATE finance_staging_imports
+    SET
+      element_checkpoint = ?,
+      element_row_count = ?,
+      element_modified_on = SYSUTCDATETIME()
+    WHERE recid = ?;
+  """
+  params = (
+    json.dumps(checkpoint) if checkpoint is not None else None,
+    args["row_count"],
+    args["recid"],
+  )
+  return await run_exec(sql, params)
+
+
 async def approve_import_v1(args: Mapping[str, Any]) -> DBResponse:
   sql = f"""
     SET NOCOUNT ON;
@@ -162,9 +184,10 @@ async def delete_import_v1(args: Mapping[str, Any]) -> DBResponse:
 async def insert_cost_detail_batch_v1(args: Mapping[str, Any]) -> DBResponse:
   imports_recid = args["imports_recid"]
   rows = args.get("rows") or []
+  row_hashes = args.get("row_hashes") or []
   inserted = 0
 
-  for row in rows:
+  for index, row in enumerate(rows):
     columns = ["imports_recid"]
     values: list[Any] = [imports_recid]
 
@@ -173,46 +196,37 @@ async def insert_cost_detail_batch_v1(args: Mapping[str, Any]) -> DBResponse:
       columns.append(column_name)
       values.append(field_value)
 
-    columns_sql = ", ".join(f"[{column}]" for column in columns)
-    placeholders_sql = ", ".join("?" for _ in values)
-    sql = f"""
-      INSERT INTO finance_staging_azure_cost_details ({columns_sql})
-      VALUES ({placeholders_sql});
-    """
-    await run_exec(sql, tuple(values))
-    inserted += 1
+    row_hash = row_hashes[index] if index < len(row_hashes) else None
+    if row_hash is None:
+      columns_sql = ", ".join(f"[{column}]" for column in columns)
+      placeholders_sql = ", ".join("?" for _ in values)
+      sql = f"""
+        INSERT INTO finance_staging_azure_cost_details ({columns_sql})
+        VALUES ({placeholders_sql});
+      """
+    else:
+      # Rows already staged by an earlier attempt of this import are skipped.
+      columns.append("element_row_hash")
+      values.append(row_hash)
+      columns_sql = ", ".join(f"[{column}]" for column in columns)
+      placeholders_sql = ", ".join("?" for _ in values)
+      sql = f"""
+        INSERT INTO finance_staging_azure_cost_details ({columns_sql})
+        SELECT {placeholders_sql}
+        WHERE NOT EXISTS (
+          SELECT 1
+          FROM finance_staging_azure_cost_details
+          WHERE imports_recid = ? AND element_row_hash = ?
+        );
+      """
+      values.extend((imports_recid, row_hash))
+    result = await run_exec(sql, tuple(values))
+    inserted += result.rowcount
 
   return DBResponse(rows=[], rowcount=inserted)
 
 
-async def list_imports_v1(args: Mapping[str, Any]) -> DBResponse:
-  status = args.get("status")
-  if status is not None:
-    sql = """
-      SELECT
-        recid,
-        element_source,
-        element_scope,
-        element_metric,
-        element_period_start,
-        element_period_end,
-        element_status,
-        element_row_count,
-        element_error,
-        element_requested_by,
-        element_approved_by,
-        element_approved_on,
-        element_created_on,
-        element_modified_on
-      FROM finance_staging_imports
-      WHERE element_status = ?
-      ORDER BY recid DESC
-      FOR JSON PATH, INCLUDE_NULL_VALUES;
-    """
-    return await run_json_many(sql, (status,))
-
-  sql = """
-    SELECT
+_IMPORT_COLUMNS = """
       recid,
       element_source,
       element_scope,
@@ -227,11 +241,52 @@ async def list_imports_v1(args: Mapping[str, Any]) -> DBResponse:
       element_approved_on,
       element_created_on,
       element_modified_on
+"""
+
+
+async def list_imports_v1(args: Mapping[str, Any]) -> DBResponse:
+  """List imports newest first, optionally by status and one keyset page at a time."""
+  where_clauses: list[str] = []
+  params: list[Any] = []
+
+  if args.get("status") is not None:
+    where_clauses.append("element_status = ?")
+    params.append(args["status"])
+
+  if args.get("after_recid") is not None:
+    where_clauses.append("recid < ?")
+    params.append(args["after_recid"])
+
+  top_sql = ""
+  if args.get("limit") is not None:
+    top_sql = "TOP (?)"
+    params.insert(0, args["limit"])
+
+  where_sql = ""
+  if where_clauses:
+    where_sql = "WHERE " + " AND ".join(where_clauses)
+
+  sql = f"""
+    SELECT {top_sql}
+      {_IMPORT_COLUMNS}
     FROM finance_staging_imports
+    {where_sql}
     ORDER BY recid DESC
     FOR JSON PATH, INCLUDE_NULL_VALUES;
   """
-  return await run_json_many(sql)
+  return await run_json_many(sql, tuple(params))
+
+
+async def get_import_v1(args: Mapping[str, Any]) -> DBResponse:
+  sql = f"""
+    SELECT
+      {_IMPORT_COLUMNS.rstrip()},
+      JSON_QUERY(element_checkpoint) AS element_checkpoint
+    FROM finance_staging_imports
+    WHERE recid = ?
+    FOR JSON PATH, WITHOUT_ARRAY_WRAPPER, INCLUDE_NULL_VALUES;
+  """
+  return await run_json_one(sql, (args["recid"],))
 
 
 async def list_cost_details_by_import_v1(args: Mapping[str, Any]) -> DBResponse:
@@ -13,10 +13,12 @@ from .models import (
   ApproveImportParams,
   CreateImportParams,
   DeleteImportParams,
+  GetImportParams,
   InsertCostDetailBatchParams,
   ListCostDetailsByImportParams,
   ListImportsParams,
   RejectImportParams,
+  UpdateImportCheckpointParams,
   UpdateImportStatusParams,
 )
 
@@ -25,10 +27,12 @@ __all__ = [
   "approve_import_v1",
   "create_import_v1",
   "delete_import_v1",
+  "get_import_v1",
   "insert_cost_detail_batch_v1",
   "list_cost_details_by_import_v1",
   "list_imports_v1",
   "reject_import_v1",
+  "update_import_checkpoint_v1",
   "update_import_status_v1",
 ]
 
@@ -39,12 +43,16 @@ _DELETE_IMPORT_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.delete_impo
 _UPDATE_IMPORT_STATUS_DISPATCHERS: dict[str, _Dispatcher] = {
   "mssql": mssql.update_import_status_v1,
 }
+_UPDATE_IMPORT_CHECKPOINT_DISPATCHERS: dict[str, _Dispatcher] = {
+  "mssql": mssql.update_import_checkpoint_v1,
+}
 _APPROVE_IMPORT_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.approve_import_v1}
 _REJECT_IMPORT_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.reject_import_v1}
 _INSERT_COST_DETAIL_BATCH_DISPATCHERS: dict[str, _Dispatcher] = {
   "mssql": mssql.insert_cost_detail_batch_v1,
 }
 _LIST_IMPORTS_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.list_imports_v1}
+_GET_IMPORT_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.get_import_v1}
 _LIST_COST_DETAILS_BY_IMPORT_DISPATCHERS: dict[str, _Dispatcher] = {
   "mssql": mssql.list_cost_details_by_import_v1,
 }
@@ -80,6 +88,14 @@ async def update_import_status_v1(request: DBRequest, *, provider: str) -> DBRes
   return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
 
 
+async def update_import_checkpoint_v1(request: DBRequest, *, provider: str) -> DBResponse:
+  params = UpdateImportCheckpointParams.model_validate(request.payload)
+  result = await _select_dispatcher(provider, _UPDATE_IMPORT_CHECKPOINT_DISPATCHERS)(
+    params.model_dump(),
+  )
+  return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
+
+
 async def approve_import_v1(request: DBRequest, *, provider: str) -> DBResponse:
   params = ApproveImportParams.model_validate(request.payload)
   result = await _select_dispatcher(provider, _APPROVE_IMPORT_DISPATCHERS)(params.model_dump())
@@ -106,6 +122,12 @@ async def list_imports_v1(request: DBRequest, *, provider: str) -> DBResponse:
   return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
 
 
+async def get_import_v1(request: DBRequest, *, provider: str) -> DBResponse:
+  params = GetImportParams.model_validate(request.payload)
+  result = await _select_dispatcher(provider, _GET_IMPORT_DISPATCHERS)(params.model_dump())
+  return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
+
+
 async def list_cost_details_by_import_v1(request: DBRequest, *, provider: str) -> DBResponse:
   params = ListCostDetailsByImportParams.model_validate(request.payload)
   result = await _select_dispatcher(provider, _LIST_COST_DETAILS_BY_IMPORT_DISPATCHERS)(
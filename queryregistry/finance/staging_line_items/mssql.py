@@ -24,11 +24,19 @@ async def insert_line_items_batch_v1(args: Mapping[str, Any]) -> DBResponse:
       element_currency,
       element_raw_json,
       element_record_type,
+      element_row_hash,
       element_created_on
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, SYSUTCDATETIME());
+    )
+    SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, SYSUTCDATETIME()
+    WHERE NOT EXISTS (
+      SELECT 1
+      FROM finance_staging_line_items
+      WHERE imports_recid = ? AND element_row_hash = ?
+    );
   """
   for row in rows:
-    await run_exec(
+    row_hash = row.get("element_row_hash")
+    result = await run_exec(
       sql,
       (
         args["imports_recid"],
@@ -43,9 +51,12 @@ async def insert_line_items_batch_v1(args: Mapping[str, Any]) -> DBResponse:
         row.get("element_currency"),
         row.get("element_raw_json"),
         row.get("element_record_type") or "usage",
+        row_hash,
+        args["imports_recid"],
+        row_hash,
       ),
     )
-    inserted += 1
+    inserted += result.rowcount
   return DBResponse(rows=[], rowcount=inserted)
 
 
@@ -83,7 +94,8 @@ async def aggregate_line_items_v1(args: Mapping[str, Any]) -> DBResponse:
       element_category,
       element_record_type,
       SUM(element_amount) AS element_total_amount,
-      COUNT_BIG(1) AS element_row_count
+      COUNT_BIG(1) AS element_row_count,
+      MIN(vendors_recid) AS vendors_recid
     FROM finance_staging_line_items
     WHERE imports_recid = ?
     GROUP BY element_service, element_category, element_record_type
@@ -2,18 +2,23 @@
 
 from __future__ import annotations
 
+import json
 from typing import Any, Iterable, Tuple
 
+from queryregistry.models import DBResponse
+
 from server.modules.providers.database.mssql_provider.db_helpers import (
   exec_query,
   fetch_json,
   fetch_rows,
 )
 from server.modules.providers.database.mssql_provider.logic import transaction
+
 __all__ = [
   "run_exec",
   "run_json_many",
   "run_json_one",
+  "run_json_one_atomic",
   "run_rows_many",
   "run_rows_one",
   "transaction",
@@ -38,3 +43,23 @@ async def run_rows_one(sql: str, params: Iterable[Any] | Tuple[Any, ...] = ()) -
 
 async def run_rows_many(sql: str, params: Iterable[Any] | Tuple[Any, ...] = ()) -> Any:
   return await fetch_rows(sql, tuple(params), one=False)
+
+
+async def run_json_one_atomic(sql: str, params: Iterable[Any] | Tuple[Any, ...] = ()) -> DBResponse:
+  """Run a multi-statement batch in one transaction and read its JSON result.
+
+  Pooled connections run in autocommit mode, so each statement of a plain
+  batch commits on its own. Batches that must apply all of their writes or
+  none of them go through here instead of ``run_json_one``.
+  """
+  async with transaction() as cur:
+    await cur.execute(sql, tuple(params))
+    parts: list[str] = []
+    while True:
+      row = await cur.fetchone()
+      if not row or not row[0]:
+        break
+      parts.append(row[0])
+  if not parts:
+    return DBResponse()
+  return DBResponse(rows=[json.loads("".join(parts))], rowcount=1)
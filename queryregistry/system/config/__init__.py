@@ -8,6 +8,7 @@ from .models import ConfigKeyParams, UpsertConfigParams
 
 __all__ = [
   "delete_config_request",
+  "get_config_checksum_request",
   "get_config_request",
   "get_configs_request",
   "upsert_config_request",
@@ -22,6 +23,10 @@ def get_configs_request() -> DBRequest:
   return DBRequest(op="db:system:config:list:1", payload={})
 
 
+def get_config_checksum_request() -> DBRequest:
+  return DBRequest(op="db:system:config:get_checksum:1", payload={})
+
+
 def upsert_config_request(params: UpsertConfigParams) -> DBRequest:
   return DBRequest(op="db:system:config:upsert:1", payload=params.model_dump())
 
@@ -7,7 +7,13 @@ from typing import Sequence
 from queryregistry.dispatch import dispatch_subdomain_request
 from queryregistry.models import DBRequest, DBResponse
 
-from .services import delete_config_v1, get_config_v1, get_configs_v1, upsert_config_v1
+from .services import (
+  delete_config_v1,
+  get_config_checksum_v1,
+  get_config_v1,
+  get_configs_v1,
+  upsert_config_v1,
+)
 from ..dispatch import SubdomainDispatcher
 
 __all__ = ["handle_config_request"]
@@ -15,6 +21,7 @@ __all__ = ["handle_config_request"]
 DISPATCHERS: dict[tuple[str, str], SubdomainDispatcher] = {
   ("get", "1"): get_config_v1,
   ("list", "1"): get_configs_v1,
+  ("get_checksum", "1"): get_config_checksum_v1,
   ("upsert", "1"): upsert_config_v1,
   ("delete", "1"): delete_config_v1,
 }
@@ -7,6 +7,7 @@ from typing import TypedDict
 from pydantic import BaseModel, ConfigDict
 
 __all__ = [
+  "ConfigChecksumRecord",
   "ConfigKeyParams",
   "ConfigRecord",
   "UpsertConfigParams",
@@ -35,3 +36,10 @@ class ConfigRecord(TypedDict):
 
   element_key: str
   element_value: str
+
+
+class ConfigChecksumRecord(TypedDict):
+  """Aggregate fingerprint of the configuration table used for change detection."""
+
+  element_count: int
+  element_checksum: int | None
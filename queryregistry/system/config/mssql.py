@@ -11,6 +11,7 @@ from queryregistry.models import DBResponse
 
 __all__ = [
   "delete_config_v1",
+  "get_config_checksum_v1",
   "get_config_v1",
   "get_configs_v1",
   "upsert_config_v1",
@@ -38,6 +39,17 @@ async def get_configs_v1(_: Mapping[str, Any]) -> DBResponse:
   return await run_json_many(sql)
 
 
+async def get_config_checksum_v1(_: Mapping[str, Any]) -> DBResponse:
+  sql = """
+    SELECT
+      COUNT(*) AS element_count,
+      CHECKSUM_AGG(BINARY_CHECKSUM(element_key, element_value)) AS element_checksum
+    FROM system_config
+    FOR JSON PATH, WITHOUT_ARRAY_WRAPPER;
+  """
+  return await run_json_one(sql)
+
+
 async def upsert_config_v1(args: Mapping[str, Any]) -> DBResponse:
   key = args["key"]
   value = args["value"]
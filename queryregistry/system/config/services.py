@@ -12,6 +12,7 @@ from .models import ConfigKeyParams, UpsertConfigParams
 
 __all__ = [
   "delete_config_v1",
+  "get_config_checksum_v1",
   "get_config_v1",
   "get_configs_v1",
   "upsert_config_v1",
@@ -21,6 +22,7 @@ _Dispatcher = Callable[[Mapping[str, Any]], Awaitable[DBResponse]]
 
 _GET_CONFIG_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.get_config_v1}
 _GET_CONFIGS_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.get_configs_v1}
+_GET_CONFIG_CHECKSUM_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.get_config_checksum_v1}
 _UPSERT_CONFIG_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.upsert_config_v1}
 _DELETE_CONFIG_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.delete_config_v1}
 
@@ -43,6 +45,11 @@ async def get_configs_v1(request: DBRequest, *, provider: str) -> DBResponse:
   return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
 
 
+async def get_config_checksum_v1(request: DBRequest, *, provider: str) -> DBResponse:
+  result = await _select_dispatcher(provider, _GET_CONFIG_CHECKSUM_DISPATCHERS)(request.payload)
+  return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
+
+
 async def upsert_config_v1(request: DBRequest, *, provider: str) -> DBResponse:
   params = UpsertConfigParams.model_validate(request.payload)
   result = await _select_dispatcher(provider, _UPSERT_CONFIG_DISPATCHERS)(params.model_dump())
@@ -11,6 +11,7 @@ from .models import (
   FindRecentParams,
   InsertConversationParams,
   InsertMessageParams,
+  InsertMessagesParams,
   ListConversationSummaryParams,
   ListByTimeParams,
   ListChannelMessagesParams,
@@ -25,6 +26,7 @@ __all__ = [
   "get_stats_request",
   "insert_conversation_request",
   "insert_message_request",
+  "insert_messages_request",
   "list_by_time_request",
   "list_channel_messages_request",
   "list_recent_request",
@@ -46,6 +48,10 @@ def insert_message_request(params: InsertMessageParams) -> DBRequest:
   return DBRequest(op="db:system:conversations:insert_message:1", payload=params.model_dump())
 
 
+def insert_messages_request(params: InsertMessagesParams) -> DBRequest:
+  return DBRequest(op="db:system:conversations:insert_messages:1", payload=params.model_dump())
+
+
 def update_output_request(params: UpdateOutputParams) -> DBRequest:
   return DBRequest(op="db:system:conversations:update_output:1", payload=params.model_dump())
 
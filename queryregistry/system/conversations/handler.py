@@ -14,6 +14,7 @@ from .services import (
   get_stats_v1,
   insert_conversation_v1,
   insert_message_v1,
+  insert_messages_v1,
   list_by_time_v1,
   list_channel_messages_v1,
   list_recent_v1,
@@ -29,6 +30,7 @@ DISPATCHERS: dict[tuple[str, str], SubdomainDispatcher] = {
   ("insert", "1"): insert_conversation_v1,
   ("find_recent", "1"): find_recent_v1,
   ("insert_message", "1"): insert_message_v1,
+  ("insert_messages", "1"): insert_messages_v1,
   ("update_output", "1"): update_output_v1,
   ("list_by_time", "1"): list_by_time_v1,
   ("list_thread", "1"): list_thread_v1,
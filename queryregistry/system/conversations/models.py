@@ -14,6 +14,7 @@ __all__ = [
   "FindRecentParams",
   "InsertConversationParams",
   "InsertMessageParams",
+  "InsertMessagesParams",
   "ListConversationSummaryParams",
   "ListByTimeParams",
   "ListChannelMessagesParams",
@@ -62,12 +63,20 @@ class InsertMessageParams(BaseModel):
   users_guid: str | None = None
   thread_id: str | None = None
   tokens: int | None = None
+  created_on: str | None = None
+
+
+class InsertMessagesParams(BaseModel):
+  model_config = ConfigDict(extra="forbid")
+
+  messages: list[InsertMessageParams]
 
 
 class ListThreadParams(BaseModel):
   model_config = ConfigDict(extra="forbid")
 
   thread_id: str
+  limit: int | None = None
 
 
 class ListChannelMessagesParams(BaseModel):
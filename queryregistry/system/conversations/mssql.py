@@ -5,7 +5,7 @@ from __future__ import annotations
 from collections.abc import Mapping
 from typing import Any
 
-from queryregistry.providers.mssql import run_exec, run_json_many, run_json_one
+from queryregistry.providers.mssql import run_exec, run_json_many, run_json_one, transaction
 
 from queryregistry.models import DBResponse
 
@@ -13,6 +13,7 @@ __all__ = [
   "find_recent_v1",
   "insert_conversation_v1",
   "insert_message_v1",
+  "insert_messages_v1",
   "list_by_time_v1",
   "list_channel_messages_v1",
   "list_recent_v1",
@@ -79,27 +80,73 @@ async def insert_message_v1(args: Mapping[str, Any]) -> DBResponse:
       element_role,
       element_content,
       element_thread_id,
-      element_tokens
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+      element_tokens,
+      element_created_on
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, SYSDATETIMEOFFSET()));
     SELECT SCOPE_IDENTITY() AS recid
     FOR JSON PATH, WITHOUT_ARRAY_WRAPPER;
   """
-  return await run_json_one(
-    sql,
-    (
-      args["personas_recid"],
-      args["models_recid"],
-      args.get("guild_id"),
-      args.get("channel_id"),
-      args.get("user_id"),
-      args.get("users_guid"),
-      args["role"],
-      args["content"],
-      args.get("thread_id"),
-      args.get("tokens"),
-    ),
+  return await run_json_one(sql, _message_values(args))
+
+
+# SQL Server accepts at most 2100 parameters per statement.
+MESSAGE_INSERT_BATCH_ROWS = 150
+
+
+def _message_values(args: Mapping[str, Any]) -> tuple[Any, ...]:
+  return (
+    args["personas_recid"],
+    args["models_recid"],
+    args.get("guild_id"),
+    args.get("channel_id"),
+    args.get("user_id"),
+    args.get("users_guid"),
+    args["role"],
+    args["content"],
+    args.get("thread_id"),
+    args.get("tokens"),
+    args.get("created_on"),
   )
 
+
+async def insert_messages_v1(args: Mapping[str, Any]) -> DBResponse:
+  """Insert a batch of messages in one transaction.
+
+  Rows go in as multi-row INSERTs of ``MESSAGE_INSERT_BATCH_ROWS``; a failure
+  in any chunk rolls back the whole batch so the caller can retry it intact.
+  """
+  messages = args.get("messages") or []
+  if not messages:
+    return DBResponse(rows=[], rowcount=0)
+  async with transaction() as cur:
+    for start in range(0, len(messages), MESSAGE_INSERT_BATCH_ROWS):
+      chunk = messages[start:start + MESSAGE_INSERT_BATCH_ROWS]
+      rows_sql = ",\n        ".join(
+        "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, SYSDATETIMEOFFSET()))" for _ in chunk
+      )
+      sql = f"""
+      INSERT INTO assistant_conversations (
+        personas_recid,
+        models_recid,
+        element_guild_id,
+        element_channel_id,
+        element_user_id,
+        users_guid,
+        element_role,
+        element_content,
+        element_thread_id,
+        element_tokens,
+        element_created_on
+      ) VALUES
+        {rows_sql};
+      """
+      values: list[Any] = []
+      for message in chunk:
+        values.extend(_message_values(message))
+      await cur.execute(sql, tuple(values))
+  return DBResponse(rows=[], rowcount=len(messages))
+
+
 async def find_recent_v1(args: Mapping[str, Any]) -> DBResponse:
   personas_recid = args["personas_recid"]
   models_recid = args["models_recid"]
@@ -259,6 +306,24 @@ async def list_recent_v1(_: Mapping[str, Any]) -> DBResponse:
 
 
 async def list_thread_v1(args: Mapping[str, Any]) -> DBResponse:
+  limit = args.get("limit")
+  if limit:
+    sql = """
+      SELECT recid, personas_recid, models_recid, element_guild_id, element_channel_id,
+             element_user_id, users_guid, element_role, element_content,
+             element_thread_id, element_tokens, element_created_on
+      FROM (
+        SELECT TOP (?) recid, personas_recid, models_recid, element_guild_id, element_channel_id,
+               element_user_id, users_guid, element_role, element_content,
+               element_thread_id, element_tokens, element_created_on
+        FROM assistant_conversations
+        WHERE element_thread_id = ?
+        ORDER BY element_created_on DESC, recid DESC
+      ) AS recent
+      ORDER BY element_created_on ASC, recid ASC
+      FOR JSON PATH, INCLUDE_NULL_VALUES;
+    """
+    return await run_json_many(sql, (limit, args["thread_id"]))
   sql = """
     SELECT recid, personas_recid, models_recid, element_guild_id, element_channel_id,
            element_user_id, users_guid, element_role, element_content,
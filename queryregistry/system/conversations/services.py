@@ -15,6 +15,7 @@ from .models import (
   FindRecentParams,
   InsertConversationParams,
   InsertMessageParams,
+  InsertMessagesParams,
   ListConversationSummaryParams,
   ListByTimeParams,
   ListChannelMessagesParams,
@@ -26,6 +27,7 @@ __all__ = [
   "find_recent_v1",
   "insert_conversation_v1",
   "insert_message_v1",
+  "insert_messages_v1",
   "list_by_time_v1",
   "list_channel_messages_v1",
   "list_recent_v1",
@@ -42,6 +44,7 @@ _Dispatcher = Callable[[Mapping[str, Any]], Awaitable[DBResponse]]
 _INSERT_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.insert_conversation_v1}
 _FIND_RECENT_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.find_recent_v1}
 _INSERT_MESSAGE_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.insert_message_v1}
+_INSERT_MESSAGES_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.insert_messages_v1}
 _UPDATE_OUTPUT_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.update_output_v1}
 _LIST_BY_TIME_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.list_by_time_v1}
 _LIST_THREAD_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.list_thread_v1}
@@ -81,6 +84,12 @@ async def insert_message_v1(request: DBRequest, *, provider: str) -> DBResponse:
   result = await _select_dispatcher(provider, _INSERT_MESSAGE_DISPATCHERS)(params.model_dump())
   return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
 
+
+async def insert_messages_v1(request: DBRequest, *, provider: str) -> DBResponse:
+  params = InsertMessagesParams.model_validate(request.payload)
+  result = await _select_dispatcher(provider, _INSERT_MESSAGES_DISPATCHERS)(params.model_dump())
+  return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
+
 async def update_output_v1(request: DBRequest, *, provider: str) -> DBResponse:
   params = UpdateOutputParams.model_validate(request.payload)
   result = await _select_dispatcher(provider, _UPDATE_OUTPUT_DISPATCHERS)(params.model_dump())
@@ -12,6 +12,7 @@ from .async_tasks.handler import handle_async_tasks_request
 from .batch_jobs.handler import handle_batch_jobs_request
 from .config.handler import handle_config_request
 from .conversations.handler import handle_conversations_request
+from .leases.handler import handle_leases_request
 from .personas.handler import handle_personas_request
 from .public.handler import handle_public_request
 from .renewals.handler import handle_renewals_request
@@ -24,6 +25,7 @@ HANDLERS = {
   "batch_jobs": handle_batch_jobs_request,
   "config": handle_config_request,
   "conversations": handle_conversations_request,
+  "leases": handle_leases_request,
   "personas": handle_personas_request,
   "public": handle_public_request,
   "renewals": handle_renewals_request,
@@ -0,0 +1,20 @@
+"""System leases query registry request builders."""
+
+from __future__ import annotations
+
+from queryregistry.models import DBRequest
+
+from .models import AcquireLeaseParams, ReleaseLeaseParams
+
+__all__ = [
+  "acquire_lease_request",
+  "release_lease_request",
+]
+
+
+def acquire_lease_request(params: AcquireLeaseParams) -> DBRequest:
+  return DBRequest(op="db:system:leases:acquire:1", payload=params.model_dump())
+
+
+def release_lease_request(params: ReleaseLeaseParams) -> DBRequest:
+  return DBRequest(op="db:system:leases:release:1", payload=params.model_dump())
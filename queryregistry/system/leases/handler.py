@@ -0,0 +1,32 @@
+"""System leases handler implementations."""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+from queryregistry.dispatch import dispatch_subdomain_request
+from queryregistry.models import DBRequest, DBResponse
+
+from .services import acquire_lease_v1, release_lease_v1
+
+__all__ = ["handle_leases_request"]
+
+DISPATCHERS = {
+  ("acquire", "1"): acquire_lease_v1,
+  ("release", "1"): release_lease_v1,
+}
+
+
+async def handle_leases_request(
+  path: Sequence[str],
+  request: DBRequest,
+  *,
+  provider: str,
+) -> DBResponse:
+  return await dispatch_subdomain_request(
+    path,
+    request,
+    provider=provider,
+    dispatchers=DISPATCHERS,
+    detail="Unknown system leases operation",
+  )
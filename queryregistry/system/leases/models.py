@@ -0,0 +1,35 @@
+"""System leases query registry service models."""
+
+from __future__ import annotations
+
+from typing import TypedDict
+
+from pydantic import BaseModel, ConfigDict
+
+__all__ = [
+  "AcquireLeaseParams",
+  "LeaseRecord",
+  "ReleaseLeaseParams",
+]
+
+
+class AcquireLeaseParams(BaseModel):
+  model_config = ConfigDict(extra="forbid")
+
+  name: str
+  holder: str
+  ttl_seconds: int
+
+
+class ReleaseLeaseParams(BaseModel):
+  model_config = ConfigDict(extra="forbid")
+
+  name: str
+  holder: str
+
+
+class LeaseRecord(TypedDict):
+  element_name: str
+  element_holder: str
+  element_acquired_on: str
+  element_expires_on: str
@@ -0,0 +1,74 @@
+"""MSSQL implementations for system leases query registry services."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from queryregistry.models import DBResponse
+from queryregistry.providers.mssql import run_exec, run_json_one
+
+__all__ = [
+  "acquire_lease_v1",
+  "release_lease_v1",
+]
+
+
+async def acquire_lease_v1(args: Mapping[str, Any]) -> DBResponse:
+  """Take or renew a named lease and return its current holder.
+
+  The lease is granted when it does not exist, has expired, or is already held
+  by the caller. The caller owns the lease only when the returned
+  ``element_holder`` matches the requested holder.
+  """
+  sql = """
+    SET NOCOUNT ON;
+    DECLARE @name nvarchar(64) = ?;
+    DECLARE @holder nvarchar(256) = ?;
+    DECLARE @ttl int = ?;
+    DECLARE @now datetimeoffset(7) = SYSUTCDATETIME();
+
+    -- One MERGE under HOLDLOCK so concurrent first acquires cannot both insert.
+    MERGE system_leases WITH (HOLDLOCK) AS lease
+    USING (SELECT @name AS element_name) AS requested
+      ON lease.element_name = requested.element_name
+    WHEN MATCHED AND (lease.element_holder = @holder OR lease.element_expires_on <= @now) THEN
+      UPDATE SET
+        element_acquired_on = CASE WHEN lease.element_holder = @holder THEN lease.element_acquired_on ELSE @now END,
+        element_holder = @holder,
+        element_expires_on = DATEADD(SECOND, @ttl, @now),
+        element_modified_on = @now
+    WHEN NOT MATCHED THEN
+      INSERT (
+        element_name,
+        element_holder,
+        element_acquired_on,
+        element_expires_on,
+        element_created_on,
+        element_modified_on
+      )
+      VALUES (@name, @holder, @now, DATEADD(SECOND, @ttl, @now), @now, @now);
+
+    SELECT
+      element_name,
+      element_holder,
+      element_acquired_on,
+      element_expires_on
+    FROM system_leases
+    WHERE element_name = @name
+    FOR JSON PATH, WITHOUT_ARRAY_WRAPPER, INCLUDE_NULL_VALUES;
+  """
+  return await run_json_one(sql, (args["name"], args["holder"], args["ttl_seconds"]))
+
+
+async def release_lease_v1(args: Mapping[str, Any]) -> DBResponse:
+  sql = """
+    SET NOCOUNT ON;
+    UPDATE system_leases
+    SET
+      element_expires_on = SYSUTCDATETIME(),
+      element_modified_on = SYSUTCDATETIME()
+    WHERE element_name = ?
+      AND element_holder = ?;
+  """
+  return await run_exec(sql, (args["name"], args["holder"]))
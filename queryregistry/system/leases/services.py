@@ -0,0 +1,40 @@
+"""System leases query registry service dispatchers."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+
+from queryregistry.models import DBRequest, DBResponse
+
+from . import mssql
+from .models import AcquireLeaseParams, ReleaseLeaseParams
+
+__all__ = [
+  "acquire_lease_v1",
+  "release_lease_v1",
+]
+
+_Dispatcher = Callable[[Mapping[str, Any]], Awaitable[DBResponse]]
+
+_ACQUIRE_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.acquire_lease_v1}
+_RELEASE_DISPATCHERS: dict[str, _Dispatcher] = {"mssql": mssql.release_lease_v1}
+
+
+def _select_dispatcher(provider: str, dispatchers: dict[str, _Dispatcher]) -> _Dispatcher:
+  dispatcher = dispatchers.get(provider)
+  if dispatcher is None:
+    raise KeyError(f"Unsupported provider '{provider}' for system leases registry")
+  return dispatcher
+
+
+async def acquire_lease_v1(request: DBRequest, *, provider: str) -> DBResponse:
+  params = AcquireLeaseParams.model_validate(request.payload)
+  result = await _select_dispatcher(provider, _ACQUIRE_DISPATCHERS)(params.model_dump())
+  return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
+
+
+async def release_lease_v1(request: DBRequest, *, provider: str) -> DBResponse:
+  params = ReleaseLeaseParams.model_validate(request.payload)
+  result = await _select_dispatcher(provider, _RELEASE_DISPATCHERS)(params.model_dump())
+  return DBResponse(op=request.op, payload=result.payload, rowcount=result.rowcount)
@@ -2,33 +2,37 @@
 
 Exports handlers for each RPC domain with role-based access.
 The auth and public domains are exempt from role checks.
+
+Domain packages are imported on first dispatch so that loading ``rpc`` does
+not pull in every module and SDK behind the individual domains.
 """
 
-from .support.handler import handle_support_request
-from .auth.handler import handle_auth_request
-from .moderation.handler import handle_moderation_request
-from .public.handler import handle_public_request
-from .service.handler import handle_service_request
-from .storage.handler import handle_storage_request
-from .system.handler import handle_system_request
-from .users.handler import handle_users_request
-from .account.handler import handle_account_request
-from .discord.handler import handle_discord_request
-from .finance.handler import handle_finance_request
+from __future__ import annotations
 
+import importlib
+from collections.abc import Callable
 
-HANDLERS: dict[str, callable] = {
-  "support": handle_support_request,
-  "auth": handle_auth_request,
-  "moderation": handle_moderation_request,
-  "public": handle_public_request,
-  "service": handle_service_request,
-  "storage": handle_storage_request,
-  "system": handle_system_request,
-  "users": handle_users_request,
-  "account": handle_account_request,
-  "discord": handle_discord_request,
-  "finance": handle_finance_request,
+# Values are "module:handler" paths until the domain is first dispatched.
+HANDLERS: dict[str, Callable | str] = {
+  "support": "rpc.support.handler:handle_support_request",
+  "auth": "rpc.auth.handler:handle_auth_request",
+  "moderation": "rpc.moderation.handler:handle_moderation_request",
+  "public": "rpc.public.handler:handle_public_request",
+  "service": "rpc.service.handler:handle_service_request",
+  "storage": "rpc.storage.handler:handle_storage_request",
+  "system": "rpc.system.handler:handle_system_request",
+  "users": "rpc.users.handler:handle_users_request",
+  "account": "rpc.account.handler:handle_account_request",
+  "discord": "rpc.discord.handler:handle_discord_request",
+  "finance": "rpc.finance.handler:handle_finance_request",
 }
 
 
+def get_handler(domain: str) -> Callable | None:
+  """Return the handler for ``domain``, importing its package on first use."""
+  entry = HANDLERS.get(domain)
+  if isinstance(entry, str):
+    module_path, attr = entry.split(":", 1)
+    entry = getattr(importlib.import_module(module_path), attr)
+    HANDLERS[domain] = entry
+  return entry
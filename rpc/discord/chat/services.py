@@ -4,7 +4,9 @@ from typing import Any, Dict, List
 from fastapi import HTTPException, Request
 
 from rpc.helpers import unbox_request
+from server.jobs.discord_tasks import PERSONA_DELIVERY_HANDLER, SUMMARIZE_HANDLER, hand_off_to_leader
 from server.models import RPCResponse
+from server.modules.discord_bot_module import DiscordBotUnavailableError
 from server.modules.discord_chat_module import DiscordChatModule
 from server.modules.openai_module import OpenaiModule
 
@@ -29,17 +31,32 @@ def _persona_stub_response(rpc_request, detail: str) -> RPCResponse:
   )
 
 
+def _handoff_payload(task: Dict[str, Any], ack_message: str) -> Dict[str, Any]:
+  return {
+    "success": True,
+    "reason": "queued_on_leader",
+    "task_guid": task["guid"],
+    "ack_message": ack_message,
+  }
+
+
 async def discord_chat_summarize_channel_v1(request: Request):
   rpc_request, _, _ = await unbox_request(request)
   payload = rpc_request.payload or {}
   module: DiscordChatModule = request.app.state.discord_chat
   await module.on_ready()
-  result = await module.summarize_and_deliver(
-    guild_id=payload.get("guild_id"),
-    channel_id=payload.get("channel_id"),
-    hours=int(payload.get("hours", 1)),
-    user_id=int(payload["user_id"]) if payload.get("user_id") is not None else None,
-  )
+  args = {
+    "guild_id": payload.get("guild_id"),
+    "channel_id": payload.get("channel_id"),
+    "hours": int(payload.get("hours", 1)),
+    "user_id": int(payload["user_id"]) if payload.get("user_id") is not None else None,
+  }
+  try:
+    result = await module.summarize_and_deliver(**args)
+  except DiscordBotUnavailableError:
+    # Only the leader worker holds the bot connection; it runs the summary.
+    task = await hand_off_to_leader(request.app, SUMMARIZE_HANDLER, args)
+    result = _handoff_payload(task, "Summary queued for delivery.")
   return RPCResponse(
     op=rpc_request.op,
     payload=result,
@@ -362,14 +379,19 @@ async def discord_chat_deliver_persona_response_v1(request: Request):
       version=rpc_request.version,
     )
 
-  result = await module.deliver_persona_response(
-    persona=payload.get("persona", ""),
-    response=response,
-    conversation_reference=payload.get("conversation_reference"),
-    guild_id=payload.get("guild_id"),
-    channel_id=channel_id,
-    user_id=user_id,
-  )
+  args = {
+    "persona": payload.get("persona", ""),
+    "response": response,
+    "conversation_reference": payload.get("conversation_reference"),
+    "guild_id": payload.get("guild_id"),
+    "channel_id": channel_id,
+    "user_id": user_id,
+  }
+  try:
+    result = await module.deliver_persona_response(**args)
+  except DiscordBotUnavailableError:
+    task = await hand_off_to_leader(request.app, PERSONA_DELIVERY_HANDLER, args)
+    result = _handoff_payload(task, "Persona response queued.")
 
   return RPCResponse(
     op=rpc_request.op,
@@ -26,3 +26,4 @@ class DiscordGuildsUpdateCredits1(BaseModel):
 class DiscordGuildsSyncResult1(BaseModel):
   synced: int
   guilds: list[DiscordGuildsGuildItem1]
+  task_guid: str | None = None
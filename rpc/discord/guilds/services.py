@@ -1,7 +1,9 @@
 from fastapi import Request
 
 from rpc.helpers import unbox_request
+from server.jobs.discord_tasks import GUILD_SYNC_HANDLER, hand_off_to_leader
 from server.models import RPCResponse
+from server.modules.discord_bot_module import DiscordBotUnavailableError
 
 from .models import (
   DiscordGuildsGuildItem1,
@@ -45,7 +47,13 @@ async def discord_guilds_sync_v1(request: Request):
   rpc_request, _, _ = await unbox_request(request)
   module = getattr(request.app.state, "discord_bot", None) or getattr(request.app.state, "discord", None)
   await module.on_ready()
-  synced = await module.sync_guild_records()
+  try:
+    synced = await module.sync_guild_records()
+  except DiscordBotUnavailableError:
+    # Only the leader worker holds the bot connection; it runs the sync.
+    task = await hand_off_to_leader(request.app, GUILD_SYNC_HANDLER, {})
+    payload = DiscordGuildsSyncResult1(synced=0, guilds=[], task_guid=task["guid"])
+    return RPCResponse(op=rpc_request.op, payload=payload.model_dump(), version=rpc_request.version)
   payload = DiscordGuildsSyncResult1(
     synced=synced.get("synced", 0),
     guilds=[DiscordGuildsGuildItem1(**row) for row in synced.get("guilds", [])],
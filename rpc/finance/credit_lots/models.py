@@ -45,7 +45,6 @@ class CreditLotConsume1(BaseModel):
   credits_needed: int
   service_type: str | None = None
   description: str | None = None
-  periods_guid: str | None = None
 
 
 class CreditLotExpire1(BaseModel):
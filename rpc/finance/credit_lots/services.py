@@ -92,7 +92,6 @@ async def finance_credit_lots_consume_v1(request: Request):
       credits_needed=input_payload.credits_needed,
       service_type=input_payload.service_type,
       description=input_payload.description,
-      periods_guid=input_payload.periods_guid,
       actor_guid=auth_ctx.user_guid,
     )
   except ValueError as exc:
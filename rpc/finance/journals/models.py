@@ -20,6 +20,9 @@ class JournalItem1(BaseModel):
 
 class JournalList1(BaseModel):
   journals: list[JournalItem1]
+  next_after_recid: int | None = None
+  total: int | None = None
+  total_estimated: bool = False
 
 
 class JournalGet1(BaseModel):
@@ -68,6 +71,8 @@ class JournalCreate1(BaseModel):
 class JournalListFilter1(BaseModel):
   status: int | None = None
   periods_guid: str | None = None
+  after_recid: int | None = None
+  limit: int | None = Field(default=None, ge=1, le=500)
 
 
 class JournalSubmitForApproval1(BaseModel):
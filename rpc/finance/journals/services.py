@@ -34,8 +34,19 @@ async def finance_journals_list_v1(request: Request):
   input_payload = JournalListFilter1(**(rpc_request.payload or {}))
   module = request.app.state.finance
   await module.on_ready()
-  rows = await module.list_journals(status=input_payload.status, periods_guid=input_payload.periods_guid)
+  rows = await module.list_journals(
+    status=input_payload.status,
+    periods_guid=input_payload.periods_guid,
+    after_recid=input_payload.after_recid,
+    limit=input_payload.limit,
+  )
   payload = JournalList1(journals=[JournalItem1(**journal) for journal in rows])
+  if input_payload.limit is not None and len(rows) == input_payload.limit:
+    payload.next_after_recid = rows[-1]["recid"]
+  if input_payload.limit is not None and input_payload.after_recid is None:
+    count = await module.count_journals(status=input_payload.status, periods_guid=input_payload.periods_guid)
+    payload.total = count["total"]
+    payload.total_estimated = count["estimated"]
   return RPCResponse(op=rpc_request.op, payload=payload.model_dump(), version=rpc_request.version)
 
 
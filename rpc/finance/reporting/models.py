@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class TrialBalanceFilter1(BaseModel):
@@ -10,6 +10,9 @@ class JournalSummaryFilter1(BaseModel):
   journal_status: int | None = None
   fiscal_year: int | None = None
   periods_guid: str | None = None
+  after_recid: int | None = None
+  limit: int | None = Field(default=None, ge=1, le=500)
+  columns: list[str] | None = None
 
 
 class PeriodStatusFilter1(BaseModel):
@@ -26,6 +29,9 @@ class TrialBalanceList1(BaseModel):
 
 class JournalSummaryList1(BaseModel):
   journals: list[dict]
+  next_after_recid: int | None = None
+  total: int | None = None
+  total_estimated: bool = False
 
 
 class PeriodStatusList1(BaseModel):
@@ -34,10 +34,23 @@ async def finance_reporting_journal_summary_v1(request: Request):
   module = request.app.state.finance
   await module.on_ready()
   try:
-    rows = await module.journal_summary(payload.journal_status, payload.fiscal_year, payload.periods_guid)
+    rows = await module.journal_summary(
+      payload.journal_status,
+      payload.fiscal_year,
+      payload.periods_guid,
+      after_recid=payload.after_recid,
+      limit=payload.limit,
+      columns=payload.columns,
+    )
   except ValueError as exc:
     raise HTTPException(status_code=400, detail=str(exc)) from exc
   response_payload = JournalSummaryList1(journals=rows)
+  if payload.limit is not None and len(rows) == payload.limit:
+    response_payload.next_after_recid = rows[-1]["recid"]
+  if payload.limit is not None and payload.after_recid is None:
+    count = await module.journal_summary_count(payload.journal_status, payload.fiscal_year, payload.periods_guid)
+    response_payload.total = count["total"]
+    response_payload.total_estimated = count["estimated"]
   return RPCResponse(op=rpc_request.op, payload=response_payload.model_dump(), version=rpc_request.version)
 
 
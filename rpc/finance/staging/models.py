@@ -1,4 +1,4 @@
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 
 
 class StagingImport1(BaseModel):
@@ -26,8 +26,20 @@ class StagingImportInvoicesResult1(BaseModel):
   message: str | None = None
 
 
+class StagingResumeImport1(BaseModel):
+  imports_recid: int
+
+
+class StagingResumeImportResult1(BaseModel):
+  import_recid: int
+  status: str
+  row_count: int
+
+
 class StagingListImports1(BaseModel):
   status: int | None = None
+  after_recid: int | None = None
+  limit: int | None = Field(default=None, ge=1, le=500)
 
 
 class StagingImportItem1(BaseModel):
@@ -49,6 +61,7 @@ class StagingImportItem1(BaseModel):
 
 class StagingImportList1(BaseModel):
   imports: list[StagingImportItem1]
+  next_after_recid: int | None = None
 
 
 class StagingListDetails1(BaseModel):
@@ -92,6 +105,17 @@ class StagingPromoteResult1(BaseModel):
   task_guid: str
 
 
+class StagingBackfill1(BaseModel):
+  start_month: str
+  end_month: str
+  subscriptions: list[str] = []
+  metric: str = "ActualCost"
+
+
+class StagingBackfillResult1(BaseModel):
+  task_guid: str
+
+
 class StagingLineItem1(BaseModel):
   recid: int
   imports_recid: int
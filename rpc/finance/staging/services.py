@@ -6,6 +6,8 @@ from server.models import RPCResponse
 from .models import (
   StagingApprove1,
   StagingApproveResult1,
+  StagingBackfill1,
+  StagingBackfillResult1,
   StagingDeleteImport1,
   StagingDeleteResult1,
   StagingImport1,
@@ -22,6 +24,8 @@ from .models import (
   StagingPromoteResult1,
   StagingReject1,
   StagingRejectResult1,
+  StagingResumeImport1,
+  StagingResumeImportResult1,
 )
 
 
@@ -54,13 +58,32 @@ async def finance_staging_import_invoices_v1(request: Request):
   return RPCResponse(op=rpc_request.op, payload=response_payload.model_dump(), version=rpc_request.version)
 
 
+async def finance_staging_resume_import_v1(request: Request):
+  rpc_request, auth_ctx, _ = await unbox_request(request)
+  payload = StagingResumeImport1(**(rpc_request.payload or {}))
+  module = request.app.state.billing_import
+  await module.on_ready()
+  try:
+    result = await module.resume_import(payload.imports_recid)
+  except ValueError as exc:
+    raise HTTPException(status_code=400, detail=str(exc)) from exc
+  response_payload = StagingResumeImportResult1(
+    import_recid=result["import_recid"],
+    status=result["status"],
+    row_count=result.get("row_count", result.get("invoice_count", 0)),
+  )
+  return RPCResponse(op=rpc_request.op, payload=response_payload.model_dump(), version=rpc_request.version)
+
+
 async def finance_staging_list_imports_v1(request: Request):
   rpc_request, auth_ctx, _ = await unbox_request(request)
   payload = StagingListImports1(**(rpc_request.payload or {}))
   module = request.app.state.finance
   await module.on_ready()
-  rows = await module.list_imports(payload.status)
+  rows = await module.list_imports(payload.status, after_recid=payload.after_recid, limit=payload.limit)
   response_payload = StagingImportList1(imports=[StagingImportItem1(**dict(row)) for row in rows])
+  if payload.limit is not None and len(rows) == payload.limit:
+    response_payload.next_after_recid = int(rows[-1]["recid"])
   return RPCResponse(op=rpc_request.op, payload=response_payload.model_dump(), version=rpc_request.version)
 
 
@@ -131,6 +154,28 @@ async def finance_staging_promote_v1(request: Request):
   return RPCResponse(op=rpc_request.op, payload=result.model_dump(), version=rpc_request.version)
 
 
+async def finance_staging_backfill_v1(request: Request):
+  rpc_request, auth_ctx, _ = await unbox_request(request)
+  payload = StagingBackfill1(**(rpc_request.payload or {}))
+  module = request.app.state.async_task
+  await module.on_ready()
+  try:
+    task = await module.submit_task(
+      handler_name="finance.billing.backfill",
+      payload=payload.model_dump(),
+      source_type="rpc",
+      source_id=f"{payload.start_month}..{payload.end_month}",
+      created_by=auth_ctx.user_guid,
+      timeout_seconds=None,
+      poll_interval_seconds=None,
+      max_retries=0,
+    )
+  except ValueError as exc:
+    raise HTTPException(status_code=400, detail=str(exc)) from exc
+  result = StagingBackfillResult1(task_guid=task["guid"])
+  return RPCResponse(op=rpc_request.op, payload=result.model_dump(), version=rpc_request.version)
+
+
 async def finance_staging_list_line_items_v1(request: Request):
   rpc_request, auth_ctx, _ = await unbox_request(request)
   payload = StagingListDetails1(**(rpc_request.payload or {}))
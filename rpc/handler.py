@@ -4,7 +4,7 @@ from types import SimpleNamespace
 from fastapi import HTTPException, Request
 from starlette.datastructures import Headers
 
-from rpc import HANDLERS
+from rpc import get_handler
 from rpc.helpers import unbox_request
 from server.models import AuthContext, RPCRequest, RPCResponse
 
@@ -56,7 +56,7 @@ async def _dispatch_rpc_request(request, rpc_request: RPCRequest, parts: list[st
   try:
     domain = parts[1]
     remainder = parts[2:]
-    handler = HANDLERS.get(domain)
+    handler = get_handler(domain)
     if not handler:
       raise HTTPException(status_code=404, detail='Unknown RPC domain')
     response = await handler(remainder, request)
@@ -0,0 +1,106 @@
+"""Benchmark concurrent FIFO credit consumption against a test database.
+
+Runs ``--workers`` concurrent consumers, each issuing ``--iterations`` calls to
+``db:finance:credit_lots:consume_fifo:1`` for the same user, then reports
+consumes/sec and latency percentiles. The wallet is read before and after the
+run to confirm that concurrent consumers never spent the same credits twice.
+
+  python scripts/benchmark_credit_consumption.py --users-guid <guid> --workers 8 --iterations 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from dotenv import load_dotenv
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, REPO_ROOT)
+
+from queryregistry.finance.credit_lots import mssql  # noqa: E402
+from server.modules.providers.database.mssql_provider import logic  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description="Benchmark FIFO credit consumption throughput.")
+  parser.add_argument("--users-guid", required=True, help="User whose credit lots are consumed")
+  parser.add_argument("--workers", type=int, default=8, help="Concurrent consumers")
+  parser.add_argument("--iterations", type=int, default=50, help="Consumes issued by each worker")
+  parser.add_argument("--credits", type=int, default=1, help="Credits consumed per call")
+  return parser.parse_args()
+
+
+def percentile(samples: list[float], pct: float) -> float:
+  if not samples:
+    return 0.0
+  ordered = sorted(samples)
+  index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+  return ordered[index]
+
+
+async def wallet_total(users_guid: str) -> int:
+  res = await mssql.sum_remaining_by_user_v1({"users_guid": users_guid})
+  row = res.rows[0] if res.rows else {}
+  return int(row.get("total_remaining") or 0)
+
+
+async def worker(args: argparse.Namespace, latencies: list[float], outcomes: dict[str, int]) -> None:
+  payload = {
+    "users_guid": args.users_guid,
+    "credits_needed": args.credits,
+    "description": "benchmark",
+    "actor_guid": None,
+  }
+  for _ in range(args.iterations):
+    started = time.perf_counter()
+    res = await mssql.consume_fifo_v1(payload)
+    latencies.append(time.perf_counter() - started)
+    row = res.rows[0] if res.rows else {}
+    if row.get("success"):
+      outcomes["consumed"] += int(row.get("credits_consumed") or 0)
+    else:
+      outcomes["rejected"] += 1
+
+
+async def main() -> int:
+  args = parse_args()
+  load_dotenv(os.path.join(REPO_ROOT, ".env"))
+  dsn = os.environ.get("AZURE_SQL_CONNECTION_STRING_DEV") or os.environ.get("AZURE_SQL_CONNECTION_STRING")
+  if not dsn:
+    print("Missing AZURE_SQL_CONNECTION_STRING_DEV/AZURE_SQL_CONNECTION_STRING in environment", file=sys.stderr)
+    return 1
+
+  await logic.init_pool(dsn=dsn)
+  try:
+    before = await wallet_total(args.users_guid)
+    latencies: list[float] = []
+    outcomes = {"consumed": 0, "rejected": 0}
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(args, latencies, outcomes) for _ in range(args.workers)))
+    elapsed = time.perf_counter() - started
+    after = await wallet_total(args.users_guid)
+  finally:
+    await logic.close_pool()
+
+  calls = len(latencies)
+  print(f"calls:          {calls} ({args.workers} workers x {args.iterations})")
+  print(f"elapsed:        {elapsed:.2f}s")
+  print(f"consumes/sec:   {calls / elapsed if elapsed else 0.0:.1f}")
+  print(f"latency p50:    {percentile(latencies, 50) * 1000:.1f}ms")
+  print(f"latency p95:    {percentile(latencies, 95) * 1000:.1f}ms")
+  print(f"latency mean:   {statistics.fmean(latencies) * 1000 if latencies else 0.0:.1f}ms")
+  print(f"rejected:       {outcomes['rejected']}")
+  print(f"wallet:         {before} -> {after} (consumed {outcomes['consumed']})")
+  if before - after != outcomes["consumed"]:
+    print("Wallet delta does not match credits consumed", file=sys.stderr)
+    return 1
+  return 0
+
+
+if __name__ == "__main__":
+  raise SystemExit(asyncio.run(main()))
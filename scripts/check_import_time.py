@@ -0,0 +1,116 @@
+"""Report cold import time for the server and flag eagerly loaded SDKs.
+
+Runs ``python -X importtime`` in a fresh interpreter against the RPC entry
+point and every ``server/modules/*_module.py`` file (the set the
+``ModuleManager`` imports at startup). Fails when a heavy SDK is imported at
+module load instead of on first use, or when the optional time budget is
+exceeded.
+
+Usage:
+  python scripts/check_import_time.py [--budget-ms 1500] [--top 15]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MODULES_DIR = os.path.join(REPO_ROOT, "server", "modules")
+
+# SDKs that must only be imported by the code path that uses them.
+HEAVY_MODULES = (
+  "atproto",
+  "azure.identity",
+  "azure.storage.blob",
+  "discord",
+  "openai",
+  "tiktoken",
+)
+
+
+@dataclass(slots=True)
+class ImportRecord:
+  name: str
+  self_us: int
+  cumulative_us: int
+  depth: int
+
+
+def parse_importtime(output: str) -> list[ImportRecord]:
+  """Parse ``-X importtime`` stderr into records in emission order."""
+  records: list[ImportRecord] = []
+  for line in output.splitlines():
+    if not line.startswith("import time:"):
+      continue
+    parts = line[len("import time:"):].split("|")
+    if len(parts) != 3 or not parts[0].strip().isdigit():
+      continue
+    raw_name = parts[2]
+    name = raw_name.strip()
+    depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+    records.append(ImportRecord(name, int(parts[0]), int(parts[1]), depth))
+  return records
+
+
+def default_targets() -> list[str]:
+  modules = sorted(
+    f"server.modules.{name[:-3]}"
+    for name in os.listdir(MODULES_DIR)
+    if name.endswith("_module.py")
+  )
+  return ["rpc.handler", *modules]
+
+
+def run_importtime(targets: list[str]) -> list[ImportRecord]:
+  code = "\n".join(f"import {target}" for target in targets)
+  result = subprocess.run(
+    [sys.executable, "-X", "importtime", "-c", code],
+    cwd=REPO_ROOT,
+    capture_output=True,
+    text=True,
+  )
+  if result.returncode != 0:
+    raise RuntimeError(f"Import failed:\n{result.stderr[-2000:]}")
+  return parse_importtime(result.stderr)
+
+
+def find_heavy_imports(records: list[ImportRecord], heavy: tuple[str, ...] = HEAVY_MODULES) -> list[str]:
+  loaded = {record.name for record in records}
+  return [name for name in heavy if name in loaded]
+
+
+def total_ms(records: list[ImportRecord]) -> float:
+  return sum(record.cumulative_us for record in records if record.depth == 0) / 1000
+
+
+def check(targets: list[str] | None = None, budget_ms: float | None = None) -> tuple[list[str], list[ImportRecord]]:
+  records = run_importtime(targets or default_targets())
+  problems = [f"{name} imported at module load" for name in find_heavy_imports(records)]
+  elapsed = total_ms(records)
+  if budget_ms is not None and elapsed > budget_ms:
+    problems.append(f"cold import took {elapsed:.0f} ms (budget {budget_ms:.0f} ms)")
+  return problems, records
+
+
+def main() -> int:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("targets", nargs="*", help="Modules to import (default: rpc.handler and all server modules)")
+  parser.add_argument("--budget-ms", type=float, default=None, help="Fail when total cold import time exceeds this")
+  parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+  args = parser.parse_args()
+
+  problems, records = check(args.targets or None, args.budget_ms)
+  print(f"Total cold import: {total_ms(records):.0f} ms")
+  for record in sorted(records, key=lambda item: item.cumulative_us, reverse=True)[:args.top]:
+    print(f"  {record.cumulative_us / 1000:8.1f} ms  {record.name}")
+  for problem in problems:
+    print(f"FAIL: {problem}")
+  return 1 if problems else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
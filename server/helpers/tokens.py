@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Sequence
+
+DEFAULT_ENCODING = "cl100k_base"
+# Inputs larger than this are counted in a worker thread.
+EXECUTOR_THRESHOLD_CHARS = 64 * 1024
+
+_encoders: dict[str, Any] = {}
+_encoders_lock = threading.RLock()
+
+
+def get_encoder(model: str | None = None) -> Any | None:
+  """Return the cached tiktoken encoder for ``model``, or None without tiktoken."""
+  key = (model or "").strip() or DEFAULT_ENCODING
+  try:
+    return _encoders[key]
+  except KeyError:
+    pass
+  with _encoders_lock:
+    if key not in _encoders:
+      _encoders[key] = _load_encoder(key)
+    return _encoders[key]
+
+
+def _load_encoder(key: str) -> Any | None:
+  try:
+    import tiktoken
+  except ImportError:
+    return None
+  if key != DEFAULT_ENCODING:
+    try:
+      return tiktoken.encoding_for_model(key)
+    except Exception:
+      # Unknown models raise KeyError; a failed BPE download raises anything.
+      return get_encoder(DEFAULT_ENCODING)
+  try:
+    return tiktoken.get_encoding(DEFAULT_ENCODING)
+  except Exception:
+    return None
+
+
+def count_tokens(text: str, model: str | None = None) -> int:
+  encoder = get_encoder(model)
+  if encoder is None:
+    return len(text.split())
+  return len(encoder.encode_ordinary(text))
+
+
+def count_tokens_batch(texts: Sequence[str], model: str | None = None) -> list[int]:
+  """Count tokens for each text, encoding the whole list in one batch call."""
+  if not texts:
+    return []
+  encoder = get_encoder(model)
+  if encoder is None:
+    return [len(text.split()) for text in texts]
+  return [len(tokens) for tokens in encoder.encode_ordinary_batch(list(texts))]
+
+
+def take_recent(
+  texts: Sequence[str],
+  budget: int,
+  counts: Sequence[int | None] | None = None,
+  model: str | None = None,
+) -> tuple[list[str], int]:
+  """Keep the newest texts that fit in ``budget`` tokens, oldest first.
+
+  ``counts`` supplies stored token counts; missing entries are counted here.
+  Returns the kept texts and the tokens they use.
+  """
+  known = list(counts) if counts is not None else [None] * len(texts)
+  missing = [index for index, count in enumerate(known) if count is None]
+  if missing:
+    for index, count in zip(missing, count_tokens_batch([texts[index] for index in missing], model)):
+      known[index] = count
+  kept: list[str] = []
+  used = 0
+  for text, count in zip(reversed(texts), reversed(known)):
+    if used + count > budget:
+      break
+    kept.append(text)
+    used += count
+  kept.reverse()
+  return kept, used
+
+
+async def count_tokens_async(text: str, model: str | None = None) -> int:
+  if len(text) < EXECUTOR_THRESHOLD_CHARS:
+    return count_tokens(text, model)
+  return await asyncio.to_thread(count_tokens, text, model)
+
+
+async def count_tokens_batch_async(texts: Sequence[str], model: str | None = None) -> list[int]:
+  if sum(len(text) for text in texts) < EXECUTOR_THRESHOLD_CHARS:
+    return count_tokens_batch(texts, model)
+  return await asyncio.to_thread(count_tokens_batch, texts, model)
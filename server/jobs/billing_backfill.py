@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from calendar import monthrange
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, field_validator, model_validator
+
+from server.modules.async_task_handlers import PipelineHandler
+
+
+def _parse_month(value: str) -> datetime:
+  parsed = datetime.strptime(value, "%Y-%m")
+  if parsed.strftime("%Y-%m") != value:
+    raise ValueError("month must be in YYYY-MM format")
+  return parsed
+
+
+def _months(start_month: str, end_month: str) -> list[str]:
+  current = _parse_month(start_month)
+  end = _parse_month(end_month)
+  months: list[str] = []
+  while current <= end:
+    months.append(current.strftime("%Y-%m"))
+    current = current.replace(year=current.year + current.month // 12, month=current.month % 12 + 1)
+  return months
+
+
+BACKFILL_HANDLER = "finance.billing.backfill"
+IMPORT_PERIOD_HANDLER = "finance.billing.import_period"
+
+
+class BillingBackfillPayload(BaseModel):
+  start_month: str
+  end_month: str
+  subscriptions: list[str] = []
+  metric: str = "ActualCost"
+
+  @field_validator("start_month", "end_month")
+  @classmethod
+  def validate_month(cls, value: str) -> str:
+    try:
+      _parse_month(value)
+    except ValueError as exc:
+      raise ValueError("month must be in YYYY-MM format") from exc
+    return value
+
+  @model_validator(mode="after")
+  def validate_range(self) -> "BillingBackfillPayload":
+    if self.end_month < self.start_month:
+      raise ValueError("end_month must not be before start_month")
+    return self
+
+
+class BillingImportPeriodPayload(BaseModel):
+  subscription_id: str | None = None
+  period_start: str
+  period_end: str
+  metric: str = "ActualCost"
+
+
+class BillingBackfillHandler(PipelineHandler):
+  """Backfill Azure cost details for several subscriptions and months at once.
+
+  Each subscription and month is queued as its own import task, so a long or
+  failed report never holds up the others and each keeps its own progress.
+  """
+
+  payload_model = BillingBackfillPayload
+
+  steps = [
+    ("plan_periods", lambda app, payload, context: BillingBackfillHandler.plan_periods(app, payload, context)),
+    ("queue_imports", lambda app, payload, context: BillingBackfillHandler.queue_imports(app, payload, context)),
+  ]
+
+  @staticmethod
+  async def plan_periods(app, payload: dict[str, Any], context: dict[str, Any]) -> dict[str, Any]:
+    del app, context
+    subscriptions: list[str | None] = list(payload.get("subscriptions") or []) or [None]
+    runs: list[dict[str, Any]] = []
+    for month in _months(payload["start_month"], payload["end_month"]):
+      parsed = _parse_month(month)
+      period_end = f"{month}-{monthrange(parsed.year, parsed.month)[1]:02d}"
+      for subscription_id in subscriptions:
+        runs.append(
+          {
+            "subscription_id": subscription_id,
+            "period_start": f"{month}-01",
+            "period_end": period_end,
+            "metric": payload.get("metric") or "ActualCost",
+          },
+        )
+    return {"runs": runs}
+
+  @staticmethod
+  async def queue_imports(app, payload: dict[str, Any], context: dict[str, Any]) -> dict[str, Any]:
+    del payload
+    async_task = app.state.async_task
+    imports: list[dict[str, Any]] = []
+    for run in context.get("runs") or []:
+      task = await async_task.submit_task(
+        IMPORT_PERIOD_HANDLER,
+        run,
+        source_type="backfill",
+        source_id=f"{run.get('subscription_id') or ''}:{run['period_start']}",
+        created_by=None,
+        timeout_seconds=None,
+        poll_interval_seconds=None,
+        max_retries=3,
+      )
+      imports.append({**run, "task_guid": task["guid"]})
+    return {"imports": imports}
+
+
+class BillingImportPeriodHandler(PipelineHandler):
+  """Import Azure cost details for one subscription and month.
+
+  The staging import is created in its own step so its recid is in the task
+  context before any report is requested. The ingest step resumes that import,
+  so retries and a new leader continue from its checkpoint instead of starting
+  another import.
+  """
+
+  payload_model = BillingImportPeriodPayload
+  # The provider's shared token bucket still paces the Cost Management calls.
+  max_concurrency = 4
+
+  steps = [
+    ("create_import", lambda app, payload, context: BillingImportPeriodHandler.create_import(app, payload, context)),
+    ("ingest", lambda app, payload, context: BillingImportPeriodHandler.ingest(app, payload, context)),
+  ]
+
+  @staticmethod
+  async def create_import(app, payload: dict[str, Any], context: dict[str, Any]) -> dict[str, Any]:
+    if context.get("import_recid"):
+      return {}
+    billing_import = app.state.billing_import
+    await billing_import.on_ready()
+    import_recid = await billing_import.create_import("azure_cost_details", **payload)
+    return {"import_recid": import_recid}
+
+  @staticmethod
+  async def ingest(app, payload: dict[str, Any], context: dict[str, Any]) -> dict[str, Any]:
+    del payload
+    billing_import = app.state.billing_import
+    await billing_import.on_ready()
+    result = await billing_import.resume_import(int(context["import_recid"]))
+    return {"status": result.get("status"), "row_count": int(result.get("row_count") or 0)}
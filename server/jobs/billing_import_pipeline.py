@@ -1,39 +1,114 @@
 from __future__ import annotations
 
 import json
+import re
+from dataclasses import dataclass
 from datetime import date
 from decimal import ROUND_HALF_UP, Decimal
-from typing import Any
+from typing import Any, Iterable
 
 from pydantic import BaseModel
 
 from queryregistry.finance.staging import (
-  list_imports_request,
+  get_import_request,
   update_import_status_request,
 )
 from queryregistry.finance.staging.models import (
-  ListImportsParams,
+  GetImportParams,
   UpdateImportStatusParams,
 )
-from queryregistry.finance.staging_line_items import (
-  aggregate_line_items_request,
-  list_line_items_by_import_request,
-)
-from queryregistry.finance.staging_line_items.models import (
-  AggregateLineItemsParams,
-  ListLineItemsByImportParams,
-)
-from queryregistry.finance.staging_account_map import (
-  resolve_account_request,
-)
-from queryregistry.finance.staging_account_map.models import ResolveAccountParams
+from queryregistry.finance.staging_line_items import aggregate_line_items_request
+from queryregistry.finance.staging_line_items.models import AggregateLineItemsParams
+from queryregistry.finance.staging_account_map import list_account_map_request
+from queryregistry.finance.staging_account_map.models import ListAccountMapParams
 from server.modules.async_task_handlers import PipelineHandler
 from server.modules.models.finance_statuses import (
+  ELEMENT_ACTIVE,
   IMPORT_APPROVED,
   IMPORT_PROMOTED,
 )
 
 
+@dataclass(slots=True)
+class _AccountRule:
+  recid: int
+  vendors_recid: int | None
+  service_pattern: str
+  meter_regex: re.Pattern[str] | None
+  priority: int
+  row: dict[str, Any]
+
+
+def _compile_meter_pattern(pattern: str) -> re.Pattern[str]:
+  """Translate a ``LIKE`` pattern (with ``*`` as an alias for ``%``) to a regex."""
+  parts: list[str] = []
+  for char in pattern:
+    if char in "*%":
+      parts.append(".*")
+    elif char == "_":
+      parts.append(".")
+    else:
+      parts.append(re.escape(char))
+  return re.compile("".join(parts), re.IGNORECASE | re.DOTALL)
+
+
+class _AccountMapMatcher:
+  """Resolve staging accounts in memory with the ordering of ``resolve_account``.
+
+  Rules are bucketed by exact service name (case-insensitive, as the database
+  collation compares them) with ``*`` rules kept aside. A lookup ranks the
+  candidates by vendor match, then exact over wildcard service, then priority
+  and recid.
+  """
+
+  def __init__(self, rows: Iterable[dict[str, Any]]):
+    self._by_service: dict[str, list[_AccountRule]] = {}
+    self._wildcards: list[_AccountRule] = []
+    for row in rows:
+      if int(row.get("element_status") or 0) != ELEMENT_ACTIVE:
+        continue
+      service_pattern = str(row.get("element_service_pattern") or "")
+      meter_pattern = row.get("element_meter_pattern")
+      rule = _AccountRule(
+        recid=int(row["recid"]),
+        vendors_recid=int(row["vendors_recid"]) if row.get("vendors_recid") is not None else None,
+        service_pattern=service_pattern,
+        meter_regex=_compile_meter_pattern(str(meter_pattern)) if meter_pattern is not None else None,
+        priority=int(row.get("element_priority") or 0),
+        row=dict(row),
+      )
+      if service_pattern == "*":
+        self._wildcards.append(rule)
+      else:
+        self._by_service.setdefault(service_pattern.casefold(), []).append(rule)
+
+  def resolve(
+    self,
+    service: str,
+    meter_category: str | None,
+    vendors_recid: int | None,
+  ) -> dict[str, Any] | None:
+    meter = meter_category or ""
+    best: tuple[tuple[int, int, int, int], _AccountRule] | None = None
+    exact = self._by_service.get(service.casefold(), [])
+    for service_rank, rules in ((0, exact), (1, self._wildcards)):
+      for rule in rules:
+        if vendors_recid is not None and rule.vendors_recid not in (None, vendors_recid):
+          continue
+        if rule.meter_regex is not None and not rule.meter_regex.fullmatch(meter):
+          continue
+        if vendors_recid is not None and rule.vendors_recid == vendors_recid:
+          vendor_rank = 0
+        elif rule.vendors_recid is None:
+          vendor_rank = 1
+        else:
+          vendor_rank = 2
+        key = (vendor_rank, service_rank, -rule.priority, rule.recid)
+        if best is None or key < best[0]:
+          best = (key, rule)
+    return best[1].row if best else None
+
+
 class BillingImportPipelinePayload(BaseModel):
   imports_recid: int
   ledgers_recid: int | None = None
@@ -56,8 +131,8 @@ class BillingImportPipelineHandler(PipelineHandler):
     await db.on_ready()
 
     imports_recid = int(payload["imports_recid"])
-    res = await db.run(list_imports_request(ListImportsParams()))
-    import_row = next((dict(row) for row in (res.rows or []) if int(row.get("recid") or 0) == imports_recid), None)
+    res = await db.run(get_import_request(GetImportParams(recid=imports_recid)))
+    import_row = dict(res.rows[0]) if res.rows else None
     if not import_row:
       raise ValueError(f"Import {imports_recid} not found")
 
@@ -88,15 +163,8 @@ class BillingImportPipelineHandler(PipelineHandler):
     aggregate_res = await db.run(
       aggregate_line_items_request(AggregateLineItemsParams(imports_recid=imports_recid))
     )
-    line_items_res = await db.run(
-      list_line_items_by_import_request(ListLineItemsByImportParams(imports_recid=imports_recid))
-    )
-    vendor_recid = None
-    if line_items_res.rows:
-      vendor_recid = int(line_items_res.rows[0].get("vendors_recid") or 0) or None
-
-    accounts = await finance.list_accounts()
-    accounts_by_guid = {str(acct["guid"]): acct for acct in accounts}
+    rules_res = await db.run(list_account_map_request(ListAccountMapParams()))
+    matcher = _AccountMapMatcher(dict(row) for row in rules_res.rows or [])
 
     warnings: list[dict[str, Any]] = []
     classified: list[dict[str, Any]] = []
@@ -106,29 +174,26 @@ class BillingImportPipelineHandler(PipelineHandler):
       meter_category = row.get("element_category")
       amount = Decimal(str(row.get("element_total_amount") or "0"))
       row_count = int(row.get("element_row_count") or 0)
+      vendor_recid = int(row.get("vendors_recid") or 0) or None
 
-      resolved = await db.run(
-        resolve_account_request(
-          ResolveAccountParams(
-            service_name=str(service or ""),
-            meter_category=str(meter_category) if meter_category is not None else None,
-            vendors_recid=vendor_recid,
-          )
-        )
+      resolved_row = matcher.resolve(
+        str(service or ""),
+        str(meter_category) if meter_category is not None else None,
+        vendor_recid,
       )
-      if not resolved.rows:
+      if resolved_row is None:
         raise ValueError(
           f"No staging account mapping for service='{service}' meter_category='{meter_category}'",
         )
 
-      resolved_row = dict(resolved.rows[0])
       accounts_guid = str(resolved_row["accounts_guid"])
-      account = accounts_by_guid.get(accounts_guid)
       account_number = resolved_row.get("account_number")
       account_name = resolved_row.get("account_name")
-      if account:
-        account_number = account_number or account.get("number")
-        account_name = account_name or account.get("name")
+      if not account_number or not account_name:
+        account = await finance.get_account(accounts_guid)
+        if account:
+          account_number = account_number or account.get("number")
+          account_name = account_name or account.get("name")
 
       if str(resolved_row.get("element_service_pattern") or "") == "*":
         warnings.append(
@@ -172,14 +237,7 @@ class BillingImportPipelineHandler(PipelineHandler):
     period_start_raw = str(import_metadata.get("element_period_start") or "")
     period_start = date.fromisoformat(period_start_raw[:10])
 
-    periods = await finance.list_periods()
-    matching_period = None
-    for period in periods:
-      start_date = date.fromisoformat(str(period["start_date"])[:10])
-      end_date = date.fromisoformat(str(period["end_date"])[:10])
-      if start_date <= period_start <= end_date:
-        matching_period = period
-        break
+    matching_period = await finance.get_period_for_date(period_start)
     if not matching_period:
       raise ValueError(f"No fiscal period found for import date {period_start.isoformat()}")
 
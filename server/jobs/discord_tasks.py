@@ -0,0 +1,109 @@
+"""Discord work handed from follower workers to the leader.
+
+Only the leader worker holds the Discord bot connection. RPCs served by any
+other worker submit one of these pipeline tasks instead; the leader's
+``AsyncTaskModule`` tick runs it where the bot is available.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from server.modules.async_task_handlers import PipelineHandler
+
+SUMMARIZE_HANDLER = "discord.chat.summarize_and_deliver"
+PERSONA_DELIVERY_HANDLER = "discord.chat.deliver_persona_response"
+GUILD_SYNC_HANDLER = "discord.guilds.sync"
+# Leader ticks run every few seconds; a task still queued after this has no leader.
+HANDOFF_TIMEOUT_SECONDS = 600
+
+
+class DiscordSummarizePayload(BaseModel):
+  guild_id: int
+  channel_id: int
+  hours: int = 1
+  user_id: int | None = None
+
+
+class DiscordPersonaDeliveryPayload(BaseModel):
+  persona: str = ""
+  response: dict[str, Any] | str | None = None
+  conversation_reference: int | None = None
+  guild_id: int | None = None
+  channel_id: int | None = None
+  user_id: int | None = None
+
+
+class DiscordSummarizeHandler(PipelineHandler):
+  """Summarize a channel and deliver the result from the leader."""
+
+  payload_model = DiscordSummarizePayload
+
+  steps = [
+    ("summarize_and_deliver", lambda app, payload, context: DiscordSummarizeHandler.run(app, payload, context)),
+  ]
+
+  @staticmethod
+  async def run(app, payload: dict[str, Any], context: dict[str, Any]) -> dict[str, Any]:
+    del context
+    module = app.state.discord_chat
+    await module.on_ready()
+    return await module.summarize_and_deliver(
+      guild_id=payload["guild_id"],
+      channel_id=payload["channel_id"],
+      hours=payload["hours"],
+      user_id=payload.get("user_id"),
+    )
+
+
+class DiscordPersonaDeliveryHandler(PipelineHandler):
+  """Queue a generated persona response on the leader's bot."""
+
+  payload_model = DiscordPersonaDeliveryPayload
+
+  steps = [
+    ("deliver_persona_response", lambda app, payload, context: DiscordPersonaDeliveryHandler.run(app, payload, context)),
+  ]
+
+  @staticmethod
+  async def run(app, payload: dict[str, Any], context: dict[str, Any]) -> dict[str, Any]:
+    del context
+    module = app.state.discord_chat
+    await module.on_ready()
+    return await module.deliver_persona_response(**payload)
+
+
+class DiscordGuildSyncHandler(PipelineHandler):
+  """Refresh guild records from the guilds the leader's bot can see."""
+
+  steps = [
+    ("sync_guild_records", lambda app, payload, context: DiscordGuildSyncHandler.run(app, payload, context)),
+  ]
+
+  @staticmethod
+  async def run(app, payload: dict[str, Any], context: dict[str, Any]) -> dict[str, Any]:
+    del payload, context
+    module = app.state.discord_bot
+    await module.on_ready()
+    synced = await module.sync_guild_records()
+    return {"synced": synced.get("synced", 0)}
+
+
+async def hand_off_to_leader(app, handler_name: str, payload: dict[str, Any]) -> dict[str, Any]:
+  """Queue ``handler_name`` for the leader and return the created task."""
+  async_task = getattr(app.state, "async_task", None)
+  if async_task is None:
+    raise HTTPException(status_code=503, detail="Discord bot is not connected on this worker")
+  await async_task.on_ready()
+  return await async_task.submit_task(
+    handler_name,
+    payload,
+    source_type="discord",
+    source_id=None,
+    created_by=None,
+    timeout_seconds=HANDOFF_TIMEOUT_SECONDS,
+    poll_interval_seconds=None,
+  )
@@ -0,0 +1,34 @@
+"""Credit consumption revenue recognition batch job.
+
+Callable path for batch job registration: server.jobs.revenue_recognition.run
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import FastAPI
+
+
+async def run(app: FastAPI, params: dict[str, Any]) -> dict[str, Any]:
+  """Recognize revenue for consumed purchase credits.
+
+  Params (all optional):
+      before: str — ISO timestamp, floored to the hour; only events created
+          earlier are recognized. Defaults to the start of the current UTC hour.
+      limit: int — maximum user-hour groups processed in one run (default 1000).
+
+  Each journal is posted to the period covering its consumption hour.
+
+  Returns dict with the number of journals posted and events recognized.
+  """
+  finance = getattr(app.state, "finance", None)
+  if finance is None:
+    raise RuntimeError("FinanceModule is not available")
+  await finance.on_ready()
+
+  summary = await finance.recognize_consumed_revenue(
+    before=params.get("before"),
+    limit=int(params.get("limit") or 1000),
+  )
+  return {"status": "completed", **summary}
@@ -0,0 +1,47 @@
+"""Trial balance reconciliation batch job.
+
+Callable path for batch job registration: server.jobs.trial_balance.run
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import FastAPI
+
+
+async def run(app: FastAPI, params: dict[str, Any]) -> dict[str, Any]:
+  """Check the maintained trial balance against vw_finance_trial_balance.
+
+  Params (all optional):
+      rebuild: bool — recompute the balance before reconciling.
+      periods_guid: str — limit the rebuild and the check to one period.
+      fiscal_year: int — limit the check to one fiscal year.
+      repair: bool — rebuild every period that reconciles with differences.
+
+  Returns dict with the number of mismatched period/account totals left.
+  """
+  finance = getattr(app.state, "finance", None)
+  if finance is None:
+    raise RuntimeError("FinanceModule is not available")
+  await finance.on_ready()
+
+  periods_guid = params.get("periods_guid")
+  fiscal_year = params.get("fiscal_year")
+  rebuilt: list[str | None] = []
+  if params.get("rebuild"):
+    await finance.rebuild_trial_balance(periods_guid)
+    rebuilt.append(periods_guid)
+
+  mismatches = await finance.reconcile_trial_balance(fiscal_year=fiscal_year, period_guid=periods_guid)
+  if mismatches and params.get("repair"):
+    for guid in sorted({str(row["period_guid"]) for row in mismatches}):
+      await finance.rebuild_trial_balance(guid)
+      rebuilt.append(guid)
+    mismatches = await finance.reconcile_trial_balance(fiscal_year=fiscal_year, period_guid=periods_guid)
+
+  return {
+    "status": "completed" if not mismatches else "mismatched",
+    "periods_rebuilt": len(rebuilt),
+    "mismatches": len(mismatches),
+  }
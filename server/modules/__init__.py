@@ -2,11 +2,24 @@ from abc import ABC, abstractmethod
 from fastapi import FastAPI
 from typing import Type, Dict, List
 from server.helpers.strings import camel_case
-import asyncio, logging, os, importlib
+import asyncio, logging, os, importlib, time
 
 MODULES_FOLDER = os.path.dirname(__file__)
+DEFAULT_STARTUP_TIMEOUT = 60.0
+
+STATUS_READY = "ready"
+STATUS_FAILED = "failed"
+STATUS_TIMED_OUT = "timed_out"
+STATUS_SKIPPED = "skipped"
 
 class BaseModule(ABC):
+  # Registration names of modules whose startup must complete first. Required
+  # dependencies that fail or are not loaded cause this module to be skipped;
+  # optional dependencies are only waited on when they are loaded.
+  dependencies: tuple[str, ...] = ()
+  optional_dependencies: tuple[str, ...] = ()
+  startup_timeout: float | None = None
+
   def __init__(self, app: FastAPI):
     self.app = app
     self._ready_event = asyncio.Event()
@@ -25,44 +38,168 @@ class BaseModule(ABC):
   async def on_ready(self):
     await self._ready_event.wait()
 
+  @property
+  def is_ready(self) -> bool:
+    return self._ready_event.is_set()
+
+class ModuleStartupError(RuntimeError):
+  pass
+
+def _disabled_modules() -> set[str]:
+  raw = os.getenv("DISABLED_MODULES", "")
+  return {name.strip() for name in raw.split(",") if name.strip()}
+
+def _startup_timeout() -> float:
+  raw = os.getenv("MODULE_STARTUP_TIMEOUT")
+  try:
+    return float(raw) if raw else DEFAULT_STARTUP_TIMEOUT
+  except ValueError:
+    logging.warning("[ModuleManager] Invalid MODULE_STARTUP_TIMEOUT=%s", raw)
+    return DEFAULT_STARTUP_TIMEOUT
+
 class ModuleManager:
-  def __init__(self, app: FastAPI):
+  def __init__(self, app: FastAPI, modules: Dict[str, BaseModule] | None = None):
     self.app = app
     self.instances: Dict[str, BaseModule] = {}
+    self.disabled: set[str] = _disabled_modules()
+    self.default_timeout: float = _startup_timeout()
+    self.import_timings: Dict[str, float] = {}
+    self.startup_report: List[dict] = []
+    self._started: set[str] = set()
+
+    if modules is not None:
+      for module_name, instance in modules.items():
+        setattr(app.state, module_name, instance)
+        self.instances[module_name] = instance
+    else:
+      self._load_modules()
+    self.order: List[str] = self._resolve_order()
 
-    for fname in os.listdir(MODULES_FOLDER):
+  def _load_modules(self):
+    for fname in sorted(os.listdir(MODULES_FOLDER)):
       if not fname.endswith("_module.py") or fname == "__init__.py":
         continue
 
       file_name = fname[:-3]  # strip '.py'
       module_name = file_name[:-7]
+      if module_name in self.disabled:
+        logging.info("[ModuleManager] %s disabled; not imported", module_name)
+        continue
       class_name = camel_case(file_name.removesuffix("_module")) + "Module"
       module_path = f"{__name__}.{file_name}"
 
+      started = time.perf_counter()
       mod = importlib.import_module(module_path)
       if not hasattr(mod, class_name):
         raise ImportError(f"Module '{file_name}' missing expected class '{class_name}'")
       cls = getattr(mod, class_name)
-      instance = cls(app)
+      instance = cls(self.app)
+      self.import_timings[module_name] = time.perf_counter() - started
 
-      setattr(app.state, module_name, instance)
+      setattr(self.app.state, module_name, instance)
       self.instances[module_name] = instance
 
-  async def startup_all(self):
-    async def _startup_module(name: str, module: BaseModule):
-      await module.startup()
+  def _dependencies_of(self, name: str) -> tuple[list[str], list[str]]:
+    module = self.instances[name]
+    required = list(module.dependencies)
+    optional = [dep for dep in module.optional_dependencies if dep in self.instances]
+    return required, optional
+
+  def _resolve_order(self) -> List[str]:
+    """Return module names in dependency order; raise on dependency cycles."""
+    pending: Dict[str, set[str]] = {}
+    for name in self.instances:
+      required, optional = self._dependencies_of(name)
+      pending[name] = {dep for dep in required + optional if dep in self.instances}
+    order: List[str] = []
+    while pending:
+      ready = sorted(name for name, deps in pending.items() if not deps)
+      if not ready:
+        raise ModuleStartupError(f"Module dependency cycle among: {', '.join(sorted(pending))}")
+      for name in ready:
+        order.append(name)
+        del pending[name]
+      for deps in pending.values():
+        deps.difference_update(ready)
+    return order
+
+  async def _startup_module(self, name: str, tasks: Dict[str, asyncio.Task]) -> dict:
+    module = self.instances[name]
+    required, optional = self._dependencies_of(name)
+    entry = {"module": name, "status": STATUS_READY, "wait_ms": 0.0, "startup_ms": 0.0, "detail": ""}
+    waited_from = time.perf_counter()
+    dep_tasks = [tasks[dep] for dep in required + optional if dep in tasks]
+    if dep_tasks:
+      await asyncio.wait(dep_tasks)
+    entry["wait_ms"] = (time.perf_counter() - waited_from) * 1000
+
+    missing = [dep for dep in required if dep not in tasks]
+    unready = [dep for dep in required if dep in tasks and tasks[dep].result()["status"] != STATUS_READY]
+    if missing or unready:
+      entry["status"] = STATUS_SKIPPED
+      entry["detail"] = "missing: " + ", ".join(missing + unready)
+      setattr(self.app.state, name, None)
+      return entry
+
+    timeout = module.startup_timeout or self.default_timeout
+    started = time.perf_counter()
+    self._started.add(name)
+    try:
+      await asyncio.wait_for(module.startup(), timeout=timeout)
+      if not module.is_ready:
+        entry["status"] = STATUS_FAILED
+        entry["detail"] = "startup returned without marking ready"
+    except asyncio.TimeoutError:
+      entry["status"] = STATUS_TIMED_OUT
+      entry["detail"] = f"startup exceeded {timeout:.0f}s"
+    except Exception as exc:
+      logging.exception("[ModuleManager] %s startup failed", name)
+      entry["status"] = STATUS_FAILED
+      entry["detail"] = f"{type(exc).__name__}: {exc}"
+    entry["startup_ms"] = (time.perf_counter() - started) * 1000
+    if entry["status"] == STATUS_READY:
       logging.info("[Module] %s loaded", name)
+    else:
+      setattr(self.app.state, name, None)
+    return entry
+
+  def _log_report(self, total_ms: float):
+    lines = [f"[ModuleManager] startup finished in {total_ms:.0f} ms"]
+    for entry in sorted(self.startup_report, key=lambda item: item["startup_ms"], reverse=True):
+      import_ms = self.import_timings.get(entry["module"], 0.0) * 1000
+      line = (
+        f"  {entry['module']:<18} {entry['status']:<9} "
+        f"import={import_ms:7.1f}ms wait={entry['wait_ms']:7.1f}ms startup={entry['startup_ms']:7.1f}ms"
+      )
+      if entry["detail"]:
+        line += f" ({entry['detail']})"
+      lines.append(line)
+    logging.info("\n".join(lines))
 
-    await asyncio.gather(*(
-      _startup_module(name, module)
-      for name, module in self.instances.items()
-    ))
+  async def startup_all(self):
+    started = time.perf_counter()
+    tasks: Dict[str, asyncio.Task] = {}
+    for name in self.order:
+      tasks[name] = asyncio.create_task(self._startup_module(name, tasks), name=f"startup:{name}")
+    self.startup_report = list(await asyncio.gather(*tasks.values()))
+    self._log_report((time.perf_counter() - started) * 1000)
+
+    failed = [entry["module"] for entry in self.startup_report if entry["status"] in (STATUS_FAILED, STATUS_TIMED_OUT)]
+    if failed:
+      raise ModuleStartupError(f"Module startup failed: {', '.join(failed)}")
 
   async def shutdown_all(self):
-    await asyncio.gather(*(mod.shutdown() for mod in self.instances.values()))
+    names = [name for name in self.order if name in self._started]
+    results = await asyncio.gather(
+      *(self.instances[name].shutdown() for name in names),
+      return_exceptions=True,
+    )
+    for name, result in zip(names, results):
+      if isinstance(result, Exception):
+        logging.error("[ModuleManager] %s shutdown failed: %s", name, result)
     for name in self.instances:
       setattr(self.app.state, name, None)
-  
+
   async def restart(self, name: str):
     instance = self.instances.get(name)
     if not instance:
@@ -70,5 +207,5 @@ class ModuleManager:
     await instance.shutdown()
     new_instance = type(instance)(self.app)
     setattr(self.app.state, name, new_instance)
-    await new_instance.startup()
+    await asyncio.wait_for(new_instance.startup(), timeout=new_instance.startup_timeout or self.default_timeout)
     self.instances[name] = new_instance
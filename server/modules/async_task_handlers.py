@@ -37,3 +37,5 @@ PipelineStep = Callable[[Any, dict[str, Any], dict[str, Any]], Awaitable[dict[st
 class PipelineHandler(AsyncTaskHandler):
   handler_type = "pipeline"
   steps: list[tuple[str, PipelineStep]] = []
+  # Most tasks of this handler whose steps run at once on the leader; None is unlimited.
+  max_concurrency: int | None = None
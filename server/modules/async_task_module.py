@@ -4,7 +4,7 @@ import asyncio
 import json
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, TYPE_CHECKING
 from uuid import UUID
 
 from fastapi import FastAPI, HTTPException
@@ -30,6 +30,9 @@ from . import BaseModule
 from .async_task_handlers import CallbackHandler, PipelineHandler
 from .db_module import DbModule
 
+if TYPE_CHECKING:  # pragma: no cover
+  from .leader_module import LeaderModule
+
 
 STATUS_QUEUED = 0
 STATUS_RUNNING = 1
@@ -44,26 +47,57 @@ ACTIVE_STATUSES = {STATUS_QUEUED, STATUS_RUNNING, STATUS_POLLING, STATUS_WAITING
 
 
 class AsyncTaskModule(BaseModule):
+  dependencies = ("db",)
+  optional_dependencies = ("finance", "leader")
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.db: DbModule | None = None
+    self.leader: LeaderModule | None = None
     self.handlers: dict[str, Any] = {}
     self.tick_interval_seconds = 10
     self._loop_task: asyncio.Task | None = None
     self._loop_lock = asyncio.Lock()
+    # Pipeline steps run beside the tick loop, keyed by task recid.
+    self._pipeline_runs: dict[int, tuple[str, asyncio.Task]] = {}
 
   async def startup(self):
     self.db = self.app.state.db
     await self.db.on_ready()
     self.app.state.async_task = self
+    self.leader = getattr(self.app.state, "leader", None)
     self._loop_task = asyncio.create_task(self._tick_loop())
 
     finance = getattr(self.app.state, "finance", None)
     if finance is not None:
       await finance.on_ready()
+      from server.jobs.billing_backfill import (
+        BACKFILL_HANDLER,
+        IMPORT_PERIOD_HANDLER,
+        BillingBackfillHandler,
+        BillingImportPeriodHandler,
+      )
       from server.jobs.billing_import_pipeline import BillingImportPipelineHandler
 
       self.register_handler("finance.billing.import_pipeline", BillingImportPipelineHandler())
+      self.register_handler(BACKFILL_HANDLER, BillingBackfillHandler())
+      self.register_handler(IMPORT_PERIOD_HANDLER, BillingImportPeriodHandler())
+
+    if getattr(self.app.state, "discord_bot", None) is not None:
+      from server.jobs.discord_tasks import (
+        GUILD_SYNC_HANDLER,
+        PERSONA_DELIVERY_HANDLER,
+        SUMMARIZE_HANDLER,
+        DiscordGuildSyncHandler,
+        DiscordPersonaDeliveryHandler,
+        DiscordSummarizeHandler,
+      )
+
+      # Followers hand Discord sends to the leader, which holds the bot.
+      self.register_handler(GUILD_SYNC_HANDLER, DiscordGuildSyncHandler())
+      if getattr(self.app.state, "discord_chat", None) is not None:
+        self.register_handler(SUMMARIZE_HANDLER, DiscordSummarizeHandler())
+        self.register_handler(PERSONA_DELIVERY_HANDLER, DiscordPersonaDeliveryHandler())
     logging.debug("[AsyncTaskModule] loaded")
     self.mark_ready()
 
@@ -75,6 +109,12 @@ class AsyncTaskModule(BaseModule):
       except asyncio.CancelledError:
         pass
     self._loop_task = None
+    runs = [run for _, run in self._pipeline_runs.values()]
+    for run in runs:
+      run.cancel()
+    # A cancelled step leaves its task running on the same step for the next leader.
+    await asyncio.gather(*runs, return_exceptions=True)
+    self._pipeline_runs.clear()
     self.db = None
     logging.info("[AsyncTaskModule] shutdown")
 
@@ -147,6 +187,7 @@ class AsyncTaskModule(BaseModule):
     task = await self.get_task_or_404(guid)
     if task["status"] in {STATUS_COMPLETED, STATUS_CANCELLED, STATUS_TIMED_OUT}:
       return task
+    self._cancel_pipeline_run(task["recid"])
     updated = await self._update_task(task["recid"], status=STATUS_CANCELLED)
     await self._add_event(task["recid"], "cancelled")
     return updated
@@ -190,7 +231,9 @@ class AsyncTaskModule(BaseModule):
   async def _tick_loop(self):
     while True:
       try:
-        await self.tick_once()
+        # Ticks are a singleton duty; without a leader module this process runs them.
+        if self.leader is None or self.leader.is_leader:
+          await self.tick_once()
       except asyncio.CancelledError:
         raise
       except Exception as exc:
@@ -212,7 +255,44 @@ class AsyncTaskModule(BaseModule):
         elif task["status"] == STATUS_POLLING:
           await self._process_poll_task(task, now)
         elif task["status"] == STATUS_RUNNING:
-          await self._process_pipeline_task(task)
+          self._spawn_pipeline_run(task)
+
+  def _spawn_pipeline_run(self, task: dict[str, Any]):
+    """Run the task's next pipeline step in the background so long steps do not hold up the tick."""
+    recid = task["recid"]
+    if recid in self._pipeline_runs:
+      return
+    handler_name = task["handler_name"]
+    handler = self._get_handler(handler_name)
+    limit = getattr(handler, "max_concurrency", None)
+    if limit is not None:
+      running = sum(1 for name, _ in self._pipeline_runs.values() if name == handler_name)
+      if running >= limit:
+        return
+    run = asyncio.create_task(self._run_pipeline_step(task["guid"]))
+    self._pipeline_runs[recid] = (handler_name, run)
+    run.add_done_callback(lambda done: self._forget_pipeline_run(recid, done))
+
+  async def _run_pipeline_step(self, guid: str):
+    # The tick's snapshot may predate the previous step; reload before running.
+    try:
+      task = await self.get_task(guid)
+      if task and task["status"] == STATUS_RUNNING:
+        await self._process_pipeline_task(task)
+    except asyncio.CancelledError:
+      raise
+    except Exception as exc:
+      logging.exception("[AsyncTaskModule] Pipeline step error for task %s: %s", guid, exc)
+
+  def _forget_pipeline_run(self, recid: int, run: asyncio.Task):
+    entry = self._pipeline_runs.get(recid)
+    if entry and entry[1] is run:
+      del self._pipeline_runs[recid]
+
+  def _cancel_pipeline_run(self, recid: int):
+    entry = self._pipeline_runs.pop(recid, None)
+    if entry:
+      entry[1].cancel()
 
   async def _start_task(self, task: dict[str, Any]):
     handler = self._get_handler(task["handler_name"])
@@ -308,6 +388,7 @@ class AsyncTaskModule(BaseModule):
     return await self.get_task(task["guid"])
 
   async def _timeout_task(self, task: dict[str, Any]):
+    self._cancel_pipeline_run(task["recid"])
     await self._update_task(task["recid"], status=STATUS_TIMED_OUT, error="Task timed out")
     await self._add_event(task["recid"], "timed_out")
 
@@ -16,18 +16,20 @@ from server.modules.providers.auth.microsoft_provider import MicrosoftAuthProvid
 from server.modules.providers.auth.google_provider import GoogleAuthProvider
 from server.modules.providers.auth.discord_provider import DiscordAuthProvider
 from server.modules.discord_bot_module import DiscordBotModule
+from server.modules.system_config_module import SystemConfigModule
 from queryregistry.handler import dispatch_query_request
 from queryregistry.identity.users import account_exists_request
 from queryregistry.identity.sessions import get_rotkey_request
 from queryregistry.identity.sessions.models import RotkeyLookupParams
-from queryregistry.system.config import get_config_request
-from queryregistry.system.config.models import ConfigKeyParams
 
 DEFAULT_SESSION_TOKEN_EXPIRY = 15 # minutes
 DEFAULT_ROTATION_TOKEN_EXPIRY = 90 # days
 
 
 class AuthModule(BaseModule):
+  dependencies = ("env", "db", "system_config", "role")
+  optional_dependencies = ("discord_bot",)
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.providers: dict[str, AuthProviderBase] = {}
@@ -37,6 +39,7 @@ class AuthModule(BaseModule):
     self.role: RoleModule | None = None
     self.domain_role_map: dict[str, int] = {}
     self.discord: DiscordBotModule | None = None
+    self.system_config: SystemConfigModule | None = None
 
   @property
   def roles(self) -> dict[str, int]:
@@ -56,14 +59,15 @@ class AuthModule(BaseModule):
 
   async def _read_config_value(self, key: str) -> str | None:
     """Read a single system_config value by key."""
-    res = await self.db.run(get_config_request(ConfigKeyParams(key=key)))
-    return res.rows[0]["element_value"] if res.rows else None
+    return self.system_config.get_value(key)
 
   async def startup(self):
     self.env: EnvModule = self.app.state.env
     await self.env.on_ready()
     self.db: DbModule = self.app.state.db
     await self.db.on_ready()
+    self.system_config = self.app.state.system_config
+    await self.system_config.on_ready()
     self.discord = getattr(self.app.state, "discord_bot", None) or getattr(self.app.state, "discord", None)
     self.discord = getattr(self.app.state, "discord_bot", None)
     if self.discord:
@@ -125,6 +129,7 @@ class AuthModule(BaseModule):
       self.mark_ready()
     except Exception as e:
       logging.exception("[AuthModule] Failed to load providers: %s", e)
+      raise
 
   async def shutdown(self):
     for provider in self.providers.values():
@@ -5,7 +5,7 @@ import importlib
 import json
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, TYPE_CHECKING
 
 from fastapi import FastAPI
 
@@ -32,17 +32,25 @@ from queryregistry.system.batch_jobs.models import (
   UpsertJobParams,
 )
 
+if TYPE_CHECKING:  # pragma: no cover
+  from .leader_module import LeaderModule
+
 
 class BatchJobModule(BaseModule):
+  dependencies = ("db",)
+  optional_dependencies = ("leader",)
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.db: DbModule | None = None
+    self.leader: LeaderModule | None = None
     self._scheduler_task: asyncio.Task | None = None
 
   async def startup(self):
     self.db = self.app.state.db
     await self.db.on_ready()
     self.app.state.batch_job = self
+    self.leader = getattr(self.app.state, "leader", None)
     self._scheduler_task = asyncio.create_task(self._scheduler_loop())
     logging.debug("[BatchJobModule] loaded")
     self.mark_ready()
@@ -196,6 +204,8 @@ class BatchJobModule(BaseModule):
   async def _scheduler_loop(self) -> None:
     while True:
       await asyncio.sleep(30)
+      if self.leader is not None and not self.leader.is_leader:
+        continue
       try:
         now = datetime.now(timezone.utc)
         assert self.db
@@ -7,13 +7,19 @@ from typing import Any, Dict, TYPE_CHECKING
 
 from fastapi import FastAPI
 
+from queryregistry.finance.staging import get_import_request
+from queryregistry.finance.staging.models import GetImportParams
+
 from . import BaseModule
+from .models.finance_statuses import IMPORT_FAILED, IMPORT_PENDING
 
 if TYPE_CHECKING:  # pragma: no cover
   from .providers.billing import BillingImportProvider
 
 
 class BillingImportModule(BaseModule):
+  dependencies = ("env", "db", "system_config")
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.providers: Dict[str, "BillingImportProvider"] = {}
@@ -66,3 +72,26 @@ class BillingImportModule(BaseModule):
     if not provider:
       raise ValueError(f"Billing provider '{provider_name}' not registered")
     return await provider.run_import(**kwargs)
+
+  async def create_import(self, provider_name: str, **kwargs: Any) -> int:
+    """Create a pending staging import to be ingested later with ``resume_import``."""
+    provider = self.providers.get(provider_name)
+    if not provider:
+      raise ValueError(f"Billing provider '{provider_name}' not registered")
+    return await provider.create_import(**kwargs)
+
+  async def resume_import(self, imports_recid: int) -> dict:
+    """Resume a failed or interrupted import with the provider that started it."""
+    db = self.app.state.db
+    await db.on_ready()
+    res = await db.run(get_import_request(GetImportParams(recid=imports_recid)))
+    if not res.rows:
+      raise ValueError(f"Staging import {imports_recid} not found")
+    import_row = res.rows[0]
+    if import_row.get("element_status") not in (IMPORT_PENDING, IMPORT_FAILED):
+      raise ValueError("Only pending or failed imports can be resumed")
+    provider_name = import_row.get("element_source")
+    provider = self.providers.get(provider_name)
+    if not provider:
+      raise ValueError(f"Billing provider '{provider_name}' not registered")
+    return await provider.resume_import(import_row)
@@ -3,14 +3,13 @@ from __future__ import annotations
 import logging
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from typing import Any, Callable
 
-from atproto import AsyncClient as AsyncBskyClient, client_utils
 from fastapi import FastAPI
 
-from queryregistry.system.config.models import ConfigKeyParams
-from queryregistry.system.config import get_config_request
 from . import BaseModule
 from .db_module import DbModule
+from .system_config_module import SystemConfigModule
 
 
 @dataclass
@@ -22,16 +21,22 @@ class BskyPostResult:
 
 
 class BskyModule(BaseModule):
+  dependencies = ("db", "system_config")
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.db: DbModule | None = None
+    self.system_config: SystemConfigModule | None = None
     self._handle: str = "elideusgroup.com"
     self._password: str | None = None
-    self._client_factory = AsyncBskyClient
+    # atproto is slow to import; it is loaded on the first post.
+    self._client_factory: Callable[[], Any] | None = None
 
   async def startup(self):
     self.db = self.app.state.db
     await self.db.on_ready()
+    self.system_config = self.app.state.system_config
+    await self.system_config.on_ready()
     self._handle = await self._load_optional_config("BskyHandle") or self._handle
     self._password = await self._load_optional_config("BskyPassword") or None
     if not self._password:
@@ -40,19 +45,17 @@ class BskyModule(BaseModule):
 
   async def shutdown(self):
     self.db = None
+    self.system_config = None
     self._password = None
 
   async def _load_optional_config(self, key: str) -> str:
-    if not self.db:
-      raise RuntimeError("BskyModule requires database module")
-    res = await self.db.run(get_config_request(ConfigKeyParams(key=key)))
-    if not res.rows:
-      return ""
-    return res.rows[0].get("element_value") or ""
+    if not self.system_config:
+      raise RuntimeError("BskyModule requires system config module")
+    return self.system_config.get_value(key) or ""
 
   async def _ensure_credentials(self):
-    if not self.db:
-      raise RuntimeError("BskyModule requires database module")
+    if not self.system_config:
+      raise RuntimeError("BskyModule requires system config module")
     if not self._password:
       self._password = await self._load_optional_config("BskyPassword") or None
     if not self._password:
@@ -65,6 +68,10 @@ class BskyModule(BaseModule):
   @asynccontextmanager
   async def _client_session(self):
     await self._ensure_credentials()
+    if self._client_factory is None:
+      from atproto import AsyncClient as AsyncBskyClient
+
+      self._client_factory = AsyncBskyClient
     client = self._client_factory()
     try:
       profile = await client.login(self._handle, self._password)
@@ -79,6 +86,8 @@ class BskyModule(BaseModule):
     if not message or not message.strip():
       raise ValueError("Message must not be empty")
     async with self._client_session() as (client, profile):
+      from atproto import client_utils
+
       text = client_utils.TextBuilder().text(message)
       record = await client.send_post(text)
       display_name = getattr(profile, "display_name", None)
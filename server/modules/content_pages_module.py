@@ -31,6 +31,8 @@ from queryregistry.content.pages.models import (
 
 
 class ContentPagesModule(BaseModule):
+  dependencies = ("db",)
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.db: DbModule | None = None
@@ -24,6 +24,8 @@ from .db_module import DbModule
 
 
 class ConversationsModule(BaseModule):
+  dependencies = ("db",)
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.db: DbModule | None = None
@@ -164,6 +164,8 @@ def _sql_literal(value: Any) -> str:
 
 
 class DatabaseCliModule(BaseModule):
+  dependencies = ("db", "env")
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.db: DbModule | None = None
@@ -11,6 +11,7 @@ from queryregistry.system.config.models import ConfigKeyParams
 from . import BaseModule
 from .env_module import EnvModule
 from .providers import DbProviderBase
+from queryregistry.cache import QueryResultCache
 from queryregistry.models import DBRequest, DBResponse
 from queryregistry.system.config import get_config_request
 from queryregistry.helpers import parse_query_operation
@@ -26,11 +27,14 @@ _QUIET_OPS = frozenset({
 
 
 class DbModule(BaseModule):
+  dependencies = ("env",)
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.provider: str = "mssql"
     self.logging_level: int = 0
     self._provider: DbProviderBase | None = None
+    self.cache = QueryResultCache()
 
   async def init(self, provider: str | None = None, **cfg):
     """Initialize database provider.
@@ -76,7 +80,6 @@ class DbModule(BaseModule):
     if not isinstance(request, DBRequest):
       raise TypeError("DbModule.run requires a DBRequest instance")
     op = request.op
-    provider_name = self.provider
     registry_logger = logging.getLogger("server" + ".registry")
 
     try:
@@ -90,7 +93,16 @@ class DbModule(BaseModule):
     else:
       registry_logger.info("DB completed: %s", op)
 
-    response = await dispatch_query_request(request, provider=provider_name)
+    if self.cache.is_cacheable(op):
+      return await self.cache.get_or_load(request, lambda: self._dispatch(request))
+
+    response = await self._dispatch(request)
+    self.cache.invalidate_for_write(op)
+    return response
+
+  async def _dispatch(self, request: DBRequest) -> DBResponse:
+    op = request.op
+    response = await dispatch_query_request(request, provider=self.provider)
 
     if not isinstance(response, DBResponse):
       response = self._normalize_response(op, response)
@@ -99,6 +111,9 @@ class DbModule(BaseModule):
 
     return response
 
+  def cache_stats(self) -> dict[str, Any]:
+    return self.cache.stats()
+
   def _normalize_response(self, op: str, result: Any) -> DBResponse:
     if isinstance(result, DBResponse):
       if not result.op:
@@ -132,6 +147,7 @@ class DbModule(BaseModule):
     self.mark_ready()
 
   async def shutdown(self):
+    self.cache.clear()
     if self._provider:
       await self._provider.shutdown()
       self._provider = None
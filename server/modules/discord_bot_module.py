@@ -1,9 +1,10 @@
 """Discord bot coordination module."""
 
-import logging, discord, asyncio, os
+from __future__ import annotations
+
+import logging, asyncio, os
 from typing import IO, TYPE_CHECKING, Any
 from fastapi import FastAPI
-from discord.ext import commands
 
 try:  # pragma: no cover - platform dependent import
   import fcntl
@@ -18,8 +19,8 @@ except ImportError:  # pragma: no cover - non-Windows platforms
 from . import BaseModule
 from .env_module import EnvModule
 from .db_module import DbModule
-from queryregistry.system.config.models import ConfigKeyParams
-from queryregistry.system.config import get_config_request
+from .system_config_module import SystemConfigModule
+from .discord_message_buffer import ChannelMessageBuffer
 from queryregistry.discord.guilds import (
   get_guild_request,
   list_guilds_request,
@@ -37,13 +38,24 @@ from server.helpers.logging import configure_discord_logging, remove_discord_log
 from server.routers.discord_events import register_discord_event_handlers
 
 if TYPE_CHECKING:  # pragma: no cover
+  from collections.abc import AsyncIterable
+  from discord.ext import commands
   from .discord_output_module import DiscordOutputModule
+  from .leader_module import LeaderModule
   DiscordAuthModule = Any
   SocialInputModule = Any
   DiscordInputProvider = Any
 
 
+class DiscordBotUnavailableError(RuntimeError):
+  """Raised for Discord sends on a worker that does not hold the bot connection."""
+
+
 class DiscordBotModule(BaseModule):
+  dependencies = ("env", "db", "system_config")
+  optional_dependencies = ("leader",)
+  startup_timeout = 120.0
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.secret: str = ""
@@ -51,6 +63,7 @@ class DiscordBotModule(BaseModule):
     self.bot: commands.Bot | None = None
     self.db: DbModule | None = None
     self.env: EnvModule | None = None
+    self.system_config: SystemConfigModule | None = None
     self.discord_output: "DiscordOutputModule" | None = None
     self.discord_auth: "DiscordAuthModule" | None = None
     self._task: asyncio.Task | None = None
@@ -60,10 +73,13 @@ class DiscordBotModule(BaseModule):
     self.GUILD_RATE_LIMIT = 1000
     self.owns_bot: bool = False
     self._lock_handle: IO[str] | None = None
+    self.leader: "LeaderModule" | None = None
+    self._takeover_task: asyncio.Task | None = None
     self.auth_module: "DiscordAuthModule" | None = None
     self.output_module: "DiscordOutputModule" | None = None
     self.social_input_module: "SocialInputModule" | None = None
     self.input_provider: "DiscordInputProvider" | None = None
+    self.message_buffer: ChannelMessageBuffer | None = None
     if not getattr(self.app.state, "discord_bot", None):
       setattr(self.app.state, "discord_bot", self)
 
@@ -72,27 +88,61 @@ class DiscordBotModule(BaseModule):
     await self.env.on_ready()
     self.db: DbModule = self.app.state.db
     await self.db.on_ready()
+    self.system_config = self.app.state.system_config
+    await self.system_config.on_ready()
     self.discord_output = getattr(self.app.state, "discord_output", None)
     self.discord_auth = getattr(self.app.state, "discord_auth", None) or getattr(self.app.state, "auth", None)
     self.social_input_module = getattr(self.app.state, "social_input", None)
+    self.leader = getattr(self.app.state, "leader", None)
     setattr(self.app.state, "discord", self)
+    if self.leader is not None:
+      # Multi-worker mode: only the lease holder connects; others take over on failover.
+      self.leader.add_listener(self._on_leadership_changed)
+      if self.leader.is_leader:
+        await self._start_bot()
+      else:
+        logging.info("[DiscordBotModule] startup deferred: another worker holds the leader lease")
+      self.mark_ready()
+      return
     if not self._acquire_bot_lock():
       logging.info("[DiscordBotModule] startup skipped: Discord bot already owned by another worker")
       self.mark_ready()
       return
+    await self._start_bot()
+    self.mark_ready()
+
+  async def shutdown(self):
+    if self._takeover_task:
+      self._takeover_task.cancel()
+      try:
+        await self._takeover_task
+      except asyncio.CancelledError:
+        pass
+      self._takeover_task = None
+    await self._stop_bot()
+    self._release_bot_lock()
+    if getattr(self.app.state, "discord_bot", None) is self:
+      self.app.state.discord_bot = None
+
+  async def _start_bot(self):
     try:
       self.owns_bot = True
       setattr(self.app.state, "discord_bot", self)
       self.secret = self.env.get("DISCORD_SECRET")
       self.bot = self._init_discord_bot('!')
       self.bot.app = self.app
+      self.message_buffer = ChannelMessageBuffer(
+        capacity=self.system_config.get_int("DiscordChannelBufferSize", 1000),
+        spill_bytes=self.system_config.get_int("DiscordChannelBufferSpillBytes", 262144),
+        max_channels=self.system_config.get_int("DiscordChannelBufferChannels", 200),
+      )
       register_discord_event_handlers(self)
       update_logging_level(self.db.logging_level)
       configure_discord_logging(self)
-      res = await self.db.run(get_config_request(ConfigKeyParams(key="DiscordSyschan")))
-      if not res.rows:
+      syschan = self.system_config.get_value("DiscordSyschan")
+      if syschan is None:
         raise ValueError("Missing config value for key: DiscordSyschan")
-      self.syschan = int(res.rows[0]["element_value"] or 0)
+      self.syschan = int(syschan or 0)
       try:
         await self.bot.login(self.secret)
         self._task = asyncio.create_task(self.bot.connect())
@@ -110,13 +160,10 @@ class DiscordBotModule(BaseModule):
       self.bot = None
       self._release_bot_lock()
       self.owns_bot = False
-      if getattr(self.app.state, "discord_bot", None) is self:
-        self.app.state.discord_bot = None
       raise
     logging.debug("Discord bot module loaded")
-    self.mark_ready()
 
-  async def shutdown(self):
+  async def _stop_bot(self):
     if self.bot:
       await self.bot.close()
       self.bot = None
@@ -127,12 +174,32 @@ class DiscordBotModule(BaseModule):
         pass
       self._task = None
     remove_discord_logging(self)
-    self._release_bot_lock()
+    self.message_buffer = None
     self.owns_bot = False
-    if getattr(self.app.state, "discord_bot", None) is self:
-      self.app.state.discord_bot = None
+
+  async def _on_leadership_changed(self, is_leader: bool):
+    if is_leader and not self.bot and not self._takeover_task:
+      self._takeover_task = asyncio.create_task(self._take_over())
+    elif not is_leader and self.bot:
+      logging.info("[DiscordBotModule] leader lease lost; disconnecting bot")
+      await self._stop_bot()
+
+  async def _take_over(self):
+    try:
+      logging.info("[DiscordBotModule] leader lease acquired; connecting bot")
+      await self._start_bot()
+      if self.social_input_module:
+        await self.social_input_module.attach_discord_provider()
+    except Exception:
+      logging.exception("[DiscordBotModule] failover start failed")
+    finally:
+      self._takeover_task = None
 
   def _init_discord_bot(self, prefix: str) -> commands.Bot:
+    # discord.py is imported on first use so deployments without the bot skip it.
+    import discord
+    from discord.ext import commands
+
     intents = discord.Intents.default()
     intents.guild_messages = True
     intents.guilds = True
@@ -205,7 +272,14 @@ class DiscordBotModule(BaseModule):
       self.output_module = output
     return output
 
+  def require_bot(self) -> "commands.Bot":
+    """Return the connected bot; only the leader worker holds one."""
+    if not self.bot:
+      raise DiscordBotUnavailableError("Discord bot is not connected on this worker")
+    return self.bot
+
   def _require_output_module(self) -> "DiscordOutputModule":
+    self.require_bot()
     output = self._get_output_module()
     if not output:
       raise RuntimeError("DiscordOutputModule is not available")
@@ -229,6 +303,10 @@ class DiscordBotModule(BaseModule):
     output = self._require_output_module()
     await output.queue_channel_message(channel_id, message)
 
+  async def stream_channel_message(self, channel_id: int, deltas: AsyncIterable[str]) -> str:
+    output = self._require_output_module()
+    return await output.stream_to_channel(channel_id, deltas)
+
   async def queue_user_message(self, user_id: int, message: str) -> None:
     if not message:
       return
@@ -268,12 +346,11 @@ class DiscordBotModule(BaseModule):
       logging.info("[DiscordBot] guild nearing rate limit", extra={"guild_id": guild_id, "count": g})
 
   async def send_sys_message(self, message: str):
-    if not self.syschan:
+    # System messages are best effort; workers without the bot drop them.
+    if not self.syschan or not self.bot:
       return
     if await self._try_send_channel(self.syschan, message):
       return
-    if not self.bot:
-      return
     channel = self.bot.get_channel(self.syschan)
     if channel:
       from server.helpers.logging import split_message
@@ -317,12 +394,10 @@ class DiscordBotModule(BaseModule):
     return {"guild_id": guild_id, "credits": credits}
 
   async def sync_guild_records(self) -> dict[str, Any]:
-    if not self.bot:
-      logging.warning("[DiscordBotModule] Discord bot not available")
-      return {"synced": 0, "guilds": []}
+    bot = self.require_bot()
     assert self.db
     synced = 0
-    for guild in self.bot.guilds:
+    for guild in bot.guilds:
       try:
         await self.db.run(
           upsert_guild_request(
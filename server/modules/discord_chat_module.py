@@ -1,21 +1,42 @@
 """Discord chat utilities module."""
 
-import logging, time, discord, uuid
+from __future__ import annotations
+
+import asyncio, hashlib, logging, time, uuid, zlib
+from collections import OrderedDict
 from queryregistry.discord.channels import bump_activity_request
 from queryregistry.discord.channels.models import BumpChannelActivityParams
 from datetime import datetime, timedelta, timezone
 from fastapi import FastAPI
 from typing import Any, Dict, List
 
+from server.helpers.tokens import count_tokens_async, count_tokens_batch, count_tokens_batch_async, take_recent
 from . import BaseModule
-from .discord_bot_module import DiscordBotModule
+from .discord_bot_module import DiscordBotModule, DiscordBotUnavailableError
+from .discord_message_buffer import BufferedMessage
 from .db_module import DbModule
 
 
+SUMMARY_CHUNK_TOKENS = 6000
+SUMMARY_CHUNK_MAX_TOKENS = 400
+SUMMARY_CONCURRENCY = 4
+SUMMARY_CACHE_SIZE = 512
+SUMMARY_MAX_REDUCE_ROUNDS = 3
+PERSONA_CONTEXT_TOKENS = 3000
+SUMMARY_CHUNK_PROMPT = (
+  "Summarize this part of a Discord channel conversation. Keep who said what, "
+  "decisions, open questions and links. It will be merged with summaries of the "
+  "neighbouring parts, so do not add an introduction or conclusion."
+)
+
+
 class DiscordChatModule(BaseModule):
+  optional_dependencies = ("discord_bot",)
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.discord: DiscordBotModule | None = None
+    self._chunk_summaries: OrderedDict[str, str] = OrderedDict()
 
   async def startup(self):
     self.discord = getattr(self.app.state, "discord_bot", None)
@@ -57,22 +78,46 @@ class DiscordChatModule(BaseModule):
       )
 
   async def fetch_channel_history_backwards(self, guild_id: int, channel_id: int, hours: int, max_messages: int = 5000) -> dict:
-    assert self.discord and self.discord.bot
+    """Collect the newest ``max_messages`` of the last ``hours``, oldest first.
+
+    The gateway-fed message buffer serves the part of the window it covers;
+    Discord REST is paged only for the older remainder.
+    """
+    assert self.discord
+    bot = self.discord.bot
+    if not bot:
+      raise DiscordBotUnavailableError("Discord bot is not connected on this worker")
     start = time.perf_counter()
-    guild = self.discord.bot.get_guild(guild_id)
-    channel = guild.get_channel(channel_id) if guild else None
-    if not channel:
-      return {"messages": [], "cap_hit": False}
     after = datetime.now(timezone.utc) - timedelta(hours=hours)
-    messages: List[discord.Message] = []
-    try:
-      async for msg in channel.history(limit=max_messages, after=after, oldest_first=False):
-        messages.append(msg)
-    except Exception:
-      logging.exception("[DiscordChatModule] fetch_channel_history_backwards failed")
-      raise
-    messages.reverse()
+    buffer = self.discord.message_buffer
+    covered_since = buffer.covered_since(channel_id) if buffer else None
+    messages: List[BufferedMessage] = buffer.read(channel_id, after) if covered_since else []
+    fetched = 0
+    if len(messages) < max_messages and (covered_since is None or covered_since > after):
+      guild = bot.get_guild(guild_id)
+      channel = guild.get_channel(channel_id) if guild else None
+      if not channel:
+        return {"messages": messages[-max_messages:], "cap_hit": False}
+      older: List[BufferedMessage] = []
+      # Messages sharing the boundary millisecond can be both fetched and buffered.
+      buffered_ids = {m.message_id for m in messages}
+      try:
+        async for msg in channel.history(
+          limit=max_messages - len(messages),
+          after=after,
+          before=covered_since,
+          oldest_first=False,
+        ):
+          if msg.id not in buffered_ids:
+            older.append(BufferedMessage.from_message(msg))
+      except Exception:
+        logging.exception("[DiscordChatModule] fetch_channel_history_backwards failed")
+        raise
+      older.reverse()
+      fetched = len(older)
+      messages = older + messages
     cap_hit = len(messages) >= max_messages
+    messages = messages[-max_messages:]
     elapsed = time.perf_counter() - start
     logging.info(
       "[DiscordChatModule] fetch_channel_history_backwards",
@@ -81,27 +126,21 @@ class DiscordChatModule(BaseModule):
         "channel_id": channel_id,
         "hours": hours,
         "messages_collected": len(messages),
+        "messages_fetched": fetched,
         "cap_hit": cap_hit,
         "elapsed": elapsed,
       },
     )
     return {"messages": messages, "cap_hit": cap_hit}
 
-  def estimate_tokens(self, text: str) -> int:
-    try:
-      import tiktoken
-      enc = tiktoken.get_encoding("cl100k_base")
-      return len(enc.encode(text))
-    except Exception:
-      return len(text.split())
-
   async def summarize_channel(self, guild_id: int, channel_id: int, hours: int, max_messages: int = 5000) -> dict:
     start = time.perf_counter()
     history = await self.fetch_channel_history_backwards(guild_id, channel_id, hours, max_messages)
     messages = history["messages"]
-    lines = [f"{m.author.name}: {m.content}" for m in messages if getattr(m, "content", None)]
+    lines = [f"{m.author_name}: {m.content}" for m in messages if m.content]
     raw_text_blob = "\n".join(lines)
-    tokens = self.estimate_tokens(raw_text_blob)
+    line_tokens = await count_tokens_batch_async(lines)
+    tokens = sum(line_tokens)
     elapsed = time.perf_counter() - start
     logging.info(
       "[DiscordChatModule] summarize_channel",
@@ -119,9 +158,73 @@ class DiscordChatModule(BaseModule):
       "messages_collected": len(messages),
       "token_count_estimate": tokens,
       "raw_text_blob": raw_text_blob,
+      "lines": lines,
+      "line_tokens": line_tokens,
       "cap_hit": history["cap_hit"],
     }
 
+  def chunk_lines(self, lines: List[str], budget: int, line_tokens: List[int] | None = None) -> List[str]:
+    """Pack lines into chunks of at most ``budget`` tokens.
+
+    Once a chunk is half full it also closes after any line whose checksum
+    marks a boundary. Boundaries therefore follow the content rather than the
+    window start, so overlapping windows produce the same chunks and reuse
+    their cached summaries.
+    """
+    if line_tokens is None:
+      line_tokens = count_tokens_batch(lines)
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for line, tokens in zip(lines, line_tokens):
+      if current and current_tokens + tokens > budget:
+        chunks.append("\n".join(current))
+        current, current_tokens = [], 0
+      current.append(line)
+      current_tokens += tokens
+      if current_tokens >= budget // 2 and zlib.crc32(line.encode("utf-8")) % 16 == 0:
+        chunks.append("\n".join(current))
+        current, current_tokens = [], 0
+    if current:
+      chunks.append("\n".join(current))
+    return chunks
+
+  async def _map_reduce_summary(
+    self,
+    lines: List[str],
+    complete,
+    cache_scope: str,
+    line_tokens: List[int] | None = None,
+  ) -> str:
+    """Summarize chunks concurrently until the combined summaries fit one request."""
+    semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+
+    async def _summarize_chunk(chunk: str) -> str:
+      key = hashlib.sha256(f"{cache_scope}\n{chunk}".encode("utf-8")).hexdigest()
+      cached = self._chunk_summaries.get(key)
+      if cached is not None:
+        self._chunk_summaries.move_to_end(key)
+        return cached
+      async with semaphore:
+        response = await complete(SUMMARY_CHUNK_PROMPT, chunk, SUMMARY_CHUNK_MAX_TOKENS)
+      content = (response.get("content") if isinstance(response, dict) else getattr(response, "content", "")) or ""
+      if content:
+        self._chunk_summaries[key] = content
+        if len(self._chunk_summaries) > SUMMARY_CACHE_SIZE:
+          self._chunk_summaries.popitem(last=False)
+      return content
+
+    text = "\n".join(lines)
+    for _ in range(SUMMARY_MAX_REDUCE_ROUNDS):
+      chunks = self.chunk_lines(lines, SUMMARY_CHUNK_TOKENS, line_tokens)
+      partials = await asyncio.gather(*(_summarize_chunk(chunk) for chunk in chunks))
+      lines = [partial for partial in partials if partial]
+      line_tokens = count_tokens_batch(lines)
+      text = "\n\n".join(lines)
+      if len(chunks) <= 1 or sum(line_tokens) <= SUMMARY_CHUNK_TOKENS:
+        break
+    return text
+
   async def summarize_chat(
     self,
     guild_id: int,
@@ -167,36 +270,57 @@ class DiscordChatModule(BaseModule):
           max_tokens = tokens_val
       generator = getattr(openai, "generate_chat", None)
       fetch_chat = getattr(openai, "fetch_chat", None)
-      response = None
-      try:
+
+      async def _complete(system_prompt: str, user_prompt: str, completion_tokens: int | None):
+        token_count = await count_tokens_async(user_prompt, model_hint or None)
         if generator:
-          response = await generator(
-            system_prompt=role,
-            user_prompt=summary["raw_text_blob"],
+          return await generator(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
             model=model_hint or None,
-            max_tokens=max_tokens,
+            max_tokens=completion_tokens,
             persona=persona_name,
             persona_details=persona_details,
             guild_id=guild_id,
             channel_id=channel_id,
             user_id=user_id,
             input_log=str(hours),
-            token_count=summary["token_count_estimate"],
+            token_count=token_count,
+            bulk=True,
+            cache=True,
           )
-        elif fetch_chat:
-          response = await fetch_chat(
+        if fetch_chat:
+          return await fetch_chat(
             [],
-            role,
-            summary["raw_text_blob"],
-            max_tokens,
+            system_prompt,
+            user_prompt,
+            completion_tokens,
             persona=persona_name,
             guild_id=guild_id,
             channel_id=channel_id,
             user_id=user_id,
             input_log=str(hours),
-            token_count=summary["token_count_estimate"],
+            token_count=token_count,
             model=model_hint or "gpt-4o-mini",
+            bulk=True,
+          )
+        return None
+
+      response = None
+      try:
+        user_prompt = summary["raw_text_blob"]
+        if summary["token_count_estimate"] > SUMMARY_CHUNK_TOKENS:
+          partials = await self._map_reduce_summary(
+            summary.get("lines") or summary["raw_text_blob"].split("\n"),
+            _complete,
+            f"{model_hint}\n{SUMMARY_CHUNK_PROMPT}",
+            summary.get("line_tokens"),
+          )
+          user_prompt = (
+            "Summaries of consecutive parts of the conversation, oldest first:\n\n"
+            f"{partials}"
           )
+        response = await _complete(role, user_prompt, max_tokens)
       except Exception:
         logging.exception("[DiscordChatModule] chat generation failed")
         response = None
@@ -278,6 +402,8 @@ class DiscordChatModule(BaseModule):
         token_count_estimate=token_count_estimate,
         cap_hit=cap_hit,
       )
+    except DiscordBotUnavailableError:
+      raise
     except Exception:
       logging.exception(
         "[DiscordChatModule] summarize_and_deliver failed",
@@ -543,26 +669,15 @@ class DiscordChatModule(BaseModule):
         "ack_message": "Failed to fetch messages. Please try again later.",
       }
     messages = history.get("messages") or []
-    channel_history: List[Dict[str, Any]] = []
-    for msg in messages:
-      content = getattr(msg, "content", None)
-      if not content:
-        continue
-      author = getattr(msg, "author", None)
-      author_name = None
-      if author is not None:
-        author_name = (
-          getattr(author, "display_name", None)
-          or getattr(author, "name", None)
-          or getattr(author, "id", None)
-        )
-      channel_history.append(
-        {
-          "author": str(author_name) if author_name is not None else "unknown",
-          "content": str(content),
-          "created_at": getattr(msg, "created_at", None),
-        }
-      )
+    channel_history: List[Dict[str, Any]] = [
+      {
+        "author": msg.display_name,
+        "content": msg.content,
+        "created_at": msg.created_at,
+      }
+      for msg in messages
+      if msg.content
+    ]
     return {"success": True, "channel_history": channel_history}
 
   async def insert_conversation_input(
@@ -648,7 +763,13 @@ class DiscordChatModule(BaseModule):
     guild_id: int | None = None,
     channel_id: int | None = None,
     user_id: int | None = None,
+    stream: bool = False,
   ) -> Dict[str, Any]:
+    """Generate a persona reply.
+
+    With ``stream`` the reply is posted to ``channel_id`` while it is being
+    generated, and the response is marked ``delivered``.
+    """
     await self.on_ready()
     persona_name = (persona or "").strip()
     message_text = (message or "").strip()
@@ -696,44 +817,37 @@ class DiscordChatModule(BaseModule):
     conversation_history = conversation_history or []
     channel_history = channel_history or []
 
-    def _format_conversation(items: List[Dict[str, Any]]) -> str:
-      parts: List[str] = []
-      for item in items[-10:]:
-        role = item.get("role") or "user"
-        content = item.get("content") or ""
-        if not content:
-          continue
-        parts.append(f"{role}: {content}")
-      return "\n".join(parts)
-
-    def _format_channel(items: List[Dict[str, Any]]) -> str:
-      parts: List[str] = []
-      for item in items[-20:]:
-        author = item.get("author") or "unknown"
-        content = item.get("content") or ""
-        if not content:
-          continue
-        parts.append(f"{author}: {content}")
-      return "\n".join(parts)
+    stored_context = stored_context or []
 
+    # Least volatile material goes first so consecutive requests share the
+    # longest possible prefix after the system prompt for provider caching.
+    sections = [
+      (
+        "Recent stored conversation context:",
+        [f"{item.get('role') or 'user'}: {item['content']}" for item in stored_context if item.get("content")],
+        [item.get("tokens") for item in stored_context if item.get("content")],
+      ),
+      (
+        "Recent persona conversation:",
+        [f"{item.get('role') or 'user'}: {item['content']}" for item in conversation_history if item.get("content")],
+        None,
+      ),
+      (
+        "Recent channel activity:",
+        [f"{item.get('author') or 'unknown'}: {item['content']}" for item in channel_history if item.get("content")],
+        None,
+      ),
+    ]
+    sections = [section for section in sections if section[1]]
     context_sections: List[str] = []
-    convo_text = _format_conversation(conversation_history)
-    if convo_text:
-      context_sections.append("Recent persona conversation:\n" + convo_text)
-    channel_text = _format_channel(channel_history)
-    if channel_text:
-      context_sections.append("Recent channel activity:\n" + channel_text)
-    stored_context = stored_context or []
-    if stored_context:
-      stored_parts: List[str] = []
-      for msg in stored_context[-15:]:
-        r = msg.get("role") or "user"
-        c = msg.get("content") or ""
-        if c:
-          stored_parts.append(f"{r}: {c}")
-      stored_text = "\n".join(stored_parts)
-      if stored_text:
-        context_sections.append("Recent stored conversation context:\n" + stored_text)
+    remaining = PERSONA_CONTEXT_TOKENS
+    for index, (heading, lines, counts) in enumerate(sections):
+      # Split what is left evenly; sections that need less pass it on.
+      share = remaining // (len(sections) - index)
+      kept, used = take_recent(lines, share, counts, model_hint)
+      remaining -= used
+      if kept:
+        context_sections.append(heading + "\n" + "\n".join(kept))
     prompt_context = "\n\n".join(context_sections)
     logging.info(
       "[DiscordChatModule] context assembled for persona response",
@@ -746,26 +860,44 @@ class DiscordChatModule(BaseModule):
         "stored_context_count": len(stored_context),
         "context_sections_count": len(context_sections),
         "prompt_context_length": len(prompt_context),
+        "prompt_context_tokens": PERSONA_CONTEXT_TOKENS - remaining,
       },
     )
 
     system_prompt = persona_details.get("prompt") or ""
+    delivered = False
 
     try:
-      response = await openai.generate_chat(
-        system_prompt=system_prompt,
-        user_prompt=message_text,
-        model=model_hint,
-        max_tokens=tokens_hint,
-        prompt_context=prompt_context,
-        persona=None,
-        persona_details=None,
-        guild_id=guild_id,
-        channel_id=channel_id,
-        user_id=user_id,
-        input_log=message_text,
-        token_count=None,
-      )
+      if stream and channel_id is not None and self.discord and hasattr(openai, "stream_chat"):
+        content = await self.discord.stream_channel_message(
+          int(channel_id),
+          openai.stream_chat(
+            system_prompt=system_prompt,
+            user_prompt=message_text,
+            model=model_hint,
+            max_tokens=tokens_hint,
+            prompt_context=prompt_context,
+            cache=True,
+          ),
+        )
+        response = {"content": content, "model": model_hint}
+        delivered = True
+      else:
+        response = await openai.generate_chat(
+          system_prompt=system_prompt,
+          user_prompt=message_text,
+          model=model_hint,
+          max_tokens=tokens_hint,
+          prompt_context=prompt_context,
+          persona=None,
+          persona_details=None,
+          guild_id=guild_id,
+          channel_id=channel_id,
+          user_id=user_id,
+          input_log=message_text,
+          token_count=None,
+          cache=True,
+        )
     except Exception:
       logging.exception(
         "[DiscordChatModule] OpenAI request failed for persona response",
@@ -797,7 +929,7 @@ class DiscordChatModule(BaseModule):
 
     return {
       "success": True,
-      "response": {"text": content or "", "model": model_used},
+      "response": {"text": content or "", "model": model_used, "delivered": delivered},
       "model": model_used,
       "usage": usage,
       "conversation_reference": conversation_reference,
@@ -827,9 +959,13 @@ class DiscordChatModule(BaseModule):
         response_text = response.get("content") or ""
     success = False
     try:
-      if channel_id is not None and response_text:
+      if isinstance(response, dict) and response.get("delivered"):
+        success = bool(response_text)
+      elif channel_id is not None and response_text:
         await self.discord.queue_channel_message(int(channel_id), response_text)
         success = True
+    except DiscordBotUnavailableError:
+      raise
     except Exception:
       logging.exception(
         "[DiscordChatModule] failed to queue persona response",
@@ -1018,6 +1154,7 @@ class DiscordChatModule(BaseModule):
       guild_id=metadata.get("guild_id"),
       channel_id=metadata.get("channel_id"),
       user_id=metadata.get("user_id"),
+      stream=True,
     )
     context["response"] = response.get("response", context.get("response"))
     context["model"] = response.get("model", context.get("model"))
@@ -0,0 +1,189 @@
+"""Rolling per-channel message buffer fed by Discord gateway events."""
+
+from __future__ import annotations
+
+import json
+import zlib
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable
+
+SPILL_SEGMENT_SIZE = 200
+# Discord timestamps have millisecond precision and REST ``before`` is exclusive,
+# so coverage starts one tick after the newest dropped message.
+_COVERAGE_TICK = timedelta(milliseconds=1)
+
+
+@dataclass(slots=True)
+class BufferedMessage:
+  message_id: int
+  author_name: str
+  display_name: str
+  content: str
+  created_at: datetime
+
+  @classmethod
+  def from_message(cls, message: Any) -> "BufferedMessage":
+    author = getattr(message, "author", None)
+    author_name = str(getattr(author, "name", None) or getattr(author, "id", None) or "unknown")
+    display_name = str(getattr(author, "display_name", None) or author_name)
+    return cls(
+      message_id=int(message.id),
+      author_name=author_name,
+      display_name=display_name,
+      content=getattr(message, "content", None) or "",
+      created_at=message.created_at,
+    )
+
+
+@dataclass(slots=True)
+class _Segment:
+  last_id: int
+  last_created_at: datetime
+  blob: bytes
+
+
+def _pack(messages: Iterable[BufferedMessage]) -> bytes:
+  records = [
+    [m.message_id, m.author_name, m.display_name, m.content, m.created_at.isoformat()]
+    for m in messages
+  ]
+  return zlib.compress(json.dumps(records, separators=(",", ":")).encode("utf-8"))
+
+
+def _unpack(blob: bytes) -> list[BufferedMessage]:
+  return [
+    BufferedMessage(record[0], record[1], record[2], record[3], datetime.fromisoformat(record[4]))
+    for record in json.loads(zlib.decompress(blob))
+  ]
+
+
+class _ChannelBuffer:
+  __slots__ = ("messages", "by_id", "segments", "spilled_bytes", "overrides", "covered_since")
+
+  def __init__(self, covered_since: datetime):
+    self.messages: deque[BufferedMessage] = deque()
+    self.by_id: dict[int, BufferedMessage] = {}
+    self.segments: deque[_Segment] = deque()
+    self.spilled_bytes = 0
+    # Edits (content) and deletes (None) that arrive for already spilled messages.
+    self.overrides: dict[int, str | None] = {}
+    self.covered_since = covered_since
+
+
+class ChannelMessageBuffer:
+  """Bounded recent history per channel, kept current from gateway events.
+
+  Each channel holds up to ``capacity`` messages in memory. With a
+  ``spill_bytes`` budget, older messages are moved into compressed segments
+  instead of being dropped. ``covered_since`` reports how far back a
+  channel's history is complete, so callers only page Discord REST for the
+  older remainder. Coverage restarts whenever a new gateway session begins,
+  because events missed while disconnected are not replayed.
+  """
+
+  def __init__(self, capacity: int = 1000, spill_bytes: int = 0, max_channels: int = 200):
+    self.capacity = max(1, capacity)
+    self.spill_bytes = max(0, spill_bytes)
+    self.max_channels = max(1, max_channels)
+    self._channels: OrderedDict[int, _ChannelBuffer] = OrderedDict()
+    self._evicted: dict[int, datetime] = {}
+    self._listening_since: datetime | None = None
+
+  def reset(self, now: datetime | None = None):
+    self._channels.clear()
+    self._evicted.clear()
+    self._listening_since = now or datetime.now(timezone.utc)
+
+  def covered_since(self, channel_id: int) -> datetime | None:
+    if self._listening_since is None:
+      return None
+    buffer = self._channels.get(channel_id)
+    if buffer is not None:
+      return buffer.covered_since
+    return self._evicted.get(channel_id, self._listening_since)
+
+  def add(self, channel_id: int, message: BufferedMessage):
+    if self._listening_since is None:
+      return
+    buffer = self._channels.get(channel_id)
+    if buffer is None:
+      buffer = _ChannelBuffer(self._evicted.pop(channel_id, self._listening_since))
+      self._channels[channel_id] = buffer
+      if len(self._channels) > self.max_channels:
+        evicted_id, _ = self._channels.popitem(last=False)
+        self._evicted[evicted_id] = datetime.now(timezone.utc)
+    else:
+      self._channels.move_to_end(channel_id)
+    buffer.messages.append(message)
+    buffer.by_id[message.message_id] = message
+    self._trim(buffer)
+
+  def edit(self, channel_id: int, message_id: int, content: str):
+    buffer = self._channels.get(channel_id)
+    if buffer is None:
+      return
+    message = buffer.by_id.get(message_id)
+    if message is not None:
+      message.content = content
+    elif buffer.segments and message_id <= buffer.segments[-1].last_id:
+      buffer.overrides[message_id] = content
+
+  def delete(self, channel_id: int, message_ids: Iterable[int]):
+    buffer = self._channels.get(channel_id)
+    if buffer is None:
+      return
+    for message_id in message_ids:
+      message = buffer.by_id.pop(message_id, None)
+      if message is not None:
+        buffer.messages.remove(message)
+      elif buffer.segments and message_id <= buffer.segments[-1].last_id:
+        buffer.overrides[message_id] = None
+
+  def read(self, channel_id: int, after: datetime) -> list[BufferedMessage]:
+    """Return buffered messages created after ``after``, oldest first."""
+    buffer = self._channels.get(channel_id)
+    if buffer is None:
+      return []
+    messages: list[BufferedMessage] = []
+    for segment in buffer.segments:
+      if segment.last_created_at <= after:
+        continue
+      for message in _unpack(segment.blob):
+        if message.created_at <= after:
+          continue
+        if message.message_id in buffer.overrides:
+          content = buffer.overrides[message.message_id]
+          if content is None:
+            continue
+          message.content = content
+        messages.append(message)
+    messages.extend(m for m in buffer.messages if m.created_at > after)
+    return messages
+
+  def _trim(self, buffer: _ChannelBuffer):
+    if not self.spill_bytes:
+      while len(buffer.messages) > self.capacity:
+        dropped = buffer.messages.popleft()
+        buffer.by_id.pop(dropped.message_id, None)
+        buffer.covered_since = dropped.created_at + _COVERAGE_TICK
+      return
+
+    if len(buffer.messages) < self.capacity + SPILL_SEGMENT_SIZE:
+      return
+    spilled = [buffer.messages.popleft() for _ in range(SPILL_SEGMENT_SIZE)]
+    for message in spilled:
+      buffer.by_id.pop(message.message_id, None)
+    segment = _Segment(spilled[-1].message_id, spilled[-1].created_at, _pack(spilled))
+    buffer.segments.append(segment)
+    buffer.spilled_bytes += len(segment.blob)
+    while buffer.spilled_bytes > self.spill_bytes and buffer.segments:
+      dropped = buffer.segments.popleft()
+      buffer.spilled_bytes -= len(dropped.blob)
+      buffer.covered_since = dropped.last_created_at + _COVERAGE_TICK
+      buffer.overrides = {
+        message_id: content
+        for message_id, content in buffer.overrides.items()
+        if message_id > dropped.last_id
+      }
@@ -1,39 +1,124 @@
 """Discord output module responsible for delivering messages safely."""
 
-import asyncio, logging, time, discord
-from collections.abc import Awaitable, Callable
+from __future__ import annotations
+
+import asyncio, logging, time
+from collections import deque
+from collections.abc import AsyncIterable, Awaitable, Callable
 from contextlib import suppress
-from typing import List, NamedTuple, TYPE_CHECKING
+from typing import Any, List, TYPE_CHECKING
 from fastapi import FastAPI
-from discord.ext import commands
 
 from . import BaseModule
 
 if TYPE_CHECKING:  # pragma: no cover
+  import discord
+  from discord.ext import commands
   from .discord_bot_module import DiscordBotModule
 
 _SendCallable = Callable[[str], Awaitable[None]]
 
+# Discord allows roughly five message creates per channel every five seconds
+# and fifty requests per second across the bot.
+ROUTE_LIMIT = 5
+ROUTE_PERIOD = 5.0
+GLOBAL_LIMIT = 50
+GLOBAL_PERIOD = 1.0
+MAX_RATE_LIMIT_RETRIES = 3
+MAX_IDLE_DESTINATIONS = 1000
+# Minimum spacing between edits of a message that is still streaming.
+STREAM_EDIT_INTERVAL = 1.0
+
+
+class _RouteBucket:
+  """Fixed-window request budget mirroring a Discord rate-limit bucket."""
+
+  __slots__ = ("limit", "period", "remaining", "reset_at")
+
+  def __init__(self, limit: int, period: float):
+    self.limit = max(1, limit)
+    self.period = max(0.0, period)
+    self.remaining = self.limit
+    self.reset_at = 0.0
+
+  def wait_time(self, now: float) -> float:
+    if now >= self.reset_at:
+      self.remaining = self.limit
+      self.reset_at = now + self.period
+    if self.remaining > 0:
+      return 0.0
+    return self.reset_at - now
+
+  def consume(self) -> None:
+    self.remaining -= 1
+
+  def defer(self, seconds: float, now: float) -> None:
+    # Discord's retry-after is authoritative over the local window.
+    self.remaining = 0
+    self.reset_at = now + seconds
+
+
+class _OutboundMessage:
+  __slots__ = ("message", "chunks", "enqueued_at", "future", "sender", "retries")
+
+  def __init__(self, message: str, chunks: List[str], future: asyncio.Future[None] | None):
+    self.message = message
+    self.chunks: deque[str] = deque(chunks)
+    self.enqueued_at = time.monotonic()
+    self.future = future
+    self.sender: _SendCallable | None = None
+    self.retries = 0
+
 
-class _QueuePayload(NamedTuple):
-  kind: str
-  target_id: int
-  message: str
+class _Destination:
+  """Pending messages for one channel or DM, delivered in order."""
+
+  __slots__ = ("kind", "target_id", "pending", "bucket", "scheduled")
+
+  def __init__(self, kind: str, target_id: int, bucket: _RouteBucket):
+    self.kind = kind
+    self.target_id = target_id
+    self.pending: deque[_OutboundMessage] = deque()
+    self.bucket = bucket
+    self.scheduled = False
 
 
 class DiscordOutputModule(BaseModule):
+  """Delivers Discord messages through per-destination queues.
+
+  Each channel or DM has its own queue and its own route bucket. Workers
+  take destinations round-robin and send one chunk per turn, so a long
+  message to one channel does not hold up the others. A destination whose
+  bucket is spent is set aside until its window resets, and a rate-limit
+  error from Discord defers the bucket by the reported retry-after.
+  """
+
+  optional_dependencies = ("discord_bot",)
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.discord: "DiscordBotModule" | None = None
     self._message_size_limit = 1998
-    self._trickle_delay = 1.0
-    self._send_lock = asyncio.Lock()
-    self._outbound_queue: asyncio.Queue[_QueuePayload] = asyncio.Queue()
-    self._worker_task: asyncio.Task[None] | None = None
+    self._route_limit = ROUTE_LIMIT
+    self._route_period = ROUTE_PERIOD
+    self._worker_count = 4
+    self._global_bucket = _RouteBucket(GLOBAL_LIMIT, GLOBAL_PERIOD)
+    self._destinations: dict[tuple[str, int], _Destination] = {}
+    self._ready: asyncio.Queue[_Destination] = asyncio.Queue()
+    self._pending_messages = 0
+    self._drained = asyncio.Event()
+    self._drained.set()
+    self._worker_tasks: list[asyncio.Task[None]] = []
     self._stats_lock = asyncio.Lock()
     self._channel_stats: dict[int, dict[str, float | int]] = {}
     self._user_stats: dict[int, dict[str, float | int]] = {}
-    self._aggregate_stats: dict[str, float | int] = {"messages": 0, "characters": 0, "last_sent_at": 0.0}
+    self._aggregate_stats: dict[str, float | int] = {
+      "messages": 0,
+      "characters": 0,
+      "last_sent_at": 0.0,
+      "last_latency": 0.0,
+      "avg_latency": 0.0,
+    }
 
   async def startup(self):
     self.discord = getattr(self.app.state, "discord_bot", None) or getattr(self.app.state, "discord_bot", None)
@@ -44,17 +129,17 @@ class DiscordOutputModule(BaseModule):
         register(self)
     self.app.state.discord_output = self
     logging.debug("[DiscordOutputModule] loaded")
-    if not self._worker_task:
-      self._worker_task = asyncio.create_task(self._queue_worker(), name="discord-output-worker")
+    self._start_workers()
     self.mark_ready()
 
   async def shutdown(self):
     logging.info("[DiscordOutputModule] shutdown")
-    if self._worker_task:
-      self._worker_task.cancel()
+    for task in self._worker_tasks:
+      task.cancel()
+    for task in self._worker_tasks:
       with suppress(asyncio.CancelledError):
-        await self._worker_task
-      self._worker_task = None
+        await task
+    self._worker_tasks = []
     if self.discord and getattr(self.discord, "output_module", None) is self:
       self.discord.output_module = None
     if getattr(self.app.state, "discord_output", None) is self:
@@ -66,47 +151,118 @@ class DiscordOutputModule(BaseModule):
       raise ValueError("max_message_size must be greater than zero")
     self._message_size_limit = max_message_size
 
-  def configure_trickle_rate(self, delay_seconds: float) -> None:
-    if delay_seconds < 0:
-      raise ValueError("delay_seconds cannot be negative")
-    self._trickle_delay = delay_seconds
+  def configure_route_limit(self, messages: int, period_seconds: float) -> None:
+    if messages <= 0:
+      raise ValueError("messages must be greater than zero")
+    if period_seconds < 0:
+      raise ValueError("period_seconds cannot be negative")
+    self._route_limit = messages
+    self._route_period = period_seconds
+    for destination in self._destinations.values():
+      destination.bucket = _RouteBucket(messages, period_seconds)
 
   async def send_to_channel(self, channel_id: int, message: str) -> None:
     if not message:
       return
-    channel = await self._resolve_channel(channel_id)
-    await self._deliver_in_chunks(channel.send, message)
-    await self._record_channel_throughput(channel_id, message)
+    await self._enqueue("channel", channel_id, message, wait=True)
 
   async def send_to_user(self, user_id: int, message: str) -> None:
     if not message:
       return
-    user = await self._resolve_user(user_id)
-    await self._deliver_in_chunks(user.send, message)
-    await self._record_user_throughput(user_id, message)
+    await self._enqueue("user", user_id, message, wait=True)
 
   async def queue_channel_message(self, channel_id: int, message: str) -> None:
     if not message:
       return
-    await self._outbound_queue.put(_QueuePayload("channel", channel_id, message))
+    await self._enqueue("channel", channel_id, message)
 
   async def queue_user_message(self, user_id: int, message: str) -> None:
     if not message:
       return
-    await self._outbound_queue.put(_QueuePayload("user", user_id, message))
+    await self._enqueue("user", user_id, message)
+
+  async def stream_to_channel(self, channel_id: int, deltas: AsyncIterable[str]) -> str:
+    """Post text to a channel while it is still being generated.
+
+    The first chunk is posted as soon as it has visible text. The chunk being
+    written is then edited in place, at most once per
+    ``STREAM_EDIT_INTERVAL`` and only while the channel's bucket has budget.
+    Once the text outgrows the message window, the next chunk starts a new
+    message. Returns the full text.
+    """
+    started = time.monotonic()
+    channel = await self._resolve_channel(channel_id)
+    key = ("channel", channel_id)
+    destination = self._destinations.get(key)
+    if destination is None:
+      destination = _Destination("channel", channel_id, _RouteBucket(self._route_limit, self._route_period))
+      self._destinations[key] = destination
+    posted: list[tuple[Any, str]] = []
+    last_edit = 0.0
+    text = ""
+
+    async def sync(final: bool) -> None:
+      nonlocal last_edit
+      chunks = self._yield_chunks(text, self._message_size_limit)
+      for index, chunk in enumerate(chunks):
+        now = time.monotonic()
+        if index < len(posted):
+          message, shown = posted[index]
+          if shown == chunk:
+            continue
+          live = index == len(chunks) - 1 and not final
+          if live and (now - last_edit < STREAM_EDIT_INTERVAL or destination.bucket.wait_time(now) > 0):
+            continue
+          await self._wait_for_budget(destination)
+          await message.edit(content=chunk)
+          posted[index] = (message, chunk)
+          last_edit = time.monotonic()
+        else:
+          await self._wait_for_budget(destination)
+          posted.append((await channel.send(chunk), chunk))
+          last_edit = time.monotonic()
+
+    async for delta in deltas:
+      text += delta
+      await sync(final=False)
+    await sync(final=True)
+    if text.strip():
+      await self._record_stats(self._channel_stats, channel_id, text, time.monotonic() - started)
+    return text
 
   async def wait_for_drain(self) -> None:
-    await self._outbound_queue.join()
+    await self._drained.wait()
 
   async def get_throughput_snapshot(self) -> dict[str, dict]:
+    now = time.monotonic()
+    queues: dict[str, dict[int, dict[str, float | int]]] = {"channel": {}, "user": {}}
+    for destination in self._destinations.values():
+      if destination.pending:
+        queues[destination.kind][destination.target_id] = {
+          "queued": len(destination.pending),
+          "oldest_wait": now - destination.pending[0].enqueued_at,
+        }
     async with self._stats_lock:
       return {
-        "aggregate": dict(self._aggregate_stats),
-        "channels": {cid: dict(stats) for cid, stats in self._channel_stats.items()},
-        "users": {uid: dict(stats) for uid, stats in self._user_stats.items()},
+        "aggregate": {
+          **self._aggregate_stats,
+          "queued": self._pending_messages,
+          "active_destinations": sum(len(entries) for entries in queues.values()),
+        },
+        "channels": {
+          cid: {**stats, "queued": queues["channel"].get(cid, {}).get("queued", 0)}
+          for cid, stats in self._channel_stats.items()
+        },
+        "users": {
+          uid: {**stats, "queued": queues["user"].get(uid, {}).get("queued", 0)}
+          for uid, stats in self._user_stats.items()
+        },
+        "queues": queues,
       }
 
   async def _resolve_channel(self, channel_id: int) -> discord.abc.Messageable:
+    import discord
+
     bot = self._get_bot()
     channel = bot.get_channel(channel_id)
     if channel is None:
@@ -120,6 +276,8 @@ class DiscordOutputModule(BaseModule):
     return channel
 
   async def _resolve_user(self, user_id: int) -> discord.abc.Messageable:
+    import discord
+
     bot = self._get_bot()
     user = bot.get_user(user_id)
     if user is None:
@@ -137,48 +295,143 @@ class DiscordOutputModule(BaseModule):
       raise RuntimeError("Discord bot is not available")
     return self.discord.bot
 
+  def _start_workers(self) -> None:
+    if self._worker_tasks:
+      return
+    self._worker_tasks = [
+      asyncio.create_task(self._queue_worker(), name=f"discord-output-worker-{index}")
+      for index in range(self._worker_count)
+    ]
+
+  async def _enqueue(self, kind: str, target_id: int, message: str, *, wait: bool = False) -> None:
+    key = (kind, target_id)
+    destination = self._destinations.get(key)
+    if destination is None:
+      if len(self._destinations) >= MAX_IDLE_DESTINATIONS:
+        self._prune_destinations()
+      destination = _Destination(kind, target_id, _RouteBucket(self._route_limit, self._route_period))
+      self._destinations[key] = destination
+    future = asyncio.get_running_loop().create_future() if wait else None
+    destination.pending.append(
+      _OutboundMessage(message, self._yield_chunks(message, self._message_size_limit), future),
+    )
+    self._pending_messages += 1
+    self._drained.clear()
+    self._schedule(destination)
+    if future is not None:
+      await future
+
+  def _prune_destinations(self) -> None:
+    # Idle destinations keep their bucket until its window has passed, so a
+    # new message right after a burst still honours the remaining budget.
+    now = time.monotonic()
+    for key, destination in list(self._destinations.items()):
+      if not destination.scheduled and now >= destination.bucket.reset_at:
+        del self._destinations[key]
+
+  async def _wait_for_budget(self, destination: _Destination) -> None:
+    while True:
+      now = time.monotonic()
+      delay = max(destination.bucket.wait_time(now), self._global_bucket.wait_time(now))
+      if delay <= 0:
+        destination.bucket.consume()
+        self._global_bucket.consume()
+        return
+      await asyncio.sleep(delay)
+
+  def _schedule(self, destination: _Destination) -> None:
+    if not destination.scheduled and destination.pending:
+      destination.scheduled = True
+      self._ready.put_nowait(destination)
+
+  def _reschedule_after(self, destination: _Destination, delay: float) -> None:
+    asyncio.get_running_loop().call_later(delay, self._ready.put_nowait, destination)
+
   async def _queue_worker(self) -> None:
     while True:
-      try:
-        payload = await self._outbound_queue.get()
-      except asyncio.CancelledError:
-        raise
-      try:
-        if payload.kind == "channel":
-          await self.send_to_channel(payload.target_id, payload.message)
+      destination = await self._ready.get()
+      now = time.monotonic()
+      delay = max(destination.bucket.wait_time(now), self._global_bucket.wait_time(now))
+      if delay > 0:
+        self._reschedule_after(destination, delay)
+        continue
+      await self._send_next_chunk(destination)
+      if destination.pending:
+        # Back of the line, so every waiting destination gets a turn.
+        self._ready.put_nowait(destination)
+      else:
+        destination.scheduled = False
+
+  async def _send_next_chunk(self, destination: _Destination) -> None:
+    outbound = destination.pending[0]
+    try:
+      if outbound.sender is None:
+        if destination.kind == "channel":
+          outbound.sender = (await self._resolve_channel(destination.target_id)).send
         else:
-          await self.send_to_user(payload.target_id, payload.message)
-      except asyncio.CancelledError:
-        raise
-      except Exception:  # pragma: no cover - logged for observability
-        logging.exception("[DiscordOutputModule] failed to dispatch message", extra={"kind": payload.kind, "target": payload.target_id})
-      finally:
-        self._outbound_queue.task_done()
-
-  async def _deliver_in_chunks(self, sender: _SendCallable, text: str) -> None:
-    chunks = self._yield_chunks(text, self._message_size_limit)
-    async with self._send_lock:
-      for chunk in chunks:
-        await sender(chunk)
-        if self._trickle_delay > 0:
-          await asyncio.sleep(self._trickle_delay)
-
-  async def _record_channel_throughput(self, channel_id: int, message: str) -> None:
-    await self._record_stats(self._channel_stats, channel_id, message)
-
-  async def _record_user_throughput(self, user_id: int, message: str) -> None:
-    await self._record_stats(self._user_stats, user_id, message)
-
-  async def _record_stats(self, bucket: dict[int, dict[str, float | int]], identifier: int, message: str) -> None:
+          outbound.sender = (await self._resolve_user(destination.target_id)).send
+      if outbound.chunks:
+        destination.bucket.consume()
+        self._global_bucket.consume()
+        await outbound.sender(outbound.chunks[0])
+        outbound.chunks.popleft()
+    except asyncio.CancelledError:
+      raise
+    except Exception as exc:
+      retry_after = self._retry_after(exc)
+      if retry_after is not None and outbound.retries < MAX_RATE_LIMIT_RETRIES:
+        outbound.retries += 1
+        destination.bucket.defer(retry_after, time.monotonic())
+        return
+      logging.exception(
+        "[DiscordOutputModule] failed to dispatch message",
+        extra={"kind": destination.kind, "target": destination.target_id},
+      )
+      self._finish(destination, exc)
+      return
+    if not outbound.chunks:
+      latency = time.monotonic() - outbound.enqueued_at
+      stats = self._channel_stats if destination.kind == "channel" else self._user_stats
+      await self._record_stats(stats, destination.target_id, outbound.message, latency)
+      self._finish(destination, None)
+
+  def _finish(self, destination: _Destination, error: Exception | None) -> None:
+    outbound = destination.pending.popleft()
+    if outbound.future is not None and not outbound.future.done():
+      if error is None:
+        outbound.future.set_result(None)
+      else:
+        outbound.future.set_exception(error)
+    self._pending_messages -= 1
+    if not self._pending_messages:
+      self._drained.set()
+
+  @staticmethod
+  def _retry_after(exc: Exception) -> float | None:
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after is None and getattr(exc, "status", None) == 429:
+      retry_after = 1.0
+    return float(retry_after) if retry_after is not None else None
+
+  async def _record_stats(
+    self,
+    bucket: dict[int, dict[str, float | int]],
+    identifier: int,
+    message: str,
+    latency: float,
+  ) -> None:
     async with self._stats_lock:
-      stats = bucket.setdefault(identifier, {"messages": 0, "characters": 0, "last_sent_at": 0.0})
+      stats = bucket.setdefault(
+        identifier,
+        {"messages": 0, "characters": 0, "last_sent_at": 0.0, "last_latency": 0.0, "avg_latency": 0.0},
+      )
       now = time.time()
-      stats["messages"] += 1
-      stats["characters"] += len(message)
-      stats["last_sent_at"] = now
-      self._aggregate_stats["messages"] += 1
-      self._aggregate_stats["characters"] += len(message)
-      self._aggregate_stats["last_sent_at"] = now
+      for entry in (stats, self._aggregate_stats):
+        entry["messages"] += 1
+        entry["characters"] += len(message)
+        entry["last_sent_at"] = now
+        entry["last_latency"] = latency
+        entry["avg_latency"] = entry.get("avg_latency", 0.0) + (latency - entry.get("avg_latency", 0.0)) / entry["messages"]
 
   @staticmethod
   def _wrap_line(line: str, max_message_size: int) -> List[str]:
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import json
+import time
 import uuid
+from bisect import bisect_right
+from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 from typing import Any
@@ -11,11 +15,11 @@ from fastapi import FastAPI
 
 from . import BaseModule
 from .db_module import DbModule
+from queryregistry.cache import FINANCE_PERIOD_TTL_SECONDS, FINANCE_REFERENCE_TTL_SECONDS
 from queryregistry.finance.ledgers import (
   create_ledger_request,
   delete_ledger_request,
   get_ledger_by_name_request,
-  get_ledger_request,
   journal_reference_count_request,
   list_ledgers_request,
   update_ledger_request,
@@ -24,21 +28,18 @@ from queryregistry.finance.ledgers.models import (
   CreateLedgerParams,
   DeleteLedgerParams,
   GetLedgerByNameParams,
-  GetLedgerParams,
   JournalReferenceCountParams,
   ListLedgersParams,
   UpdateLedgerParams,
 )
 from queryregistry.finance.accounts import (
   delete_account_request,
-  get_account_request,
   list_account_children_request,
   list_accounts_request,
   upsert_account_request,
 )
 from queryregistry.finance.accounts.models import (
   DeleteAccountParams,
-  GetAccountParams,
   ListAccountsParams,
   ListChildrenParams,
   UpsertAccountParams,
@@ -113,37 +114,45 @@ from queryregistry.finance.journal_lines.models import (
   ListLinesByJournalParams,
 )
 from queryregistry.finance.journals import (
+  count_journals_request,
   create_journal_request,
   get_by_posting_key_request,
   get_journal_request,
   list_journals_request,
+  post_journal_request,
   update_journal_status_request,
 )
 from queryregistry.finance.journals.models import (
+  CountJournalsParams,
   CreateJournalParams,
   GetByPostingKeyParams,
   GetJournalParams,
   ListJournalsParams,
+  PostJournalParams,
   UpdateJournalStatusParams,
 )
 from queryregistry.finance.credit_lots import (
   create_event_request,
   create_lot_request,
-  consume_credits_request,
+  consume_fifo_request,
   expire_lot_request,
   get_lot_request,
+  link_events_journal_request,
   list_events_by_lot_request,
   list_lots_by_user_request,
+  list_unrecognized_consumption_request,
   sum_remaining_by_user_request,
 )
 from queryregistry.finance.credit_lots.models import (
   CreateEventParams,
   CreateLotParams,
-  ConsumeCreditsParams,
+  ConsumeFifoParams,
   ExpireLotParams,
   GetLotParams,
+  LinkEventsJournalParams,
   ListEventsByLotParams,
   ListLotsByUserParams,
+  ListUnrecognizedConsumptionParams,
   SumRemainingByUserParams,
 )
 from queryregistry.finance.credits import (
@@ -198,20 +207,27 @@ from queryregistry.finance.product_journal_config.models import (
 )
 from queryregistry.finance.reporting import (
   credit_lot_summary_request,
+  journal_summary_count_request,
   journal_summary_request,
   period_status_request,
+  rebuild_trial_balance_request,
+  reconcile_trial_balance_request,
   trial_balance_request,
 )
 from queryregistry.finance.reporting.models import (
   CreditLotSummaryParams,
+  JournalSummaryCountParams,
   JournalSummaryParams,
   PeriodStatusParams,
+  RebuildTrialBalanceParams,
+  ReconcileTrialBalanceParams,
   TrialBalanceParams,
 )
 from queryregistry.finance.staging import (
   approve_import_request,
   create_import_request,
   delete_import_request,
+  get_import_request,
   list_cost_details_by_import_request,
   list_imports_request,
   reject_import_request,
@@ -221,6 +237,7 @@ from queryregistry.finance.staging.models import (
   ApproveImportParams,
   CreateImportParams,
   DeleteImportParams,
+  GetImportParams,
   ListCostDetailsByImportParams,
   ListImportsParams,
   RejectImportParams,
@@ -250,12 +267,10 @@ from queryregistry.finance.status import get_status_code_request, list_status_co
 from queryregistry.finance.status.models import GetStatusCodeParams, ListStatusCodesParams
 from queryregistry.finance.vendors import (
   delete_vendor_request,
-  get_vendor_by_name_request,
   list_vendors_request,
   upsert_vendor_request,
 )
 from queryregistry.finance.vendors.models import (
-  GetVendorByNameParams,
   DeleteVendorParams,
   ListVendorsParams,
   UpsertVendorParams,
@@ -299,11 +314,54 @@ _FOUR_PLACES = Decimal("0.0001")
 _UPSERT_NUMBER_STRIP = frozenset({"account_name", "remaining"})
 
 
+# Writes made through this module invalidate immediately, edits from other
+# workers age out on the same schedule as the query result cache. Period status
+# guards never read the snapshot; see ``get_period``.
+_REFERENCE_TTL_SECONDS = {
+  "accounts": FINANCE_REFERENCE_TTL_SECONDS,
+  "ledgers": FINANCE_REFERENCE_TTL_SECONDS,
+  "vendors": FINANCE_REFERENCE_TTL_SECONDS,
+  "periods": FINANCE_PERIOD_TTL_SECONDS,
+}
+
+
+@dataclass(slots=True)
+class _ReferenceIndex:
+  """Indexed snapshot of one finance reference table."""
+  loaded_at: float
+  by_key: dict[str, dict[str, dict[str, Any]]]
+  ordered: list[dict[str, Any]] = field(default_factory=list)
+  sort_keys: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _NumberBlock:
+  """A reserved ``finance_numbers`` range handed out in-process."""
+  row: dict[str, Any]
+  next_value: int
+  end_value: int
+
+  @property
+  def remaining(self) -> int:
+    return self.end_value - self.next_value + 1
+
+
+@dataclass(slots=True)
+class _NumberSequenceState:
+  lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+  block: _NumberBlock | None = None
+  refill: asyncio.Task | None = None
+
+
 class FinanceModule(BaseModule):
+  dependencies = ("db",)
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.db: DbModule | None = None
     self._pipeline_config_cache: dict[tuple[str, str], str] = {}
+    self._number_sequences: dict[tuple[str, str], _NumberSequenceState] = {}
+    self._references: dict[str, _ReferenceIndex] = {}
 
   async def startup(self):
     self.db = self.app.state.db
@@ -314,6 +372,11 @@ class FinanceModule(BaseModule):
 
   async def shutdown(self):
     logging.info("[FinanceModule] shutdown")
+    for state in self._number_sequences.values():
+      if state.refill and not state.refill.done():
+        state.refill.cancel()
+    self._number_sequences = {}
+    self._references = {}
     self.db = None
     self._pipeline_config_cache = {}
 
@@ -510,6 +573,88 @@ class FinanceModule(BaseModule):
     """Quantize to 5 decimal places for storage."""
     return value.quantize(_FIVE_PLACES, rounding=ROUND_HALF_UP)
 
+  @staticmethod
+  def _reference_key(value: Any) -> str:
+    return str(value).strip().lower()
+
+  async def _load_reference(self, kind: str) -> _ReferenceIndex:
+    key = self._reference_key
+    now = time.monotonic()
+    if kind == "accounts":
+      rows = await self.list_accounts()
+      return _ReferenceIndex(
+        loaded_at=now,
+        by_key={
+          "guid": {key(row["guid"]): row for row in rows if row.get("guid")},
+          "number": {key(row["number"]): row for row in rows if row.get("number")},
+        },
+      )
+    if kind == "periods":
+      rows = sorted(
+        (row for row in await self.list_periods() if row.get("start_date") and row.get("end_date")),
+        key=lambda row: str(row["start_date"])[:10],
+      )
+      return _ReferenceIndex(
+        loaded_at=now,
+        by_key={"guid": {key(row["guid"]): row for row in rows if row.get("guid")}},
+        ordered=rows,
+        sort_keys=[str(row["start_date"])[:10] for row in rows],
+      )
+    if kind == "ledgers":
+      rows = await self.list_ledgers()
+      return _ReferenceIndex(
+        loaded_at=now,
+        by_key={
+          "recid": {key(row["recid"]): row for row in rows if row.get("recid") is not None},
+          "name": {key(row["element_name"]): row for row in rows if row.get("element_name")},
+        },
+      )
+    if kind == "vendors":
+      rows = await self.list_vendors()
+      return _ReferenceIndex(
+        loaded_at=now,
+        by_key={
+          "recid": {key(row["recid"]): row for row in rows if row.get("recid") is not None},
+          "name": {key(row["element_name"]): row for row in rows if row.get("element_name")},
+        },
+      )
+    raise ValueError(f"Unknown finance reference '{kind}'")
+
+  async def _reference(self, kind: str) -> _ReferenceIndex:
+    index = self._references.get(kind)
+    if index is None or time.monotonic() - index.loaded_at >= _REFERENCE_TTL_SECONDS[kind]:
+      index = await self._load_reference(kind)
+      self._references[kind] = index
+    return index
+
+  def _invalidate_reference(self, *kinds: str) -> None:
+    for kind in kinds:
+      self._references.pop(kind, None)
+
+  async def _lookup_reference(self, kind: str, index_name: str, value: Any) -> dict[str, Any] | None:
+    if value is None:
+      return None
+    row = (await self._reference(kind)).by_key[index_name].get(self._reference_key(value))
+    return dict(row) if row else None
+
+  async def get_account_by_number(self, number: str) -> dict[str, Any] | None:
+    return await self._lookup_reference("accounts", "number", number)
+
+  async def get_period_for_date(self, on_date: date | str) -> dict[str, Any] | None:
+    """Return the fiscal period whose start/end range covers ``on_date``."""
+    target = on_date.isoformat() if isinstance(on_date, date) else str(on_date)[:10]
+    index = await self._reference("periods")
+    position = bisect_right(index.sort_keys, target) - 1
+    if position < 0:
+      return None
+    period = index.ordered[position]
+    if str(period["end_date"])[:10] < target:
+      return None
+    return dict(period)
+
+  async def get_vendor_by_name(self, name: str) -> dict[str, Any] | None:
+    return await self._lookup_reference("vendors", "name", name)
+
   async def list_periods(self) -> list[dict[str, Any]]:
     assert self.db
     res = await self.db.run(list_periods_request(ListPeriodsParams()))
@@ -521,6 +666,11 @@ class FinanceModule(BaseModule):
     return [self._map_period(row) for row in res.rows]
 
   async def get_period(self, guid: str) -> dict[str, Any] | None:
+    """Read one period straight from the database.
+
+    Close, reopen, lock, unlock and posting guards check ``status`` through this
+    method, so it bypasses the reference snapshot and is not a cached query.
+    """
     assert self.db
     res = await self.db.run(get_period_request(GetPeriodParams(guid=guid)))
     if not res.rows:
@@ -560,6 +710,7 @@ class FinanceModule(BaseModule):
       raise ValueError(f"Cannot close period: {summary}")
 
     res = await self.db.run(close_period_request(ClosePeriodParams(guid=guid, closed_by=closed_by)))
+    self._invalidate_reference("periods")
     if not res.rows:
       raise ValueError("Period status was modified concurrently")
     return self._map_period(dict(res.rows[0]))
@@ -573,6 +724,7 @@ class FinanceModule(BaseModule):
       raise ValueError("Only closed periods can be reopened")
 
     res = await self.db.run(reopen_period_request(ReopenPeriodParams(guid=guid)))
+    self._invalidate_reference("periods")
     if not res.rows:
       raise ValueError("Period status was modified concurrently")
     return self._map_period(dict(res.rows[0]))
@@ -586,6 +738,7 @@ class FinanceModule(BaseModule):
       raise ValueError("Only closed periods can be locked")
 
     res = await self.db.run(lock_period_request(LockPeriodParams(guid=guid, locked_by=locked_by)))
+    self._invalidate_reference("periods")
     if not res.rows:
       raise ValueError("Period status was modified concurrently")
     return self._map_period(dict(res.rows[0]))
@@ -599,6 +752,7 @@ class FinanceModule(BaseModule):
       raise ValueError("Only locked periods can be unlocked")
 
     res = await self.db.run(unlock_period_request(UnlockPeriodParams(guid=guid)))
+    self._invalidate_reference("periods")
     if not res.rows:
       raise ValueError("Period status was modified concurrently")
     return self._map_period(dict(res.rows[0]))
@@ -609,12 +763,14 @@ class FinanceModule(BaseModule):
     next_data["status"] = self._validate_period_status(int(next_data.get("status", PERIOD_OPEN)))
     params = UpsertPeriodParams(**next_data)
     res = await self.db.run(upsert_period_request(params))
+    self._invalidate_reference("periods")
     row = dict(res.rows[0]) if res.rows else params.model_dump()
     return self._map_period(row)
 
   async def delete_period(self, guid: str) -> dict[str, Any]:
     assert self.db
     await self.db.run(delete_period_request(DeletePeriodParams(guid=guid)))
+    self._invalidate_reference("periods")
     return {"guid": guid}
 
   @staticmethod
@@ -642,11 +798,7 @@ class FinanceModule(BaseModule):
     return [self._map_ledger(row) for row in res.rows]
 
   async def get_ledger(self, recid: int) -> dict[str, Any] | None:
-    assert self.db
-    res = await self.db.run(get_ledger_request(GetLedgerParams(recid=recid)))
-    if not res.rows:
-      return None
-    return self._map_ledger(dict(res.rows[0]))
+    return await self._lookup_reference("ledgers", "recid", recid)
 
   async def _get_ledger_by_name(self, element_name: str) -> dict[str, Any] | None:
     assert self.db
@@ -693,6 +845,7 @@ class FinanceModule(BaseModule):
       element_status=ELEMENT_ACTIVE,
     )
     res = await self.db.run(create_ledger_request(params))
+    self._invalidate_reference("ledgers")
     if not res.rows:
       raise ValueError("Ledger create did not return a row")
     return self._map_ledger(dict(res.rows[0]))
@@ -714,6 +867,7 @@ class FinanceModule(BaseModule):
       element_status=int(data.get("element_status", existing.get("element_status") or ELEMENT_ACTIVE)),
     )
     res = await self.db.run(update_ledger_request(params))
+    self._invalidate_reference("ledgers")
     if not res.rows:
       raise ValueError("Ledger update did not return a row")
     return self._map_ledger(dict(res.rows[0]))
@@ -734,6 +888,7 @@ class FinanceModule(BaseModule):
       raise ValueError("Ledger cannot be deleted because journals already reference it")
 
     await self.db.run(delete_ledger_request(DeleteLedgerParams(recid=recid)))
+    self._invalidate_reference("ledgers")
     return {**existing, "element_status": ELEMENT_INACTIVE}
 
   async def generate_calendar(self, fiscal_year: int, start_date: str | None = None) -> list[dict[str, Any]]:
@@ -812,11 +967,7 @@ class FinanceModule(BaseModule):
     return [self._map_account(row) for row in res.rows]
 
   async def get_account(self, guid: str) -> dict[str, Any] | None:
-    assert self.db
-    res = await self.db.run(get_account_request(GetAccountParams(guid=guid)))
-    if not res.rows:
-      return None
-    return self._map_account(dict(res.rows[0]))
+    return await self._lookup_reference("accounts", "guid", guid)
 
   async def upsert_account(self, data: dict[str, Any]) -> dict[str, Any]:
     assert self.db
@@ -825,12 +976,14 @@ class FinanceModule(BaseModule):
       next_data["guid"] = str(uuid.uuid4())
     params = UpsertAccountParams(**next_data)
     res = await self.db.run(upsert_account_request(params))
+    self._invalidate_reference("accounts")
     row = dict(res.rows[0]) if res.rows else params.model_dump()
     return self._map_account(row)
 
   async def delete_account(self, guid: str) -> dict[str, Any]:
     assert self.db
     await self.db.run(delete_account_request(DeleteAccountParams(guid=guid)))
+    self._invalidate_reference("accounts")
     return {"guid": guid}
 
   async def list_account_children(self, parent_guid: str) -> list[dict[str, Any]]:
@@ -1023,17 +1176,24 @@ class FinanceModule(BaseModule):
     await self.db.run(delete_dimension_request(DeleteDimensionParams(recid=recid)))
     return {"recid": recid}
 
-  async def list_imports(self, status: int | None = None) -> list[dict[str, Any]]:
+  async def list_imports(
+    self,
+    status: int | None = None,
+    after_recid: int | None = None,
+    limit: int | None = None,
+  ) -> list[dict[str, Any]]:
     assert self.db
-    res = await self.db.run(list_imports_request(ListImportsParams(status=status)))
+    res = await self.db.run(
+      list_imports_request(ListImportsParams(status=status, after_recid=after_recid, limit=limit))
+    )
     return [dict(row) for row in res.rows]
 
   async def get_import(self, recid: int) -> dict[str, Any] | None:
-    rows = await self.list_imports()
-    for row in rows:
-      if int(row.get("recid") or 0) == recid:
-        return row
-    return None
+    assert self.db
+    res = await self.db.run(get_import_request(GetImportParams(recid=recid)))
+    if not res.rows:
+      return None
+    return dict(res.rows[0])
 
   async def list_cost_details_by_import(self, imports_recid: int) -> list[dict[str, Any]]:
     assert self.db
@@ -1121,11 +1281,48 @@ class FinanceModule(BaseModule):
     )
     return [dict(row) for row in res.rows]
 
+  async def rebuild_trial_balance(self, periods_guid: str | None = None) -> dict[str, Any]:
+    """Recompute the maintained trial balance for one period, or all of them."""
+    assert self.db
+    res = await self.db.run(
+      rebuild_trial_balance_request(RebuildTrialBalanceParams(periods_guid=periods_guid))
+    )
+    summary = dict(res.rows[0]) if res.rows else {}
+    logging.info(
+      "[FinanceModule] trial balance rebuilt for %s: %s rows",
+      periods_guid or "all periods",
+      summary.get("rows_written", 0),
+    )
+    return summary
+
+  async def reconcile_trial_balance(
+    self,
+    fiscal_year: int | None = None,
+    period_guid: str | None = None,
+  ) -> list[dict[str, Any]]:
+    """Return the period/account totals where the maintained balance and the view disagree."""
+    assert self.db
+    res = await self.db.run(
+      reconcile_trial_balance_request(
+        ReconcileTrialBalanceParams(fiscal_year=fiscal_year, period_guid=period_guid)
+      )
+    )
+    mismatches = [dict(row) for row in res.rows]
+    if mismatches:
+      logging.warning(
+        "[FinanceModule] trial balance differs from vw_finance_trial_balance for %d period/account totals",
+        len(mismatches),
+      )
+    return mismatches
+
   async def journal_summary(
     self,
     journal_status: int | None = None,
     fiscal_year: int | None = None,
     periods_guid: str | None = None,
+    after_recid: int | None = None,
+    limit: int | None = None,
+    columns: list[str] | None = None,
   ) -> list[dict[str, Any]]:
     assert self.db
     res = await self.db.run(
@@ -1134,11 +1331,33 @@ class FinanceModule(BaseModule):
           journal_status=journal_status,
           fiscal_year=fiscal_year,
           periods_guid=periods_guid,
+          after_recid=after_recid,
+          limit=limit,
+          columns=columns,
         )
       )
     )
     return [dict(row) for row in res.rows]
 
+  async def journal_summary_count(
+    self,
+    journal_status: int | None = None,
+    fiscal_year: int | None = None,
+    periods_guid: str | None = None,
+  ) -> dict[str, Any]:
+    assert self.db
+    res = await self.db.run(
+      journal_summary_count_request(
+        JournalSummaryCountParams(
+          journal_status=journal_status,
+          fiscal_year=fiscal_year,
+          periods_guid=periods_guid,
+        )
+      )
+    )
+    row = dict(res.rows[0]) if res.rows else {}
+    return {"total": int(row.get("total") or 0), "estimated": bool(row.get("estimated"))}
+
   async def period_status(self, fiscal_year: int | None = None) -> list[dict[str, Any]]:
     assert self.db
     res = await self.db.run(period_status_request(PeriodStatusParams(fiscal_year=fiscal_year)))
@@ -1176,11 +1395,13 @@ class FinanceModule(BaseModule):
     assert self.db
     params = UpsertVendorParams(**data)
     res = await self.db.run(upsert_vendor_request(params))
+    self._invalidate_reference("vendors")
     return dict(res.rows[0]) if res.rows else params.model_dump()
 
   async def delete_vendor(self, recid: int) -> dict[str, Any]:
     assert self.db
     await self.db.run(delete_vendor_request(DeleteVendorParams(recid=recid)))
+    self._invalidate_reference("vendors")
     return {"recid": recid, "deleted": True}
 
   async def create_payment_request(self, payload: dict[str, Any], requested_by: str) -> dict[str, Any]:
@@ -1189,12 +1410,10 @@ class FinanceModule(BaseModule):
     if not vendor_name:
       raise ValueError("vendor_name is required")
 
-    vendor_result = await self.db.run(
-      get_vendor_by_name_request(GetVendorByNameParams(element_name=vendor_name)),
-    )
-    if not vendor_result.rows:
+    vendor = await self.get_vendor_by_name(vendor_name)
+    if not vendor:
       raise ValueError(f"Unknown vendor: {vendor_name}")
-    vendor_recid = int(vendor_result.rows[0]["recid"])
+    vendor_recid = int(vendor["recid"])
 
     create_result = await self.db.run(
       create_import_request(
@@ -1504,11 +1723,32 @@ class FinanceModule(BaseModule):
     self,
     status: int | None = None,
     periods_guid: str | None = None,
+    after_recid: int | None = None,
+    limit: int | None = None,
   ) -> list[dict[str, Any]]:
     assert self.db
-    res = await self.db.run(list_journals_request(ListJournalsParams(status=status, periods_guid=periods_guid)))
+    res = await self.db.run(
+      list_journals_request(
+        ListJournalsParams(
+          status=status,
+          periods_guid=periods_guid,
+          after_recid=after_recid,
+          limit=limit,
+        )
+      )
+    )
     return [self._map_journal(row) for row in res.rows]
 
+  async def count_journals(
+    self,
+    status: int | None = None,
+    periods_guid: str | None = None,
+  ) -> dict[str, Any]:
+    assert self.db
+    res = await self.db.run(count_journals_request(CountJournalsParams(status=status, periods_guid=periods_guid)))
+    row = dict(res.rows[0]) if res.rows else {}
+    return {"total": int(row.get("total") or 0), "estimated": bool(row.get("estimated"))}
+
   async def get_journal(self, recid: int) -> dict[str, Any] | None:
     assert self.db
     res = await self.db.run(get_journal_request(GetJournalParams(recid=recid)))
@@ -1526,8 +1766,8 @@ class FinanceModule(BaseModule):
     await self.db.run(delete_lines_by_journal_request(DeleteLinesByJournalParams(journals_recid=journals_recid)))
     return {"journals_recid": journals_recid}
 
-  async def _next_formatted_number(self, prefix: str, scope: str) -> tuple[str, int]:
-    """Get the next sequence value by scope and return the formatted identifier."""
+  async def _reserve_number_block(self, prefix: str, scope: str) -> _NumberBlock:
+    """Reserve the next ``element_allocation_size`` numbers, rolling over if exhausted."""
     assert self.db
     next_res = await self.db.run(
       next_number_by_scope_request(NextNumberByScopeParams(prefix=prefix, scope=scope))
@@ -1547,7 +1787,41 @@ class FinanceModule(BaseModule):
         raise ValueError(f"Number sequence rollover failed: prefix={prefix} scope={scope}")
       result = dict(retry_res.rows[0])
 
-    next_val = int(result.get("element_block_start", result.get("element_last_number", 0)))
+    start = int(result.get("element_block_start", result.get("element_last_number", 0)))
+    end = int(result.get("element_block_end", start) or start)
+    return _NumberBlock(row=result, next_value=start, end_value=max(end, start))
+
+  async def _next_formatted_number(self, prefix: str, scope: str) -> tuple[str, int]:
+    """Hand out the next number for a scope from the in-process reserved block.
+
+    Each reservation claims ``element_allocation_size`` numbers in one
+    round trip. Once half of the current block is used, the next block is
+    reserved in the background so callers rarely wait on the sequence row.
+    Numbers left in a block when the process exits are skipped.
+    """
+    state = self._number_sequences.setdefault((prefix, scope), _NumberSequenceState())
+
+    async with state.lock:
+      block = state.block
+      if block is None or block.remaining <= 0:
+        block = None
+        if state.refill is not None:
+          refill, state.refill = state.refill, None
+          try:
+            block = await refill
+          except Exception:
+            logging.exception("[FinanceModule] Background number reservation failed for %s/%s", prefix, scope)
+        if block is None:
+          block = await self._reserve_number_block(prefix, scope)
+        state.block = block
+
+      next_val = block.next_value
+      block.next_value += 1
+      size = int(block.row.get("element_allocation_size") or 1)
+      if size > 1 and state.refill is None and block.remaining <= size // 2:
+        state.refill = asyncio.create_task(self._reserve_number_block(prefix, scope))
+
+    result = block.row
     pattern = result.get("element_pattern") or result.get("element_display_format")
     series = int(result.get("element_series_number", 1) or 1)
 
@@ -1681,6 +1955,9 @@ class FinanceModule(BaseModule):
       ledgers_recid=ledgers_recid,
       lines=lines,
     )
+    if created.get("status") == JOURNAL_POSTED:
+      # A retried posting key returns the journal an earlier attempt already posted.
+      return created
     return await self.post_journal(int(created["recid"]), posted_by=posted_by)
 
   async def submit_journal_for_approval(
@@ -1722,15 +1999,16 @@ class FinanceModule(BaseModule):
     await self._validate_balanced_journal_lines(lines)
 
     res = await self.db.run(
-      update_journal_status_request(
-        UpdateJournalStatusParams(
+      post_journal_request(
+        PostJournalParams(
           recid=recid,
-          status=JOURNAL_POSTED,
           posted_by=posted_by,
           posted_on=datetime.now(timezone.utc).isoformat(),
         )
       )
     )
+    if not res.rows:
+      raise ValueError("Journal was posted or changed by another request")
     return self._map_journal(dict(res.rows[0]))
 
   async def approve_journal(
@@ -1811,6 +2089,8 @@ class FinanceModule(BaseModule):
       posted_by=posted_by or "SYSTEM",
     )
 
+    # The reversal's lines reached finance_trial_balances when it was posted;
+    # the status updates below only link the two journals.
     reversal_recid = int(reversal["recid"])
     await self.db.run(
       update_journal_status_request(
@@ -1859,11 +2139,10 @@ class FinanceModule(BaseModule):
 
   async def _get_account_guid_by_number(self, account_number: str) -> str:
     """Look up an account GUID by its account number."""
-    accounts = await self.list_accounts()
-    for acct in accounts:
-      if acct["number"] == account_number:
-        return acct["guid"]
-    raise ValueError(f"Account {account_number} not found")
+    account = await self.get_account_by_number(account_number)
+    if not account:
+      raise ValueError(f"Account {account_number} not found")
+    return account["guid"]
 
   async def _sync_wallet(self, users_guid: str) -> None:
     """Sync the users_credits wallet balance from lot totals."""
@@ -1881,16 +2160,10 @@ class FinanceModule(BaseModule):
     }
 
   async def _get_current_open_period_guid(self) -> str:
-    today = date.today().isoformat()
-    periods = await self.list_periods()
-    for period in periods:
-      if int(period.get("status") or ELEMENT_INACTIVE) != PERIOD_OPEN:
-        continue
-      start_date = str(period.get("start_date") or "")
-      end_date = str(period.get("end_date") or "")
-      if start_date and end_date and start_date <= today <= end_date:
-        return str(period["guid"])
-    raise ValueError("No open accounting period covers today's date")
+    period = await self.get_period_for_date(date.today())
+    if not period or int(period.get("status") or ELEMENT_INACTIVE) != PERIOD_OPEN:
+      raise ValueError("No open accounting period covers today's date")
+    return str(period["guid"])
 
   async def _append_balanced_journal_lines(
     self,
@@ -2117,6 +2390,119 @@ class FinanceModule(BaseModule):
     await self._sync_wallet(str(expired["users_guid"]))
     return expired
 
+  async def recognize_consumed_revenue(
+    self,
+    *,
+    before: str | None = None,
+    limit: int = 1000,
+  ) -> dict[str, Any]:
+    """Post aggregated revenue journals for unrecognized purchase consumption.
+
+    Consume events on purchase lots created before ``before`` (floored to the
+    hour; default: the start of the current UTC hour, so only closed hours
+    are recognized) are grouped per user per hour, up to ``limit`` groups per
+    run. Each group gets one deferred-to-recognized revenue journal in the
+    period covering that hour, and its events are linked to it through
+    ``journals_recid``. The journal's posting key is derived from the user
+    and hour, so a run interrupted between posting and linking reuses the
+    posted journal instead of posting the revenue again.
+    """
+    assert self.db
+    cutoff = datetime.now(timezone.utc) if before is None else datetime.fromisoformat(before)
+    if cutoff.tzinfo is None:
+      cutoff = cutoff.replace(tzinfo=timezone.utc)
+    before = cutoff.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0).isoformat()
+
+    res = await self.db.run(
+      list_unrecognized_consumption_request(ListUnrecognizedConsumptionParams(before=before, limit=limit))
+    )
+    groups: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for row in res.rows:
+      hour = str(row.get("element_hour") or str(row.get("element_created_on") or "")[:13])
+      groups.setdefault((str(row["users_guid"]), hour.replace(" ", "T")), []).append(dict(row))
+
+    summary = {"journals_created": 0, "events_recognized": 0, "groups_skipped": 0, "revenue": "0.00000"}
+    if not groups:
+      return summary
+
+    deferred_revenue_account = await self.get_pipeline_config(
+      "credit_consumption",
+      "deferred_revenue_account_number",
+    )
+    recognized_revenue_account = await self.get_pipeline_config(
+      "credit_consumption",
+      "revenue_account_number",
+    )
+    deferred_revenue_guid = await self._get_account_guid_by_number(deferred_revenue_account)
+    recognized_revenue_guid = await self._get_account_guid_by_number(recognized_revenue_account)
+
+    total_revenue = Decimal("0")
+    for (users_guid, hour), events in groups.items():
+      amount = Decimal("0")
+      credits = 0
+      for event in events:
+        credits += int(event.get("element_credits") or 0)
+        amount += self._quantize_5dp(
+          Decimal(int(event.get("element_credits") or 0)) * self._to_decimal(event.get("element_unit_price", "0"))
+        )
+      if amount <= Decimal("0"):
+        continue
+      period = await self.get_period_for_date(hour[:10])
+      if not period:
+        logging.warning("[FinanceModule] no period covers %s; consumption for %s left unrecognized", hour, users_guid)
+        summary["groups_skipped"] += 1
+        continue
+      hour_key = hour[:10].replace("-", "") + hour[11:13]
+      description = f"Credit consumption {hour.replace('T', ' ')}:00 UTC ({credits} credits, {len(events)} events)"
+      try:
+        journal = await self.create_and_post_system_journal(
+          name=f"REV-{users_guid[:8]}-{hour_key}",
+          description=description,
+          posting_key=f"REV-CONSUME-{users_guid}-{hour_key}",
+          source_type="credit_consumption",
+          source_id=users_guid,
+          periods_guid=str(period["guid"]),
+          lines=[
+            {
+              "line_number": 1,
+              "accounts_guid": deferred_revenue_guid,
+              "debit": str(amount),
+              "credit": "0",
+              "description": description,
+            },
+            {
+              "line_number": 2,
+              "accounts_guid": recognized_revenue_guid,
+              "debit": "0",
+              "credit": str(amount),
+              "description": description,
+            },
+          ],
+        )
+      except ValueError:
+        logging.warning(
+          "[FinanceModule] revenue journal for %s at %s not posted; retrying next run",
+          users_guid,
+          hour,
+          exc_info=True,
+        )
+        summary["groups_skipped"] += 1
+        continue
+      await self.db.run(
+        link_events_journal_request(
+          LinkEventsJournalParams(
+            events_recids=[int(event["recid"]) for event in events],
+            journals_recid=int(journal["recid"]),
+          )
+        )
+      )
+      summary["journals_created"] += 1
+      summary["events_recognized"] += len(events)
+      total_revenue += amount
+
+    summary["revenue"] = str(self._quantize_5dp(total_revenue))
+    return summary
+
   async def consume_credits(
     self,
     *,
@@ -2125,99 +2511,47 @@ class FinanceModule(BaseModule):
     service_type: str | None = None,
     description: str | None = None,
     actor_guid: str | None = None,
-    periods_guid: str | None = None,
   ) -> dict[str, Any]:
+    """Consume credits FIFO across the user's lots.
+
+    Revenue for purchased credits is not journaled here; the hourly
+    ``server.jobs.revenue_recognition`` batch job aggregates the Consume
+    events into one journal per user per hour and back-links them.
+    """
     assert self.db
 
     if credits_needed <= 0:
       raise ValueError("credits_needed must be greater than zero")
 
-    lots_res = await self.db.run(list_lots_by_user_request(ListLotsByUserParams(users_guid=users_guid)))
-    lots = [self._map_lot(row) for row in lots_res.rows]
-
-    remaining_need = credits_needed
-    consumed_lots: list[tuple[dict[str, Any], int]] = []
-    for lot in lots:
-      if remaining_need <= 0:
-        break
-      available = int(lot.get("credits_remaining") or 0)
-      if available <= 0:
-        continue
-      take = min(available, remaining_need)
-      consume_res = await self.db.run(
-        consume_credits_request(ConsumeCreditsParams(recid=int(lot["recid"]), credits_to_consume=take))
-      )
-      if consume_res.rowcount == 0:
-        continue
-      consumed_lots.append((lot, take))
-      remaining_need -= take
-
-    if remaining_need > 0:
-      available = credits_needed - remaining_need
-      raise ValueError(f"Insufficient credits: needed {credits_needed}, available {available}")
-
-    recognized_revenue = Decimal("0")
-    for lot, take in consumed_lots:
-      if lot.get("source_type") == "purchase":
-        recognized_revenue += self._quantize_5dp(Decimal(take) * self._to_decimal(lot.get("unit_price", "0")))
-
-    journal: dict[str, Any] | None = None
-    if recognized_revenue > Decimal("0"):
-      deferred_revenue_account = await self.get_pipeline_config(
-        "credit_consumption",
-        "deferred_revenue_account_number",
-      )
-      recognized_revenue_account = await self.get_pipeline_config(
-        "credit_consumption",
-        "revenue_account_number",
-      )
-      deferred_revenue_guid = await self._get_account_guid_by_number(deferred_revenue_account)
-      recognized_revenue_guid = await self._get_account_guid_by_number(recognized_revenue_account)
-      journal = await self.create_and_post_system_journal(
-        name=f"REV-{users_guid[:8]}-{credits_needed}",
-        source_type="credit_consumption",
-        source_id=users_guid,
-        periods_guid=periods_guid,
-        lines=[
-          {
-            "line_number": 1,
-            "accounts_guid": deferred_revenue_guid,
-            "debit": str(recognized_revenue),
-            "credit": "0",
-            "description": description or service_type,
-          },
-          {
-            "line_number": 2,
-            "accounts_guid": recognized_revenue_guid,
-            "debit": "0",
-            "credit": str(recognized_revenue),
-            "description": description or service_type,
-          },
-        ],
-        posted_by=actor_guid or "SYSTEM",
-      )
-
-    for lot, take in consumed_lots:
-      event_journal_recid = None
-      if journal and lot.get("source_type") == "purchase":
-        event_journal_recid = int(journal["recid"])
-      await self.db.run(
-        create_event_request(
-          CreateEventParams(
-            lots_recid=int(lot["recid"]),
-            event_type="Consume",
-            credits=take,
-            unit_price=str(lot.get("unit_price") or "0"),
-            description=description or service_type,
-            actor_guid=actor_guid,
-            journals_recid=event_journal_recid,
-          )
+    res = await self.db.run(
+      consume_fifo_request(
+        ConsumeFifoParams(
+          users_guid=users_guid,
+          credits_needed=credits_needed,
+          description=description or service_type,
+          actor_guid=actor_guid,
         )
       )
+    )
+    outcome = res.rows[0] if res.rows else {}
+    if not outcome.get("success"):
+      available = int(outcome.get("credits_available") or 0)
+      raise ValueError(f"Insufficient credits: needed {credits_needed}, available {available}")
+    consumed_lots = list(outcome.get("lots") or [])
 
-    await self._sync_wallet(users_guid)
     return {
       "credits_consumed": credits_needed,
       "lots_affected": len(consumed_lots),
-      "journal_recid": int(journal["recid"]) if journal else None,
+      "journal_recid": None,
+      "wallet_balance": int(outcome.get("wallet_balance") or 0),
+      "lots": [
+        {
+          "lots_recid": int(lot["lots_recid"]),
+          "events_recid": int(lot["events_recid"]) if lot.get("events_recid") is not None else None,
+          "source_type": lot.get("source_type"),
+          "unit_price": str(lot.get("unit_price") or "0"),
+          "credits": int(lot["credits"]),
+        }
+        for lot in consumed_lots
+      ],
     }
@@ -0,0 +1,143 @@
+"""Database-lease leader election for singleton duties."""
+
+from __future__ import annotations
+
+import asyncio, logging, os, socket, time
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from fastapi import FastAPI
+
+from queryregistry.system.leases import acquire_lease_request, release_lease_request
+from queryregistry.system.leases.models import AcquireLeaseParams, ReleaseLeaseParams
+
+from . import BaseModule
+from .db_module import DbModule
+from .system_config_module import SystemConfigModule
+
+LEASE_NAME = "singleton"
+DEFAULT_LEASE_SECONDS = 30
+
+LeadershipListener = Callable[[bool], Awaitable[None]]
+
+
+def _worker_count() -> int:
+  try:
+    return max(int(os.environ.get("WEB_CONCURRENCY", "1")), 1)
+  except ValueError:
+    return 1
+
+
+class LeaderModule(BaseModule):
+  """Elects one worker process to run singleton duties.
+
+  Every worker renews a shared row in ``system_leases``; whichever process
+  holds it is the leader and runs the Discord bot connection, async task
+  ticks and the batch job scheduler. When the leader stops renewing, the
+  lease expires and another worker takes over. Listeners registered with
+  ``add_listener`` are told when this process gains or loses leadership.
+
+  A single worker (``WEB_CONCURRENCY`` of 1) leads without a lease. With more
+  workers nobody leads until the lease is granted; a lease that cannot be read
+  is retried on every renewal interval.
+  """
+  dependencies = ("db", "system_config")
+
+  def __init__(self, app: FastAPI):
+    super().__init__(app)
+    self.db: DbModule | None = None
+    self.system_config: SystemConfigModule | None = None
+    self.holder_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+    self.lease_seconds: int = DEFAULT_LEASE_SECONDS
+    self.mode = "lease"
+    self._is_leader = False
+    self._valid_until = 0.0
+    self._listeners: list[LeadershipListener] = []
+    self._task: asyncio.Task | None = None
+
+  async def startup(self):
+    self.db = self.app.state.db
+    await self.db.on_ready()
+    self.system_config = self.app.state.system_config
+    await self.system_config.on_ready()
+    self.lease_seconds = max(self.system_config.get_int("LeaderLeaseSeconds", DEFAULT_LEASE_SECONDS), 3)
+    if _worker_count() <= 1:
+      self.mode = "single"
+      await self._set_leader(True)
+    else:
+      try:
+        await self._acquire()
+      except Exception:
+        logging.error(
+          "[LeaderModule] leader lease unavailable at startup (is migration v0.11.1.0 applied?); retrying",
+          exc_info=True,
+        )
+      self._task = asyncio.create_task(self._renew_loop())
+    logging.info("[LeaderModule] %s started (mode=%s, leader=%s)", self.holder_id, self.mode, self._is_leader)
+    self.mark_ready()
+
+  async def shutdown(self):
+    if self._task:
+      self._task.cancel()
+      try:
+        await self._task
+      except asyncio.CancelledError:
+        pass
+      self._task = None
+    if self._is_leader and self.mode == "lease" and self.db:
+      try:
+        await self.db.run(release_lease_request(ReleaseLeaseParams(name=LEASE_NAME, holder=self.holder_id)))
+      except Exception:
+        logging.exception("[LeaderModule] Failed to release lease")
+    await self._set_leader(False)
+    self._listeners.clear()
+    self.db = None
+
+  @property
+  def is_leader(self) -> bool:
+    return self._is_leader
+
+  def add_listener(self, listener: LeadershipListener):
+    self._listeners.append(listener)
+
+  async def renew(self) -> bool:
+    """Acquire or extend the lease; return whether this process is leader."""
+    try:
+      return await self._acquire()
+    except Exception:
+      logging.exception("[LeaderModule] Lease renewal failed")
+      # Keep leadership only while the last granted lease is still valid.
+      await self._set_leader(self._is_leader and time.monotonic() < self._valid_until)
+      return self._is_leader
+
+  async def _acquire(self) -> bool:
+    started = time.monotonic()
+    res = await self.db.run(acquire_lease_request(AcquireLeaseParams(
+      name=LEASE_NAME,
+      holder=self.holder_id,
+      ttl_seconds=self.lease_seconds,
+    )))
+    row = res.rows[0] if res.rows else {}
+    held = row.get("element_holder") == self.holder_id
+    if held:
+      # Measured from before the request so a slow round trip never overstates the lease.
+      self._valid_until = started + self.lease_seconds
+    await self._set_leader(held)
+    return held
+
+  async def _set_leader(self, value: bool):
+    if value == self._is_leader:
+      return
+    self._is_leader = value
+    logging.info("[LeaderModule] %s %s leadership", self.holder_id, "acquired" if value else "lost")
+    for listener in list(self._listeners):
+      try:
+        await listener(value)
+      except Exception:
+        logging.exception("[LeaderModule] Leadership listener failed")
+
+  async def _renew_loop(self):
+    interval = self.lease_seconds / 3
+    while True:
+      await asyncio.sleep(interval)
+      await self.renew()
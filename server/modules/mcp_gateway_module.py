@@ -40,14 +40,13 @@ from queryregistry.identity.mcp_agents.models import (
   UserGuidParams,
 )
 from queryregistry.models import DBRequest
-from queryregistry.system.config import get_config_request, upsert_config_request
-from queryregistry.system.config.models import ConfigKeyParams, UpsertConfigParams
 
 from . import BaseModule
 from .auth_module import AuthModule
 from .db_module import DbModule
 from .discord_bot_module import DiscordBotModule
 from .oauth_module import OauthModule
+from .system_config_module import SystemConfigModule
 
 
 def _coerce_datetime(value) -> datetime | None:
@@ -95,6 +94,9 @@ class SlidingWindowRateLimiter:
 
 
 class McpGatewayModule(BaseModule):
+  dependencies = ("db", "system_config", "auth", "oauth")
+  optional_dependencies = ("discord_bot",)
+
   ROLE_MCP_ACCESS_MASK = 32
 
   def __init__(self, app: FastAPI):
@@ -111,6 +113,8 @@ class McpGatewayModule(BaseModule):
   async def startup(self):
     self.db: DbModule = self.app.state.db
     await self.db.on_ready()
+    self.system_config: SystemConfigModule = self.app.state.system_config
+    await self.system_config.on_ready()
     self.auth: AuthModule = self.app.state.auth
     await self.auth.on_ready()
     self.oauth: OauthModule = self.app.state.oauth
@@ -119,6 +123,7 @@ class McpGatewayModule(BaseModule):
     if self.discord:
       await self.discord.on_ready()
     await self.refresh_runtime_config()
+    self.system_config.add_listener(self._on_config_changed)
     self.mark_ready()
 
   async def shutdown(self):
@@ -143,11 +148,12 @@ class McpGatewayModule(BaseModule):
     self.token_ip_limit = await self._get_config_int("MCP_RATE_LIMIT_TOKEN_IP", fallback=60)
     self.token_global_limit = await self._get_config_int("MCP_RATE_LIMIT_TOKEN_GLOBAL", fallback=500)
 
+  async def _on_config_changed(self, changed: set[str]):
+    if "Hostname" in changed or any(key.startswith("MCP_") for key in changed):
+      await self.refresh_runtime_config()
+
   async def _get_config_value(self, key: str, *, fallback: str = "") -> str:
-    res = await self.db.run(get_config_request(ConfigKeyParams(key=key)))
-    if not res.rows:
-      return fallback
-    value = res.rows[0].get("element_value")
+    value = self.system_config.get_value(key)
     return str(value) if value is not None else fallback
 
   async def _get_config_int(self, key: str, *, fallback: int) -> int:
@@ -167,7 +173,7 @@ class McpGatewayModule(BaseModule):
 
   async def _set_dcr_enabled(self, enabled: bool):
     value = "true" if enabled else "false"
-    await self.db.run(upsert_config_request(UpsertConfigParams(key="MCP_DCR_ENABLED", value=value)))
+    await self.system_config.set_value("MCP_DCR_ENABLED", value)
     self.dcr_enabled = enabled
 
   async def check_register_rate(self, ip: str) -> bool:
@@ -4,8 +4,6 @@ from typing import Any
 
 from fastapi import FastAPI
 
-from queryregistry.system.config import get_config_request
-from queryregistry.system.config.models import ConfigKeyParams
 from queryregistry.system.personas import (
   delete_model_request,
   list_models_request,
@@ -15,21 +13,28 @@ from queryregistry.system.personas.models import DeleteModelParams, UpsertModelP
 
 from . import BaseModule
 from .db_module import DbModule
+from .system_config_module import SystemConfigModule
 
 
 class ModelsRegistryModule(BaseModule):
+  dependencies = ("db", "system_config")
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.db: DbModule | None = None
+    self.system_config: SystemConfigModule | None = None
 
   async def startup(self):
     self.db = self.app.state.db
     await self.db.on_ready()
+    self.system_config = self.app.state.system_config
+    await self.system_config.on_ready()
     self.app.state.models_registry = self
     self.mark_ready()
 
   async def shutdown(self):
     self.db = None
+    self.system_config = None
 
   async def list_models_registry(self) -> list[dict[str, Any]]:
     assert self.db
@@ -40,16 +45,22 @@ class ModelsRegistryModule(BaseModule):
     assert self.db
     params = UpsertModelParams(**payload)
     await self.db.run(upsert_model_request(params))
+    self._invalidate_persona_registry()
     return params.model_dump()
 
   async def delete_model_registry(self, recid: int | None = None, name: str | None = None) -> dict[str, Any]:
     assert self.db
     params = DeleteModelParams(recid=recid, name=name)
     await self.db.run(delete_model_request(params))
+    self._invalidate_persona_registry()
     return params.model_dump()
 
+  def _invalidate_persona_registry(self) -> None:
+    openai = getattr(self.app.state, "openai", None)
+    if openai is not None:
+      openai.invalidate_registry()
+
   async def get_api_providers(self) -> list[str]:
-    assert self.db
-    res = await self.db.run(get_config_request(ConfigKeyParams(key="ApiProviders")))
-    value = res.rows[0]["element_value"] if res.rows else "openai,lumalabs"
+    assert self.system_config
+    value = self.system_config.get_value("ApiProviders", "openai,lumalabs")
     return [p.strip() for p in str(value).split(",") if p.strip()]
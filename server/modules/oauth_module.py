@@ -21,7 +21,6 @@ from queryregistry.identity.sessions.models import (
   UpdateDeviceTokenParams,
 )
 from queryregistry.models import DBRequest as QueryDBRequest, DBResponse as QueryDBResponse
-from queryregistry.system.config.models import ConfigKeyParams
 from . import BaseModule
 
 from server.modules.auth_module import AuthModule
@@ -31,6 +30,7 @@ except Exception:
   DEFAULT_SESSION_TOKEN_EXPIRY = 15
 from server.modules.db_module import DbModule
 from server.modules.discord_bot_module import DiscordBotModule
+from server.modules.system_config_module import SystemConfigModule
 from queryregistry.identity.auth import (
   create_from_provider_request,
   get_any_by_provider_identifier_request,
@@ -49,10 +49,12 @@ from queryregistry.identity.sessions import (
 )
 from queryregistry.finance.credits import set_credits_request
 from queryregistry.finance.credits.models import SetCreditsParams
-from queryregistry.system.config import get_config_request
 
 
 class OauthModule(BaseModule):
+  dependencies = ("auth", "db", "system_config", "env")
+  optional_dependencies = ("discord_bot",)
+
   TOKEN_ENDPOINTS = {
     "google": "https://oauth2.googleapis.com/token",
     "microsoft": "https://login.microsoftonline.com/consumers/oauth2/v2.0/token",
@@ -63,13 +65,15 @@ class OauthModule(BaseModule):
     super().__init__(app)
     self.discord: DiscordBotModule | None = None
     self.env = None
-    self._redirect_uri: str | None = None
+    self.system_config: SystemConfigModule | None = None
 
   async def startup(self):
     self.auth: AuthModule = self.app.state.auth
     await self.auth.on_ready()
     self.db: DbModule = self.app.state.db
     await self.db.on_ready()
+    self.system_config = self.app.state.system_config
+    await self.system_config.on_ready()
     self.env = getattr(self.app.state, "env", None)
     if self.env:
       await self.env.on_ready()
@@ -110,16 +114,13 @@ class OauthModule(BaseModule):
     }.get(provider)
 
   async def _get_redirect_uri(self, provider: str) -> str:
-    if self._redirect_uri:
-      return self._redirect_uri
-    res = await self.db.run(get_config_request(ConfigKeyParams(key="RedirectUri")))
-    if not res.rows:
+    redirect_uri = self.system_config.get_value("RedirectUri")
+    if redirect_uri is None:
       raise HTTPException(
         status_code=500,
         detail=f"{self._provider_title(provider)} OAuth redirect URI not configured",
       )
-    self._redirect_uri = res.rows[0]["element_value"]
-    return self._redirect_uri
+    return redirect_uri
 
   def _get_provider_client_id(self, provider: str) -> str:
     providers = getattr(self.auth, "providers", {})
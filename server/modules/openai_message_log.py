@@ -0,0 +1,99 @@
+"""Write-behind buffer for conversation message rows."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class MessageLogBuffer(Generic[T]):
+  """Collects rows and hands them to ``write`` in batches.
+
+  A flush runs once ``max_batch`` rows are pending or ``flush_interval``
+  seconds after the first pending row, whichever comes first; ``close``
+  flushes whatever is left. Rows from a failed write stay queued for the
+  next flush, up to ``max_pending`` rows, beyond which the oldest are dropped.
+  """
+
+  def __init__(
+    self,
+    write: Callable[[list[T]], Awaitable[object]],
+    *,
+    max_batch: int = 50,
+    flush_interval: float = 1.0,
+    max_pending: int = 5000,
+  ):
+    self.write = write
+    self.max_batch = max(1, max_batch)
+    self.flush_interval = flush_interval
+    self.max_pending = max(self.max_batch, max_pending)
+    self.written = 0
+    self.batches = 0
+    self.dropped = 0
+    self._pending: list[T] = []
+    self._lock = asyncio.Lock()
+    self._timer: asyncio.TimerHandle | None = None
+    self._tasks: set[asyncio.Task] = set()
+
+  @property
+  def pending(self) -> int:
+    return len(self._pending)
+
+  def add(self, row: T) -> None:
+    self._pending.append(row)
+    if len(self._pending) > self.max_pending:
+      overflow = len(self._pending) - self.max_pending
+      del self._pending[:overflow]
+      self.dropped += overflow
+      logging.warning("[MessageLogBuffer] dropped %d unwritten rows", overflow)
+    if len(self._pending) >= self.max_batch:
+      self._spawn_flush()
+    elif self._timer is None:
+      self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self._spawn_flush)
+
+  async def flush(self) -> None:
+    async with self._lock:
+      self._cancel_timer()
+      if not self._pending:
+        return
+      batch, self._pending = self._pending, []
+      try:
+        await self.write(batch)
+      except Exception:
+        logging.exception("[MessageLogBuffer] write of %d rows failed", len(batch))
+        self._pending[:0] = batch
+        if self._timer is None:
+          self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self._spawn_flush)
+        return
+      self.written += len(batch)
+      self.batches += 1
+
+  async def close(self) -> None:
+    self._cancel_timer()
+    if self._tasks:
+      await asyncio.gather(*self._tasks, return_exceptions=True)
+    await self.flush()
+    self._cancel_timer()
+
+  def stats(self) -> dict[str, int]:
+    return {
+      "pending": len(self._pending),
+      "written": self.written,
+      "batches": self.batches,
+      "dropped": self.dropped,
+    }
+
+  def _spawn_flush(self) -> None:
+    self._cancel_timer()
+    task = asyncio.get_running_loop().create_task(self.flush())
+    self._tasks.add(task)
+    task.add_done_callback(self._tasks.discard)
+
+  def _cancel_timer(self) -> None:
+    if self._timer is not None:
+      self._timer.cancel()
+      self._timer = None
@@ -2,23 +2,28 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from datetime import datetime, timedelta, timezone
-from typing import TYPE_CHECKING, Any, Dict, List
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List
 from fastapi import FastAPI
-from openai import AsyncOpenAI
 from . import BaseModule
 from .db_module import DbModule
 from .discord_bot_module import DiscordBotModule
-from queryregistry.system.config import get_config_request
-from queryregistry.system.config.models import ConfigKeyParams
+from .system_config_module import SystemConfigModule
+from server.helpers.tokens import count_tokens_async, count_tokens_batch_async
+from .openai_message_log import MessageLogBuffer
+from .openai_response_cache import ResponseCache
+from .openai_scheduler import PRIORITY_BULK, PRIORITY_INTERACTIVE, OpenaiRequestScheduler
+from queryregistry.cache import PERSONA_TTL_SECONDS
 from queryregistry.system.conversations import (
-  insert_message_request,
+  insert_messages_request,
   list_by_time_request,
   list_channel_messages_request,
   list_thread_request,
 )
 from queryregistry.system.conversations.models import (
   InsertMessageParams,
+  InsertMessagesParams,
   ListByTimeParams,
   ListChannelMessagesParams,
   ListThreadParams,
@@ -37,62 +42,71 @@ from queryregistry.system.personas.models import (
 )
 
 if TYPE_CHECKING:  # pragma: no cover
+  from openai import AsyncOpenAI
   from .discord_output_module import DiscordOutputModule
 
 
-class SummaryQueue:
-  def __init__(self, delay=15):
-    self.queue = asyncio.Queue()
-    self._lock = asyncio.Lock()
-    self.delay = delay
-    self.processing = False
-    self._processing_task: asyncio.Task | None = None
-
-  async def add(self, func, *args, **kwargs):
-    loop = asyncio.get_event_loop()
-    future = loop.create_future()
-    async with self._lock:
-      await self.queue.put((func, args, kwargs, future))
-      if not self.processing:
-        self.processing = True
-        self._processing_task = loop.create_task(self._process_queue())
-    return await future
-
-  async def _process_queue(self):
-    loop = asyncio.get_running_loop()
-    try:
-      while True:
-        func, args, kwargs, future = await self.queue.get()
-        try:
-          result = await func(*args, **kwargs)
-          if not future.done():
-            future.set_result(result)
-        except Exception as e:
-          if not future.done():
-            future.set_exception(e)
-        await asyncio.sleep(self.delay)
-    except asyncio.CancelledError:
-      raise
-    finally:
-      async with self._lock:
-        self.processing = False
-        self._processing_task = None
-        if not self.queue.empty():
-          self.processing = True
-          self._processing_task = loop.create_task(self._process_queue())
+EMBEDDING_MODEL = "text-embedding-3-small"
+_RESPONSE_CACHE_KEYS = {"OpenAIResponseCacheSeconds", "OpenAIResponseCacheSimilarity"}
+_MESSAGE_LOG_KEYS = {"OpenAIMessageLogBatchSize", "OpenAIMessageLogFlushMs"}
+
+
+class _PersonaRegistry:
+  """Persona and model rows indexed by name and recid."""
+
+  __slots__ = ("loaded_at", "personas_by_name", "personas_by_recid", "models_by_name", "models_by_recid")
+
+  def __init__(self, personas: List[Dict[str, Any]], models: List[Dict[str, Any]]):
+    self.loaded_at = time.monotonic()
+    self.personas_by_name: Dict[str, Dict[str, Any]] = {}
+    self.personas_by_recid: Dict[int, Dict[str, Any]] = {}
+    self.models_by_name: Dict[str, Dict[str, Any]] = {}
+    self.models_by_recid: Dict[int, Dict[str, Any]] = {}
+    for row in personas:
+      self.add_persona(row)
+    for row in models:
+      if row.get("element_name"):
+        self.models_by_name[row["element_name"]] = row
+      if row.get("recid") is not None:
+        self.models_by_recid[int(row["recid"])] = row
+
+  def expired(self) -> bool:
+    return time.monotonic() - self.loaded_at >= PERSONA_TTL_SECONDS
+
+  def add_persona(self, row: Dict[str, Any]) -> None:
+    name = row.get("name") or row.get("persona_name")
+    if name:
+      self.personas_by_name[name] = row
+    if row.get("recid") is not None:
+      self.personas_by_recid[int(row["recid"])] = row
+
 
 class OpenaiModule(BaseModule):
+  dependencies = ("db", "system_config")
+  optional_dependencies = ("discord_bot", "discord_output")
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.db: DbModule | None = None
+    self.system_config: SystemConfigModule | None = None
     self.client: AsyncOpenAI | None = None
-    self.summary_queue = SummaryQueue()
+    self.scheduler = OpenaiRequestScheduler()
+    self._registry: _PersonaRegistry | None = None
+    self._registry_version = 0
+    self._registry_lock = asyncio.Lock()
+    self.response_cache: ResponseCache | None = None
+    self.message_log: MessageLogBuffer[InsertMessageParams] = MessageLogBuffer(self._write_messages)
     self.discord: DiscordBotModule | None = None
     self.discord_output: "DiscordOutputModule" | None = None
 
   async def startup(self):
     self.db = self.app.state.db
     await self.db.on_ready()
+    self.system_config = self.app.state.system_config
+    await self.system_config.on_ready()
+    self.scheduler = OpenaiRequestScheduler(
+      max_concurrency=self.system_config.get_int("OpenAIMaxConcurrency", 8),
+    )
     self.discord = getattr(self.app.state, "discord_bot", None) or getattr(self.app.state, "discord_bot", None)
     if self.discord:
       await self.discord.on_ready()
@@ -100,43 +114,144 @@ class OpenaiModule(BaseModule):
     if self.discord_output:
       await self.discord_output.on_ready()
     self.client = await self.init_openai_client()
+    self._configure_response_cache()
+    self._configure_message_log()
+    try:
+      await self._get_registry()
+    except Exception:
+      logging.exception("[OpenaiModule] failed to preload persona registry")
+    self.system_config.add_listener(self._on_config_changed)
     self.app.state.openai = self
     logging.debug("[OpenaiModule] loaded")
     self.mark_ready()
 
   async def shutdown(self):
     logging.info("[OpenaiModule] shutdown")
-    if self.summary_queue._processing_task:
-      self.summary_queue._processing_task.cancel()
+    await self.message_log.close()
     self.client = None
     self.db = None
+    self.system_config = None
     self.discord_output = None
 
   async def get_openai_token(self) -> str:
-    assert self.db
-    res = await self.db.run(get_config_request(ConfigKeyParams(key="OpenAIApiKey")))
-    if res.rows:
-      return res.rows[0].get("element_value", "")
-    return ""
+    assert self.system_config
+    return self.system_config.get_value("OpenAIApiKey", "")
+
+  async def _on_config_changed(self, changed: set[str]):
+    if "OpenAIApiKey" in changed:
+      self.client = await self.init_openai_client()
+    if changed & _RESPONSE_CACHE_KEYS:
+      self._configure_response_cache()
+    if changed & _MESSAGE_LOG_KEYS:
+      self._configure_message_log()
+
+  def _configure_message_log(self) -> None:
+    assert self.system_config
+    self.message_log.max_batch = max(1, self.system_config.get_int("OpenAIMessageLogBatchSize", 50))
+    self.message_log.flush_interval = self.system_config.get_int("OpenAIMessageLogFlushMs", 1000) / 1000
+
+  def _configure_response_cache(self) -> None:
+    """Enable the response cache when OpenAIResponseCacheSeconds is positive.
+
+    OpenAIResponseCacheSimilarity (a percentage) additionally enables the
+    embedding-similarity tier.
+    """
+    assert self.system_config
+    ttl = self.system_config.get_int("OpenAIResponseCacheSeconds", 0)
+    if ttl <= 0:
+      self.response_cache = None
+      return
+    similarity = self.system_config.get_int("OpenAIResponseCacheSimilarity", 0) / 100
+    self.response_cache = ResponseCache(
+      ttl,
+      embed=self.embed_text if similarity > 0 else None,
+      similarity_threshold=similarity,
+    )
+
+  def get_response_cache_stats(self) -> Dict[str, Any]:
+    if not self.response_cache:
+      return {"enabled": False}
+    return {"enabled": True, **self.response_cache.stats()}
+
+  async def embed_text(self, text: str) -> List[float]:
+    assert self.client
+    client = self.client
+    raw = await self.scheduler.submit(
+      lambda: client.embeddings.with_raw_response.create(model=EMBEDDING_MODEL, input=text),
+      estimated_tokens=await count_tokens_async(text),
+    )
+    return list(raw.parse().data[0].embedding)
 
   async def init_openai_client(self) -> AsyncOpenAI | None:
     token = await self.get_openai_token()
     if not token:
       logging.warning("[OpenaiModule] OpenAIApiKey not configured")
       return None
+    from openai import AsyncOpenAI
+
     return AsyncOpenAI(api_key=token)
 
+  def invalidate_registry(self) -> None:
+    """Drop cached persona and model rows; the next lookup reloads them.
+
+    Writes through this worker invalidate at once; edits made by other workers
+    are picked up when the registry ages out after ``PERSONA_TTL_SECONDS``.
+    """
+    self._registry_version += 1
+    self._registry = None
+
+  async def _get_registry(self) -> _PersonaRegistry:
+    registry = self._registry
+    if registry is not None and not registry.expired():
+      return registry
+    async with self._registry_lock:
+      registry = self._registry
+      if registry is not None and not registry.expired():
+        return registry
+      assert self.db
+      version = self._registry_version
+      personas = await self.db.run(list_personas_request())
+      models = await self.db.run(list_models_request())
+      registry = _PersonaRegistry(list(personas.rows or []), list(models.rows or []))
+      # A write during the load leaves the result stale; serve it once but
+      # do not keep it.
+      if version == self._registry_version:
+        self._registry = registry
+      return registry
+
   async def _get_persona(self, name: str) -> dict | None:
     if not self.db:
       return None
     try:
+      registry = await self._get_registry()
+      row = registry.personas_by_name.get(name)
+      if row is not None:
+        return row
+      # Personas created outside this process are picked up on first use.
       res = await self.db.run(get_persona_by_name_request(PersonaNameParams(name=name)))
       if res.rows:
+        registry.add_persona(res.rows[0])
         return res.rows[0]
     except Exception:
       logging.exception("[OpenaiModule] fetch persona failed")
     return None
 
+  async def get_persona_by_recid(self, recid: int) -> Dict[str, Any] | None:
+    if not self.db:
+      return None
+    registry = await self._get_registry()
+    return registry.personas_by_recid.get(int(recid))
+
+  async def get_model(self, *, recid: int | None = None, name: str | None = None) -> Dict[str, Any] | None:
+    if not self.db:
+      return None
+    registry = await self._get_registry()
+    if recid is not None:
+      return registry.models_by_recid.get(int(recid))
+    if name:
+      return registry.models_by_name.get(name)
+    return None
+
   async def get_persona_definition(self, name: str) -> Dict[str, Any] | None:
     persona_row = await self._get_persona(name)
     if not persona_row:
@@ -206,10 +321,12 @@ class OpenaiModule(BaseModule):
         is_active=payload["is_active"],
       ))
     )
+    self.invalidate_registry()
 
   async def delete_persona(self, recid: int | None = None, name: str | None = None) -> None:
     assert self.db
     await self.db.run(delete_persona_request(DeletePersonaParams(recid=recid, name=name)))
+    self.invalidate_registry()
 
   async def log_message(
     self,
@@ -224,30 +341,37 @@ class OpenaiModule(BaseModule):
     users_guid: str | None = None,
     thread_id: str | None = None,
     tokens: int | None = None,
-  ) -> int | None:
-    """Insert a single message row using the new message-per-row schema."""
+  ) -> None:
+    """Queue a message row for the next batched insert.
+
+    Rows are written behind the response path by ``message_log``; the
+    creation time is captured here so batching keeps thread order.
+    """
     if not self.db:
-      return None
-    try:
-      res = await self.db.run(
-        insert_message_request(InsertMessageParams(
-          personas_recid=personas_recid,
-          models_recid=models_recid,
-          role=role,
-          content=content,
-          guild_id=str(guild_id) if guild_id is not None else None,
-          channel_id=str(channel_id) if channel_id is not None else None,
-          user_id=str(user_id) if user_id is not None else None,
-          users_guid=users_guid,
-          thread_id=thread_id,
-          tokens=tokens,
-        ))
-      )
-      if res.rows:
-        return res.rows[0].get("recid")
-    except Exception:
-      logging.exception("[OpenaiModule] insert message failed")
-    return None
+      return
+    self.message_log.add(InsertMessageParams(
+      personas_recid=personas_recid,
+      models_recid=models_recid,
+      role=role,
+      content=content,
+      guild_id=str(guild_id) if guild_id is not None else None,
+      channel_id=str(channel_id) if channel_id is not None else None,
+      user_id=str(user_id) if user_id is not None else None,
+      users_guid=users_guid,
+      thread_id=thread_id,
+      tokens=tokens,
+      created_on=datetime.now(timezone.utc).isoformat(),
+    ))
+
+  async def _write_messages(self, messages: List[InsertMessageParams]) -> None:
+    """Insert queued rows in one request, counting tokens the callers left out."""
+    assert self.db
+    missing = [message for message in messages if message.tokens is None and message.content]
+    if missing:
+      counts = await count_tokens_batch_async([message.content for message in missing])
+      for message, count in zip(missing, counts):
+        message.tokens = count
+    await self.db.run(insert_messages_request(InsertMessagesParams(messages=messages)))
 
   async def get_thread_history(
     self,
@@ -258,16 +382,18 @@ class OpenaiModule(BaseModule):
     """Retrieve message history for a thread, formatted for OpenAI messages."""
     if not self.db or not thread_id:
       return []
+    await self.message_log.flush()
     try:
       res = await self.db.run(
-        list_thread_request(ListThreadParams(thread_id=thread_id))
+        list_thread_request(ListThreadParams(
+          thread_id=thread_id,
+          limit=limit if limit and limit > 0 else None,
+        ))
       )
     except Exception:
       logging.exception("[OpenaiModule] failed to load thread history")
       return []
     rows = list(res.rows or [])
-    if limit and limit > 0:
-      rows = rows[-limit:]
     messages: List[Dict[str, str]] = []
     for row in rows:
       role = (row.get("element_role") or "user").strip()
@@ -282,10 +408,14 @@ class OpenaiModule(BaseModule):
     channel_id: int | str,
     *,
     limit: int = 30,
-  ) -> List[Dict[str, str]]:
-    """Retrieve recent stored messages from a guild+channel for context."""
+  ) -> List[Dict[str, Any]]:
+    """Retrieve recent stored messages from a guild+channel for context.
+
+    Each entry carries the stored token count (``tokens``) when one exists.
+    """
     if not self.db:
       return []
+    await self.message_log.flush()
     try:
       res = await self.db.run(
         list_channel_messages_request(ListChannelMessagesParams(
@@ -299,12 +429,12 @@ class OpenaiModule(BaseModule):
       return []
     rows = list(res.rows or [])
     rows.reverse()
-    messages: List[Dict[str, str]] = []
+    messages: List[Dict[str, Any]] = []
     for row in rows:
       role = (row.get("element_role") or "user").strip()
       content = (row.get("element_content") or "").strip()
       if content:
-        messages.append({"role": role, "content": content})
+        messages.append({"role": role, "content": content, "tokens": row.get("element_tokens")})
     return messages
 
   async def get_recent_persona_conversation_history(
@@ -318,6 +448,7 @@ class OpenaiModule(BaseModule):
       return []
     if personas_recid is None:
       return []
+    await self.message_log.flush()
     end = datetime.now(timezone.utc)
     start = end - timedelta(days=max(lookback_days, 0))
     try:
@@ -378,11 +509,134 @@ class OpenaiModule(BaseModule):
     user_id: int | None = None,
     input_log: str | None = None,
     token_count: int | None = None,
+    bulk: bool = False,
+    cache: bool = False,
   ) -> Dict[str, Any]:
+    """Run a chat completion through the request scheduler.
+
+    ``bulk`` marks background work such as summaries, which yields to
+    interactive requests when the rate-limit budget is tight. ``cache``
+    opts the call into the response cache when it is enabled.
+    """
     if not self.client:
       logging.warning("[OpenaiModule] client not initialized")
       return {"content": ""}
 
+    params = await self._build_chat_params(
+      system_prompt=system_prompt,
+      user_prompt=user_prompt,
+      model=model,
+      max_tokens=max_tokens,
+      tools=tools,
+      prompt_context=prompt_context,
+      persona=persona,
+      persona_details=persona_details,
+    )
+    cache_key = self._response_cache_key(params, prompt_context, user_prompt) if cache and not tools else None
+    if cache_key and self.response_cache:
+      cached = await self.response_cache.get(*cache_key)
+      if cached is not None:
+        return {**cached, "cached": True}
+    completion = await self._submit_chat(params, bulk=bulk)
+    usage = getattr(completion, "usage", None)
+    total_tokens = getattr(usage, "total_tokens", None) if usage else None
+    choice = completion.choices[0].message
+    content = choice.content
+    result: Dict[str, Any] = {
+      "content": content,
+      "model": getattr(completion, "model", params["model"]),
+      "role": getattr(choice, "role", ""),
+    }
+    if usage:
+      result["usage"] = {
+        "prompt_tokens": getattr(usage, "prompt_tokens", None),
+        "completion_tokens": getattr(usage, "completion_tokens", None),
+        "total_tokens": total_tokens,
+      }
+    if cache_key and self.response_cache:
+      await self.response_cache.put(*cache_key, result)
+    return result
+
+  def _response_cache_key(
+    self,
+    params: Dict[str, Any],
+    prompt_context: str,
+    user_prompt: str | None,
+  ) -> tuple[str, str, str, str] | None:
+    if not self.response_cache:
+      return None
+    system_prompt = next(
+      (message["content"] for message in params["messages"] if message["role"] == "system"),
+      "",
+    )
+    return (params["model"], system_prompt, prompt_context or "", user_prompt or "")
+
+  async def stream_chat(
+    self,
+    *,
+    system_prompt: str,
+    user_prompt: str | None = None,
+    model: str | None = None,
+    max_tokens: int | None = None,
+    prompt_context: str = "",
+    persona: str | None = None,
+    persona_details: Dict[str, Any] | None = None,
+    cache: bool = False,
+  ) -> AsyncIterator[str]:
+    """Yield completion text as the model generates it.
+
+    A response cache hit is yielded as a single piece.
+    """
+    if not self.client:
+      logging.warning("[OpenaiModule] client not initialized")
+      return
+    params = await self._build_chat_params(
+      system_prompt=system_prompt,
+      user_prompt=user_prompt,
+      model=model,
+      max_tokens=max_tokens,
+      prompt_context=prompt_context,
+      persona=persona,
+      persona_details=persona_details,
+    )
+    cache_key = self._response_cache_key(params, prompt_context, user_prompt) if cache else None
+    if cache_key and self.response_cache:
+      cached = await self.response_cache.get(*cache_key)
+      if cached is not None:
+        yield cached["content"]
+        return
+    params["stream"] = True
+    params["stream_options"] = {"include_usage": True}
+    stream = await self._submit_chat(params, bulk=False)
+    parts: List[str] = []
+    usage = None
+    async for event in stream:
+      usage = getattr(event, "usage", None) or usage
+      choices = getattr(event, "choices", None)
+      if not choices:
+        continue
+      delta = getattr(choices[0].delta, "content", None)
+      if delta:
+        parts.append(delta)
+        yield delta
+    if cache_key and self.response_cache:
+      result: Dict[str, Any] = {"content": "".join(parts), "model": params["model"], "role": "assistant"}
+      if usage:
+        result["usage"] = {"total_tokens": getattr(usage, "total_tokens", None)}
+      await self.response_cache.put(*cache_key, result)
+
+  async def _build_chat_params(
+    self,
+    *,
+    system_prompt: str,
+    user_prompt: str | None,
+    model: str | None,
+    max_tokens: int | None,
+    prompt_context: str,
+    persona: str | None,
+    persona_details: Dict[str, Any] | None,
+    tools: List[Dict[str, Any]] | None = None,
+  ) -> Dict[str, Any]:
     resolved_model = (model or "").strip() or "gpt-4o-mini"
     resolved_tokens = max_tokens
     resolved_prompt = system_prompt or ""
@@ -430,24 +684,21 @@ class OpenaiModule(BaseModule):
       params["max_tokens"] = resolved_tokens
     if tools:
       params["tools"] = tools
-
-    completion = await self.client.chat.completions.create(**params)
-    usage = getattr(completion, "usage", None)
-    total_tokens = getattr(usage, "total_tokens", None) if usage else None
-    choice = completion.choices[0].message
-    content = choice.content
-    result: Dict[str, Any] = {
-      "content": content,
-      "model": getattr(completion, "model", resolved_model),
-      "role": getattr(choice, "role", ""),
-    }
-    if usage:
-      result["usage"] = {
-        "prompt_tokens": getattr(usage, "prompt_tokens", None),
-        "completion_tokens": getattr(usage, "completion_tokens", None),
-        "total_tokens": total_tokens,
-      }
-    return result
+    return params
+
+  async def _submit_chat(self, params: Dict[str, Any], *, bulk: bool) -> Any:
+    assert self.client
+    prompt_tokens = sum(await count_tokens_batch_async(
+      [message["content"] for message in params["messages"]],
+      params["model"],
+    ))
+    client = self.client
+    raw = await self.scheduler.submit(
+      lambda: client.chat.completions.with_raw_response.create(**params),
+      estimated_tokens=prompt_tokens + (params.get("max_tokens") or 0),
+      priority=PRIORITY_BULK if bulk else PRIORITY_INTERACTIVE,
+    )
+    return raw.parse()
 
   async def persona_response(
     self,
@@ -528,6 +779,7 @@ class OpenaiModule(BaseModule):
     input_log: str | None = None,
     token_count: int | None = None,
     model: str = "gpt-4o-mini",
+    bulk: bool = False,
   ):
     result = await self.generate_chat(
       system_prompt=role,
@@ -542,6 +794,7 @@ class OpenaiModule(BaseModule):
       user_id=user_id,
       input_log=input_log,
       token_count=token_count,
+      bulk=bulk,
     )
     if isinstance(result, dict):
       result.pop("usage", None)
@@ -0,0 +1,171 @@
+"""Short-lived cache of chat completions for repeated prompts."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any
+
+EmbedCallable = Callable[[str], Awaitable[Sequence[float]]]
+
+# Embedding inputs are capped; the newest context matters most for similarity.
+EMBEDDING_INPUT_CHARS = 16000
+
+
+def _normalize(text: str | None) -> str:
+  return " ".join((text or "").split())
+
+
+def _digest(text: str) -> str:
+  return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class _Entry:
+  __slots__ = ("scope", "result", "expires_at", "embedding", "norm")
+
+  def __init__(self, scope: str, result: dict[str, Any], expires_at: float):
+    self.scope = scope
+    self.result = result
+    self.expires_at = expires_at
+    self.embedding: Sequence[float] | None = None
+    self.norm = 0.0
+
+
+class ResponseCache:
+  """Chat completions keyed by model, system prompt, context and user prompt.
+
+  Exact hits match on the hashes of the whitespace-normalized prompts. With
+  an ``embed`` callable and a ``similarity_threshold``, an exact miss falls
+  back to the most similar live entry for the same model and system prompt.
+  Entries expire after ``ttl_seconds``.
+  """
+
+  def __init__(
+    self,
+    ttl_seconds: float,
+    *,
+    max_entries: int = 512,
+    embed: EmbedCallable | None = None,
+    similarity_threshold: float = 0.0,
+  ):
+    self.ttl_seconds = ttl_seconds
+    self.max_entries = max(1, max_entries)
+    self.embed = embed
+    self.similarity_threshold = similarity_threshold
+    self._entries: OrderedDict[str, _Entry] = OrderedDict()
+    self.hits = 0
+    self.semantic_hits = 0
+    self.misses = 0
+    self.tokens_saved = 0
+
+  @property
+  def semantic_enabled(self) -> bool:
+    return self.embed is not None and self.similarity_threshold > 0
+
+  @staticmethod
+  def scope(model: str, system_prompt: str) -> str:
+    return f"{model}:{_digest(_normalize(system_prompt))}"
+
+  @staticmethod
+  def key(model: str, system_prompt: str, context: str, user_prompt: str) -> str:
+    return "|".join((
+      ResponseCache.scope(model, system_prompt),
+      _digest(_normalize(context)),
+      _normalize(user_prompt),
+    ))
+
+  async def get(
+    self,
+    model: str,
+    system_prompt: str,
+    context: str,
+    user_prompt: str,
+  ) -> dict[str, Any] | None:
+    now = time.monotonic()
+    self._expire(now)
+    entry = self._entries.get(self.key(model, system_prompt, context, user_prompt))
+    if entry is None and self.semantic_enabled:
+      entry = await self._nearest(self.scope(model, system_prompt), context, user_prompt)
+      if entry is not None:
+        self.semantic_hits += 1
+    if entry is None:
+      self.misses += 1
+      return None
+    self.hits += 1
+    usage = entry.result.get("usage") or {}
+    self.tokens_saved += int(usage.get("total_tokens") or 0)
+    return dict(entry.result)
+
+  async def put(
+    self,
+    model: str,
+    system_prompt: str,
+    context: str,
+    user_prompt: str,
+    result: dict[str, Any],
+  ) -> None:
+    if not result.get("content"):
+      return
+    key = self.key(model, system_prompt, context, user_prompt)
+    entry = _Entry(self.scope(model, system_prompt), dict(result), time.monotonic() + self.ttl_seconds)
+    if self.semantic_enabled:
+      embedding = await self._embed(context, user_prompt)
+      # Without an embedding the entry keeps norm 0: exact hits only.
+      if embedding is not None:
+        entry.embedding = embedding
+        entry.norm = math.sqrt(sum(value * value for value in embedding))
+    self._entries[key] = entry
+    self._entries.move_to_end(key)
+    while len(self._entries) > self.max_entries:
+      self._entries.popitem(last=False)
+
+  def stats(self) -> dict[str, Any]:
+    lookups = self.hits + self.misses
+    return {
+      "entries": len(self._entries),
+      "hits": self.hits,
+      "semantic_hits": self.semantic_hits,
+      "misses": self.misses,
+      "hit_rate": self.hits / lookups if lookups else 0.0,
+      "tokens_saved": self.tokens_saved,
+    }
+
+  def _expire(self, now: float) -> None:
+    for key in [key for key, entry in self._entries.items() if entry.expires_at <= now]:
+      del self._entries[key]
+
+  @staticmethod
+  def _embedding_input(context: str, user_prompt: str) -> str:
+    return f"{_normalize(context)}\n{_normalize(user_prompt)}"[-EMBEDDING_INPUT_CHARS:]
+
+  async def _embed(self, context: str, user_prompt: str) -> Sequence[float] | None:
+    """Embed the prompt, or None when the embeddings call fails."""
+    assert self.embed
+    try:
+      return await self.embed(self._embedding_input(context, user_prompt))
+    except Exception:
+      logging.warning("[ResponseCache] embedding failed; skipping the similarity tier", exc_info=True)
+      return None
+
+  async def _nearest(self, scope: str, context: str, user_prompt: str) -> _Entry | None:
+    candidates = [entry for entry in self._entries.values() if entry.scope == scope and entry.norm]
+    if not candidates:
+      return None
+    vector = await self._embed(context, user_prompt)
+    if vector is None:
+      return None
+    norm = math.sqrt(sum(value * value for value in vector))
+    if not norm:
+      return None
+    best: _Entry | None = None
+    best_score = self.similarity_threshold
+    for entry in candidates:
+      assert entry.embedding is not None
+      score = sum(a * b for a, b in zip(vector, entry.embedding)) / (norm * entry.norm)
+      if score >= best_score:
+        best, best_score = entry, score
+    return best
@@ -0,0 +1,218 @@
+"""Admission control for OpenAI requests within the account's rate limits."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import re
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value: str | None) -> float | None:
+  """Parse OpenAI reset durations such as ``"20ms"``, ``"1s"`` or ``"6m0s"``."""
+  if not value:
+    return None
+  parts = _DURATION_PART.findall(value)
+  if not parts:
+    try:
+      return float(value)
+    except ValueError:
+      return None
+  return sum(float(amount) * _DURATION_SECONDS[unit] for amount, unit in parts)
+
+
+class _Budget:
+  """One rate-limit dimension (requests or tokens) as reported by headers."""
+
+  __slots__ = ("limit", "remaining", "reset_at")
+
+  def __init__(self):
+    self.limit: int | None = None
+    self.remaining: float | None = None
+    self.reset_at = 0.0
+
+  def wait_time(self, cost: float, now: float) -> float:
+    if self.remaining is None:
+      return 0.0
+    if now >= self.reset_at and self.limit is not None:
+      self.remaining = float(self.limit)
+    if self.remaining >= cost or (self.limit is not None and cost > self.limit):
+      return 0.0
+    return max(self.reset_at - now, 0.0)
+
+  def spend(self, cost: float) -> None:
+    if self.remaining is not None:
+      self.remaining -= cost
+
+  def observe(self, limit: str | None, remaining: str | None, reset: str | None, now: float) -> None:
+    try:
+      if limit is not None:
+        self.limit = int(limit)
+      if remaining is not None:
+        self.remaining = float(remaining)
+    except ValueError:
+      return
+    reset_seconds = parse_reset(reset)
+    if reset_seconds is not None:
+      self.reset_at = now + reset_seconds
+
+
+class OpenaiRequestScheduler:
+  """Runs OpenAI calls concurrently within the request and token budgets.
+
+  Budgets come from the ``x-ratelimit-*`` headers of earlier responses; until
+  the first response only the concurrency limit applies. Waiting calls are
+  admitted by priority, interactive before bulk, then in arrival order.
+  Throttled calls (HTTP 429) hold back every caller until the reported
+  reset, or a jittered exponential backoff, and are then retried.
+  """
+
+  def __init__(
+    self,
+    max_concurrency: int = 8,
+    *,
+    max_retries: int = 5,
+    base_backoff: float = 1.0,
+    max_backoff: float = 30.0,
+  ):
+    self.max_concurrency = max(1, max_concurrency)
+    self.max_retries = max_retries
+    self.base_backoff = base_backoff
+    self.max_backoff = max_backoff
+    self.requests = _Budget()
+    self.tokens = _Budget()
+    self._blocked_until = 0.0
+    self._running = 0
+    self._waiting: list[tuple[int, int]] = []
+    self._sequence = itertools.count()
+    self._condition = asyncio.Condition()
+
+  @property
+  def queued(self) -> int:
+    return len(self._waiting)
+
+  @property
+  def running(self) -> int:
+    return self._running
+
+  async def submit(
+    self,
+    call: Callable[[], Awaitable[T]],
+    *,
+    estimated_tokens: int = 0,
+    priority: int = PRIORITY_INTERACTIVE,
+  ) -> T:
+    ticket = (priority, next(self._sequence))
+    attempt = 0
+    while True:
+      await self._admit(ticket, estimated_tokens)
+      try:
+        result = await call()
+      except Exception as exc:
+        delay = self._throttle_delay(exc, attempt)
+        if delay is None or attempt >= self.max_retries:
+          raise
+      else:
+        self.observe(getattr(result, "headers", None))
+        return result
+      finally:
+        # Also runs when the caller is cancelled mid-call.
+        await self._release()
+      attempt += 1
+      logging.warning(
+        "[OpenaiRequestScheduler] throttled, retrying",
+        extra={"attempt": attempt, "delay": delay},
+      )
+      await self._defer(delay)
+
+  def observe(self, headers: Mapping[str, str] | None) -> None:
+    if not headers:
+      return
+    now = time.monotonic()
+    self.requests.observe(
+      headers.get("x-ratelimit-limit-requests"),
+      headers.get("x-ratelimit-remaining-requests"),
+      headers.get("x-ratelimit-reset-requests"),
+      now,
+    )
+    self.tokens.observe(
+      headers.get("x-ratelimit-limit-tokens"),
+      headers.get("x-ratelimit-remaining-tokens"),
+      headers.get("x-ratelimit-reset-tokens"),
+      now,
+    )
+
+  async def _admit(self, ticket: tuple[int, int], estimated_tokens: int) -> None:
+    async with self._condition:
+      heapq.heappush(self._waiting, ticket)
+      try:
+        while True:
+          delay = self._admission_delay(ticket, estimated_tokens)
+          if delay == 0.0:
+            break
+          try:
+            await asyncio.wait_for(self._condition.wait(), timeout=delay)
+          except asyncio.TimeoutError:
+            pass
+      finally:
+        self._waiting.remove(ticket)
+        heapq.heapify(self._waiting)
+        # The next ticket may now be at the head, whether admitted or cancelled.
+        self._condition.notify_all()
+      self._running += 1
+      self.requests.spend(1)
+      self.tokens.spend(estimated_tokens)
+
+  def _admission_delay(self, ticket: tuple[int, int], estimated_tokens: int) -> float | None:
+    """Seconds until ``ticket`` may run, 0.0 to run now, None to wait for a release."""
+    if self._waiting[0] != ticket or self._running >= self.max_concurrency:
+      return None
+    now = time.monotonic()
+    return max(
+      self._blocked_until - now,
+      self.requests.wait_time(1, now),
+      self.tokens.wait_time(estimated_tokens, now),
+      0.0,
+    )
+
+  async def _release(self) -> None:
+    async with self._condition:
+      self._running -= 1
+      self._condition.notify_all()
+
+  async def _defer(self, delay: float) -> None:
+    async with self._condition:
+      self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+      self._condition.notify_all()
+
+  def _throttle_delay(self, exc: Exception, attempt: int) -> float | None:
+    if getattr(exc, "status_code", None) != 429:
+      return None
+    body = getattr(exc, "body", None)
+    if getattr(exc, "code", None) == "insufficient_quota" or (
+      isinstance(body, dict) and body.get("code") == "insufficient_quota"
+    ):
+      return None
+    headers: Any = getattr(getattr(exc, "response", None), "headers", None) or {}
+    hinted = parse_reset(headers.get("retry-after"))
+    if hinted is None:
+      resets = [
+        parse_reset(headers.get("x-ratelimit-reset-requests")),
+        parse_reset(headers.get("x-ratelimit-reset-tokens")),
+      ]
+      hinted = max((reset for reset in resets if reset is not None), default=None)
+    backoff = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+    return max(hinted or 0.0, backoff * random.uniform(0.5, 1.5))
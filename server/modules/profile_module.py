@@ -18,6 +18,8 @@ from queryregistry.models import DBRequest, DBResponse
 
 
 class ProfileModule(BaseModule):
+  dependencies = ("db", "auth")
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.db: DbModule | None = None
@@ -27,5 +27,17 @@ class BillingImportProvider(LifecycleProvider, ABC):
 
   @abstractmethod
   async def run_import(self, **kwargs: Any) -> dict:
-    """Execute an import. Returns a dict with import_recid, status, row_count, etc."""
+    """Execute an import. Returns a dict with import_recid, status, row_count, etc.
+
+    When the import fails after its staging import row exists, the raised
+    exception carries that row's recid as ``import_recid``.
+    """
     ...
+
+  async def create_import(self, **kwargs: Any) -> int:
+    """Create the staging import row for a later ``resume_import`` and return its recid."""
+    raise ValueError(f"Billing provider '{self.name}' does not support staged imports")
+
+  async def resume_import(self, import_row: dict) -> dict:
+    """Continue an interrupted import from the checkpoint on its staging import row."""
+    raise ValueError(f"Billing provider '{self.name}' does not support resuming imports")
@@ -5,7 +5,8 @@ from __future__ import annotations
 import asyncio
 import csv
 from decimal import Decimal, InvalidOperation
-from datetime import datetime
+from datetime import datetime, timezone
+import hashlib
 import io
 import json
 import logging
@@ -13,34 +14,40 @@ import re
 from typing import TYPE_CHECKING
 
 import aiohttp
-from azure.identity.aio import ClientSecretCredential
 
 from queryregistry.finance.staging import (
   create_import_request,
   insert_cost_detail_batch_request,
+  update_import_checkpoint_request,
   update_import_status_request,
 )
 from queryregistry.finance.staging_line_items import insert_line_items_batch_request
 from queryregistry.finance.staging.models import (
   CreateImportParams,
   InsertCostDetailBatchParams,
+  UpdateImportCheckpointParams,
   UpdateImportStatusParams,
 )
 from queryregistry.finance.staging_line_items.models import InsertLineItemsBatchParams
 from queryregistry.finance.vendors import get_vendor_by_name_request
 from queryregistry.finance.vendors.models import GetVendorByNameParams
-from queryregistry.system.config import get_config_request
-from queryregistry.system.config.models import ConfigKeyParams
 
 from ...db_module import DbModule
 from ...env_module import EnvModule
+from ...system_config_module import SystemConfigModule
 from . import BillingImportProvider
+from .rate_limit import TokenBucket
 from ...models.finance_statuses import IMPORT_FAILED, IMPORT_PENDING_APPROVAL
 
 if TYPE_CHECKING:  # pragma: no cover
+  from azure.identity.aio import ClientSecretCredential
   from ...billing_import_module import BillingImportModule
 
 
+DEFAULT_REQUESTS_PER_MINUTE = 30
+MAX_THROTTLED_RETRIES = 5
+
+
 class AzureCostDetailsProvider(BillingImportProvider):
   name = "azure_cost_details"
   _START_DATE_AFTER_PATTERN = re.compile(
@@ -53,6 +60,7 @@ class AzureCostDetailsProvider(BillingImportProvider):
     super().__init__(module)
     self.db: DbModule | None = None
     self.env: EnvModule | None = None
+    self.system_config: SystemConfigModule | None = None
     self._tenant_id: str | None = None
     self._client_id: str | None = None
     self._client_secret: str | None = None
@@ -62,16 +70,25 @@ class AzureCostDetailsProvider(BillingImportProvider):
     self._credential_client_id: str | None = None
     self._credential_client_secret: str | None = None
     self._azure_vendor_recid: int | None = None
+    # Shared by every concurrent import so backfills stay within the Cost Management quota.
+    self._rate_limiter = TokenBucket(DEFAULT_REQUESTS_PER_MINUTE / 60, DEFAULT_REQUESTS_PER_MINUTE // 6)
 
   async def startup(self):
     self.db = self.module.app.state.db
     await self.db.on_ready()
     self.env = self.module.app.state.env
     await self.env.on_ready()
+    self.system_config = self.module.app.state.system_config
+    await self.system_config.on_ready()
 
     self._client_id = await self._load_config("AzureBillingClientId")
     self._tenant_id = await self._load_config("AzureBillingTenantId")
     self._subscription_id = await self._load_config("AzureBillingSubscriptionId")
+    requests_per_minute = max(
+      self.system_config.get_int("AzureBillingRequestsPerMinute", DEFAULT_REQUESTS_PER_MINUTE),
+      1,
+    )
+    self._rate_limiter = TokenBucket(requests_per_minute / 60, requests_per_minute // 6)
     try:
       self._client_secret = self.env.get("AZURE_BILLING_CLIENT_SECRET") if self.env else None
     except Exception:
@@ -104,21 +121,20 @@ class AzureCostDetailsProvider(BillingImportProvider):
     self._azure_vendor_recid = None
     self.db = None
     self.env = None
+    self.system_config = None
 
   async def run_import(self, **kwargs) -> dict:
     return await self.import_cost_details(
       period_start=kwargs["period_start"],
       period_end=kwargs["period_end"],
       metric=kwargs.get("metric", "ActualCost"),
+      subscription_id=kwargs.get("subscription_id"),
     )
 
   async def _load_config(self, key: str) -> str:
-    if not self.db:
-      raise RuntimeError("AzureBillingImportModule requires database module")
-    res = await self.db.run(get_config_request(ConfigKeyParams(key=key)))
-    if not res.rows:
-      return ""
-    return res.rows[0].get("element_value") or ""
+    if not self.system_config:
+      raise RuntimeError("AzureBillingImportModule requires system config module")
+    return self.system_config.get_value(key) or ""
 
   async def _get_management_token(self) -> str:
     """Acquire an Azure Management API access token via client credentials."""
@@ -140,6 +156,8 @@ class AzureCostDetailsProvider(BillingImportProvider):
     ):
       if self._credential:
         await self._credential.close()
+      from azure.identity.aio import ClientSecretCredential
+
       self._credential = ClientSecretCredential(
         tenant_id=self._tenant_id,
         client_id=self._client_id,
@@ -161,6 +179,18 @@ class AzureCostDetailsProvider(BillingImportProvider):
       return default
     return max(1, min(parsed, 300))
 
+  def _throttle_delay(self, response) -> int | None:
+    """Seconds to back off when the Cost Management API throttles a request."""
+    if response.status != 429:
+      return None
+    delays = [
+      self._parse_retry_after(value)
+      for key, value in response.headers.items()
+      if key.lower() == "retry-after"
+      or (key.lower().startswith("x-ms-ratelimit-") and key.lower().endswith("-retry-after"))
+    ]
+    return max(delays) if delays else 60
+
   def _parse_start_date_after_error(self, response_text: str) -> datetime | None:
     match = self._START_DATE_AFTER_PATTERN.search(response_text)
     if not match:
@@ -195,190 +225,375 @@ class AzureCostDetailsProvider(BillingImportProvider):
     except ValueError:
       return raw[:10]
 
+  @staticmethod
+  def _row_hash(row: dict[str, object], occurrence: int, blob_index: int = 0) -> str:
+    """Stable identity for a cost detail row within its import.
+
+    ``occurrence`` separates identical rows within one blob and ``blob_index``
+    separates identical rows in different blobs of the same report.
+    """
+    digest = hashlib.sha256(json.dumps(row, sort_keys=True).encode("utf-8"))
+    if occurrence:
+      digest.update(f"#{occurrence}".encode("utf-8"))
+    if blob_index:
+      digest.update(f"@{blob_index}".encode("utf-8"))
+    return digest.hexdigest()
+
+  @staticmethod
+  def _manifest_expired(checkpoint: dict) -> bool:
+    valid_till = checkpoint.get("valid_till")
+    if not valid_till:
+      return False
+    try:
+      expires = datetime.strptime(str(valid_till)[:19], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+    except ValueError:
+      return False
+    return expires <= datetime.now(timezone.utc)
+
+  async def _save_checkpoint(self, import_recid: int, checkpoint: dict | None, row_count: int):
+    await self.db.run(
+      update_import_checkpoint_request(
+        UpdateImportCheckpointParams(recid=import_recid, checkpoint=checkpoint, row_count=row_count),
+      ),
+    )
+
+  async def _request_report(
+    self,
+    session: aiohttp.ClientSession,
+    headers: dict[str, str],
+    subscription_id: str,
+    period_start: str,
+    period_end: str,
+    metric: str,
+  ) -> tuple[str, int]:
+    url = (
+      "https://management.azure.com/subscriptions/"
+      f"{subscription_id}/providers/Microsoft.CostManagement/"
+      "generateCostDetailsReport?api-version=2025-03-01"
+    )
+    body = {
+      "metric": metric,
+      "timePeriod": {
+        "start": period_start,
+        "end": period_end,
+      },
+    }
+    attempt = 0
+    throttled = 0
+    while attempt < 2:
+      await self._rate_limiter.acquire()
+      async with session.post(url, headers=headers, json=body) as response:
+        delay = self._throttle_delay(response)
+        if delay is not None and throttled < MAX_THROTTLED_RETRIES:
+          throttled += 1
+          self._rate_limiter.defer(delay)
+          continue
+        if response.status == 202:
+          location = response.headers.get("Location")
+          retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+          if not location:
+            raise RuntimeError("Azure Cost Details report response missing Location header")
+          return location, retry_after
+
+        response_text = await response.text()
+        if response.status != 400 or attempt == 1:
+          raise RuntimeError(
+            "Azure Cost Details report request failed "
+            f"({response.status}): {response_text}",
+          )
+
+        corrected_start_dt = self._parse_start_date_after_error(response_text)
+        if not corrected_start_dt:
+          raise RuntimeError(
+            "Azure Cost Details report request failed "
+            f"({response.status}): {response_text}",
+          )
+
+        corrected_start = corrected_start_dt.isoformat(timespec="seconds")
+        logging.info(
+          "[AzureBillingImportModule] Auto-corrected Azure Cost Details start date from %s to %s",
+          body["timePeriod"]["start"],
+          corrected_start,
+        )
+        body["timePeriod"]["start"] = corrected_start
+        attempt += 1
+    raise RuntimeError("Azure Cost Details report request failed with unknown retry state")
+
+  async def _poll_report(
+    self,
+    session: aiohttp.ClientSession,
+    location: str,
+    headers: dict[str, str],
+    retry_after: int,
+  ) -> dict:
+    throttled = 0
+    while True:
+      await asyncio.sleep(retry_after)
+      await self._rate_limiter.acquire()
+      async with session.get(location, headers=headers) as poll_response:
+        delay = self._throttle_delay(poll_response)
+        if delay is not None and throttled < MAX_THROTTLED_RETRIES:
+          throttled += 1
+          self._rate_limiter.defer(delay)
+          retry_after = 0
+          continue
+        throttled = 0
+        poll_payload = await poll_response.json(content_type=None)
+        if poll_response.status >= 400:
+          raise RuntimeError(
+            "Azure Cost Details poll failed "
+            f"({poll_response.status}): {poll_payload}",
+          )
+        poll_status = (poll_payload.get("status") or "").strip()
+        retry_after = self._parse_retry_after(poll_response.headers.get("Retry-After"))
+        if poll_status == "Completed":
+          return poll_payload
+        if poll_status == "Failed":
+          error_payload = poll_payload.get("error") or poll_payload
+          raise RuntimeError(f"Azure Cost Details report failed: {error_payload}")
+
+  async def _insert_batch(
+    self,
+    import_recid: int,
+    vendors_recid: int,
+    raw_batch: list[dict[str, object]],
+    normalized_batch: list[dict[str, object]],
+    row_hashes: list[str],
+  ) -> int:
+    """Stage one batch and return how many cost detail rows were new."""
+    res = await self.db.run(
+      insert_cost_detail_batch_request(
+        InsertCostDetailBatchParams(imports_recid=import_recid, rows=raw_batch, row_hashes=row_hashes),
+      ),
+    )
+    await self.db.run(
+      insert_line_items_batch_request(
+        InsertLineItemsBatchParams(
+          imports_recid=import_recid,
+          vendors_recid=vendors_recid,
+          rows=normalized_batch,
+        ),
+      ),
+    )
+    return int(res.rowcount or 0)
+
+  async def create_import(self, **kwargs) -> int:
+    subscription_id = kwargs.get("subscription_id") or self._subscription_id
+    if not subscription_id:
+      raise ValueError("Azure billing subscription not configured")
+    return await self._create_import(
+      subscription_id,
+      kwargs["period_start"],
+      kwargs["period_end"],
+      kwargs.get("metric", "ActualCost"),
+    )
+
   async def import_cost_details(
     self,
     period_start: str,
     period_end: str,
     metric: str = "ActualCost",
+    subscription_id: str | None = None,
   ) -> dict:
+    subscription_id = subscription_id or self._subscription_id
+    if not subscription_id:
+      raise ValueError("Azure billing subscription not configured")
+    import_recid = await self._create_import(subscription_id, period_start, period_end, metric)
+    return await self._ingest_cost_details(
+      import_recid,
+      subscription_id,
+      period_start,
+      period_end,
+      metric,
+      {},
+    )
+
+  async def _create_import(self, subscription_id: str, period_start: str, period_end: str, metric: str) -> int:
     if not self.db:
       raise RuntimeError("AzureBillingImportModule requires database module")
+    create_res = await self.db.run(
+      create_import_request(
+        CreateImportParams(
+          source="azure_cost_details",
+          scope=f"subscriptions/{subscription_id}",
+          metric=metric,
+          period_start=period_start,
+          period_end=period_end,
+        ),
+      ),
+    )
+    if not create_res.rows:
+      raise RuntimeError("Failed to create finance staging import record")
+    return int(create_res.rows[0]["recid"])
+
+  async def resume_import(self, import_row: dict) -> dict:
+    """Continue a failed or interrupted import from its last committed batch.
 
-    import_recid: int | None = None
-    total_rows = 0
+    The stored manifest is reused while its blob links are valid; otherwise the
+    report is regenerated and row hashes, scoped by blob, skip the rows already staged.
+    """
+    if not self.db:
+      raise RuntimeError("AzureBillingImportModule requires database module")
+    scope = str(import_row.get("element_scope") or "")
+    subscription_id = scope.split("/", 1)[1] if scope.startswith("subscriptions/") else self._subscription_id
+    if not subscription_id:
+      raise ValueError("Azure billing subscription not configured")
+    checkpoint = import_row.get("element_checkpoint") or {}
+    if isinstance(checkpoint, str):
+      checkpoint = json.loads(checkpoint)
+    return await self._ingest_cost_details(
+      int(import_row["recid"]),
+      subscription_id,
+      str(import_row["element_period_start"]),
+      str(import_row["element_period_end"]),
+      import_row.get("element_metric") or "ActualCost",
+      dict(checkpoint),
+    )
+
+  async def _ingest_cost_details(
+    self,
+    import_recid: int,
+    subscription_id: str,
+    period_start: str,
+    period_end: str,
+    metric: str,
+    checkpoint: dict,
+  ) -> dict:
+    total_rows = int(checkpoint.get("rows_committed") or 0)
     status = "failed"
 
     try:
-      if not self._subscription_id:
-        raise ValueError("Azure billing subscription not configured")
+      vendor_lookup = await self.db.run(
+        get_vendor_by_name_request(GetVendorByNameParams(element_name="Azure")),
+      )
+      if not vendor_lookup.rows:
+        raise ValueError("Missing finance vendor seed row for Azure")
+      vendors_recid = int(vendor_lookup.rows[0]["recid"])
 
       token = await self._get_management_token()
-
-      create_res = await self.db.run(
-        create_import_request(
-          CreateImportParams(
-            source="azure_cost_details",
-            scope=f"subscriptions/{self._subscription_id}",
-            metric=metric,
-            period_start=period_start,
-            period_end=period_end,
-          ),
-        ),
-      )
-      if not create_res.rows:
-        raise RuntimeError("Failed to create finance staging import record")
-      import_recid = int(create_res.rows[0]["recid"])
-
-      url = (
-        "https://management.azure.com/subscriptions/"
-        f"{self._subscription_id}/providers/Microsoft.CostManagement/"
-        "generateCostDetailsReport?api-version=2025-03-01"
-      )
       headers = {
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json",
       }
-      body = {
-        "metric": metric,
-        "timePeriod": {
-          "start": period_start,
-          "end": period_end,
-        },
-      }
 
       async with aiohttp.ClientSession() as session:
-        corrected_start: str | None = None
-        for attempt in range(2):
-          async with session.post(url, headers=headers, json=body) as response:
-            if response.status == 202:
-              location = response.headers.get("Location")
-              retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
-              if not location:
-                raise RuntimeError("Azure Cost Details report response missing Location header")
-              break
-
-            response_text = await response.text()
-            if response.status != 400 or attempt == 1:
-              raise RuntimeError(
-                "Azure Cost Details report request failed "
-                f"({response.status}): {response_text}",
-              )
-
-            corrected_start_dt = self._parse_start_date_after_error(response_text)
-            if not corrected_start_dt:
-              raise RuntimeError(
-                "Azure Cost Details report request failed "
-                f"({response.status}): {response_text}",
+        if checkpoint.get("manifest") and self._manifest_expired(checkpoint):
+          logging.info(
+            "[AzureBillingImportModule] Cost details manifest for import %s expired; regenerating report",
+            import_recid,
+          )
+          checkpoint = {"rows_committed": total_rows}
+
+        if not checkpoint.get("manifest"):
+          poll_payload: dict | None = None
+          location = checkpoint.get("location")
+          if location:
+            try:
+              poll_payload = await self._poll_report(session, location, headers, 0)
+            except RuntimeError:
+              logging.info(
+                "[AzureBillingImportModule] Stored report location for import %s is no longer valid",
+                import_recid,
               )
-
-            corrected_start = corrected_start_dt.isoformat(timespec="seconds")
-            logging.info(
-              "[AzureBillingImportModule] Auto-corrected Azure Cost Details start date from %s to %s",
-              body["timePeriod"]["start"],
-              corrected_start,
+          if poll_payload is None:
+            location, retry_after = await self._request_report(
+              session,
+              headers,
+              subscription_id,
+              period_start,
+              period_end,
+              metric,
             )
-            body["timePeriod"]["start"] = corrected_start
-        else:
-          raise RuntimeError("Azure Cost Details report request failed with unknown retry state")
-
-        manifest: dict | None = None
-        while True:
-          await asyncio.sleep(retry_after)
-          async with session.get(location, headers=headers) as poll_response:
-            poll_payload = await poll_response.json(content_type=None)
-            if poll_response.status >= 400:
-              raise RuntimeError(
-                "Azure Cost Details poll failed "
-                f"({poll_response.status}): {poll_payload}",
-              )
-            poll_status = (poll_payload.get("status") or "").strip()
-            retry_after = self._parse_retry_after(poll_response.headers.get("Retry-After"))
-            if poll_status == "Completed":
-              manifest = poll_payload.get("manifest") or {}
-              break
-            if poll_status == "Failed":
-              error_payload = poll_payload.get("error") or poll_payload
-              raise RuntimeError(f"Azure Cost Details report failed: {error_payload}")
+            checkpoint["location"] = location
+            await self._save_checkpoint(import_recid, checkpoint, total_rows)
+            poll_payload = await self._poll_report(session, location, headers, retry_after)
+
+          checkpoint.update(
+            manifest=poll_payload.get("manifest") or {},
+            valid_till=poll_payload.get("validTill"),
+            blob_index=0,
+            blob_offset=0,
+          )
+          await self._save_checkpoint(import_recid, checkpoint, total_rows)
 
+        manifest = checkpoint["manifest"]
         blobs = manifest.get("blobs") if isinstance(manifest, dict) else None
         if not isinstance(blobs, list) or not blobs:
           raise RuntimeError("Azure Cost Details manifest missing blobs")
-        blob_link = blobs[0].get("blobLink") if isinstance(blobs[0], dict) else None
-        if not blob_link:
-          raise RuntimeError("Azure Cost Details blob link missing from manifest")
-
-        async with session.get(blob_link) as blob_response:
-          if blob_response.status >= 400:
-            response_text = await blob_response.text()
-            raise RuntimeError(
-              "Azure Cost Details blob download failed "
-              f"({blob_response.status}): {response_text}",
-            )
-          csv_text = await blob_response.text()
-          csv_text = csv_text.lstrip("\ufeff")
 
-      vendor_lookup = await self.db.run(
-        get_vendor_by_name_request(GetVendorByNameParams(element_name="Azure")),
-      )
-      if not vendor_lookup.rows:
-        raise ValueError("Missing finance vendor seed row for Azure")
-      vendors_recid = int(vendor_lookup.rows[0]["recid"])
-
-      csv_reader = csv.DictReader(io.StringIO(csv_text))
-      raw_batch: list[dict[str, object]] = []
-      normalized_batch: list[dict[str, object]] = []
-      for row in csv_reader:
-        clean_row = {key: value for key, value in row.items() if key}
-        raw_batch.append(clean_row)
-        normalized_batch.append(
-          {
-            "element_date": self._to_iso_date(clean_row.get("date")),
-            "element_service": clean_row.get("consumedService"),
-            "element_category": clean_row.get("meterCategory"),
-            "element_description": clean_row.get("meterName"),
-            "element_quantity": self._to_decimal(clean_row.get("quantity")),
-            "element_unit_price": self._to_decimal(clean_row.get("effectivePrice")),
-            "element_amount": self._to_decimal(clean_row.get("costInBillingCurrency")) or "0",
-            "element_currency": clean_row.get("billingCurrency"),
-            "element_raw_json": json.dumps(clean_row),
-          },
-        )
-        if len(raw_batch) >= 100:
-          await self.db.run(
-            insert_cost_detail_batch_request(
-              InsertCostDetailBatchParams(imports_recid=import_recid, rows=raw_batch),
-            ),
-          )
-          await self.db.run(
-            insert_line_items_batch_request(
-              InsertLineItemsBatchParams(
-                imports_recid=import_recid,
-                vendors_recid=vendors_recid,
-                rows=normalized_batch,
-              ),
-            ),
-          )
-          total_rows += len(raw_batch)
-          raw_batch = []
-          normalized_batch = []
-
-      if raw_batch:
-        await self.db.run(
-          insert_cost_detail_batch_request(
-            InsertCostDetailBatchParams(imports_recid=import_recid, rows=raw_batch),
-          ),
-        )
-        await self.db.run(
-          insert_line_items_batch_request(
-            InsertLineItemsBatchParams(
-              imports_recid=import_recid,
-              vendors_recid=vendors_recid,
-              rows=normalized_batch,
-            ),
-          ),
-        )
-        total_rows += len(raw_batch)
+        start_index = int(checkpoint.get("blob_index") or 0)
+        for blob_index in range(start_index, len(blobs)):
+          blob = blobs[blob_index]
+          blob_link = blob.get("blobLink") if isinstance(blob, dict) else None
+          if not blob_link:
+            raise RuntimeError("Azure Cost Details blob link missing from manifest")
+
+          async with session.get(blob_link) as blob_response:
+            if blob_response.status >= 400:
+              response_text = await blob_response.text()
+              if blob_response.status in (403, 404):
+                # The blob link has expired; the next resume regenerates the report.
+                checkpoint.pop("manifest", None)
+                checkpoint.pop("location", None)
+                await self._save_checkpoint(import_recid, checkpoint, total_rows)
+              raise RuntimeError(
+                "Azure Cost Details blob download failed "
+                f"({blob_response.status}): {response_text}",
+              )
+            csv_text = await blob_response.text()
+            csv_text = csv_text.lstrip("\ufeff")
+
+          skip = int(checkpoint.get("blob_offset") or 0) if blob_index == start_index else 0
+          offset = 0
+          occurrences: dict[str, int] = {}
+          raw_batch: list[dict[str, object]] = []
+          normalized_batch: list[dict[str, object]] = []
+          row_hashes: list[str] = []
+          for row in csv.DictReader(io.StringIO(csv_text)):
+            clean_row = {key: value for key, value in row.items() if key}
+            base_hash = self._row_hash(clean_row, 0)
+            occurrence = occurrences.get(base_hash, 0)
+            occurrences[base_hash] = occurrence + 1
+            offset += 1
+            if offset <= skip:
+              continue
+
+            row_hash = base_hash if not (occurrence or blob_index) else self._row_hash(clean_row, occurrence, blob_index)
+            raw_batch.append(clean_row)
+            row_hashes.append(row_hash)
+            normalized_batch.append(
+              {
+                "element_date": self._to_iso_date(clean_row.get("date")),
+                "element_service": clean_row.get("consumedService"),
+                "element_category": clean_row.get("meterCategory"),
+                "element_description": clean_row.get("meterName"),
+                "element_quantity": self._to_decimal(clean_row.get("quantity")),
+                "element_unit_price": self._to_decimal(clean_row.get("effectivePrice")),
+                "element_amount": self._to_decimal(clean_row.get("costInBillingCurrency")) or "0",
+                "element_currency": clean_row.get("billingCurrency"),
+                "element_raw_json": json.dumps(clean_row),
+                "element_row_hash": row_hash,
+              },
+            )
+            if len(raw_batch) >= 100:
+              total_rows += await self._insert_batch(
+                import_recid, vendors_recid, raw_batch, normalized_batch, row_hashes,
+              )
+              checkpoint.update(blob_index=blob_index, blob_offset=offset, rows_committed=total_rows)
+              await self._save_checkpoint(import_recid, checkpoint, total_rows)
+              raw_batch = []
+              normalized_batch = []
+              row_hashes = []
+
+          if raw_batch:
+            total_rows += await self._insert_batch(
+              import_recid, vendors_recid, raw_batch, normalized_batch, row_hashes,
+            )
+          checkpoint.update(blob_index=blob_index + 1, blob_offset=0, rows_committed=total_rows)
+          await self._save_checkpoint(import_recid, checkpoint, total_rows)
 
+      # The manifest holds signed blob links; drop it once every blob is staged.
+      await self._save_checkpoint(import_recid, None, total_rows)
       await self.db.run(
         update_import_status_request(
           UpdateImportStatusParams(
@@ -397,7 +612,7 @@ class AzureCostDetailsProvider(BillingImportProvider):
       }
     except Exception as exc:
       logging.exception("[AzureBillingImportModule] Cost details import failed")
-      if import_recid and self.db:
+      if self.db:
         try:
           await self.db.run(
             update_import_status_request(
@@ -411,4 +626,5 @@ class AzureCostDetailsProvider(BillingImportProvider):
           )
         except Exception:
           logging.exception("[AzureBillingImportModule] Failed to update import failure status")
+      exc.import_recid = import_recid
       raise
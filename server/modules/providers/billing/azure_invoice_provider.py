@@ -5,15 +5,23 @@ from __future__ import annotations
 from calendar import monthrange
 from decimal import Decimal, InvalidOperation
 from datetime import datetime
+import hashlib
 import json
 import logging
 from typing import Any, TYPE_CHECKING
 
 import aiohttp
-from azure.identity.aio import ClientSecretCredential
 
-from queryregistry.finance.staging import create_import_request, update_import_status_request
-from queryregistry.finance.staging.models import CreateImportParams, UpdateImportStatusParams
+from queryregistry.finance.staging import (
+  create_import_request,
+  update_import_checkpoint_request,
+  update_import_status_request,
+)
+from queryregistry.finance.staging.models import (
+  CreateImportParams,
+  UpdateImportCheckpointParams,
+  UpdateImportStatusParams,
+)
 from queryregistry.finance.staging_invoices import get_invoice_by_name_request, insert_invoice_batch_request
 from queryregistry.finance.staging_invoices.models import GetInvoiceByNameParams, InsertInvoiceBatchParams
 from queryregistry.finance.staging_line_items import insert_line_items_batch_request
@@ -22,15 +30,15 @@ from queryregistry.finance.staging_purge_log import check_purged_key_request
 from queryregistry.finance.staging_purge_log.models import CheckPurgedKeyParams
 from queryregistry.finance.vendors import get_vendor_by_name_request
 from queryregistry.finance.vendors.models import GetVendorByNameParams
-from queryregistry.system.config import get_config_request
-from queryregistry.system.config.models import ConfigKeyParams
 
 from ...db_module import DbModule
 from ...env_module import EnvModule
+from ...system_config_module import SystemConfigModule
 from . import BillingImportProvider
 from ...models.finance_statuses import IMPORT_FAILED, IMPORT_PENDING_APPROVAL
 
 if TYPE_CHECKING:  # pragma: no cover
+  from azure.identity.aio import ClientSecretCredential
   from ...billing_import_module import BillingImportModule
 
 
@@ -41,6 +49,7 @@ class AzureInvoiceProvider(BillingImportProvider):
     super().__init__(module)
     self.db: DbModule | None = None
     self.env: EnvModule | None = None
+    self.system_config: SystemConfigModule | None = None
     self._tenant_id: str | None = None
     self._client_id: str | None = None
     self._client_secret: str | None = None
@@ -58,6 +67,8 @@ class AzureInvoiceProvider(BillingImportProvider):
     await self.db.on_ready()
     self.env = self.module.app.state.env
     await self.env.on_ready()
+    self.system_config = self.module.app.state.system_config
+    await self.system_config.on_ready()
 
     self._client_id = await self._load_config("AzureBillingClientId")
     self._tenant_id = await self._load_config("AzureBillingTenantId")
@@ -96,6 +107,7 @@ class AzureInvoiceProvider(BillingImportProvider):
     self._azure_vendor_recid = None
     self.db = None
     self.env = None
+    self.system_config = None
 
   async def run_import(self, **kwargs: Any) -> dict:
     return await self.import_invoices(
@@ -103,13 +115,25 @@ class AzureInvoiceProvider(BillingImportProvider):
       billing_account=kwargs.get("billing_account"),
     )
 
+  async def resume_import(self, import_row: dict) -> dict:
+    """Re-run an interrupted invoice import into the same staging import row.
+
+    Invoices staged by the earlier attempt are kept; their line items are
+    re-sent and skipped by row hash if they were already written.
+    """
+    checkpoint = import_row.get("element_checkpoint") or {}
+    if isinstance(checkpoint, str):
+      checkpoint = json.loads(checkpoint)
+    return await self.import_invoices(
+      period_month=str(import_row["element_period_start"])[:7],
+      billing_account=checkpoint.get("billing_account"),
+      import_recid=int(import_row["recid"]),
+    )
+
   async def _load_config(self, key: str) -> str:
-    if not self.db:
-      raise RuntimeError("AzureInvoiceProvider requires database module")
-    res = await self.db.run(get_config_request(ConfigKeyParams(key=key)))
-    if not res.rows:
-      return ""
-    return res.rows[0].get("element_value") or ""
+    if not self.system_config:
+      raise RuntimeError("AzureInvoiceProvider requires system config module")
+    return self.system_config.get_value(key) or ""
 
   async def _get_management_token(self) -> str:
     if not self.env:
@@ -130,6 +154,8 @@ class AzureInvoiceProvider(BillingImportProvider):
     ):
       if self._credential:
         await self._credential.close()
+      from azure.identity.aio import ClientSecretCredential
+
       self._credential = ClientSecretCredential(
         tenant_id=self._tenant_id,
         client_id=self._client_id,
@@ -233,6 +259,7 @@ class AzureInvoiceProvider(BillingImportProvider):
       description = f"Azure invoice {invoice_name}"
 
     return {
+      "element_row_hash": hashlib.sha256(f"invoice:{invoice_name}".encode("utf-8")).hexdigest(),
       "element_date": AzureInvoiceProvider._to_iso_date(
         properties.get("invoiceDate") or properties.get("dueDate") or properties.get("invoicePeriodEndDate"),
       ),
@@ -286,7 +313,12 @@ class AzureInvoiceProvider(BillingImportProvider):
       "element_raw_json": json.dumps(invoice_payload),
     }
 
-  async def import_invoices(self, period_month: str, billing_account: str | None = None) -> dict[str, Any]:
+  async def import_invoices(
+    self,
+    period_month: str,
+    billing_account: str | None = None,
+    import_recid: int | None = None,
+  ) -> dict[str, Any]:
     if not self.db:
       raise RuntimeError("AzureInvoiceProvider requires database module")
     if not self._subscription_id:
@@ -300,9 +332,9 @@ class AzureInvoiceProvider(BillingImportProvider):
       label = "AzureBillingAccountIdOrg" if billing_account == "org" else "AzureBillingAccountId"
       raise ValueError(f"Azure billing account ID not configured (set {label} in system_config)")
 
-    import_recid: int | None = None
     invoice_count = 0
     skipped_count = 0
+    resumed_count = 0
 
     try:
       parsed_month = datetime.strptime(period_month, "%Y-%m")
@@ -315,20 +347,30 @@ class AzureInvoiceProvider(BillingImportProvider):
     period_end = f"{period_month}-{monthrange(parsed_month.year, parsed_month.month)[1]:02d}"
 
     try:
-      create_res = await self.db.run(
-        create_import_request(
-          CreateImportParams(
-            source="azure_invoices",
-            scope=f"subscriptions/{self._subscription_id}",
-            metric="Invoices",
-            period_start=period_start,
-            period_end=period_end,
+      if import_recid is None:
+        create_res = await self.db.run(
+          create_import_request(
+            CreateImportParams(
+              source="azure_invoices",
+              scope=f"subscriptions/{self._subscription_id}",
+              metric="Invoices",
+              period_start=period_start,
+              period_end=period_end,
+            ),
           ),
-        ),
-      )
-      if not create_res.rows:
-        raise RuntimeError("Failed to create finance staging import record")
-      import_recid = int(create_res.rows[0]["recid"])
+        )
+        if not create_res.rows:
+          raise RuntimeError("Failed to create finance staging import record")
+        import_recid = int(create_res.rows[0]["recid"])
+        await self.db.run(
+          update_import_checkpoint_request(
+            UpdateImportCheckpointParams(
+              recid=import_recid,
+              checkpoint={"billing_account": billing_account},
+              row_count=0,
+            ),
+          ),
+        )
 
       vendor_recid = await self._get_vendor_recid()
       token = await self._get_management_token()
@@ -389,6 +431,11 @@ class AzureInvoiceProvider(BillingImportProvider):
             get_invoice_by_name_request(GetInvoiceByNameParams(invoice_name=invoice_name)),
           )
           if existing.rows:
+            if existing.rows[0].get("imports_recid") == import_recid:
+              # Staged by an earlier attempt of this import.
+              resumed_count += 1
+              line_item_rows.append(self._build_line_item(invoice_name, invoice.get("properties") or {}, invoice))
+              continue
             skipped_count += 1
             logging.info("[AzureInvoiceProvider] Skipping existing invoice_name=%s", invoice_name)
             continue
@@ -439,6 +486,7 @@ class AzureInvoiceProvider(BillingImportProvider):
               InsertInvoiceBatchParams(imports_recid=import_recid, rows=invoice_rows),
             ),
           )
+        if line_item_rows:
           await self.db.run(
             insert_line_items_batch_request(
               InsertLineItemsBatchParams(
@@ -448,7 +496,7 @@ class AzureInvoiceProvider(BillingImportProvider):
               ),
             ),
           )
-          invoice_count = len(invoice_rows)
+          invoice_count = len(invoice_rows) + resumed_count
 
         message = (
           f"Imported {invoice_count} Azure invoice(s) for {period_month}; skipped {skipped_count}."
@@ -492,4 +540,6 @@ class AzureInvoiceProvider(BillingImportProvider):
           )
         except Exception:
           logging.exception("[AzureInvoiceProvider] Failed to update import failure status")
+      if import_recid:
+        exc.import_recid = import_recid
       raise
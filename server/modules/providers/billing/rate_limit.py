@@ -0,0 +1,44 @@
+"""Request budget shared by concurrent billing API calls."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class TokenBucket:
+  """Token bucket that every caller of one API draws from before a request.
+
+  ``defer`` empties the bucket and holds all callers back, for when the API
+  answers with a throttling response and a retry-after hint.
+  """
+
+  def __init__(self, rate_per_second: float, capacity: int):
+    if rate_per_second <= 0:
+      raise ValueError("rate_per_second must be positive")
+    self.rate_per_second = rate_per_second
+    self.capacity = max(1, capacity)
+    self._tokens = float(self.capacity)
+    self._updated = time.monotonic()
+    self._blocked_until = 0.0
+    self._lock = asyncio.Lock()
+
+  async def acquire(self):
+    async with self._lock:
+      while True:
+        now = time.monotonic()
+        if now < self._blocked_until:
+          await asyncio.sleep(self._blocked_until - now)
+          continue
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+        if self._tokens >= 1:
+          self._tokens -= 1
+          return
+        await asyncio.sleep((1 - self._tokens) / self.rate_per_second)
+
+  def defer(self, seconds: float):
+    now = time.monotonic()
+    self._blocked_until = max(self._blocked_until, now + seconds)
+    self._tokens = 0.0
+    self._updated = self._blocked_until
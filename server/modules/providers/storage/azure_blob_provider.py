@@ -7,9 +7,6 @@ import logging
 from typing import Any
 from uuid import UUID
 
-from azure.storage.blob.aio import BlobServiceClient
-from azure.storage.blob import ContentSettings
-
 from . import (
   StorageBlobItem,
   StorageBlobProperties,
@@ -56,6 +53,9 @@ class AzureBlobStorageProvider(StorageProvider):
       raise ValueError("Azure connection string is not configured")
     if not container_name:
       raise ValueError("Azure container name is required")
+    # The blob SDK is imported on first use to keep module import cheap.
+    from azure.storage.blob.aio import BlobServiceClient
+
     service = BlobServiceClient.from_connection_string(self.connection_string)
     container = service.get_container_client(container_name)
     return service, container
@@ -109,6 +109,8 @@ class AzureBlobStorageProvider(StorageProvider):
   async def upload_files(self, request: StorageUploadRequest) -> StorageUploadResponse:
     service, container = await self._open_container(request.container_name)
     container_url = container.url
+    from azure.storage.blob import ContentSettings
+
     results: list[StorageUploadResult] = []
     errors: dict[str, str] = {}
     try:
@@ -5,6 +5,9 @@ from .discord_bot_module import DiscordBotModule
 from queryregistry.content.indexing import list_public_request
 
 class PublicGalleryModule(BaseModule):
+  dependencies = ("db",)
+  optional_dependencies = ("discord_bot",)
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.db: DbModule | None = None
@@ -24,6 +24,9 @@ def _normalize_payload(payload: Any | None) -> list[dict[str, Any]]:
 
 
 class PublicLinksModule(BaseModule):
+  dependencies = ("db",)
+  optional_dependencies = ("discord_bot",)
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.db: DbModule | None = None
@@ -9,6 +9,9 @@ from .db_module import DbModule
 from .discord_bot_module import DiscordBotModule
 
 class PublicUsersModule(BaseModule):
+  dependencies = ("db",)
+  optional_dependencies = ("discord_bot",)
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.db: DbModule | None = None
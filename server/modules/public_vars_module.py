@@ -5,19 +5,24 @@ from . import BaseModule
 from .db_module import DbModule
 from .auth_module import AuthModule
 from .discord_bot_module import DiscordBotModule
-from queryregistry.system.config import get_config_request
-from queryregistry.system.config.models import ConfigKeyParams
+from .system_config_module import SystemConfigModule
 
 class PublicVarsModule(BaseModule):
+  dependencies = ("db", "system_config", "auth")
+  optional_dependencies = ("discord_bot",)
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.db: DbModule | None = None
+    self.system_config: SystemConfigModule | None = None
     self.auth: AuthModule | None = None
     self.discord: DiscordBotModule | None = None
 
   async def startup(self):
     self.db = self.app.state.db
     await self.db.on_ready()
+    self.system_config = self.app.state.system_config
+    await self.system_config.on_ready()
     self.auth = self.app.state.auth
     await self.auth.on_ready()
     self.discord = getattr(self.app.state, "discord_bot", None)
@@ -27,6 +32,7 @@ class PublicVarsModule(BaseModule):
 
   async def shutdown(self):
     self.db = None
+    self.system_config = None
     self.auth = None
 
   async def _run_command(self, *cmd: str):
@@ -42,25 +48,16 @@ class PublicVarsModule(BaseModule):
       return result.stdout, result.stderr
 
   async def get_version(self) -> str:
-    assert self.db
-    res = await self.db.run(get_config_request(ConfigKeyParams(key="version")))
-    if res.rows:
-      return res.rows[0].get("element_value", "")
-    return ""
+    assert self.system_config
+    return self.system_config.get_value("version", "")
 
   async def get_hostname(self) -> str:
-    assert self.db
-    res = await self.db.run(get_config_request(ConfigKeyParams(key="hostname")))
-    if res.rows:
-      return res.rows[0].get("element_value", "")
-    return ""
+    assert self.system_config
+    return self.system_config.get_value("hostname", "")
 
   async def get_repo(self) -> str:
-    assert self.db
-    res = await self.db.run(get_config_request(ConfigKeyParams(key="repo")))
-    if res.rows:
-      return res.rows[0].get("element_value", "")
-    return ""
+    assert self.system_config
+    return self.system_config.get_value("repo", "")
 
   async def get_ffmpeg_version(self) -> str:
     try:
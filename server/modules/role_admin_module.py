@@ -32,6 +32,9 @@ def _normalize_payload(payload: Any | None) -> list[dict[str, Any]]:
 
 
 class RoleAdminModule(BaseModule):
+  dependencies = ("db", "role")
+  optional_dependencies = ("discord_bot",)
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.discord: DiscordBotModule | None = None
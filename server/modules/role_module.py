@@ -22,6 +22,7 @@ from .db_module import DbModule
 
 class RoleModule(BaseModule):
   """Owns system role definitions, user role lookups, and bitmask utilities."""
+  dependencies = ("db",)
 
   def __init__(self, app: FastAPI):
     super().__init__(app)
@@ -44,6 +44,8 @@ class DomainEntry:
 
 
 class RpcdispatchModule(BaseModule):
+  dependencies = ("db",)
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.db: DbModule | None = None
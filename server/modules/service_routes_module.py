@@ -21,6 +21,8 @@ from .models.service_routes import (
 
 
 class ServiceRoutesModule(BaseModule):
+  dependencies = ("db", "auth")
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.db: DbModule | None = None
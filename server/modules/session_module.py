@@ -36,6 +36,9 @@ from queryregistry.models import DBRequest
 
 
 class SessionModule(BaseModule):
+  dependencies = ("auth", "db", "oauth")
+  optional_dependencies = ("discord_bot",)
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.discord: DiscordBotModule | None = None
@@ -15,6 +15,8 @@ if TYPE_CHECKING:  # pragma: no cover
 
 
 class SocialInputModule(BaseModule):
+  optional_dependencies = ("discord_bot",)
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.providers: Dict[str, "SocialInputProvider"] = {}
@@ -26,10 +28,8 @@ class SocialInputModule(BaseModule):
     if self.discord:
       await self.discord.on_ready()
       self.discord.register_social_input_module(self)
-      from .providers.social.discord_input_provider import DiscordInputProvider
-
-      provider = DiscordInputProvider(self, self.discord)
-      await self.register_provider(provider)
+      if self.discord.bot:
+        await self.attach_discord_provider()
     logging.info("[SocialInputModule] loaded providers: %s", list(self.providers.keys()))
     self.mark_ready()
 
@@ -46,6 +46,22 @@ class SocialInputModule(BaseModule):
       self.app.state.social_input = None
     self.discord = None
 
+  async def attach_discord_provider(self):
+    """Register the Discord provider against the bot this worker is running.
+
+    Called at startup and again by ``DiscordBotModule`` when this worker takes
+    over the bot after a leader failover.
+    """
+    existing = self.providers.get("discord")
+    if existing is not None:
+      if getattr(existing, "bot", None) is self.discord.bot:
+        return
+      await existing.shutdown()
+      del self.providers["discord"]
+    from .providers.social.discord_input_provider import DiscordInputProvider
+
+    await self.register_provider(DiscordInputProvider(self, self.discord))
+
   async def register_provider(self, provider: "SocialInputProvider"):
     name = provider.name
     if name in self.providers:
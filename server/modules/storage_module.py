@@ -5,8 +5,6 @@ from typing import Any
 from datetime import datetime, timezone
 from uuid import UUID
 from fastapi import FastAPI
-from queryregistry.system.config.models import ConfigKeyParams
-from queryregistry.system.config import get_config_request
 from queryregistry.content.indexing import (
   count_rows_request,
   delete_cache_folder_request,
@@ -33,6 +31,7 @@ from .auth_module import AuthModule
 from .env_module import EnvModule
 from .db_module import DbModule
 from .discord_bot_module import DiscordBotModule
+from .system_config_module import SystemConfigModule
 from .providers.storage import (
   StorageBlobProperties,
   StorageCreateFolderRequest,
@@ -54,11 +53,14 @@ class StorageModule(BaseModule):
   Database helpers are provided for upserting file metadata and querying
   indexed data.
   """
+  dependencies = ("env", "db", "system_config", "auth")
+  optional_dependencies = ("discord_bot",)
 
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.env: EnvModule | None = None
     self.db: DbModule | None = None
+    self.system_config: SystemConfigModule | None = None
     self.auth: AuthModule | None = None
     self.connection_string: str | None = None
     self.discord: DiscordBotModule | None = None
@@ -69,6 +71,8 @@ class StorageModule(BaseModule):
     await self.env.on_ready()
     self.db = self.app.state.db
     await self.db.on_ready()
+    self.system_config = self.app.state.system_config
+    await self.system_config.on_ready()
     self.auth = self.app.state.auth
     await self.auth.on_ready()
     self.discord = getattr(self.app.state, "discord_bot", None)
@@ -95,6 +99,7 @@ class StorageModule(BaseModule):
       except Exception as exc:
         logging.error("[StorageModule] Provider shutdown failed: %s", exc)
       self.provider = None
+    self.system_config = None
 
   def _require_provider(self) -> AzureBlobStorageProvider | None:
     if not self.provider:
@@ -103,11 +108,10 @@ class StorageModule(BaseModule):
     return self.provider
 
   async def _get_container_name(self) -> str | None:
-    if not self.db:
-      logging.error("[StorageModule] Database module unavailable")
+    if not self.system_config:
+      logging.error("[StorageModule] System config module unavailable")
       return None
-    res = await self.db.run(get_config_request(ConfigKeyParams(key="AzureBlobContainerName")))
-    container_name = res.rows[0]["element_value"] if res.rows else None
+    container_name = self.system_config.get_value("AzureBlobContainerName")
     if not container_name:
       logging.error("[StorageModule] AzureBlobContainerName missing")
     return container_name
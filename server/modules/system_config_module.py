@@ -1,47 +1,171 @@
 from __future__ import annotations
-import logging
+import asyncio, logging
+from typing import Awaitable, Callable
 from fastapi import FastAPI
 from queryregistry.system.config.models import ConfigKeyParams, UpsertConfigParams
 from queryregistry.system.config import (
   delete_config_request,
+  get_config_checksum_request,
   get_configs_request,
   upsert_config_request,
 )
 from . import BaseModule
 from .db_module import DbModule
-from .discord_bot_module import DiscordBotModule
+from server.helpers.logging import update_logging_level
 from server.modules.models.system_config import (
   SystemConfigDeleteResult,
   SystemConfigItem,
   SystemConfigList,
 )
 
+DEFAULT_REFRESH_SECONDS = 60
+
+ConfigListener = Callable[[set[str]], Awaitable[None]]
+
+
 class SystemConfigModule(BaseModule):
+  """Owns the in-memory ``system_config`` snapshot used by every module.
+
+  Reads are served from memory. The snapshot is refreshed by local writes and
+  by a periodic checksum comparison that picks up changes made elsewhere.
+  Listeners registered with ``add_listener`` receive the set of changed keys.
+  """
+  dependencies = ("db",)
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.db: DbModule | None = None
-    self.discord: DiscordBotModule | None = None
+    self.refresh_seconds: int = DEFAULT_REFRESH_SECONDS
+    self._values: dict[str, str] = {}
+    self._checksum: tuple | None = None
+    self._listeners: list[ConfigListener] = []
+    self._refresh_task: asyncio.Task | None = None
+    self._reload_lock = asyncio.Lock()
 
   async def startup(self):
     self.db = self.app.state.db
     await self.db.on_ready()
-    self.discord = getattr(self.app.state, "discord_bot", None)
-    if self.discord:
-      await self.discord.on_ready()
+    await self.reload()
+    self.refresh_seconds = self.get_int("SystemConfigRefreshSeconds", DEFAULT_REFRESH_SECONDS)
+    self.add_listener(self._on_logging_level_changed)
+    if self.refresh_seconds > 0:
+      self._refresh_task = asyncio.create_task(self._refresh_loop())
     self.mark_ready()
 
   async def shutdown(self):
+    if self._refresh_task:
+      self._refresh_task.cancel()
+      try:
+        await self._refresh_task
+      except asyncio.CancelledError:
+        pass
+      self._refresh_task = None
+    self._listeners.clear()
     self.db = None
 
+  def get_value(self, key: str, default: str | None = None) -> str | None:
+    value = self._values.get(key)
+    return default if value is None else value
+
+  def get_int(self, key: str, default: int) -> int:
+    value = self._values.get(key)
+    if value is None or value == "":
+      return default
+    try:
+      return int(value)
+    except (TypeError, ValueError):
+      logging.warning("[SystemConfigModule] Invalid integer config %s=%s", key, value)
+      return default
+
+  def add_listener(self, listener: ConfigListener):
+    self._listeners.append(listener)
+
+  async def _notify(self, changed: set[str]):
+    if not changed:
+      return
+    for listener in list(self._listeners):
+      try:
+        await listener(changed)
+      except Exception:
+        logging.exception("[SystemConfigModule] Config listener failed for keys %s", sorted(changed))
+
+  async def _load_checksum(self) -> tuple:
+    res = await self.db.run(get_config_checksum_request())
+    row = res.rows[0] if res.rows else {}
+    return (row.get("element_count"), row.get("element_checksum"))
+
+  async def reload(self) -> set[str]:
+    """Reload the snapshot from the database and return the keys that changed."""
+    async with self._reload_lock:
+      checksum = await self._load_checksum()
+      res = await self.db.run(get_configs_request())
+      values = {
+        row.get("element_key", ""): row.get("element_value")
+        for row in res.rows
+        if row.get("element_key")
+      }
+      changed = {
+        key
+        for key in set(self._values) | set(values)
+        if self._values.get(key) != values.get(key)
+      }
+      self._values = values
+      self._checksum = checksum
+    logging.debug("[SystemConfigModule] Loaded %d config values (%d changed)", len(values), len(changed))
+    await self._notify(changed)
+    return changed
+
+  async def check_version(self) -> bool:
+    """Reload when the stored checksum differs from the snapshot; return True on reload."""
+    checksum = await self._load_checksum()
+    if checksum == self._checksum:
+      return False
+    await self.reload()
+    return True
+
+  async def _refresh_loop(self):
+    while True:
+      await asyncio.sleep(self.refresh_seconds)
+      try:
+        await self.check_version()
+      except asyncio.CancelledError:
+        raise
+      except Exception:
+        logging.exception("[SystemConfigModule] Periodic config refresh failed")
+
+  async def _on_logging_level_changed(self, changed: set[str]):
+    if "LoggingLevel" not in changed or not self.db:
+      return
+    self.db.logging_level = self.get_int("LoggingLevel", 0)
+    update_logging_level(self.db.logging_level)
+
+  async def set_value(self, key: str, value: str):
+    await self.db.run(
+      upsert_config_request(UpsertConfigParams(key=key, value=value)),
+    )
+    previous = self._values.get(key)
+    self._values[key] = value
+    self._checksum = None
+    if previous != value:
+      await self._notify({key})
+
+  async def remove_value(self, key: str):
+    await self.db.run(
+      delete_config_request(ConfigKeyParams(key=key)),
+    )
+    self._checksum = None
+    if self._values.pop(key, None) is not None:
+      await self._notify({key})
+
   async def get_configs(self, user_guid: str, roles: list[str]) -> SystemConfigList:
     logging.debug("[system_config_get_configs_v1] user=%s roles=%s", user_guid, roles)
-    res = await self.db.run(get_configs_request())
+    await self.reload()
     items = [
       SystemConfigItem(
-        key=row.get("element_key", ""),
-        value=row.get("element_value", ""),
+        key=key,
+        value=value or "",
       )
-      for row in res.rows
+      for key, value in sorted(self._values.items())
     ]
     logging.debug(
       "[system_config_get_configs_v1] returning %d items",
@@ -57,9 +181,7 @@ class SystemConfigModule(BaseModule):
       key,
       value,
     )
-    await self.db.run(
-      upsert_config_request(UpsertConfigParams(key=key, value=value)),
-    )
+    await self.set_value(key, value)
     logging.debug(
       "[system_config_upsert_config_v1] upserted config %s",
       key,
@@ -73,9 +195,7 @@ class SystemConfigModule(BaseModule):
       roles,
       key,
     )
-    await self.db.run(
-      delete_config_request(ConfigKeyParams(key=key)),
-    )
+    await self.remove_value(key)
     logging.debug(
       "[system_config_delete_config_v1] deleted config %s",
       key,
@@ -10,6 +10,9 @@ from queryregistry.finance.credits import set_credits_request
 
 
 class UserAdminModule(BaseModule):
+  dependencies = ("db",)
+  optional_dependencies = ("discord_bot",)
+
   def __init__(self, app: FastAPI):
     super().__init__(app)
     self.discord: DiscordBotModule | None = None
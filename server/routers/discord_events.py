@@ -7,11 +7,10 @@
 import logging
 from typing import TYPE_CHECKING
 
-from discord.ext import commands
-from queryregistry.system.config import get_config_request
-from queryregistry.system.config.models import ConfigKeyParams
+from server.modules.discord_message_buffer import BufferedMessage
 
 if TYPE_CHECKING:  # pragma: no cover - runtime import cycle guard
+  from discord.ext import commands
   from server.modules.discord_bot_module import DiscordBotModule
 
 
@@ -23,17 +22,16 @@ def register_discord_event_handlers(bot_module: "DiscordBotModule") -> None:
 
   _register_on_ready_handler(bot_module, bot)
   _register_on_guild_join_handler(bot_module, bot)
+  _register_message_buffer_listeners(bot_module, bot)
 
 
-def _register_on_ready_handler(bot_module: "DiscordBotModule", bot: commands.Bot) -> None:
+def _register_on_ready_handler(bot_module: "DiscordBotModule", bot: "commands.Bot") -> None:
   @bot.event
   async def on_ready():
     channel = bot.get_channel(bot_module.syschan)
     if channel:
-      res = await bot_module.db.run(get_config_request(ConfigKeyParams(key="Version")))
-      version = res.rows[0]["element_value"] if res.rows else None
-      name_res = await bot_module.db.run(get_config_request(ConfigKeyParams(key="BotName")))
-      bot_name = name_res.rows[0]["element_value"] if name_res.rows else None
+      version = bot_module.system_config.get_value("Version")
+      bot_name = bot_module.system_config.get_value("BotName")
       msg = f"{(bot_name or 'TheOracleGPT-Dev')} Online. Version: {version or 'unknown'}"
       if await bot_module._try_send_channel(channel.id, msg):
         logging.info(msg)
@@ -47,7 +45,7 @@ def _register_on_ready_handler(bot_module: "DiscordBotModule", bot: commands.Bot
       logging.warning("[DiscordProvider] System channel not found on ready.")
 
 
-def _register_on_guild_join_handler(bot_module: "DiscordBotModule", bot: commands.Bot) -> None:
+def _register_on_guild_join_handler(bot_module: "DiscordBotModule", bot: "commands.Bot") -> None:
   @bot.event
   async def on_guild_join(guild):
     channel = bot.get_channel(bot_module.syschan)
@@ -55,3 +53,33 @@ def _register_on_guild_join_handler(bot_module: "DiscordBotModule", bot: command
       logging.info(f"Joined guild {guild.name} ({guild.id})")
     else:
       logging.warning(f"[DiscordProvider] System channel not found when joining {guild.name}.")
+
+
+def _register_message_buffer_listeners(bot_module: "DiscordBotModule", bot: "commands.Bot") -> None:
+  # Listeners rather than @bot.event so command processing in on_message is kept.
+  async def on_ready():
+    if bot_module.message_buffer:
+      bot_module.message_buffer.reset()
+
+  async def on_message(message):
+    if bot_module.message_buffer and getattr(message, "guild", None) is not None:
+      bot_module.message_buffer.add(message.channel.id, BufferedMessage.from_message(message))
+
+  async def on_raw_message_edit(payload):
+    content = (payload.data or {}).get("content")
+    if bot_module.message_buffer and content is not None:
+      bot_module.message_buffer.edit(payload.channel_id, payload.message_id, content)
+
+  async def on_raw_message_delete(payload):
+    if bot_module.message_buffer:
+      bot_module.message_buffer.delete(payload.channel_id, [payload.message_id])
+
+  async def on_raw_bulk_message_delete(payload):
+    if bot_module.message_buffer:
+      bot_module.message_buffer.delete(payload.channel_id, payload.message_ids)
+
+  bot.add_listener(on_ready, "on_ready")
+  bot.add_listener(on_message, "on_message")
+  bot.add_listener(on_raw_message_edit, "on_raw_message_edit")
+  bot.add_listener(on_raw_message_delete, "on_raw_message_delete")
+  bot.add_listener(on_raw_bulk_message_delete, "on_raw_bulk_message_delete")
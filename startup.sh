@@ -10,4 +10,16 @@
 
 # Start the FastAPI app
 #exec python -m uvicorn main:app --host 0.0.0.0 --port 8000
+# WEB_CONCURRENCY > 1 serves HTTP from several gunicorn workers. Singleton duties
+# (Discord bot, async task ticks, batch job scheduling) run on whichever worker
+# holds the leader lease in system_leases.
+WORKERS="${WEB_CONCURRENCY:-1}"
+if [ "$WORKERS" -gt 1 ]; then
+  exec python -m gunicorn main:app \
+    --worker-class uvicorn.workers.UvicornWorker \
+    --workers "$WORKERS" \
+    --bind 0.0.0.0:8000 \
+    --timeout 180 \
+    --graceful-timeout 30
+fi
 python -m uvicorn main:app --host 0.0.0.0 --port 8000
@@ -162,6 +162,20 @@ class DemoPipelineHandler(PipelineHandler):
     return {"b": context["a"] + 1}
 
 
+class SlowPipelineHandler(PipelineHandler):
+  def __init__(self):
+    self.release = asyncio.Event()
+    self.steps = [("wait", self._wait)]
+
+  async def _wait(self, app, payload, context):
+    await self.release.wait()
+    return {"done": True}
+
+
+async def _drain_pipeline_runs(module: AsyncTaskModule):
+  await asyncio.gather(*(run for _, run in list(module._pipeline_runs.values())))
+
+
 async def _build_module() -> AsyncTaskModule:
   app = FastAPI()
   app.state.db = FakeDbModule()
@@ -204,7 +218,9 @@ async def _test_pipeline_failure_and_retry():
 
     await module.tick_once()
     await module.tick_once()
+    await _drain_pipeline_runs(module)
     await module.tick_once()
+    await _drain_pipeline_runs(module)
     failed = await module.get_task(task["guid"])
     assert failed["status"] == STATUS_FAILED
     assert failed["current_step"] == "step_b"
@@ -256,3 +272,58 @@ async def _test_timeout_detection():
     assert timed_out["status"] == STATUS_TIMED_OUT
   finally:
     await module.shutdown()
+
+
+def test_pipeline_steps_run_outside_the_tick():
+  asyncio.run(_test_pipeline_steps_run_outside_the_tick())
+
+
+async def _test_pipeline_steps_run_outside_the_tick():
+  module = await _build_module()
+  try:
+    slow = SlowPipelineHandler()
+    module.register_handler("test.slow", slow)
+    module.register_handler("test.callback", DemoCallbackHandler())
+    slow_task = await module.submit_task("test.slow", {}, "rpc", "req-5", None, 30, None, 0)
+    await module.tick_once()
+    await module.tick_once()
+
+    # The slow step is still running, yet later ticks start other tasks and skip it.
+    callback_task = await module.submit_task("test.callback", {}, "rpc", "req-6", None, 30, None, 0)
+    await asyncio.wait_for(module.tick_once(), timeout=1)
+    assert (await module.get_task(callback_task["guid"]))["status"] == STATUS_WAITING_CALLBACK
+    assert len(module._pipeline_runs) == 1
+
+    slow.release.set()
+    await _drain_pipeline_runs(module)
+    completed = await module.get_task(slow_task["guid"])
+    assert completed["status"] == STATUS_COMPLETED
+    assert completed["result"] == {"done": True}
+  finally:
+    await module.shutdown()
+
+
+def test_pipeline_runs_respect_handler_concurrency():
+  asyncio.run(_test_pipeline_runs_respect_handler_concurrency())
+
+
+async def _test_pipeline_runs_respect_handler_concurrency():
+  module = await _build_module()
+  try:
+    slow = SlowPipelineHandler()
+    slow.max_concurrency = 1
+    module.register_handler("test.slow", slow)
+    first = await module.submit_task("test.slow", {}, "rpc", "req-7", None, 30, None, 0)
+    second = await module.submit_task("test.slow", {}, "rpc", "req-8", None, 30, None, 0)
+    await module.tick_once()
+    await module.tick_once()
+    assert len(module._pipeline_runs) == 1
+
+    slow.release.set()
+    await _drain_pipeline_runs(module)
+    await module.tick_once()
+    await _drain_pipeline_runs(module)
+    assert (await module.get_task(first["guid"]))["status"] == STATUS_COMPLETED
+    assert (await module.get_task(second["guid"]))["status"] == STATUS_COMPLETED
+  finally:
+    await module.shutdown()
@@ -6,6 +6,7 @@ import pytest
 
 from server.modules.providers.billing import azure_cost_details_provider as azure_mod
 from server.modules.providers.billing.azure_cost_details_provider import AzureCostDetailsProvider
+from server.modules.providers.billing.rate_limit import TokenBucket
 
 
 class _FakeResponse:
@@ -58,7 +59,7 @@ class _FakeDb:
       return SimpleNamespace(rows=[{"recid": 77}])
     if self.calls == 2:
       return SimpleNamespace(rows=[{"recid": 9}])
-    return SimpleNamespace(rows=[])
+    return SimpleNamespace(rows=[], rowcount=0)
 
 
 def _build_module(monkeypatch, session_factory):
@@ -74,6 +75,7 @@ def _build_module(monkeypatch, session_factory):
   module._credential_tenant_id = None
   module._credential_client_id = None
   module._credential_client_secret = None
+  module._rate_limiter = TokenBucket(100.0, 10)
 
   async def _fake_token():
     return "token-abc"
@@ -145,7 +147,7 @@ def test_import_cost_details_raises_immediately_for_non_matching_400(monkeypatch
     lambda: _FakeClientSession(post_responses, [], post_bodies),
   )
 
-  with pytest.raises(RuntimeError, match="Azure Cost Details report request failed"):
+  with pytest.raises(RuntimeError, match="Azure Cost Details report request failed") as exc_info:
     asyncio.run(
       module.import_cost_details(
         period_start="2024-01-01T00:00:00",
@@ -154,11 +156,13 @@ def test_import_cost_details_raises_immediately_for_non_matching_400(monkeypatch
     )
 
   assert len(post_bodies) == 1
+  assert exc_info.value.import_recid == 77
 
 
 class _RecordingDb:
-  def __init__(self):
+  def __init__(self, staged_hashes=()):
     self.requests = []
+    self.staged_hashes = set(staged_hashes)
 
   async def run(self, request):
     self.requests.append(request)
@@ -166,10 +170,14 @@ class _RecordingDb:
       return SimpleNamespace(rows=[{"recid": 77}])
     if request.op == "db:finance:vendors:get_vendor_by_name:1":
       return SimpleNamespace(rows=[{"recid": 9}])
+    if request.op == "db:finance:staging:insert_cost_detail_batch:1":
+      new_hashes = [row_hash for row_hash in request.payload["row_hashes"] if row_hash not in self.staged_hashes]
+      self.staged_hashes.update(new_hashes)
+      return SimpleNamespace(rows=[], rowcount=len(new_hashes))
     if request.op in (
-      "db:finance:staging:insert_cost_detail_batch:1",
       "db:finance:staging_line_items:insert_line_items_batch:1",
       "db:finance:staging:update_import_status:1",
+      "db:finance:staging:update_import_checkpoint:1",
     ):
       return SimpleNamespace(rows=[])
     raise AssertionError(f"unexpected op {request.op}")
@@ -251,3 +259,191 @@ def test_cost_details_decimal_and_date_helpers_preserve_precision_and_iso_dates(
   assert AzureCostDetailsProvider._to_iso_date("02/04/2026") == "2026-02-04"
   assert AzureCostDetailsProvider._to_iso_date("2026-02-04T12:34:56Z") == "2026-02-04"
   assert AzureCostDetailsProvider._to_iso_date("2026-02-04") == "2026-02-04"
+
+
+def test_resume_import_continues_from_checkpointed_blob_offset(monkeypatch):
+  post_bodies = []
+  get_responses = [
+    _FakeResponse(
+      200,
+      text_data=(
+        "date,consumedService,costInBillingCurrency\n"
+        "2024-01-02,Microsoft.Sql,1.0\n"
+        "2024-01-03,Microsoft.Sql,2.0\n"
+      ),
+    ),
+    _FakeResponse(
+      200,
+      text_data="date,consumedService,costInBillingCurrency\n2024-01-04,Microsoft.Web,3.0\n",
+    ),
+  ]
+
+  module = _build_module(
+    monkeypatch,
+    lambda: _FakeClientSession([], get_responses, post_bodies),
+  )
+  module.db = _RecordingDb()
+
+  result = asyncio.run(
+    module.resume_import(
+      {
+        "recid": 77,
+        "element_period_start": "2024-01-01",
+        "element_period_end": "2024-01-31",
+        "element_metric": "ActualCost",
+        "element_checkpoint": {
+          "location": "https://poll.example",
+          "manifest": {
+            "blobs": [{"blobLink": "https://blob.example/1"}, {"blobLink": "https://blob.example/2"}],
+          },
+          "blob_index": 0,
+          "blob_offset": 1,
+          "rows_committed": 1,
+        },
+      },
+    )
+  )
+
+  assert result == {"import_recid": 77, "status": "completed", "row_count": 3}
+  assert post_bodies == []
+
+  cost_detail_inserts = [
+    request
+    for request in module.db.requests
+    if request.op == "db:finance:staging:insert_cost_detail_batch:1"
+  ]
+  assert [request.payload["rows"][0]["date"] for request in cost_detail_inserts] == [
+    "2024-01-03",
+    "2024-01-04",
+  ]
+  assert all(len(request.payload["row_hashes"]) == 1 for request in cost_detail_inserts)
+
+  line_item_insert = next(
+    request
+    for request in module.db.requests
+    if request.op == "db:finance:staging_line_items:insert_line_items_batch:1"
+  )
+  assert line_item_insert.payload["rows"][0]["element_row_hash"] == cost_detail_inserts[0].payload["row_hashes"][0]
+
+  checkpoints = [
+    request.payload
+    for request in module.db.requests
+    if request.op == "db:finance:staging:update_import_checkpoint:1"
+  ]
+  assert checkpoints[0]["checkpoint"]["blob_index"] == 1
+  assert checkpoints[0]["row_count"] == 2
+  assert checkpoints[-1] == {"recid": 77, "checkpoint": None, "row_count": 3}
+  assert module.db.requests[-1].payload["row_count"] == 3
+
+
+def test_cost_detail_row_hash_distinguishes_identical_rows():
+  row = {"date": "2024-01-02", "costInBillingCurrency": "1.0"}
+
+  first = AzureCostDetailsProvider._row_hash(row, 0)
+
+  assert first == AzureCostDetailsProvider._row_hash(dict(reversed(list(row.items()))), 0)
+  assert first != AzureCostDetailsProvider._row_hash(row, 1)
+  assert first != AzureCostDetailsProvider._row_hash(row, 0, 1)
+  assert AzureCostDetailsProvider._row_hash(row, 1, 1) != AzureCostDetailsProvider._row_hash(row, 1)
+  assert len(first) == 64
+
+
+def test_resume_import_stages_identical_rows_from_different_blobs(monkeypatch):
+  csv_text = "date,consumedService,costInBillingCurrency\n2024-01-02,Microsoft.Sql,1.0\n"
+  get_responses = [_FakeResponse(200, text_data=csv_text), _FakeResponse(200, text_data=csv_text)]
+  module = _build_module(monkeypatch, lambda: _FakeClientSession([], get_responses, []))
+  module.db = _RecordingDb()
+
+  result = asyncio.run(
+    module.resume_import(
+      {
+        "recid": 77,
+        "element_period_start": "2024-01-01",
+        "element_period_end": "2024-01-31",
+        "element_metric": "ActualCost",
+        "element_checkpoint": {
+          "manifest": {
+            "blobs": [{"blobLink": "https://blob.example/1"}, {"blobLink": "https://blob.example/2"}],
+          },
+        },
+      },
+    )
+  )
+
+  assert result == {"import_recid": 77, "status": "completed", "row_count": 2}
+
+
+def test_import_cost_details_backs_off_when_throttled(monkeypatch):
+  post_bodies = []
+  post_responses = [
+    _FakeResponse(
+      429,
+      headers={"x-ms-ratelimit-microsoft.costmanagement-qpu-retry-after": "7"},
+    ),
+    _FakeResponse(
+      202,
+      headers={"Location": "https://poll.example", "Retry-After": "1"},
+    ),
+  ]
+  get_responses = [
+    _FakeResponse(
+      200,
+      json_data={
+        "status": "Completed",
+        "manifest": {"blobs": [{"blobLink": "https://blob.example"}]},
+      },
+    ),
+    _FakeResponse(200, text_data="date,costInBillingCurrency\n2024-01-02,1.0\n"),
+  ]
+
+  module = _build_module(
+    monkeypatch,
+    lambda: _FakeClientSession(post_responses, get_responses, post_bodies),
+  )
+  module.db = _RecordingDb()
+  deferred = []
+  monkeypatch.setattr(module._rate_limiter, "defer", deferred.append)
+
+  result = asyncio.run(
+    module.import_cost_details(
+      period_start="2024-01-01",
+      period_end="2024-01-31",
+      subscription_id="sub-456",
+    )
+  )
+
+  assert result["status"] == "completed"
+  assert deferred == [7]
+  assert len(post_bodies) == 2
+  create = module.db.requests[0]
+  assert create.payload["scope"] == "subscriptions/sub-456"
+
+
+def test_resume_import_counts_only_rows_the_insert_reports_as_new(monkeypatch):
+  csv_text = "date,consumedService,costInBillingCurrency\n2024-01-02,Microsoft.Sql,1.0\n2024-01-03,Microsoft.Sql,2.0\n"
+  get_responses = [_FakeResponse(200, text_data=csv_text)]
+  module = _build_module(monkeypatch, lambda: _FakeClientSession([], get_responses, []))
+  already_staged = AzureCostDetailsProvider._row_hash(
+    {"date": "2024-01-02", "consumedService": "Microsoft.Sql", "costInBillingCurrency": "1.0"},
+    0,
+  )
+  module.db = _RecordingDb(staged_hashes=[already_staged])
+
+  result = asyncio.run(
+    module.resume_import(
+      {
+        "recid": 77,
+        "element_period_start": "2024-01-01",
+        "element_period_end": "2024-01-31",
+        "element_metric": "ActualCost",
+        "element_checkpoint": {
+          "manifest": {"blobs": [{"blobLink": "https://blob.example/1"}]},
+          "blob_index": 0,
+          "blob_offset": 0,
+          "rows_committed": 1,
+        },
+      },
+    )
+  )
+
+  assert result == {"import_recid": 77, "status": "completed", "row_count": 2}
@@ -64,6 +64,7 @@ class _RecordingDb:
       "db:finance:staging_invoices:insert_invoice_batch:1",
       "db:finance:staging_line_items:insert_line_items_batch:1",
       "db:finance:staging:update_import_status:1",
+      "db:finance:staging:update_import_checkpoint:1",
     ):
       return SimpleNamespace(rows=[])
     raise AssertionError(f"unexpected op {request.op}")
@@ -184,6 +185,68 @@ def test_import_invoices_uses_invoices_list_and_normalizes_invoice_rows(monkeypa
   assert status_update.payload["row_count"] == 1
 
 
+def test_resume_import_keeps_invoices_staged_by_earlier_attempt(monkeypatch):
+  get_calls = []
+  invoices_list_payload = {
+    "value": [
+      {"name": "INV-STAGED", "properties": {"invoiceDate": "2025-04-30T00:00:00Z"}},
+      {"name": "INV-NEW", "properties": {"invoiceDate": "2025-04-29T00:00:00Z"}},
+    ],
+  }
+  responses = [
+    _FakeResponse(200, text_data=json.dumps(invoices_list_payload)),
+  ]
+
+  provider = _build_provider(
+    monkeypatch,
+    lambda: _FakeClientSession(responses, get_calls),
+  )
+  provider._billing_account_id_org = "org-billing-acct-456"
+  recording_run = provider.db.run
+
+  async def _run(request):
+    if (
+      request.op == "db:finance:staging_invoices:get_invoice_by_name:1"
+      and request.payload["invoice_name"] == "INV-STAGED"
+    ):
+      provider.db.requests.append(request)
+      return SimpleNamespace(rows=[{"imports_recid": 88, "element_invoice_name": "INV-STAGED"}])
+    return await recording_run(request)
+
+  provider.db.run = _run
+
+  result = asyncio.run(
+    provider.resume_import(
+      {
+        "recid": 88,
+        "element_period_start": "2025-04-01",
+        "element_checkpoint": {"billing_account": "org"},
+      },
+    )
+  )
+
+  assert result["invoice_count"] == 2
+  assert result["skipped_count"] == 0
+  assert get_calls[0]["url"].endswith("/billingAccounts/org-billing-acct-456/invoices")
+  ops = [request.op for request in provider.db.requests]
+  assert "db:finance:staging:create_import:1" not in ops
+
+  invoice_insert = next(
+    request
+    for request in provider.db.requests
+    if request.op == "db:finance:staging_invoices:insert_invoice_batch:1"
+  )
+  assert [row["element_invoice_name"] for row in invoice_insert.payload["rows"]] == ["INV-NEW"]
+
+  line_item_insert = next(
+    request
+    for request in provider.db.requests
+    if request.op == "db:finance:staging_line_items:insert_line_items_batch:1"
+  )
+  assert len(line_item_insert.payload["rows"]) == 2
+  assert all(len(row["element_row_hash"]) == 64 for row in line_item_insert.payload["rows"])
+
+
 def test_import_invoices_rejects_invalid_period_month(monkeypatch):
   provider = _build_provider(monkeypatch, lambda: _FakeClientSession([], []))
   provider._billing_account_id = "billing-acct-123"
@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+from server.jobs.billing_backfill import (
+  IMPORT_PERIOD_HANDLER,
+  BillingBackfillHandler,
+  BillingBackfillPayload,
+  BillingImportPeriodHandler,
+)
+
+
+def test_plan_periods_expands_months_and_subscriptions():
+  payload = BillingBackfillPayload(
+    start_month="2023-12",
+    end_month="2024-01",
+    subscriptions=["sub-a", "sub-b"],
+  ).model_dump()
+
+  context = asyncio.run(BillingBackfillHandler.plan_periods(None, payload, {}))
+
+  assert [(run["subscription_id"], run["period_start"], run["period_end"]) for run in context["runs"]] == [
+    ("sub-a", "2023-12-01", "2023-12-31"),
+    ("sub-b", "2023-12-01", "2023-12-31"),
+    ("sub-a", "2024-01-01", "2024-01-31"),
+    ("sub-b", "2024-01-01", "2024-01-31"),
+  ]
+
+
+def test_backfill_payload_rejects_reversed_range():
+  with pytest.raises(ValidationError):
+    BillingBackfillPayload(start_month="2024-03", end_month="2024-01")
+
+
+class _AsyncTasks:
+  def __init__(self):
+    self.submitted = []
+
+  async def submit_task(self, handler_name, payload, **kwargs):
+    self.submitted.append((handler_name, payload, kwargs["max_retries"]))
+    return {"guid": f"task-{len(self.submitted)}"}
+
+
+class _BillingImport:
+  def __init__(self):
+    self.created = []
+    self.resumed = []
+
+  async def on_ready(self):
+    return None
+
+  async def create_import(self, provider_name, **kwargs):
+    self.created.append((provider_name, kwargs))
+    return 42
+
+  async def resume_import(self, imports_recid):
+    self.resumed.append(imports_recid)
+    return {"import_recid": imports_recid, "status": "completed", "row_count": 10}
+
+
+def test_queue_imports_submits_one_task_per_run():
+  async_task = _AsyncTasks()
+  app = SimpleNamespace(state=SimpleNamespace(async_task=async_task))
+  runs = [
+    {"subscription_id": "sub-a", "period_start": "2024-01-01", "period_end": "2024-01-31", "metric": "ActualCost"},
+    {"subscription_id": "sub-b", "period_start": "2024-01-01", "period_end": "2024-01-31", "metric": "ActualCost"},
+  ]
+
+  result = asyncio.run(BillingBackfillHandler.queue_imports(app, {}, {"runs": runs}))
+
+  assert [handler_name for handler_name, _, _ in async_task.submitted] == [IMPORT_PERIOD_HANDLER] * 2
+  assert [imported["task_guid"] for imported in result["imports"]] == ["task-1", "task-2"]
+  assert result["imports"][1]["subscription_id"] == "sub-b"
+
+
+def test_import_period_records_the_import_before_ingesting_and_resumes_it():
+  billing_import = _BillingImport()
+  app = SimpleNamespace(state=SimpleNamespace(billing_import=billing_import))
+  payload = {"subscription_id": "sub-a", "period_start": "2024-01-01", "period_end": "2024-01-31", "metric": "ActualCost"}
+
+  context = asyncio.run(BillingImportPeriodHandler.create_import(app, payload, {}))
+  assert context == {"import_recid": 42}
+  assert billing_import.resumed == []
+
+  # A retried or re-run step keeps the recorded import instead of creating another.
+  assert asyncio.run(BillingImportPeriodHandler.create_import(app, payload, context)) == {}
+  result = asyncio.run(BillingImportPeriodHandler.ingest(app, payload, context))
+
+  assert billing_import.created == [("azure_cost_details", payload)]
+  assert billing_import.resumed == [42]
+  assert result == {"status": "completed", "row_count": 10}
@@ -14,14 +14,13 @@ def test_create_journal_uses_pipeline_config_values():
     async def on_ready(self):
       return None
 
-    async def list_periods(self):
-      return [
-        {
-          "guid": "period-guid",
-          "start_date": "2025-01-01",
-          "end_date": "2025-01-31",
-        }
-      ]
+    async def get_period_for_date(self, on_date):
+      assert on_date.isoformat() == "2025-01-15"
+      return {
+        "guid": "period-guid",
+        "start_date": "2025-01-01",
+        "end_date": "2025-01-31",
+      }
 
     async def get_pipeline_config(self, pipeline: str, key: str) -> str:
       requested_configs.append((pipeline, key))
@@ -81,3 +80,127 @@ def test_create_journal_uses_pipeline_config_values():
   assert created_payload["lines"][1]["accounts_guid"] == "ap-guid"
 
 
+
+
+def test_classify_costs_matches_rules_in_memory():
+  requested_ops: list[str] = []
+  rules = [
+    {
+      "recid": 1,
+      "vendors_recid": None,
+      "element_service_pattern": "*",
+      "element_meter_pattern": None,
+      "accounts_guid": "catch-all-guid",
+      "account_number": "6900",
+      "account_name": "Other",
+      "element_priority": 0,
+      "element_status": 1,
+    },
+    {
+      "recid": 2,
+      "vendors_recid": None,
+      "element_service_pattern": "Microsoft.Sql",
+      "element_meter_pattern": None,
+      "accounts_guid": "sql-generic-guid",
+      "account_number": "6100",
+      "account_name": "Databases",
+      "element_priority": 0,
+      "element_status": 1,
+    },
+    {
+      "recid": 3,
+      "vendors_recid": 7,
+      "element_service_pattern": "microsoft.sql",
+      "element_meter_pattern": "SQL*",
+      "accounts_guid": "sql-vendor-guid",
+      "account_number": "6110",
+      "account_name": "Azure SQL",
+      "element_priority": 0,
+      "element_status": 1,
+    },
+    {
+      "recid": 4,
+      "vendors_recid": 7,
+      "element_service_pattern": "Microsoft.Sql",
+      "element_meter_pattern": None,
+      "accounts_guid": "inactive-guid",
+      "account_number": "6120",
+      "account_name": "Retired",
+      "element_priority": 99,
+      "element_status": 0,
+    },
+  ]
+  aggregates = [
+    {
+      "element_service": "Microsoft.Sql",
+      "element_category": "SQL Database",
+      "element_record_type": "usage",
+      "element_total_amount": "4.00000",
+      "element_row_count": 3,
+      "vendors_recid": 7,
+    },
+    {
+      "element_service": "Microsoft.Sql",
+      "element_category": "Storage",
+      "element_record_type": "usage",
+      "element_total_amount": "1.00000",
+      "element_row_count": 1,
+      "vendors_recid": 7,
+    },
+    {
+      "element_service": "Microsoft.Cache",
+      "element_category": "Redis",
+      "element_record_type": "usage",
+      "element_total_amount": "2.00000",
+      "element_row_count": 2,
+      "vendors_recid": 7,
+    },
+  ]
+
+  class _Db:
+    async def on_ready(self):
+      return None
+
+    async def run(self, request):
+      requested_ops.append(request.op)
+      if request.op == "db:finance:staging_line_items:aggregate_line_items:1":
+        return SimpleNamespace(rows=aggregates)
+      if request.op == "db:finance:staging_account_map:list_account_map:1":
+        return SimpleNamespace(rows=rules)
+      raise AssertionError(f"Unexpected op: {request.op}")
+
+  class _Finance:
+    async def on_ready(self):
+      return None
+
+  app = SimpleNamespace(state=SimpleNamespace(db=_Db(), finance=_Finance()))
+
+  result = asyncio.run(BillingImportPipelineHandler.classify_costs(app, {}, {"imports_recid": 42}))
+
+  assert [row["accounts_guid"] for row in result["classified_costs"]] == [
+    "sql-vendor-guid",
+    "sql-generic-guid",
+    "catch-all-guid",
+  ]
+  assert [warning["service"] for warning in result["warnings"]] == ["Microsoft.Cache"]
+  assert len(requested_ops) == 2
+
+
+def test_validate_import_reads_only_the_requested_import():
+  requests = []
+
+  class _Db:
+    async def on_ready(self):
+      return None
+
+    async def run(self, request):
+      requests.append((request.op, dict(request.payload)))
+      return SimpleNamespace(rows=[{"recid": 42, "element_status": 1, "element_row_count": 3}])
+
+  app = SimpleNamespace(state=SimpleNamespace(db=_Db()))
+
+  result = asyncio.run(BillingImportPipelineHandler.validate_import(app, {"imports_recid": 42}, {}))
+
+  assert requests == [("db:finance:staging:get_import:1", {"recid": 42})]
+  assert result["imports_recid"] == 42
+  assert result["import_metadata"]["element_row_count"] == 3
@@ -400,6 +400,53 @@ def test_summarize_channel_handler():
   chat_services.unbox_request = original
 
 
+def test_summarize_channel_handler_hands_off_to_the_leader_without_the_bot():
+  from server.modules.discord_bot_module import DiscordBotUnavailableError
+
+  class NoBotModule(StubModule):
+    async def summarize_and_deliver(self, guild_id, channel_id, hours, user_id):
+      raise DiscordBotUnavailableError("Discord bot is not connected on this worker")
+
+  class StubAsyncTasks:
+    def __init__(self):
+      self.submitted = []
+
+    async def on_ready(self):
+      pass
+
+    async def submit_task(self, handler_name, payload, **kwargs):
+      self.submitted.append((handler_name, payload, kwargs["source_type"]))
+      return {'guid': 'task-1'}
+
+  app = FastAPI()
+  app.state.discord_chat = NoBotModule()
+  app.state.async_task = StubAsyncTasks()
+
+  async def fake_unbox(request):
+    return (
+      RPCRequest(op='urn:discord:chat:summarize_channel:1', payload={'guild_id': 1, 'channel_id': 2, 'user_id': '3'}),
+      AuthContext(),
+      [],
+    )
+
+  original = chat_services.unbox_request
+  chat_services.unbox_request = fake_unbox
+
+  @app.post('/rpc')
+  async def rpc_endpoint(request: Request):
+    return await chat_services.discord_chat_summarize_channel_v1(request)
+
+  try:
+    resp = TestClient(app).post('/rpc', json={'op': 'urn:discord:chat:summarize_channel:1'})
+  finally:
+    chat_services.unbox_request = original
+  assert resp.status_code == 200
+  assert resp.json()['payload']['task_guid'] == 'task-1'
+  assert app.state.async_task.submitted == [
+    ('discord.chat.summarize_and_deliver', {'guild_id': 1, 'channel_id': 2, 'hours': 1, 'user_id': 3}, 'discord'),
+  ]
+
+
 def test_persona_response_handler():
   app = FastAPI()
   module = StubOpenAIModule()
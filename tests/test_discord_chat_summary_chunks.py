@@ -0,0 +1,103 @@
+import asyncio
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import server.modules.discord_chat_module as chat_mod
+from server.helpers.tokens import count_tokens, count_tokens_batch
+from server.modules.discord_chat_module import DiscordChatModule
+
+
+def _lines(start, end):
+  return [f"user{i % 5}: message number {i} about topic {i * 7 % 13}" for i in range(start, end)]
+
+
+class FakeOpenai:
+  def __init__(self):
+    self.calls = []
+
+  async def on_ready(self):
+    return None
+
+  async def get_persona_definition(self, name):
+    return {"prompt": "summarize persona", "model": "gpt-test", "tokens": 200}
+
+  async def generate_chat(self, **kwargs):
+    self.calls.append(kwargs)
+    return {"content": f"summary {len(self.calls)}", "model": "gpt-test", "role": "assistant"}
+
+
+def _build_module(openai):
+  module = DiscordChatModule.__new__(DiscordChatModule)
+  module.app = SimpleNamespace(state=SimpleNamespace(openai=openai))
+  module._chunk_summaries = OrderedDict()
+  return module
+
+
+def test_chunk_lines_respects_budget_and_realigns_on_overlap():
+  module = _build_module(None)
+  lines = _lines(0, 1000)
+
+  chunks = module.chunk_lines(lines, 600)
+  shifted = module.chunk_lines(lines[37:], 600)
+
+  assert "\n".join(chunks).split("\n") == lines
+  assert all(sum(count_tokens_batch(chunk.split("\n"))) <= 600 for chunk in chunks)
+  # Dropping older messages only changes the leading chunks.
+  assert len(set(chunks[2:]) & set(shifted)) >= len(chunks) - 3
+
+
+def test_summarize_chat_map_reduces_and_reuses_chunk_summaries(monkeypatch):
+  openai = FakeOpenai()
+  module = _build_module(openai)
+  monkeypatch.setattr(chat_mod, "SUMMARY_CHUNK_TOKENS", 600)
+  windows = [_lines(0, 1000), _lines(37, 1020)]
+
+  async def fake_summarize_channel(guild_id, channel_id, hours, max_messages):
+    lines = windows.pop(0)
+    blob = "\n".join(lines)
+    return {
+      "messages_collected": len(lines),
+      "token_count_estimate": count_tokens(blob),
+      "raw_text_blob": blob,
+      "lines": lines,
+      "cap_hit": False,
+    }
+
+  module.summarize_channel = fake_summarize_channel
+
+  first = asyncio.run(module.summarize_chat(1, 2, 24))
+  first_calls = len(openai.calls)
+  final = openai.calls[-1]
+  assert first["summary_text"] == f"summary {first_calls}"
+  assert final["system_prompt"] == "summarize persona"
+  assert final["max_tokens"] == 200
+  assert final["user_prompt"].startswith("Summaries of consecutive parts")
+  assert all(call["system_prompt"] == chat_mod.SUMMARY_CHUNK_PROMPT for call in openai.calls[:-1])
+
+  asyncio.run(module.summarize_chat(1, 2, 24))
+  second_calls = len(openai.calls) - first_calls
+  assert second_calls < first_calls / 2
+
+
+def test_summarize_chat_sends_small_histories_in_one_request():
+  openai = FakeOpenai()
+  module = _build_module(openai)
+  lines = _lines(0, 10)
+
+  async def fake_summarize_channel(guild_id, channel_id, hours, max_messages):
+    blob = "\n".join(lines)
+    return {
+      "messages_collected": len(lines),
+      "token_count_estimate": count_tokens(blob),
+      "raw_text_blob": blob,
+      "lines": lines,
+      "cap_hit": False,
+    }
+
+  module.summarize_channel = fake_summarize_channel
+
+  result = asyncio.run(module.summarize_chat(1, 2, 1))
+
+  assert len(openai.calls) == 1
+  assert openai.calls[0]["user_prompt"] == "\n".join(lines)
+  assert result["summary_text"] == "summary 1"
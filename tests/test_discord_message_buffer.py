@@ -0,0 +1,146 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from server.modules.discord_chat_module import DiscordChatModule
+from server.modules.discord_message_buffer import BufferedMessage, ChannelMessageBuffer
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _message(message_id, minutes, content=None):
+  return BufferedMessage(
+    message_id=message_id,
+    author_name=f"user{message_id}",
+    display_name=f"User {message_id}",
+    content=content or f"message {message_id}",
+    created_at=START + timedelta(minutes=minutes),
+  )
+
+
+def test_buffer_is_not_covering_until_gateway_session_starts():
+  buffer = ChannelMessageBuffer()
+  buffer.add(10, _message(1, 1))
+
+  assert buffer.covered_since(10) is None
+  assert buffer.read(10, START) == []
+
+  buffer.reset(START)
+  assert buffer.covered_since(10) == START
+  assert buffer.covered_since(99) == START
+
+
+def test_buffer_applies_edits_and_deletes():
+  buffer = ChannelMessageBuffer()
+  buffer.reset(START)
+  for message_id in range(1, 4):
+    buffer.add(10, _message(message_id, message_id))
+
+  buffer.edit(10, 2, "edited")
+  buffer.delete(10, [3])
+
+  assert [(m.message_id, m.content) for m in buffer.read(10, START)] == [(1, "message 1"), (2, "edited")]
+  assert [m.message_id for m in buffer.read(10, START + timedelta(minutes=1))] == [2]
+
+
+def test_buffer_without_spill_moves_coverage_past_dropped_messages():
+  buffer = ChannelMessageBuffer(capacity=2)
+  buffer.reset(START)
+  for message_id in range(1, 4):
+    buffer.add(10, _message(message_id, message_id))
+
+  # REST pages before covered_since exclusively, so the dropped message must fall before it.
+  assert buffer.covered_since(10) == START + timedelta(minutes=1, milliseconds=1)
+  assert [m.message_id for m in buffer.read(10, START)] == [2, 3]
+
+
+def test_buffer_spills_old_messages_into_compressed_segments():
+  buffer = ChannelMessageBuffer(capacity=10, spill_bytes=1_000_000)
+  buffer.reset(START)
+  for message_id in range(1, 251):
+    buffer.add(10, _message(message_id, message_id))
+
+  buffer.edit(10, 5, "edited after spill")
+  buffer.delete(10, [6])
+  messages = buffer.read(10, START)
+
+  assert buffer.covered_since(10) == START
+  assert len(messages) == 249
+  assert messages[4].content == "edited after spill"
+  assert [m.message_id for m in messages[:6]] == [1, 2, 3, 4, 5, 7]
+
+
+def test_buffer_evicts_least_recent_channel_and_remembers_when():
+  buffer = ChannelMessageBuffer(max_channels=1)
+  buffer.reset(START)
+  buffer.add(10, _message(1, 1))
+  buffer.add(20, _message(2, 2))
+
+  assert buffer.read(10, START) == []
+  assert buffer.covered_since(10) > START
+  assert buffer.covered_since(20) == START
+
+
+class _History:
+  def __init__(self, messages, calls):
+    self._messages = messages
+    self._calls = calls
+
+  def history(self, **kwargs):
+    self._calls.append(kwargs)
+    messages = list(self._messages)
+
+    async def _iter():
+      for message in messages:
+        yield message
+
+    return _iter()
+
+
+def _chat_module(buffer, channel):
+  module = DiscordChatModule.__new__(DiscordChatModule)
+  guild = SimpleNamespace(get_channel=lambda _channel_id: channel)
+  module.discord = SimpleNamespace(
+    bot=SimpleNamespace(get_guild=lambda _guild_id: guild),
+    message_buffer=buffer,
+  )
+  return module
+
+
+def test_fetch_channel_history_serves_covered_window_from_buffer():
+  now = datetime.now(timezone.utc)
+  buffer = ChannelMessageBuffer()
+  buffer.reset(now - timedelta(hours=2))
+  buffer.add(10, BufferedMessage(1, "alice", "Alice", "hi", now - timedelta(minutes=5)))
+  calls = []
+  module = _chat_module(buffer, _History([], calls))
+
+  result = asyncio.run(module.fetch_channel_history_backwards(1, 10, hours=1, max_messages=200))
+
+  assert [m.content for m in result["messages"]] == ["hi"]
+  assert calls == []
+
+
+def test_fetch_channel_history_pages_rest_only_for_uncovered_gap():
+  now = datetime.now(timezone.utc)
+  covered = now - timedelta(minutes=10)
+  buffer = ChannelMessageBuffer()
+  buffer.reset(covered)
+  buffer.add(10, BufferedMessage(3, "alice", "Alice", "new", now - timedelta(minutes=1)))
+  older = [
+    SimpleNamespace(
+      id=2,
+      author=SimpleNamespace(name="bob", display_name="Bob"),
+      content="older",
+      created_at=now - timedelta(minutes=20),
+    ),
+  ]
+  calls = []
+  module = _chat_module(buffer, _History(older, calls))
+
+  result = asyncio.run(module.fetch_channel_history_backwards(1, 10, hours=1, max_messages=200))
+
+  assert [m.content for m in result["messages"]] == ["older", "new"]
+  assert calls[0]["before"] == covered
+  assert calls[0]["limit"] == 199
+  assert result["cap_hit"] is False
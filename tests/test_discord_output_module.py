@@ -0,0 +1,175 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from server.modules.discord_output_module import DiscordOutputModule
+
+
+class FakeTarget:
+  def __init__(self, target_id, log, fail_with=None):
+    self.target_id = target_id
+    self.log = log
+    self.fail_with = list(fail_with or [])
+
+  async def send(self, chunk):
+    if self.fail_with:
+      raise self.fail_with.pop(0)
+    await asyncio.sleep(0)
+    self.log.append((self.target_id, chunk))
+
+
+def _build_module(targets):
+  module = DiscordOutputModule(SimpleNamespace(state=SimpleNamespace()))
+  module.configure_message_window(10)
+
+  async def resolve(target_id):
+    return targets[target_id]
+
+  module._resolve_channel = resolve
+  module._resolve_user = resolve
+  return module
+
+
+async def _stop(module):
+  await module.shutdown()
+
+
+def test_long_message_does_not_block_other_channels():
+  async def run():
+    log = []
+    module = _build_module({1: FakeTarget(1, log), 2: FakeTarget(2, log)})
+    module.configure_route_limit(100, 0.0)
+    module._start_workers()
+    await module.queue_channel_message(1, "\n".join(f"line {i:04d}" for i in range(6)))
+    await module.send_to_channel(2, "hello")
+    delivered_before = [target for target, _ in log]
+    await module.wait_for_drain()
+    await _stop(module)
+    return log, delivered_before
+
+  log, delivered_before = asyncio.run(run())
+  assert [chunk for target, chunk in log if target == 1] == [f"line {i:04d}" for i in range(6)]
+  assert delivered_before.count(2) == 1
+  assert delivered_before.count(1) < 6
+
+
+def test_route_bucket_spaces_chunks_per_destination():
+  async def run():
+    log = []
+    module = _build_module({1: FakeTarget(1, log), 2: FakeTarget(2, log)})
+    module.configure_route_limit(2, 0.05)
+    module._start_workers()
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await module.queue_channel_message(1, "\n".join(f"chunk {i:03d}" for i in range(5)))
+    await module.queue_user_message(2, "dm")
+    await module.wait_for_drain()
+    elapsed = loop.time() - started
+    snapshot = await module.get_throughput_snapshot()
+    await _stop(module)
+    return log, elapsed, snapshot
+
+  log, elapsed, snapshot = asyncio.run(run())
+  assert [chunk for target, chunk in log if target == 1] == [f"chunk {i:03d}" for i in range(5)]
+  assert log.index((2, "dm")) < 3
+  assert elapsed >= 0.1
+  assert snapshot["aggregate"]["messages"] == 2
+  assert snapshot["aggregate"]["queued"] == 0
+  assert snapshot["channels"][1]["queued"] == 0
+  assert snapshot["channels"][1]["last_latency"] >= 0.1
+  assert snapshot["users"][2]["messages"] == 1
+
+
+def test_rate_limit_errors_are_retried_and_other_failures_surface():
+  class RateLimited(Exception):
+    retry_after = 0.01
+
+  async def run():
+    log = []
+    module = _build_module({
+      1: FakeTarget(1, log, fail_with=[RateLimited()]),
+      2: FakeTarget(2, log, fail_with=[RuntimeError("boom")]),
+    })
+    module._start_workers()
+    await module.send_to_channel(1, "retried")
+    with pytest.raises(RuntimeError):
+      await module.send_to_channel(2, "lost")
+    snapshot = await module.get_throughput_snapshot()
+    await _stop(module)
+    return log, snapshot
+
+  log, snapshot = asyncio.run(run())
+  assert log == [(1, "retried")]
+  assert snapshot["aggregate"]["queued"] == 0
+  assert 2 not in snapshot["channels"]
+
+
+class FakeStreamMessage:
+  def __init__(self, channel, content):
+    self.channel = channel
+    self.content = content
+
+  async def edit(self, content):
+    self.content = content
+    self.channel.events.append(("edit", content))
+
+
+class FakeStreamChannel:
+  def __init__(self):
+    self.events = []
+    self.messages = []
+
+  async def send(self, chunk):
+    message = FakeStreamMessage(self, chunk)
+    self.messages.append(message)
+    self.events.append(("send", chunk))
+    return message
+
+
+def test_stream_posts_early_then_edits_and_rolls_over(monkeypatch):
+  import server.modules.discord_output_module as output_mod
+
+  monkeypatch.setattr(output_mod, "STREAM_EDIT_INTERVAL", 0.0)
+  channel = FakeStreamChannel()
+
+  async def run():
+    module = _build_module({5: channel})
+    module.configure_route_limit(100, 0.0)
+
+    async def deltas():
+      for piece in ["Hel", "lo ", "world ", "and ", "more ", "words"]:
+        channel.events.append(("delta", piece))
+        yield piece
+
+    text = await module.stream_to_channel(5, deltas())
+    snapshot = await module.get_throughput_snapshot()
+    return text, snapshot
+
+  text, snapshot = asyncio.run(run())
+  assert text == "Hello world and more words"
+  assert channel.events[:2] == [("delta", "Hel"), ("send", "Hel")]
+  assert ("edit", "Hello") in channel.events
+  final_chunks = DiscordOutputModule._yield_chunks(text, 10)
+  assert len(final_chunks) > 1
+  assert [message.content for message in channel.messages] == final_chunks
+  assert snapshot["channels"][5]["messages"] == 1
+
+
+def test_stream_throttles_edits_of_the_live_chunk():
+  channel = FakeStreamChannel()
+
+  async def run():
+    module = _build_module({5: channel})
+    module.configure_message_window(100)
+    module.configure_route_limit(100, 0.0)
+
+    async def deltas():
+      for piece in ["a", "b", "c", "d"]:
+        yield piece
+
+    return await module.stream_to_channel(5, deltas())
+
+  assert asyncio.run(run()) == "abcd"
+  # Intermediate edits are skipped inside the interval; the final edit lands.
+  assert channel.events == [("send", "a"), ("edit", "abcd")]
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import asyncio
+from datetime import date
 
 import pytest
+from fastapi import FastAPI
 
 from queryregistry.models import DBResponse
 from server.modules.finance_module import FinanceModule
+from server.modules.models.finance_statuses import JOURNAL_POSTED
+
+
+def _finance_module() -> FinanceModule:
+  return FinanceModule(FastAPI())
 
 
 def test_generate_calendar_creates_16_periods_for_standard_year():
@@ -179,7 +186,7 @@ def test_create_journal_allows_open_month_close_period():
           },
         ],
       )
-    if request.op == "db:finance:journals:update_status:1":
+    if request.op == "db:finance:journals:post:1":
       return DBResponse(
         op=request.op,
         rows=[{
@@ -270,6 +277,67 @@ def test_create_and_post_system_journal_blocks_non_open_period_status():
     )
 
 
+def test_post_journal_rejects_journal_posted_concurrently():
+  module = _finance_module()
+  requests: list[str] = []
+
+  async def fake_get_journal(recid: int):
+    return {"recid": recid, "status": 0, "periods_guid": "period-guid"}
+
+  async def fake_get_period(guid: str):
+    return {"guid": guid, "status": 1, "close_type": 0}
+
+  async def fake_get_journal_lines(recid: int):
+    return [
+      {"debit": "10.00000", "credit": "0.00000"},
+      {"debit": "0.00000", "credit": "10.00000"},
+    ]
+
+  class FakeDb:
+    async def run(self, request):
+      requests.append(request.op)
+      assert request.payload["recid"] == 10
+      return DBResponse(op=request.op, rows=[])
+
+  module.db = FakeDb()
+  module.get_journal = fake_get_journal
+  module.get_period = fake_get_period
+  module.get_journal_lines = fake_get_journal_lines
+
+  with pytest.raises(ValueError, match="posted or changed by another request"):
+    asyncio.run(FinanceModule.post_journal(module, 10, posted_by="user-guid"))
+
+  assert requests == ["db:finance:journals:post:1"]
+
+
+def test_reconcile_trial_balance_returns_mismatched_totals():
+  module = _finance_module()
+  payloads: list[dict] = []
+
+  class FakeDb:
+    async def run(self, request):
+      assert request.op == "db:finance:reporting:reconcile_trial_balance:1"
+      payloads.append(dict(request.payload))
+      return DBResponse(
+        op=request.op,
+        rows=[{
+          "period_guid": "period-guid",
+          "account_guid": "expense-guid",
+          "view_debit": "10.00000",
+          "view_credit": "0.00000",
+          "table_debit": "0.00000",
+          "table_credit": "0.00000",
+        }],
+      )
+
+  module.db = FakeDb()
+
+  mismatches = asyncio.run(FinanceModule.reconcile_trial_balance(module, fiscal_year=2026))
+
+  assert payloads == [{"fiscal_year": 2026, "period_guid": None}]
+  assert [row["account_guid"] for row in mismatches] == ["expense-guid"]
+
+
 def test_next_formatted_number_rolls_over_to_next_series():
   calls: list[str] = []
 
@@ -344,7 +412,7 @@ def test_next_formatted_number_rolls_over_to_next_series():
         )
       raise AssertionError(f"Unhandled op: {request.op}")
 
-  module = FinanceModule.__new__(FinanceModule)
+  module = _finance_module()
   module.db = FakeDb()
 
   formatted, recid = asyncio.run(
@@ -355,6 +423,48 @@ def test_next_formatted_number_rolls_over_to_next_series():
   assert recid == 22
 
 
+def test_next_formatted_number_hands_out_reserved_block_and_refills_ahead():
+  reservations: list[int] = []
+
+  class FakeDb:
+    def __init__(self):
+      self.last_number = 0
+
+    async def run(self, request):
+      assert request.op == "db:finance:numbers:next_number_by_scope:1"
+      await asyncio.sleep(0)
+      start = self.last_number + 1
+      self.last_number += 4
+      reservations.append(start)
+      return DBResponse(
+        op=request.op,
+        rows=[{
+          "recid": 30,
+          "element_prefix": "JRN",
+          "element_block_start": start,
+          "element_block_end": self.last_number,
+          "element_allocation_size": 4,
+          "element_series_number": 1,
+          "element_pattern": "JRN-GEN-{series:03d}-{number:08d}",
+        }],
+      )
+
+  module = _finance_module()
+  module.db = FakeDb()
+
+  async def run():
+    results = await asyncio.gather(
+      *(FinanceModule._next_formatted_number(module, "JRN", "general") for _ in range(6))
+    )
+    return [formatted for formatted, _ in results]
+
+  numbers = asyncio.run(run())
+
+  assert sorted(numbers) == [f"JRN-GEN-001-{n:08d}" for n in range(1, 7)]
+  # Two blocks cover six numbers; the third was reserved ahead once block two was half used.
+  assert reservations == [1, 5, 9]
+
+
 def test_create_journal_uses_scope_based_sequence_lookup():
   class FakeDb:
     async def run(self, request):
@@ -575,3 +685,296 @@ def test_purchase_enablement_updates_user_enablements():
     "transaction_token": "STUB-999",
   }
   assert calls == [("user-guid", 1)]
+
+
+class _ConsumeDb:
+  def __init__(self, outcome: dict):
+    self.outcome = outcome
+    self.requests = []
+
+  async def run(self, request):
+    self.requests.append(request)
+    if request.op == "db:finance:credit_lots:consume_fifo:1":
+      return DBResponse(rows=[self.outcome], rowcount=1)
+    return DBResponse(rowcount=1)
+
+
+def test_consume_credits_uses_single_fifo_call_without_journal():
+  module = _finance_module()
+  module.db = _ConsumeDb({
+    "success": True,
+    "credits_available": 120,
+    "credits_consumed": 100,
+    "wallet_balance": 20,
+    "lots": [
+      {"lots_recid": 1, "events_recid": 11, "source_type": "grant", "unit_price": 0, "credits": 40},
+      {"lots_recid": 2, "events_recid": 12, "source_type": "purchase", "unit_price": 0.01, "credits": 60},
+    ],
+  })
+
+  result = asyncio.run(
+    FinanceModule.consume_credits(module, users_guid="user-guid", credits_needed=100, service_type="chat")
+  )
+
+  assert [request.op for request in module.db.requests] == ["db:finance:credit_lots:consume_fifo:1"]
+  assert module.db.requests[0].payload["description"] == "chat"
+  assert result["lots_affected"] == 2
+  assert result["journal_recid"] is None
+  assert result["wallet_balance"] == 20
+  assert [lot["credits"] for lot in result["lots"]] == [40, 60]
+
+
+def test_recognize_consumed_revenue_posts_one_journal_per_user_hour():
+  rows = [
+    {"recid": 1, "lots_recid": 5, "users_guid": "aaaaaaaa-1", "element_credits": 60, "element_unit_price": "0.01000", "element_created_on": "2026-10-19T13:05:00+00:00"},
+    {"recid": 2, "lots_recid": 5, "users_guid": "aaaaaaaa-1", "element_credits": 40, "element_unit_price": "0.01000", "element_created_on": "2026-10-19T13:55:00+00:00"},
+    {"recid": 3, "lots_recid": 6, "users_guid": "bbbbbbbb-2", "element_credits": 10, "element_unit_price": "0.02000", "element_created_on": "2026-10-19T13:10:00+00:00"},
+    {"recid": 4, "lots_recid": 5, "users_guid": "aaaaaaaa-1", "element_credits": 5, "element_unit_price": "0.01000", "element_created_on": "2026-10-19T14:01:00+00:00"},
+  ]
+
+  class _RecognitionDb:
+    def __init__(self):
+      self.requests = []
+
+    async def run(self, request):
+      self.requests.append(request)
+      if request.op == "db:finance:credit_lots:list_unrecognized_consumption:1":
+        return DBResponse(rows=rows, rowcount=len(rows))
+      return DBResponse(rowcount=1)
+
+  module = _finance_module()
+  module.db = _RecognitionDb()
+  journals: list[dict] = []
+
+  async def fake_get_pipeline_config(pipeline: str, key: str):
+    assert pipeline == "credit_consumption"
+    return {"deferred_revenue_account_number": "2100", "revenue_account_number": "4010"}[key]
+
+  async def fake_get_account_guid_by_number(number: str):
+    return f"acct-{number}"
+
+  async def fake_create_and_post_system_journal(**kwargs):
+    journals.append(kwargs)
+    return {"recid": 100 + len(journals)}
+
+  async def fake_get_period_for_date(on_date):
+    return {"guid": f"period-{on_date[:7]}", "status": 1}
+
+  module.get_pipeline_config = fake_get_pipeline_config
+  module._get_account_guid_by_number = fake_get_account_guid_by_number
+  module.create_and_post_system_journal = fake_create_and_post_system_journal
+  module.get_period_for_date = fake_get_period_for_date
+
+  summary = asyncio.run(
+    FinanceModule.recognize_consumed_revenue(module, before="2026-10-19T15:20:00+00:00")
+  )
+
+  assert summary == {"journals_created": 3, "events_recognized": 4, "groups_skipped": 0, "revenue": "1.25000"}
+  assert module.db.requests[0].payload["before"] == "2026-10-19T15:00:00+00:00"
+  assert [journal["source_id"] for journal in journals] == ["aaaaaaaa-1", "bbbbbbbb-2", "aaaaaaaa-1"]
+  assert [journal["posting_key"] for journal in journals] == [
+    "REV-CONSUME-aaaaaaaa-1-2026101913",
+    "REV-CONSUME-bbbbbbbb-2-2026101913",
+    "REV-CONSUME-aaaaaaaa-1-2026101914",
+  ]
+  assert {journal["periods_guid"] for journal in journals} == {"period-2026-10"}
+  assert journals[0]["lines"][0] == {
+    "line_number": 1,
+    "accounts_guid": "acct-2100",
+    "debit": "1.00000",
+    "credit": "0",
+    "description": journals[0]["description"],
+  }
+  assert journals[0]["lines"][1]["accounts_guid"] == "acct-4010"
+  links = [request.payload for request in module.db.requests if request.op.endswith(":link_events_journal:1")]
+  assert links == [
+    {"events_recids": [1, 2], "journals_recid": 101},
+    {"events_recids": [3], "journals_recid": 102},
+    {"events_recids": [4], "journals_recid": 103},
+  ]
+
+
+def test_recognize_consumed_revenue_uses_the_period_of_the_consumption_hour():
+  rows = [
+    {"recid": 1, "lots_recid": 5, "users_guid": "aaaaaaaa-1", "element_credits": 10, "element_unit_price": "0.01000", "element_created_on": "2026-10-31T23:50:00+00:00", "element_hour": "2026-10-31T23"},
+    {"recid": 2, "lots_recid": 5, "users_guid": "aaaaaaaa-1", "element_credits": 10, "element_unit_price": "0.01000", "element_created_on": "2026-11-01T00:10:00+00:00", "element_hour": "2026-11-01T00"},
+    {"recid": 3, "lots_recid": 6, "users_guid": "bbbbbbbb-2", "element_credits": 10, "element_unit_price": "0.01000", "element_created_on": "2026-09-01T00:10:00+00:00", "element_hour": "2026-09-01T00"},
+  ]
+
+  class _Db:
+    def __init__(self):
+      self.requests = []
+
+    async def run(self, request):
+      self.requests.append(request)
+      if request.op == "db:finance:credit_lots:list_unrecognized_consumption:1":
+        return DBResponse(rows=rows, rowcount=len(rows))
+      return DBResponse(rowcount=1)
+
+  module = _finance_module()
+  module.db = _Db()
+  journals: list[dict] = []
+
+  async def fake_get_pipeline_config(pipeline: str, key: str):
+    return key
+
+  async def fake_get_account_guid_by_number(number: str):
+    return f"acct-{number}"
+
+  async def fake_get_period_for_date(on_date):
+    if on_date.startswith("2026-09"):
+      return None
+    return {"guid": f"period-{on_date[:7]}", "status": 1}
+
+  async def fake_create_and_post_system_journal(**kwargs):
+    journals.append(kwargs)
+    return {"recid": 100 + len(journals)}
+
+  module.get_pipeline_config = fake_get_pipeline_config
+  module._get_account_guid_by_number = fake_get_account_guid_by_number
+  module.get_period_for_date = fake_get_period_for_date
+  module.create_and_post_system_journal = fake_create_and_post_system_journal
+
+  summary = asyncio.run(FinanceModule.recognize_consumed_revenue(module, before="2026-11-01T02:00:00+00:00"))
+
+  assert [journal["periods_guid"] for journal in journals] == ["period-2026-10", "period-2026-11"]
+  assert summary["journals_created"] == 2
+  assert summary["groups_skipped"] == 1
+  links = [request.payload["events_recids"] for request in module.db.requests if request.op.endswith(":link_events_journal:1")]
+  assert links == [[1], [2]]
+
+
+def test_create_and_post_system_journal_reuses_a_posted_posting_key():
+  module = _finance_module()
+  posted: list[int] = []
+
+  async def fake_create_journal(**kwargs):
+    assert kwargs["posting_key"] == "REV-CONSUME-user-2026101913"
+    return {"recid": 42, "status": JOURNAL_POSTED}
+
+  async def fake_post_journal(recid, posted_by=None):
+    posted.append(recid)
+    return {"recid": recid, "status": JOURNAL_POSTED}
+
+  module.create_journal = fake_create_journal
+  module.post_journal = fake_post_journal
+
+  journal = asyncio.run(FinanceModule.create_and_post_system_journal(
+    module,
+    name="REV",
+    posting_key="REV-CONSUME-user-2026101913",
+    lines=[],
+  ))
+
+  assert journal["recid"] == 42
+  assert posted == []
+
+
+def test_list_unrecognized_consumption_limits_whole_user_hour_groups(monkeypatch):
+  import queryregistry.finance.credit_lots.mssql as credit_lots_mssql
+
+  captured = {}
+
+  async def fake_run_json_many(sql, params=()):
+    captured["sql"] = sql
+    captured["params"] = params
+    return DBResponse(rows=[])
+
+  monkeypatch.setattr(credit_lots_mssql, "run_json_many", fake_run_json_many)
+
+  asyncio.run(credit_lots_mssql.list_unrecognized_consumption_v1({"before": "2026-10-19T15:00:00+00:00", "limit": 10}))
+
+  assert "GROUP BY users_guid, element_hour" in captured["sql"]
+  assert "SELECT TOP (?) users_guid, element_hour" in captured["sql"]
+  assert list(captured["params"]) == ["2026-10-19T15:00:00+00:00", 10]
+
+
+def test_consume_credits_reports_shortfall_without_follow_up_writes():
+  module = _finance_module()
+  module.db = _ConsumeDb({"success": False, "credits_available": 30, "credits_consumed": 0, "lots": []})
+
+  with pytest.raises(ValueError, match="needed 50, available 30"):
+    asyncio.run(FinanceModule.consume_credits(module, users_guid="user-guid", credits_needed=50))
+
+  assert [request.op for request in module.db.requests] == ["db:finance:credit_lots:consume_fifo:1"]
+
+
+def test_reference_cache_indexes_accounts_and_periods_until_invalidated():
+  class FakeDb:
+    def __init__(self):
+      self.ops: list[str] = []
+      self.accounts = [{"element_guid": "ACCT-1", "element_number": "2100", "element_name": "Deferred"}]
+
+    async def run(self, request):
+      self.ops.append(request.op)
+      if request.op == "db:finance:accounts:list:1":
+        return DBResponse(rows=[dict(row) for row in self.accounts])
+      if request.op == "db:finance:accounts:upsert:1":
+        self.accounts.append({"element_guid": request.payload["guid"], "element_number": request.payload["number"]})
+        return DBResponse(rows=[])
+      if request.op == "db:finance:periods:list:1":
+        return DBResponse(rows=[
+          {"element_guid": "P2", "element_start_date": "2025-01-26", "element_end_date": "2025-02-22", "element_status": 1},
+          {"element_guid": "P1", "element_start_date": "2024-12-29", "element_end_date": "2025-01-25", "element_status": 1},
+        ])
+      raise AssertionError(f"Unhandled op: {request.op}")
+
+  module = _finance_module()
+  module.db = FakeDb()
+
+  async def run():
+    assert await module._get_account_guid_by_number("2100") == "ACCT-1"
+    assert (await module.get_account("acct-1"))["number"] == "2100"
+    assert (await module.get_period_for_date("2025-01-25"))["guid"] == "P1"
+    assert (await module.get_period_for_date(date(2025, 1, 26)))["guid"] == "P2"
+    assert await module.get_period_for_date("2025-03-01") is None
+    assert await module.get_period_for_date("2024-12-01") is None
+    await module.upsert_account({
+      "guid": "ACCT-2",
+      "number": "4010",
+      "name": "Revenue",
+      "account_type": 4,
+    })
+    assert await module._get_account_guid_by_number("4010") == "ACCT-2"
+
+  asyncio.run(run())
+
+  assert module.db.ops == [
+    "db:finance:accounts:list:1",
+    "db:finance:periods:list:1",
+    "db:finance:accounts:upsert:1",
+    "db:finance:accounts:list:1",
+  ]
+
+
+def test_period_status_guards_read_the_database_not_the_snapshot():
+  class FakeDb:
+    def __init__(self):
+      self.ops: list[str] = []
+      self.status = 1
+
+    async def run(self, request):
+      self.ops.append(request.op)
+      row = {"element_guid": "P1", "element_start_date": "2025-01-01", "element_end_date": "2025-01-28", "element_status": self.status}
+      if request.op in ("db:finance:periods:list:1", "db:finance:periods:get:1"):
+        return DBResponse(rows=[row])
+      raise AssertionError(f"Unhandled op: {request.op}")
+
+  module = _finance_module()
+  module.db = FakeDb()
+
+  async def run():
+    assert (await module.get_period_for_date("2025-01-10"))["status"] == 1
+    module.db.status = 2
+    with pytest.raises(ValueError, match="Cannot post to closed period"):
+      await module._validate_journal_period_open("P1")
+    with pytest.raises(ValueError, match="Only open periods can be closed"):
+      await module.close_period("P1", "tester")
+
+  asyncio.run(run())
+
+  assert module.db.ops == [
+    "db:finance:periods:list:1",
+    "db:finance:periods:get:1",
+    "db:finance:periods:get:1",
+  ]
@@ -0,0 +1,33 @@
+import os, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from check_import_time import check, find_heavy_imports, parse_importtime, total_ms
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   discord.errors
+import time:      1500 |       1620 | discord
+import time:        80 |         80 |     rpc.helpers
+import time:       300 |        380 |   rpc.handler
+import time:        50 |        430 | rpc
+"""
+
+
+def test_parse_importtime_records_depth_and_timings():
+  records = parse_importtime(SAMPLE)
+
+  assert [(r.name, r.depth) for r in records] == [
+    ('discord.errors', 1),
+    ('discord', 0),
+    ('rpc.helpers', 2),
+    ('rpc.handler', 1),
+    ('rpc', 0),
+  ]
+  assert total_ms(records) == 2.05
+  assert find_heavy_imports(records) == ['discord']
+
+
+def test_server_modules_load_heavy_sdks_lazily():
+  problems, records = check()
+
+  assert problems == []
+  assert any(record.name == 'server.modules.bsky_module' for record in records)
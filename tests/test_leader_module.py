@@ -0,0 +1,149 @@
+import asyncio
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+
+from server.modules.leader_module import LEASE_NAME, LeaderModule
+
+
+class FakeLeaseDb:
+  """In-memory stand-in for the system_leases acquire/release semantics."""
+
+  def __init__(self):
+    self.now = 0.0
+    self.leases: dict[str, dict] = {}
+    self.fail = False
+
+  async def run(self, request):
+    if self.fail:
+      raise RuntimeError("database unavailable")
+    payload = request.payload
+    lease = self.leases.get(payload["name"])
+    if request.op == "db:system:leases:acquire:1":
+      if lease is None or lease["holder"] == payload["holder"] or lease["expires"] <= self.now:
+        lease = {"holder": payload["holder"], "expires": self.now + payload["ttl_seconds"]}
+        self.leases[payload["name"]] = lease
+      return SimpleNamespace(rows=[{"element_name": payload["name"], "element_holder": lease["holder"]}])
+    if request.op == "db:system:leases:release:1":
+      if lease is not None and lease["holder"] == payload["holder"]:
+        lease["expires"] = self.now
+      return SimpleNamespace(rows=[])
+    raise AssertionError(f"unexpected op {request.op}")
+
+
+def _module(db: FakeLeaseDb, name: str) -> tuple[LeaderModule, list[bool]]:
+  module = LeaderModule(FastAPI())
+  module.db = db
+  module.holder_id = name
+  module.lease_seconds = 30
+  events: list[bool] = []
+
+  async def _listener(is_leader: bool):
+    events.append(is_leader)
+
+  module.add_listener(_listener)
+  return module, events
+
+
+def test_single_leader_and_failover_on_release():
+  db = FakeLeaseDb()
+  first, first_events = _module(db, "worker-a")
+  second, second_events = _module(db, "worker-b")
+
+  async def run():
+    assert await first.renew() is True
+    assert await second.renew() is False
+    await first.shutdown()
+    assert await second.renew() is True
+
+  asyncio.run(run())
+  assert first_events == [True, False]
+  assert second_events == [True]
+  assert db.leases[LEASE_NAME]["holder"] == "worker-b"
+
+
+def test_expired_lease_is_taken_over():
+  db = FakeLeaseDb()
+  first, _ = _module(db, "worker-a")
+  second, _ = _module(db, "worker-b")
+
+  async def run():
+    assert await first.renew() is True
+    db.now += 31
+    assert await second.renew() is True
+    assert await first.renew() is False
+
+  asyncio.run(run())
+  assert second.is_leader and not first.is_leader
+
+
+def test_renewal_errors_step_down_once_lease_lapses():
+  db = FakeLeaseDb()
+  leader, events = _module(db, "worker-a")
+
+  async def run():
+    assert await leader.renew() is True
+    db.fail = True
+    assert await leader.renew() is True
+    leader._valid_until = 0.0
+    assert await leader.renew() is False
+
+  asyncio.run(run())
+  assert events == [True, False]
+
+
+class FakeConfig:
+  async def on_ready(self):
+    return None
+
+  def get_int(self, key, default):
+    return default
+
+
+def _started(db: FakeLeaseDb, name: str) -> LeaderModule:
+  async def ready():
+    return None
+
+  db.on_ready = ready
+  app = FastAPI()
+  app.state.db = db
+  app.state.system_config = FakeConfig()
+  module = LeaderModule(app)
+  module.holder_id = name
+  return module
+
+
+def test_single_worker_leads_without_a_lease(monkeypatch):
+  monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+  db = FakeLeaseDb()
+  db.fail = True
+  module = _started(db, "worker-a")
+
+  async def run():
+    await module.startup()
+    assert module.is_leader and module.mode == "single"
+    await module.shutdown()
+
+  asyncio.run(run())
+  assert db.leases == {}
+
+
+def test_lease_failure_at_startup_is_retried_instead_of_leading(monkeypatch):
+  monkeypatch.setenv("WEB_CONCURRENCY", "2")
+  db = FakeLeaseDb()
+  db.fail = True
+  first = _started(db, "worker-a")
+  second = _started(db, "worker-b")
+
+  async def run():
+    await first.startup()
+    await second.startup()
+    assert not first.is_leader and not second.is_leader
+    db.fail = False
+    assert await second.renew() is True
+    assert await first.renew() is False
+    await first.shutdown()
+    await second.shutdown()
+
+  asyncio.run(run())
+  assert db.leases[LEASE_NAME]["holder"] == "worker-b"
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+
+from server.modules import (
+  BaseModule,
+  ModuleManager,
+  ModuleStartupError,
+  STATUS_FAILED,
+  STATUS_READY,
+  STATUS_SKIPPED,
+  STATUS_TIMED_OUT,
+)
+
+
+class FakeModule(BaseModule):
+  def __init__(self, app, events, name, *, deps=(), optional=(), fail=False, hang=False, mark=True):
+    super().__init__(app)
+    self.events = events
+    self.name = name
+    self.dependencies = deps
+    self.optional_dependencies = optional
+    self.fail = fail
+    self.hang = hang
+    self.mark = mark
+    self.stopped = False
+
+  async def startup(self):
+    self.events.append(self.name)
+    if self.hang:
+      await asyncio.sleep(10)
+    if self.fail:
+      raise RuntimeError(f"{self.name} failed")
+    if self.mark:
+      self.mark_ready()
+
+  async def shutdown(self):
+    self.stopped = True
+
+
+def _manager(specs: dict[str, dict]) -> tuple[ModuleManager, list[str]]:
+  app = FastAPI()
+  events: list[str] = []
+  modules = {name: FakeModule(app, events, name, **spec) for name, spec in specs.items()}
+  manager = ModuleManager(app, modules=modules)
+  manager.default_timeout = 0.05
+  return manager, events
+
+
+def _statuses(manager: ModuleManager) -> dict[str, str]:
+  return {entry["module"]: entry["status"] for entry in manager.startup_report}
+
+
+def test_startup_follows_dependency_order():
+  manager, events = _manager({
+    "auth": {"deps": ("db",), "optional": ("discord_bot",)},
+    "db": {"deps": ("env",)},
+    "env": {},
+  })
+
+  asyncio.run(manager.startup_all())
+
+  assert events == ["env", "db", "auth"]
+  assert set(_statuses(manager).values()) == {STATUS_READY}
+
+
+def test_failed_dependency_skips_dependents_and_raises():
+  manager, events = _manager({
+    "db": {"fail": True},
+    "role": {"deps": ("db",)},
+    "env": {},
+  })
+
+  with pytest.raises(ModuleStartupError, match="db"):
+    asyncio.run(manager.startup_all())
+
+  statuses = _statuses(manager)
+  assert statuses == {"db": STATUS_FAILED, "env": STATUS_READY, "role": STATUS_SKIPPED}
+  assert "role" not in events
+  assert manager.app.state.role is None
+
+
+def test_hung_or_unready_modules_are_reported():
+  manager, _ = _manager({
+    "discord_bot": {"hang": True},
+    "auth": {"mark": False, "optional": ("discord_bot",)},
+  })
+
+  with pytest.raises(ModuleStartupError):
+    asyncio.run(manager.startup_all())
+
+  statuses = _statuses(manager)
+  assert statuses["discord_bot"] == STATUS_TIMED_OUT
+  assert statuses["auth"] == STATUS_FAILED
+
+
+def test_dependency_cycle_is_rejected():
+  with pytest.raises(ModuleStartupError, match="cycle"):
+    _manager({"a": {"deps": ("b",)}, "b": {"deps": ("a",)}})
+
+
+def test_shutdown_only_stops_started_modules():
+  manager, _ = _manager({"db": {"fail": True}, "role": {"deps": ("db",)}})
+
+  with pytest.raises(ModuleStartupError):
+    asyncio.run(manager.startup_all())
+  role = manager.instances["role"]
+  asyncio.run(manager.shutdown_all())
+
+  assert manager.instances["db"].stopped is True
+  assert role.stopped is False
@@ -0,0 +1,123 @@
+import asyncio
+import contextlib
+from types import SimpleNamespace
+
+import queryregistry.system.conversations.mssql as conversations_mssql
+from server.modules.openai_message_log import MessageLogBuffer
+from server.modules.openai_module import OpenaiModule
+
+
+def test_buffer_flushes_when_batch_is_full():
+  batches = []
+
+  async def write(rows):
+    batches.append(list(rows))
+
+  async def scenario():
+    buffer = MessageLogBuffer(write, max_batch=3, flush_interval=60)
+    for index in range(3):
+      buffer.add(index)
+    await asyncio.sleep(0)
+    assert batches == [[0, 1, 2]]
+    buffer.add(3)
+    buffer.add(4)
+    await asyncio.sleep(0)
+    assert buffer.pending == 2
+    await buffer.close()
+
+  asyncio.run(scenario())
+  assert batches == [[0, 1, 2], [3, 4]]
+
+
+def test_buffer_flushes_after_interval():
+  batches = []
+
+  async def write(rows):
+    batches.append(list(rows))
+
+  async def scenario():
+    buffer = MessageLogBuffer(write, max_batch=100, flush_interval=0.01)
+    buffer.add("a")
+    buffer.add("b")
+    assert batches == []
+    await asyncio.sleep(0.05)
+    assert batches == [["a", "b"]]
+    assert buffer.stats()["written"] == 2
+
+  asyncio.run(scenario())
+
+
+def test_buffer_keeps_rows_from_failed_write():
+  attempts = []
+
+  async def write(rows):
+    attempts.append(list(rows))
+    if len(attempts) == 1:
+      raise RuntimeError("database unavailable")
+
+  async def scenario():
+    buffer = MessageLogBuffer(write, max_batch=100, flush_interval=60, max_pending=100)
+    buffer.add(1)
+    await buffer.flush()
+    assert buffer.pending == 1
+    buffer.add(2)
+    await buffer.close()
+    assert buffer.pending == 0
+
+  asyncio.run(scenario())
+  assert attempts == [[1], [1, 2]]
+
+
+def test_thread_history_flushes_pending_messages_first():
+  order = []
+
+  class FakeDb:
+    async def run(self, request):
+      order.append(request.op)
+      return SimpleNamespace(rows=[], rowcount=0)
+
+  module = OpenaiModule.__new__(OpenaiModule)
+  module.db = FakeDb()
+  module.message_log = MessageLogBuffer(module._write_messages, flush_interval=60)
+
+  async def scenario():
+    await module.log_message(personas_recid=1, models_recid=2, role="assistant", content="hi", thread_id="t-1")
+    await module.get_thread_history("t-1")
+
+  asyncio.run(scenario())
+  assert order == [
+    "db:system:conversations:insert_messages:1",
+    "db:system:conversations:list_thread:1",
+  ]
+
+
+def test_insert_messages_v1_writes_all_chunks_in_one_transaction(monkeypatch):
+  calls = []
+  transactions = []
+
+  class FakeCursor:
+    async def execute(self, sql, params=()):
+      calls.append((sql, params))
+
+  @contextlib.asynccontextmanager
+  async def fake_transaction():
+    transactions.append(len(calls))
+    yield FakeCursor()
+
+  monkeypatch.setattr(conversations_mssql, "transaction", fake_transaction)
+  monkeypatch.setattr(conversations_mssql, "MESSAGE_INSERT_BATCH_ROWS", 2)
+  messages = [
+    {"personas_recid": 1, "models_recid": 2, "role": "user", "content": f"m{i}", "tokens": 1}
+    for i in range(3)
+  ]
+
+  result = asyncio.run(conversations_mssql.insert_messages_v1({"messages": messages}))
+
+  assert result.rowcount == 3
+  assert transactions == [0]
+  assert len(calls) == 2
+  first_sql, first_params = calls[0]
+  assert first_sql.count("COALESCE(?, SYSDATETIMEOFFSET())") == 2
+  assert len(first_params) == 22
+  assert first_params[7] == "m0" and first_params[18] == "m1"
+  assert len(calls[1][1]) == 11
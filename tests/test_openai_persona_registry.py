@@ -0,0 +1,118 @@
+import asyncio
+from types import SimpleNamespace
+
+from queryregistry.cache import PERSONA_TTL_SECONDS
+from server.modules.models_registry_module import ModelsRegistryModule
+from server.modules.openai_module import OpenaiModule
+
+PERSONA = {
+  "recid": 3,
+  "models_recid": 1,
+  "name": "helper",
+  "prompt": "Be helpful.",
+  "tokens": 200,
+  "model": "gpt-test",
+}
+MODEL = {"recid": 1, "element_name": "gpt-test", "element_api_provider": "openai", "element_is_active": True}
+
+
+class FakeDb:
+  def __init__(self):
+    self.ops = []
+    self.personas = [dict(PERSONA)]
+
+  async def run(self, request):
+    self.ops.append(request.op)
+    if request.op == "db:system:personas:list:1":
+      return SimpleNamespace(rows=list(self.personas), rowcount=len(self.personas))
+    if request.op == "db:system:personas:models_list:1":
+      return SimpleNamespace(rows=[dict(MODEL)], rowcount=1)
+    if request.op == "db:system:personas:get_by_name:1":
+      if request.payload["name"] == "late":
+        return SimpleNamespace(rows=[{**PERSONA, "recid": 4, "name": "late"}], rowcount=1)
+      return SimpleNamespace(rows=[], rowcount=0)
+    return SimpleNamespace(rows=[], rowcount=1)
+
+
+def _build_module(db):
+  module = OpenaiModule.__new__(OpenaiModule)
+  module.db = db
+  module._registry = None
+  module._registry_version = 0
+  module._registry_lock = asyncio.Lock()
+  return module
+
+
+def test_persona_lookups_are_served_from_the_registry():
+  db = FakeDb()
+  module = _build_module(db)
+
+  async def run():
+    first = await module.get_persona_definition("helper")
+    second = await module.get_persona_definition("helper")
+    by_recid = await module.get_persona_by_recid(3)
+    model = await module.get_model(recid=1)
+    return first, second, by_recid, model
+
+  first, second, by_recid, model = asyncio.run(run())
+  assert first == second
+  assert first["prompt"] == "Be helpful."
+  assert first["tokens"] == 200
+  assert by_recid["name"] == "helper"
+  assert model["element_name"] == "gpt-test"
+  assert db.ops == ["db:system:personas:list:1", "db:system:personas:models_list:1"]
+
+
+def test_unknown_personas_fall_back_to_a_lookup_and_are_cached():
+  db = FakeDb()
+  module = _build_module(db)
+
+  async def run():
+    missing = await module.get_persona_definition("nobody")
+    late = await module.get_persona_definition("late")
+    again = await module.get_persona_definition("late")
+    return missing, late, again
+
+  missing, late, again = asyncio.run(run())
+  assert missing is None
+  assert late == again
+  assert db.ops.count("db:system:personas:get_by_name:1") == 2
+
+
+def test_persona_and_model_writes_invalidate_the_registry():
+  db = FakeDb()
+  module = _build_module(db)
+  models_registry = ModelsRegistryModule.__new__(ModelsRegistryModule)
+  models_registry.db = db
+  models_registry.app = SimpleNamespace(state=SimpleNamespace(openai=module))
+
+  async def run():
+    await module.get_persona_definition("helper")
+    db.personas = [{**PERSONA, "prompt": "Be brief."}]
+    await module.upsert_persona({**PERSONA, "prompt": "Be brief."})
+    updated = await module.get_persona_definition("helper")
+    await models_registry.upsert_model_registry({"name": "gpt-next", "api_provider": "openai"})
+    await module.get_model(name="gpt-test")
+    return updated
+
+  updated = asyncio.run(run())
+  assert updated["prompt"] == "Be brief."
+  assert db.ops.count("db:system:personas:list:1") == 3
+
+
+def test_registry_reloads_edits_from_other_workers_after_its_ttl():
+  db = FakeDb()
+  module = _build_module(db)
+
+  async def run():
+    await module.get_persona_definition("helper")
+    db.personas = [{**PERSONA, "prompt": "Be brief."}]
+    cached = await module.get_persona_definition("helper")
+    module._registry.loaded_at -= PERSONA_TTL_SECONDS
+    reloaded = await module.get_persona_definition("helper")
+    return cached, reloaded
+
+  cached, reloaded = asyncio.run(run())
+  assert cached["prompt"] == "Be helpful."
+  assert reloaded["prompt"] == "Be brief."
+  assert db.ops.count("db:system:personas:list:1") == 2
@@ -0,0 +1,118 @@
+import asyncio
+from types import SimpleNamespace
+
+import server.modules.openai_response_cache as cache_mod
+from server.modules.openai_module import OpenaiModule
+from server.modules.openai_response_cache import ResponseCache
+from server.modules.openai_scheduler import OpenaiRequestScheduler
+
+RESULT = {"content": "summary", "model": "gpt-test", "role": "assistant", "usage": {"total_tokens": 120}}
+
+
+def test_exact_hits_normalize_whitespace_and_expire(monkeypatch):
+  clock = [100.0]
+  monkeypatch.setattr(cache_mod.time, "monotonic", lambda: clock[0])
+  cache = ResponseCache(60)
+
+  async def run():
+    await cache.put("gpt-test", "Summarize.", "alice: hi\nbob: hey", "24", RESULT)
+    hit = await cache.get("gpt-test", " Summarize. ", "alice: hi  bob: hey", "24")
+    other_context = await cache.get("gpt-test", "Summarize.", "alice: bye", "24")
+    other_model = await cache.get("gpt-other", "Summarize.", "alice: hi\nbob: hey", "24")
+    clock[0] += 61
+    expired = await cache.get("gpt-test", "Summarize.", "alice: hi\nbob: hey", "24")
+    return hit, other_context, other_model, expired
+
+  hit, other_context, other_model, expired = asyncio.run(run())
+  assert hit["content"] == "summary"
+  assert other_context is None and other_model is None and expired is None
+  stats = cache.stats()
+  assert stats["hits"] == 1
+  assert stats["misses"] == 3
+  assert stats["hit_rate"] == 0.25
+  assert stats["tokens_saved"] == 120
+  assert stats["entries"] == 0
+
+
+def test_similarity_tier_serves_near_duplicates_within_scope():
+  vectors = {
+    "what is the plan?": [1.0, 0.0, 0.1],
+    "what's the plan?": [1.0, 0.0, 0.12],
+    "tell me a joke": [0.0, 1.0, 0.0],
+  }
+
+  async def embed(text):
+    return vectors[text.strip()]
+
+  cache = ResponseCache(60, embed=embed, similarity_threshold=0.95)
+
+  async def run():
+    await cache.put("gpt-test", "Persona.", "", "what is the plan?", RESULT)
+    near = await cache.get("gpt-test", "Persona.", "", "what's the plan?")
+    far = await cache.get("gpt-test", "Persona.", "", "tell me a joke")
+    other_persona = await cache.get("gpt-test", "Other persona.", "", "what's the plan?")
+    return near, far, other_persona
+
+  near, far, other_persona = asyncio.run(run())
+  assert near["content"] == "summary"
+  assert far is None and other_persona is None
+  assert cache.stats()["semantic_hits"] == 1
+
+
+def test_embedding_failures_are_misses_but_keep_exact_entries():
+  failing = [False]
+
+  async def embed(text):
+    if failing[0]:
+      raise RuntimeError("embeddings unavailable")
+    return [1.0, 0.0]
+
+  cache = ResponseCache(60, embed=embed, similarity_threshold=0.9)
+
+  async def run():
+    await cache.put("gpt-test", "Persona.", "", "first", RESULT)
+    failing[0] = True
+    await cache.put("gpt-test", "Persona.", "", "second", RESULT)
+    near = await cache.get("gpt-test", "Persona.", "", "third")
+    exact = await cache.get("gpt-test", "Persona.", "", "second")
+    return near, exact
+
+  near, exact = asyncio.run(run())
+  assert near is None
+  assert exact == RESULT
+  assert cache.stats()["entries"] == 2
+  assert cache.stats()["misses"] == 1
+
+
+def test_generate_chat_serves_repeats_from_the_cache():
+  calls = []
+
+  async def create(**params):
+    calls.append(params)
+    completion = SimpleNamespace(
+      model="gpt-test",
+      usage=SimpleNamespace(prompt_tokens=100, completion_tokens=20, total_tokens=120),
+      choices=[SimpleNamespace(message=SimpleNamespace(content="summary", role="assistant"))],
+    )
+    return SimpleNamespace(headers={}, parse=lambda: completion)
+
+  module = OpenaiModule.__new__(OpenaiModule)
+  module.client = SimpleNamespace(
+    chat=SimpleNamespace(completions=SimpleNamespace(with_raw_response=SimpleNamespace(create=create))),
+  )
+  module.scheduler = OpenaiRequestScheduler()
+  module.response_cache = ResponseCache(60)
+
+  async def run():
+    kwargs = {"system_prompt": "Summarize.", "user_prompt": "alice: hi", "model": "gpt-test", "cache": True}
+    first = await module.generate_chat(**kwargs)
+    second = await module.generate_chat(**kwargs)
+    uncached = await module.generate_chat(**{**kwargs, "cache": False})
+    return first, second, uncached
+
+  first, second, uncached = asyncio.run(run())
+  assert len(calls) == 2
+  assert "cached" not in first
+  assert second["cached"] is True
+  assert second["content"] == first["content"] == uncached["content"]
+  assert module.get_response_cache_stats()["tokens_saved"] == 120
@@ -0,0 +1,158 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import server.modules.openai_scheduler as scheduler_mod
+from server.modules.openai_scheduler import (
+  PRIORITY_BULK,
+  PRIORITY_INTERACTIVE,
+  OpenaiRequestScheduler,
+  parse_reset,
+)
+
+
+class Throttled(Exception):
+  status_code = 429
+
+  def __init__(self, headers=None, code=None):
+    super().__init__("rate limited")
+    self.response = SimpleNamespace(headers=headers or {})
+    self.code = code
+
+
+def test_parse_reset_handles_openai_durations():
+  assert parse_reset("20ms") == pytest.approx(0.02)
+  assert parse_reset("6m0s") == pytest.approx(360.0)
+  assert parse_reset("1h2m3.5s") == pytest.approx(3723.5)
+  assert parse_reset("2") == 2.0
+  assert parse_reset(None) is None
+
+
+def test_requests_run_concurrently_up_to_the_limit():
+  async def run():
+    scheduler = OpenaiRequestScheduler(max_concurrency=3)
+    active = 0
+    peak = 0
+
+    async def call():
+      nonlocal active, peak
+      active += 1
+      peak = max(peak, active)
+      await asyncio.sleep(0.01)
+      active -= 1
+      return "ok"
+
+    results = await asyncio.gather(*(scheduler.submit(call) for _ in range(7)))
+    return results, peak
+
+  results, peak = asyncio.run(run())
+  assert results == ["ok"] * 7
+  assert peak == 3
+
+
+def test_interactive_requests_are_admitted_before_bulk():
+  async def run():
+    scheduler = OpenaiRequestScheduler(max_concurrency=1)
+    order = []
+    gate = asyncio.Event()
+
+    async def blocker():
+      await gate.wait()
+
+    def job(name):
+      async def call():
+        order.append(name)
+      return call
+
+    first = asyncio.create_task(scheduler.submit(blocker))
+    await asyncio.sleep(0)
+    bulk = asyncio.create_task(scheduler.submit(job("bulk"), priority=PRIORITY_BULK))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(scheduler.submit(job("persona"), priority=PRIORITY_INTERACTIVE))
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(first, bulk, interactive)
+    return order
+
+  assert asyncio.run(run()) == ["persona", "bulk"]
+
+
+def test_header_budgets_hold_requests_until_reset():
+  async def run():
+    scheduler = OpenaiRequestScheduler(max_concurrency=4)
+
+    async def call():
+      return SimpleNamespace(headers={
+        "x-ratelimit-limit-requests": "100",
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-reset-requests": "50ms",
+        "x-ratelimit-limit-tokens": "1000",
+        "x-ratelimit-remaining-tokens": "900",
+        "x-ratelimit-reset-tokens": "1s",
+      })
+
+    loop = asyncio.get_running_loop()
+    await scheduler.submit(call)
+    started = loop.time()
+    await scheduler.submit(call, estimated_tokens=10)
+    return loop.time() - started, scheduler
+
+  elapsed, scheduler = asyncio.run(run())
+  assert elapsed >= 0.04
+  assert scheduler.tokens.limit == 1000
+
+
+def test_throttled_requests_retry_with_backoff(monkeypatch):
+  monkeypatch.setattr(scheduler_mod.random, "uniform", lambda low, high: 1.0)
+
+  async def run():
+    scheduler = OpenaiRequestScheduler(base_backoff=0.01)
+    attempts = 0
+
+    async def flaky():
+      nonlocal attempts
+      attempts += 1
+      if attempts < 3:
+        raise Throttled({"retry-after": "0.01"})
+      return "done"
+
+    async def no_quota():
+      raise Throttled(code="insufficient_quota")
+
+    result = await scheduler.submit(flaky)
+    with pytest.raises(Throttled):
+      await scheduler.submit(no_quota)
+    return result, attempts, scheduler.running
+
+  result, attempts, running = asyncio.run(run())
+  assert result == "done"
+  assert attempts == 3
+  assert running == 0
+
+
+def test_cancelled_requests_release_their_slot_and_queue_position():
+  async def run():
+    scheduler = OpenaiRequestScheduler(max_concurrency=1)
+    started = asyncio.Event()
+
+    async def hang():
+      started.set()
+      await asyncio.Event().wait()
+
+    async def ok():
+      return "ok"
+
+    running = asyncio.create_task(scheduler.submit(hang))
+    await started.wait()
+    queued = asyncio.create_task(scheduler.submit(ok))
+    follower = asyncio.create_task(scheduler.submit(ok, priority=PRIORITY_BULK))
+    await asyncio.sleep(0)
+    assert scheduler.queued == 2
+
+    queued.cancel()
+    running.cancel()
+    result = await asyncio.wait_for(follower, timeout=1)
+    return result, scheduler.running, scheduler.queued
+
+  assert asyncio.run(run()) == ("ok", 0, 0)
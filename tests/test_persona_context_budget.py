@@ -0,0 +1,163 @@
+import asyncio
+from types import SimpleNamespace
+
+import queryregistry.system.conversations.mssql as conversations_mssql
+import server.modules.discord_chat_module as chat_mod
+from server.modules.discord_chat_module import DiscordChatModule
+from server.modules.openai_message_log import MessageLogBuffer
+from server.modules.openai_module import OpenaiModule
+
+
+class FakeOpenai:
+  def __init__(self):
+    self.calls = []
+
+  async def on_ready(self):
+    return None
+
+  async def generate_chat(self, **kwargs):
+    self.calls.append(kwargs)
+    return {"content": "reply", "model": "gpt-test"}
+
+
+def test_persona_prompt_is_budgeted_and_ordered_by_volatility(monkeypatch):
+  openai = FakeOpenai()
+  module = DiscordChatModule.__new__(DiscordChatModule)
+  module.app = SimpleNamespace(state=SimpleNamespace(openai=openai))
+
+  async def ready():
+    return None
+
+  module.on_ready = ready
+  monkeypatch.setattr(chat_mod, "PERSONA_CONTEXT_TOKENS", 60)
+
+  result = asyncio.run(module.generate_persona_response(
+    "helper",
+    "what did I miss?",
+    persona_details={"prompt": "You are helpful.", "model": "gpt-test", "tokens": 100},
+    stored_context=[
+      {"role": "user", "content": "huge stored message", "tokens": 1000},
+      {"role": "assistant", "content": "stored answer", "tokens": 5},
+    ],
+    channel_history=[
+      {"author": "alice", "content": f"channel message number {i}"} for i in range(30)
+    ],
+  ))
+
+  assert result["success"] is True
+  call = openai.calls[0]
+  assert call["system_prompt"] == "You are helpful."
+  context = call["prompt_context"]
+  assert context.index("Recent stored conversation context:") < context.index("Recent channel activity:")
+  assert "assistant: stored answer" in context
+  assert "huge stored message" not in context
+  assert "alice: channel message number 29" in context
+  assert "alice: channel message number 0\n" not in context
+  assert len(context.split()) <= 60 + 10
+
+
+def test_log_message_persists_token_count():
+  captured = []
+
+  class FakeDb:
+    async def run(self, request):
+      captured.append(request)
+      return SimpleNamespace(rows=[], rowcount=1)
+
+  module = OpenaiModule.__new__(OpenaiModule)
+  module.db = FakeDb()
+  module.message_log = MessageLogBuffer(module._write_messages)
+
+  async def scenario():
+    await module.log_message(
+      personas_recid=1,
+      models_recid=2,
+      role="user",
+      content="four words right here",
+    )
+    assert captured == []
+    await module.message_log.close()
+
+  asyncio.run(scenario())
+
+  assert captured[0].op == "db:system:conversations:insert_messages:1"
+  assert captured[0].payload["messages"][0]["tokens"] == 4
+
+
+def test_list_thread_v1_limits_in_sql(monkeypatch):
+  captured = {}
+
+  async def fake_run_json_many(sql, params=()):
+    captured["sql"] = sql
+    captured["params"] = params
+    return {"rows": []}
+
+  monkeypatch.setattr(conversations_mssql, "run_json_many", fake_run_json_many)
+
+  asyncio.run(conversations_mssql.list_thread_v1({"thread_id": "t-1", "limit": 20}))
+  assert "SELECT TOP (?)" in captured["sql"]
+  assert "ORDER BY element_created_on DESC, recid DESC" in captured["sql"]
+  assert list(captured["params"]) == [20, "t-1"]
+
+  asyncio.run(conversations_mssql.list_thread_v1({"thread_id": "t-1"}))
+  assert "TOP" not in captured["sql"]
+
+
+def test_streamed_persona_reply_is_delivered_once():
+  class StreamingOpenai(FakeOpenai):
+    def stream_chat(self, **kwargs):
+      self.calls.append(kwargs)
+
+      async def deltas():
+        yield "streamed "
+        yield "reply"
+
+      return deltas()
+
+  class FakeDiscord:
+    def __init__(self):
+      self.streamed = []
+      self.queued = []
+
+    async def on_ready(self):
+      return None
+
+    async def stream_channel_message(self, channel_id, deltas):
+      text = "".join([delta async for delta in deltas])
+      self.streamed.append((channel_id, text))
+      return text
+
+    async def queue_channel_message(self, channel_id, message):
+      self.queued.append((channel_id, message))
+
+  openai = StreamingOpenai()
+  discord = FakeDiscord()
+  module = DiscordChatModule.__new__(DiscordChatModule)
+  module.app = SimpleNamespace(state=SimpleNamespace(openai=openai))
+  module.discord = discord
+
+  async def ready():
+    return None
+
+  module.on_ready = ready
+
+  async def run():
+    generated = await module.generate_persona_response(
+      "helper",
+      "hi",
+      persona_details={"prompt": "You are helpful.", "model": "gpt-test", "tokens": 100},
+      channel_id=9,
+      stream=True,
+    )
+    delivered = await module.deliver_persona_response(
+      persona="helper",
+      response=generated["response"],
+      channel_id=9,
+    )
+    return generated, delivered
+
+  generated, delivered = asyncio.run(run())
+  assert generated["response"] == {"text": "streamed reply", "model": "gpt-test", "delivered": True}
+  assert discord.streamed == [(9, "streamed reply")]
+  assert discord.queued == []
+  assert delivered["success"] is True
@@ -0,0 +1,116 @@
+import asyncio
+
+from queryregistry.cache import CachePolicy, QueryResultCache
+from queryregistry.models import DBRequest, DBResponse
+
+
+class FakeClock:
+  def __init__(self):
+    self.now = 0.0
+
+  def __call__(self) -> float:
+    return self.now
+
+
+def _policies():
+  return {
+    "db:system:config:get": CachePolicy(ttl_seconds=10, invalidated_by=frozenset({"db:system:config:upsert"})),
+    "db:system:roles:list": CachePolicy(ttl_seconds=10),
+  }
+
+
+def _loader(calls: list, payload, delay: float = 0.0):
+  async def _load():
+    calls.append(1)
+    if delay:
+      await asyncio.sleep(delay)
+    return DBResponse(op="db:system:config:get:1", payload=payload, rowcount=1)
+  return _load
+
+
+def test_hit_after_miss_and_ttl_expiry():
+  clock = FakeClock()
+  cache = QueryResultCache(_policies(), clock=clock)
+  request = DBRequest(op="db:system:config:get:1", payload={"key": "Hostname"})
+  calls: list = []
+
+  async def run():
+    await cache.get_or_load(request, _loader(calls, {"element_value": "a"}))
+    hit = await cache.get_or_load(request, _loader(calls, {"element_value": "b"}))
+    assert hit.rows[0]["element_value"] == "a"
+    clock.now = 11
+    fresh = await cache.get_or_load(request, _loader(calls, {"element_value": "c"}))
+    assert fresh.rows[0]["element_value"] == "c"
+
+  asyncio.run(run())
+  assert len(calls) == 2
+  ops = cache.stats()["ops"]["db:system:config:get"]
+  assert ops["hits"] == 1
+  assert ops["misses"] == 2
+
+
+def test_hits_return_independent_copies():
+  cache = QueryResultCache(_policies())
+  request = DBRequest(op="db:system:config:get:1", payload={"key": "Hostname"})
+  calls: list = []
+
+  async def run():
+    first = await cache.get_or_load(request, _loader(calls, {"element_value": "a"}))
+    first.rows[0]["element_value"] = "mutated"
+    second = await cache.get_or_load(request, _loader(calls, {"element_value": "b"}))
+    assert second.rows[0]["element_value"] == "a"
+
+  asyncio.run(run())
+
+
+def test_concurrent_misses_are_coalesced():
+  cache = QueryResultCache(_policies())
+  request = DBRequest(op="db:system:config:get:1", payload={"key": "Hostname"})
+  calls: list = []
+
+  async def run():
+    return await asyncio.gather(*(
+      cache.get_or_load(request, _loader(calls, {"element_value": "a"}, delay=0.01))
+      for _ in range(5)
+    ))
+
+  results = asyncio.run(run())
+  assert len(calls) == 1
+  assert all(res.rows[0]["element_value"] == "a" for res in results)
+  assert cache.stats()["ops"]["db:system:config:get"]["coalesced"] == 4
+
+
+def test_write_invalidates_dependent_reads_only():
+  cache = QueryResultCache(_policies())
+  config_request = DBRequest(op="db:system:config:get:1", payload={"key": "Hostname"})
+  roles_request = DBRequest(op="db:system:roles:list:1", payload={})
+  calls: list = []
+
+  async def run():
+    await cache.get_or_load(config_request, _loader(calls, {"element_value": "a"}))
+    await cache.get_or_load(roles_request, _loader(calls, [{"name": "ROLE"}]))
+    assert cache.invalidate_for_write("db:system:config:upsert:1") == 1
+    assert cache.invalidate_for_write("db:system:config:list:1") == 0
+    await cache.get_or_load(config_request, _loader(calls, {"element_value": "b"}))
+    await cache.get_or_load(roles_request, _loader(calls, [{"name": "ROLE"}]))
+
+  asyncio.run(run())
+  assert len(calls) == 3
+  assert cache.stats()["ops"]["db:system:config:get"]["invalidations"] == 1
+
+
+def test_lru_eviction_respects_entry_cap():
+  cache = QueryResultCache(_policies(), max_entries=2)
+  calls: list = []
+
+  async def run():
+    for key in ("a", "b", "a", "c"):
+      request = DBRequest(op="db:system:config:get:1", payload={"key": key})
+      await cache.get_or_load(request, _loader(calls, {"element_value": key}))
+
+  asyncio.run(run())
+  stats = cache.stats()
+  assert stats["entries"] == 2
+  assert stats["ops"]["db:system:config:get"]["evictions"] == 1
+  assert cache.is_cacheable("db:system:config:get:1")
+  assert not cache.is_cacheable("db:system:config:upsert:1")
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from queryregistry.finance.journals import mssql as journals_mssql
+from queryregistry.finance.reporting import mssql as reporting_mssql
+from queryregistry.finance.reporting.models import JournalSummaryParams
+from rpc.finance.journals.models import JournalListFilter1
+from rpc.finance.reporting.models import JournalSummaryFilter1
+
+
+def test_list_v1_pages_below_after_recid(monkeypatch):
+  captured = {}
+
+  async def fake_run_json_many(sql, params=()):
+    captured["sql"] = sql
+    captured["params"] = params
+    return {"rows": []}
+
+  monkeypatch.setattr(journals_mssql, "run_json_many", fake_run_json_many)
+
+  asyncio.run(journals_mssql.list_v1({"status": 2, "after_recid": 500, "limit": 50}))
+
+  assert "SELECT TOP (?)" in captured["sql"]
+  assert "WHERE element_status = ? AND recid < ?" in captured["sql"]
+  assert "ORDER BY recid DESC" in captured["sql"]
+  assert list(captured["params"]) == [50, 2, 500]
+
+
+def test_list_v1_without_limit_returns_all_rows(monkeypatch):
+  captured = {}
+
+  async def fake_run_json_many(sql, params=()):
+    captured["sql"] = sql
+    captured["params"] = params
+    return {"rows": []}
+
+  monkeypatch.setattr(journals_mssql, "run_json_many", fake_run_json_many)
+
+  asyncio.run(journals_mssql.list_v1({}))
+
+  assert "TOP" not in captured["sql"]
+  assert list(captured["params"]) == []
+
+
+def test_count_v1_uses_partition_stats_when_unfiltered(monkeypatch):
+  captured = {}
+
+  async def fake_run_json_one(sql, params=()):
+    captured["sql"] = sql
+    captured["params"] = params
+    return {"rows": []}
+
+  monkeypatch.setattr(journals_mssql, "run_json_one", fake_run_json_one)
+
+  asyncio.run(journals_mssql.count_v1({}))
+  assert "sys.dm_db_partition_stats" in captured["sql"]
+
+  asyncio.run(journals_mssql.count_v1({"periods_guid": "period-guid"}))
+  assert "COUNT_BIG(*)" in captured["sql"]
+  assert list(captured["params"]) == ["period-guid"]
+
+
+def test_journal_summary_v1_projects_requested_columns(monkeypatch):
+  captured = {}
+
+  async def fake_run_json_many(sql, params=()):
+    captured["sql"] = sql
+    captured["params"] = params
+    return {"rows": []}
+
+  monkeypatch.setattr(reporting_mssql, "run_json_many", fake_run_json_many)
+
+  asyncio.run(reporting_mssql.journal_summary_v1({
+    "journal_status": 1,
+    "after_recid": 90,
+    "limit": 25,
+    "columns": ["journal_name", "total_debit"],
+  }))
+
+  assert "SELECT TOP (?) recid, journal_name, total_debit" in captured["sql"]
+  assert "SELECT *" not in captured["sql"]
+  assert list(captured["params"]) == [25, 1, 90]
+
+
+def test_journal_summary_params_reject_unknown_columns():
+  with pytest.raises(ValueError, match="Unknown journal summary columns"):
+    JournalSummaryParams(columns=["recid", "element_name; DROP TABLE finance_journals"])
+
+
+def test_rpc_filters_leave_listings_unbounded_without_a_limit():
+  assert JournalListFilter1().limit is None
+  assert JournalSummaryFilter1().limit is None
+  assert JournalListFilter1(limit=50).limit == 50
+  with pytest.raises(ValueError):
+    JournalSummaryFilter1(limit=501)
@@ -1,6 +1,7 @@
 import asyncio
 
 from queryregistry.finance.staging_line_items import mssql
+from queryregistry.models import DBResponse
 
 
 def test_aggregate_line_items_v1_groups_by_record_type(monkeypatch):
@@ -27,7 +28,7 @@ def test_insert_line_items_batch_v1_sets_record_type_and_defaults_usage(monkeypa
 
   async def fake_run_exec(sql, params=()):
     exec_calls.append((sql, params))
-    return {"rows": []}
+    return DBResponse(rowcount=1)
 
   monkeypatch.setattr(mssql, "run_exec", fake_run_exec)
 
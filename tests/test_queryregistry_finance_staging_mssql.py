@@ -1,6 +1,7 @@
 import asyncio
 
 from queryregistry.finance.staging import mssql
+from queryregistry.models import DBResponse
 
 
 def test_list_imports_v1_maps_element_columns_to_rpc_shape(monkeypatch):
@@ -145,7 +146,7 @@ def test_insert_cost_detail_batch_v1_uses_api_field_names_as_element_columns(mon
 
   async def fake_run_exec(sql, params=()):
     captured.append((sql, params))
-    return {"rows": []}
+    return DBResponse(rowcount=1)
 
   monkeypatch.setattr(mssql, "run_exec", fake_run_exec)
 
@@ -170,3 +171,83 @@ def test_insert_cost_detail_batch_v1_uses_api_field_names_as_element_columns(mon
   assert "[element_costInBillingCurrency]" in sql
   assert params == (77, "Microsoft.Sql", "Databases", "12.34")
   assert result.rowcount == 1
+
+
+def test_list_imports_v1_pages_below_after_recid(monkeypatch):
+  captured = {}
+
+  async def fake_run_json_many(sql, params=()):
+    captured["sql"] = sql
+    captured["params"] = params
+    return {"rows": []}
+
+  monkeypatch.setattr(mssql, "run_json_many", fake_run_json_many)
+
+  asyncio.run(mssql.list_imports_v1({"status": 1, "after_recid": 40, "limit": 20}))
+
+  assert "SELECT TOP (?)" in captured["sql"]
+  assert "WHERE element_status = ? AND recid < ?" in captured["sql"]
+  assert captured["params"] == (20, 1, 40)
+
+
+def test_get_import_v1_reads_one_import_by_recid(monkeypatch):
+  captured = {}
+
+  async def fake_run_json_one(sql, params=()):
+    captured["sql"] = sql
+    captured["params"] = params
+    return {"rows": [{"recid": 9}]}
+
+  monkeypatch.setattr(mssql, "run_json_one", fake_run_json_one)
+
+  asyncio.run(mssql.get_import_v1({"recid": 9}))
+
+  assert "WHERE recid = ?" in captured["sql"]
+  assert "WITHOUT_ARRAY_WRAPPER" in captured["sql"]
+  assert captured["params"] == (9,)
+
+
+def test_insert_cost_detail_batch_v1_skips_rows_already_staged_by_hash(monkeypatch):
+  captured = []
+
+  async def fake_run_exec(sql, params=()):
+    captured.append((sql, params))
+    return DBResponse(rowcount=0)
+
+  monkeypatch.setattr(mssql, "run_exec", fake_run_exec)
+
+  result = asyncio.run(
+    mssql.insert_cost_detail_batch_v1(
+      {
+        "imports_recid": 77,
+        "rows": [{"consumedService": "Microsoft.Sql"}],
+        "row_hashes": ["a" * 64],
+      },
+    ),
+  )
+
+  sql, params = captured[0]
+  assert "[element_row_hash]" in sql
+  assert "WHERE NOT EXISTS" in sql
+  assert params == (77, "Microsoft.Sql", "a" * 64, 77, "a" * 64)
+  assert result.rowcount == 0
+
+
+def test_update_import_checkpoint_v1_serializes_checkpoint(monkeypatch):
+  captured = {}
+
+  async def fake_run_exec(sql, params=()):
+    captured["sql"] = sql
+    captured["params"] = params
+    return {"rows": []}
+
+  monkeypatch.setattr(mssql, "run_exec", fake_run_exec)
+
+  asyncio.run(
+    mssql.update_import_checkpoint_v1(
+      {"recid": 5, "checkpoint": {"blob_index": 1, "blob_offset": 0}, "row_count": 200},
+    ),
+  )
+
+  assert "element_checkpoint = ?" in captured["sql"]
+  assert captured["params"] == ('{"blob_index": 1, "blob_offset": 0}', 200, 5)
@@ -0,0 +1,14 @@
+from scripts import seed_rpcdispatch
+
+
+def test_discover_domains_reads_root_handlers():
+  domains = seed_rpcdispatch.discover_domains()
+
+  assert domains
+  assert set(domains) == set(seed_rpcdispatch.DOMAIN_ROLES)
+
+
+def test_discover_subdomains_reads_domain_handlers():
+  subdomains = seed_rpcdispatch.discover_subdomains(seed_rpcdispatch.discover_domains())
+
+  assert ("finance", "journals") in subdomains
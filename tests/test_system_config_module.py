@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+
+from server.modules.system_config_module import SystemConfigModule
+
+
+class FakeDb:
+  def __init__(self, values: dict[str, str]):
+    self.values = dict(values)
+    self.logging_level = 0
+    self.ops: list[str] = []
+
+  async def on_ready(self):
+    return None
+
+  async def run(self, request):
+    op = request.op
+    self.ops.append(op)
+    if op == "db:system:config:get_checksum:1":
+      checksum = hash(tuple(sorted(self.values.items())))
+      return SimpleNamespace(rows=[{"element_count": len(self.values), "element_checksum": checksum}])
+    if op == "db:system:config:list:1":
+      return SimpleNamespace(rows=[
+        {"element_key": key, "element_value": value}
+        for key, value in sorted(self.values.items())
+      ])
+    if op == "db:system:config:upsert:1":
+      self.values[request.payload["key"]] = request.payload["value"]
+      return SimpleNamespace(rows=[])
+    if op == "db:system:config:delete:1":
+      self.values.pop(request.payload["key"], None)
+      return SimpleNamespace(rows=[])
+    raise AssertionError(f"unexpected op {op}")
+
+
+def _build_module(values: dict[str, str]) -> tuple[SystemConfigModule, FakeDb]:
+  app = FastAPI()
+  db = FakeDb(values)
+  app.state.db = db
+  module = SystemConfigModule(app)
+  module.db = db
+  return module, db
+
+
+def test_reads_are_served_from_snapshot():
+  module, db = _build_module({"Hostname": "example.com", "MCP_RATE_LIMIT_TOKEN_IP": "7"})
+  asyncio.run(module.reload())
+  db.ops.clear()
+
+  assert module.get_value("Hostname") == "example.com"
+  assert module.get_value("Missing", "fallback") == "fallback"
+  assert module.get_int("MCP_RATE_LIMIT_TOKEN_IP", 60) == 7
+  assert db.ops == []
+
+
+def test_local_writes_update_snapshot_and_notify():
+  module, db = _build_module({"Hostname": "example.com"})
+  changes: list[set[str]] = []
+
+  async def _listener(changed: set[str]):
+    changes.append(changed)
+
+  async def run():
+    await module.reload()
+    module.add_listener(_listener)
+    await module.upsert_config("user", [], "Hostname", "other.example.com")
+    await module.delete_config("user", [], "Hostname")
+
+  asyncio.run(run())
+  assert changes == [{"Hostname"}, {"Hostname"}]
+  assert module.get_value("Hostname") is None
+  assert "Hostname" not in db.values
+
+
+def test_check_version_reloads_external_changes():
+  module, db = _build_module({"Hostname": "example.com"})
+  changes: list[set[str]] = []
+
+  async def _listener(changed: set[str]):
+    changes.append(changed)
+
+  async def run():
+    await module.reload()
+    module.add_listener(_listener)
+    assert await module.check_version() is False
+    db.values["Hostname"] = "changed.example.com"
+    assert await module.check_version() is True
+
+  asyncio.run(run())
+  assert module.get_value("Hostname") == "changed.example.com"
+  assert changes == [{"Hostname"}]
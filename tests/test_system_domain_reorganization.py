@@ -12,7 +12,7 @@ class TestSystemHandlerRegistration:
   def test_expected_subdomains(self):
     from queryregistry.system.handler import HANDLERS
     expected = {
-      "async_tasks", "batch_jobs", "config", "conversations",
+      "async_tasks", "batch_jobs", "config", "conversations", "leases",
       "personas", "public", "renewals", "roles",
     }
     assert set(HANDLERS.keys()) == expected
@@ -37,7 +37,7 @@ class TestPublicVarsAbsorbed:
     from server.modules.public_vars_module import PublicVarsModule
     import server.modules.public_vars_module as module
     source = inspect.getsource(module)
-    assert "queryregistry.system.config" in source
+    assert "system_config" in source
     assert "queryregistry.system.public_vars" not in source
 
 
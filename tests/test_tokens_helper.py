@@ -0,0 +1,102 @@
+import asyncio
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+import server.helpers.tokens as tokens
+
+
+class FakeEncoder:
+  def __init__(self):
+    self.batch_calls = 0
+
+  def encode_ordinary(self, text):
+    return list(text)
+
+  def encode_ordinary_batch(self, texts):
+    self.batch_calls += 1
+    return [list(text) for text in texts]
+
+
+@pytest.fixture
+def encoder(monkeypatch):
+  fake = FakeEncoder()
+  monkeypatch.setattr(tokens, "_encoders", {tokens.DEFAULT_ENCODING: fake})
+  return fake
+
+
+def test_batch_counts_use_one_encoder_call(encoder):
+  assert tokens.count_tokens("abc") == 3
+  assert tokens.count_tokens_batch(["a", "bb", "ccc"]) == [1, 2, 3]
+  assert encoder.batch_calls == 1
+  assert tokens.count_tokens_batch([]) == []
+
+
+def test_large_inputs_are_counted_off_the_event_loop(encoder, monkeypatch):
+  threaded = []
+
+  async def fake_to_thread(func, *args):
+    threaded.append(func)
+    return func(*args)
+
+  monkeypatch.setattr(tokens.asyncio, "to_thread", fake_to_thread)
+  large = "x" * tokens.EXECUTOR_THRESHOLD_CHARS
+
+  assert asyncio.run(tokens.count_tokens_async("small")) == 5
+  assert threaded == []
+  assert asyncio.run(tokens.count_tokens_async(large)) == len(large)
+  assert asyncio.run(tokens.count_tokens_batch_async([large, "y"])) == [len(large), 1]
+  assert threaded == [tokens.count_tokens, tokens.count_tokens_batch]
+
+
+def test_encoders_are_cached_and_fall_back_to_word_counts(monkeypatch):
+  monkeypatch.setattr(tokens, "_encoders", {})
+  monkeypatch.setitem(sys.modules, "tiktoken", None)
+
+  assert tokens.count_tokens("three little words", "gpt-4o-mini") == 3
+  assert tokens.count_tokens_batch(["one two", "three"]) == [2, 1]
+  assert tokens._encoders == {"gpt-4o-mini": None, tokens.DEFAULT_ENCODING: None}
+
+
+def test_take_recent_keeps_newest_within_budget(encoder):
+  kept, used = tokens.take_recent(["aaaa", "bb", "cc", "d"], 5, counts=[4, None, 2, None])
+
+  assert kept == ["bb", "cc", "d"]
+  assert used == 5
+  assert encoder.batch_calls == 1
+
+
+def test_unknown_models_share_the_default_encoder(monkeypatch):
+  fake = FakeEncoder()
+
+  def encoding_for_model(model):
+    raise KeyError(model)
+
+  monkeypatch.setattr(tokens, "_encoders", {})
+  monkeypatch.setitem(
+    sys.modules,
+    "tiktoken",
+    SimpleNamespace(encoding_for_model=encoding_for_model, get_encoding=lambda name: fake),
+  )
+
+  assert tokens.get_encoder("custom-model") is fake
+  assert tokens.get_encoder() is fake
+
+
+def test_encoder_load_failures_fall_back_to_default_or_word_counts(monkeypatch):
+  def encoding_for_model(model):
+    raise OSError("failed to download BPE file")
+
+  def get_encoding(name):
+    raise ValueError("corrupt cache")
+
+  monkeypatch.setattr(tokens, "_encoders", {})
+  monkeypatch.setitem(
+    sys.modules,
+    "tiktoken",
+    SimpleNamespace(encoding_for_model=encoding_for_model, get_encoding=get_encoding),
+  )
+
+  assert tokens.count_tokens("three little words", "gpt-4o-mini") == 3
+  assert tokens._encoders == {"gpt-4o-mini": None, tokens.DEFAULT_ENCODING: None}